@@ -0,0 +1,26 @@
+"""add token_version to users
+
+Revision ID: 007_add_user_token_version
+Revises: aa963991c245
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_add_user_token_version'
+down_revision = 'aa963991c245'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add token_version, bumped to revoke a user's issued tokens."""
+    op.add_column('users',
+        sa.Column('token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    """Remove token_version from users."""
+    op.drop_column('users', 'token_version')
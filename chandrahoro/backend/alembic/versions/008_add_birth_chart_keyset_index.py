@@ -0,0 +1,24 @@
+"""add keyset pagination index to birth_charts
+
+Revision ID: 008_add_birth_chart_keyset_index
+Revises: 007_add_user_token_version
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_add_birth_chart_keyset_index'
+down_revision = '007_add_user_token_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index (user_id, created_at, id) for newest-first chart lists."""
+    op.create_index('idx_birth_charts_user_created', 'birth_charts', ['user_id', 'created_at', 'id'])
+
+
+def downgrade():
+    """Remove the chart list index."""
+    op.drop_index('idx_birth_charts_user_created', table_name='birth_charts')
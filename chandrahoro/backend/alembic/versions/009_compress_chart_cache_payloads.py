@@ -0,0 +1,88 @@
+"""store chart_cache results as compressed binary payloads
+
+Revision ID: 009_compress_chart_cache
+Revises: 008_add_birth_chart_keyset_index
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from app.core.cache_codec import decode_payload, encode_payload
+
+# revision identifiers, used by Alembic.
+revision = '009_compress_chart_cache'
+down_revision = '008_add_birth_chart_keyset_index'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 500
+
+chart_cache = sa.table(
+    'chart_cache',
+    sa.column('id', sa.String(36)),
+    sa.column('cache_data', sa.JSON(none_as_null=True)),
+    sa.column('payload', sa.LargeBinary()),
+    sa.column('payload_format', sa.String(20)),
+)
+
+
+def upgrade():
+    """Add payload columns and move existing JSON results into them."""
+    op.add_column('chart_cache',
+        sa.Column('payload', sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), 'mysql'), nullable=True))
+    op.add_column('chart_cache', sa.Column('payload_format', sa.String(length=20), nullable=True))
+    with op.batch_alter_table('chart_cache') as batch_op:
+        batch_op.alter_column('cache_data', existing_type=sa.JSON(), nullable=True)
+
+    if context.is_offline_mode():
+        return
+    bind = op.get_bind()
+    while True:
+        rows = bind.execute(
+            sa.select(chart_cache.c.id, chart_cache.c.cache_data)
+            .where(chart_cache.c.payload.is_(None), chart_cache.c.cache_data.isnot(None))
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            payload, payload_format = encode_payload(row.cache_data)
+            bind.execute(
+                chart_cache.update()
+                .where(chart_cache.c.id == row.id)
+                .values(payload=payload, payload_format=payload_format, cache_data=None)
+            )
+
+    # Rebuild the table so the space of the JSON documents is released
+    if bind.dialect.name == 'mysql':
+        op.execute('OPTIMIZE TABLE chart_cache')
+
+
+def downgrade():
+    """Move payloads back into cache_data and drop the payload columns."""
+    if not context.is_offline_mode():
+        bind = op.get_bind()
+        while True:
+            rows = bind.execute(
+                sa.select(chart_cache.c.id, chart_cache.c.payload, chart_cache.c.payload_format)
+                .where(chart_cache.c.payload.isnot(None))
+                .limit(BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                try:
+                    values = {'cache_data': decode_payload(row.payload, row.payload_format), 'payload': None}
+                except ValueError:
+                    # Cache entries are recomputable; drop what can't be decoded here
+                    bind.execute(chart_cache.delete().where(chart_cache.c.id == row.id))
+                    continue
+                bind.execute(chart_cache.update().where(chart_cache.c.id == row.id).values(**values))
+        bind.execute(chart_cache.delete().where(chart_cache.c.cache_data.is_(None)))
+
+    with op.batch_alter_table('chart_cache') as batch_op:
+        batch_op.alter_column('cache_data', existing_type=sa.JSON(), nullable=False)
+    op.drop_column('chart_cache', 'payload_format')
+    op.drop_column('chart_cache', 'payload')
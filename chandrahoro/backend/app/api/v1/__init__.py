@@ -0,0 +1,50 @@
+"""API v1 routers.
+
+``ROUTERS`` lists every router module in inclusion order (earlier routers
+win when paths overlap); ``app.main`` mounts them through
+``app.core.lazy_routes``. After adding a router or changing routes, run
+``python -m app.core.lazy_routes --write`` to refresh the manifest.
+"""
+
+from app.core.lazy_routes import RouterSpec
+
+ROUTERS = [
+    RouterSpec("auth", "/api/v1/auth", ["auth"]),
+    RouterSpec("chart", "/api/v1/chart", ["charts"]),
+    RouterSpec("charts", "/api/v1", ["charts"]),
+    RouterSpec("methodologies", "/api/v1/methodologies", ["methodologies"]),
+    RouterSpec("profiles", "/api/v1", ["profiles"]),
+    RouterSpec("timeline", "/api/v1", ["timeline"]),
+    RouterSpec("calibration", "/api/v1", ["calibration"]),
+    RouterSpec("journal", "/api/v1", ["journal"]),
+    RouterSpec("comparison", "/api/v1", ["comparison"]),
+    RouterSpec("synergy", "/api/v1", ["synergy"]),
+    RouterSpec("roles", "/api/v1", ["roles"]),
+    RouterSpec("candidates", "/api/v1", ["candidates"]),
+    RouterSpec("teams", "/api/v1", ["teams"]),
+    RouterSpec("pipeline", "/api/v1", ["pipeline"]),
+    RouterSpec("corporate_dashboard", "/api/v1", ["dashboard"]),
+    RouterSpec("privacy", "/api/v1", ["privacy"]),
+    RouterSpec("stock_universe", "/api/v1", ["stock_universe"]),
+    RouterSpec("research_session", "/api/v1", ["research_session"]),
+    RouterSpec("horoscope_generation", "/api/v1", ["horoscope_generation"]),
+    RouterSpec("feature_extraction", "/api/v1", ["feature_extraction"]),
+    RouterSpec("feature_aggregation", "/api/v1", ["feature_aggregation"]),
+    RouterSpec("price_data", "/api/v1", ["price_data"]),
+    RouterSpec("prediction_metrics", "/api/v1", ["prediction_metrics"]),
+    RouterSpec("research_dashboard", "/api/v1", ["research_dashboard"]),
+    RouterSpec("research_export", "/api/v1", ["research_export"]),
+    RouterSpec("research_safety", "/api/v1", ["research_safety"]),
+    RouterSpec("performance_optimization", "/api/v1", ["performance_optimization"]),
+    RouterSpec("security_hardening", "/api/v1", ["security_hardening"]),
+    RouterSpec("documentation", "/api/v1", ["documentation"]),
+    RouterSpec("testing_qa", "/api/v1", ["testing_qa"]),
+    RouterSpec("deployment", "/api/v1", ["deployment"]),
+    RouterSpec("locations", "/api/v1/locations", ["locations"]),
+    RouterSpec("transits", "/api/v1", ["transits"]),
+    RouterSpec("relocation", "/api/v1", ["relocation"]),
+    RouterSpec("ai", "/api/v1/ai", ["ai"]),
+    RouterSpec("llm", "/api/v1/llm", ["llm"]),
+    RouterSpec("ai_prompts", "/api/v1", ["ai-prompts"]),
+    RouterSpec("ai_reports", "/api/v1/ai-reports", ["ai-reports"]),
+]
@@ -2,13 +2,17 @@
 
 import logging
 from typing import Optional, List
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.rbac import get_current_user
-from app.models.user import User
-from app.models.ai_report_models import ReportType
+from app.core.principal import Principal
+from app.core.rbac import get_current_principal
+from app.core.compression import artifact_response, get_artifact_store
+from app.core.http_cache import CALCULATION_VERSION, cache_headers, etag_matches, make_etag, not_modified
+from app.models.ai_report_models import AiGeneratedReport, ReportType
 from app.schemas.ai_report_schemas import (
     AiReportCreate, AiReportUpdate, AiReportResponse, AiReportListResponse,
     RegenerateReportRequest, RegenerateReportResponse,
@@ -24,7 +28,7 @@ ai_report_service = AiReportService()
 @router.post("/", response_model=AiReportResponse, status_code=status.HTTP_201_CREATED)
 async def create_report(
     report_data: AiReportCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -56,7 +60,7 @@ async def list_user_reports(
     only_latest: bool = True,
     page: int = 1,
     page_size: int = 20,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -103,7 +107,7 @@ async def list_user_reports(
 @router.get("/{report_id}", response_model=AiReportResponse)
 async def get_report(
     report_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -126,17 +130,45 @@ async def get_report(
     return AiReportResponse.model_validate(report)
 
 
+def _report_filename(title: str, created_at) -> str:
+    return f"{title.replace(' ', '_')}_{created_at.strftime('%Y%m%d')}.html"
+
+
 @router.get("/{report_id}/download")
 async def download_report(
     report_id: str,
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Download report as HTML file.
 
-    Returns the HTML content with appropriate headers for download.
+    Returns the HTML content with appropriate headers for download. Report
+    HTML never changes in place (regeneration creates a new report), so a
+    matching ``If-None-Match`` returns 304 without loading the content or
+    counting a view/download, and the HTML is kept precompressed so repeat
+    downloads skip loading and compressing it.
     """
+    result = await db.execute(
+        select(AiGeneratedReport.title, AiGeneratedReport.version, AiGeneratedReport.created_at).where(
+            (AiGeneratedReport.id == report_id) & (AiGeneratedReport.user_id == current_user.id)
+        )
+    )
+    row = result.first()
+    if row is not None:
+        etag = make_etag(CALCULATION_VERSION, "ai_report", report_id, row.version, row.created_at.isoformat())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        artifact = get_artifact_store().get(etag)
+        if artifact is not None:
+            await ai_report_service.increment_download_count(db=db, report_id=report_id)
+            return artifact_response(request, artifact, {
+                "Content-Disposition": f'attachment; filename="{_report_filename(row.title, row.created_at)}"',
+                **cache_headers(etag),
+            })
+
     report = await ai_report_service.get_report_by_id(
         db=db,
         report_id=report_id,
@@ -153,23 +185,21 @@ async def download_report(
     await ai_report_service.increment_download_count(db=db, report_id=report_id)
 
     # Generate filename
-    filename = f"{report.title.replace(' ', '_')}_{report.created_at.strftime('%Y%m%d')}.html"
+    filename = _report_filename(report.title, report.created_at)
 
     # Return HTML content with download headers
-    return Response(
-        content=report.html_content,
-        media_type="text/html",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"'
-        }
-    )
+    artifact = await run_in_threadpool(get_artifact_store().put, etag, report.html_content, "text/html")
+    return artifact_response(request, artifact, {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        **cache_headers(etag),
+    })
 
 
 @router.put("/{report_id}", response_model=AiReportResponse)
 async def update_report(
     report_id: str,
     update_data: AiReportUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -196,7 +226,7 @@ async def update_report(
 @router.delete("/{report_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_report(
     report_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -221,7 +251,7 @@ async def delete_report(
 async def regenerate_report(
     report_id: str,
     regenerate_data: RegenerateReportRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -261,7 +291,7 @@ async def regenerate_report(
 async def create_share_link(
     report_id: str,
     share_data: ReportShareCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -296,7 +326,7 @@ async def create_share_link(
 
 @router.get("/stats/summary", response_model=ReportStatsResponse)
 async def get_user_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """
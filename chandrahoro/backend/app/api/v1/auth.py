@@ -8,7 +8,7 @@ from sqlalchemy import select
 from app.core.database import get_db
 from app.core.rbac import get_current_user
 from app.core.rate_limit import check_rate_limit, RATE_LIMITS
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password_async, verify_password_async
 from app.core.exceptions import (
     ValidationError, AuthenticationError, RateLimitError, DatabaseError
 )
@@ -105,14 +105,15 @@ async def register(
         Access and refresh tokens
     """
     # Check rate limit
-    is_allowed, rate_limit_info = check_rate_limit(
+    rate = await check_rate_limit(
         f"register:{request.email}",
         **RATE_LIMITS["auth"]
     )
-    if not is_allowed:
+    if not rate.allowed:
         raise RateLimitError(
             "Too many registration attempts",
-            details={"retry_after": rate_limit_info["reset"]}
+            details=rate.to_dict(),
+            headers=rate.headers()
         )
 
     try:
@@ -158,14 +159,15 @@ async def login(
         Access and refresh tokens
     """
     # Check rate limit
-    is_allowed, rate_limit_info = check_rate_limit(
+    rate = await check_rate_limit(
         f"login:{request.email}",
         **RATE_LIMITS["auth"]
     )
-    if not is_allowed:
+    if not rate.allowed:
         raise RateLimitError(
             "Too many login attempts",
-            details={"retry_after": rate_limit_info["reset"]}
+            details=rate.to_dict(),
+            headers=rate.headers()
         )
     
     try:
@@ -211,16 +213,22 @@ async def get_current_user_info(
 @router.post("/logout")
 async def logout(
     user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
-    Logout user (client-side token deletion).
+    Logout user.
+
+    Revokes every token issued to the user (all sessions) and drops
+    their cached principal.
 
     Args:
         user: Current user
+        db: Database session
 
     Returns:
         Success message
     """
+    await AuthService.revoke_tokens(db, user)
     logger.info(f"User logged out: {user.email}")
     return {"message": "Logged out successfully"}
 
@@ -297,11 +305,12 @@ async def change_password(
         db: Database session
 
     Returns:
-        Success message
+        Success message and new tokens (changing the password revokes
+        previously issued tokens)
     """
     try:
         # Verify current password
-        if not verify_password(request.current_password, user.password_hash):
+        if not await verify_password_async(request.current_password, user.password_hash):
             logger.warning(f"Failed password change attempt for: {user.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -315,13 +324,20 @@ async def change_password(
                 detail="New password must be different from current password",
             )
 
-        # Update password
-        user.password_hash = hash_password(request.new_password)
+        # Update password (bumps token_version, revoking existing tokens)
+        user.password_hash = await hash_password_async(request.new_password)
         db.add(user)
         await db.commit()
+        await db.refresh(user)
 
+        access_token, refresh_token = AuthService.issue_tokens(user)
         logger.info(f"User password changed: {user.email}")
-        return {"message": "Password changed successfully"}
+        return {
+            "message": "Password changed successfully",
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+        }
 
     except HTTPException:
         raise
@@ -438,7 +454,7 @@ async def delete_account(
     """
     try:
         # Verify password
-        if not verify_password(request.password, user.password_hash):
+        if not await verify_password_async(request.password, user.password_hash):
             logger.warning(f"Failed account deletion attempt for: {user.email}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
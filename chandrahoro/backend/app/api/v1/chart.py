@@ -1,30 +1,33 @@
 """Chart calculation API endpoints."""
 
-from datetime import datetime, timezone, date, time
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 import logging
 import json
+import time
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
 from pydantic import ValidationError as PydanticValidationError
 from app.core.exceptions import ValidationError, NotFoundError, DatabaseError
 
-from app.models.chart import ChartRequest, ChartData, BirthDetails, ChartPreferences, PlanetPosition, HousePosition
+from app.models.chart import ChartRequest, BirthDetails, ChartPreferences
 from app.models.chart_models import BirthChart
-from app.core.ephemeris import EphemerisCalculator, get_sign_name, get_nakshatra_name
-from app.core.houses import HouseSystemCalculator
-from app.core.dasha import VimshottariDasha
-from app.core.divisional_charts import DivisionalChartCalculator
-from app.core.yogas import YogaDetector
-from app.core.aspects import VedicAspectCalculator
-from app.core.transits import TransitCalculator
-from app.core.shadbala import ShadbalaCalculator
-from app.core.planetary_relationships import PlanetaryRelationshipAnalyzer
-from app.core.ashtakavarga import AshtakavargaCalculator
+from app.core.ephemeris import get_sign_name
+from app.core.dasha import parse_dasha_date
 from app.core.dasha_intensity import DashaIntensityCalculator
-from app.services.pdf_generator import PDFReportGenerator
-from app.services.image_generator import ImageGenerator
+from app.core.admission import run_heavy
+from app.core.compression import artifact_response, get_artifact_store
+from app.core.http_cache import (
+    SAMPLE_CACHE_CONTROL, cache_headers, chart_etag, etag_matches, not_modified
+)
+from app.core.serialization import FastJSONResponse, PLANET_FORMATS, compact_chart_payload, to_jsonable
+from app.core.chart_sections import (
+    PARASHARA_SECTIONS, available_sections, chart_input_hash, resolve_sections, get_chart_state
+)
+from app.core.single_flight import flight_key, get_single_flight
+from app.core.degraded_mode import get_degraded_mode
 from app.core.database import get_db
 from app.core.rbac import get_current_user_or_guest
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -34,17 +37,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-def convert_datetime_objects(obj: Any) -> Any:
-    """Recursively convert datetime objects to ISO format strings."""
-    if isinstance(obj, (datetime, date, time)):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: convert_datetime_objects(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_datetime_objects(item) for item in obj]
-    return obj
-
-
 @router.get("/test")
 async def test_chart_api():
     """Test endpoint to verify chart API is working."""
@@ -58,11 +50,15 @@ async def test_chart_api():
     }
 
 
-@router.post("/calculate", response_model=Dict[str, Any])
+@router.post("/calculate", response_model=Dict[str, Any], response_class=FastJSONResponse)
 async def calculate_chart(
     request: ChartRequest,
+    http_request: Request,
     user = Depends(get_current_user_or_guest),
     db: AsyncSession = Depends(get_db),
+    include: Optional[str] = Query(None, description="Comma-separated sections to calculate (default: all)"),
+    exclude: Optional[str] = Query(None, description="Comma-separated sections to skip"),
+    planet_format: str = Query("objects", description="Planet list encoding: objects (default) or table"),
 ):
     """
     Calculate horoscope chart from birth details using ALL available methodologies.
@@ -71,10 +67,32 @@ async def calculate_chart(
     and returns them in a unified response structure, allowing instant switching between
     methodologies on the frontend without requiring recalculation.
 
+    Sections (planets, houses, dasha.current, dasha.timeline, dasha.navigator,
+    vargas, yogas, aspects, shadbala, relationships, ashtakavarga and
+    methodologies.<name>) can be selected with ``include``/``exclude``; only
+    the requested sections and their dependencies are calculated. Group names
+    such as ``dasha`` or ``methodologies`` select every section under them.
+
+    The response is rendered directly with orjson. ``planet_format=table``
+    encodes planet lists as compact column/row tables.
+
+    Responses carry a strong ETag derived from the chart input; a matching
+    ``If-None-Match`` returns 304 before anything is calculated (and the
+    chart is not saved again).
+
+    Under load (see ``app.core.degraded_mode``) a request without
+    ``include`` may skip optional sections; they are listed in
+    ``deferred_sections`` and can be fetched later with ``include=``. Such
+    partial responses are marked ``degraded`` and are not cacheable.
+
     Args:
         request: Chart calculation request with birth details and preferences
+        http_request: Raw request (for If-None-Match)
         user: Current user (authenticated or guest)
         db: Database session
+        include: Sections to calculate (default: all)
+        exclude: Sections to skip
+        planet_format: ``objects`` or ``table``
 
     Returns:
         Unified chart data with results from all methodologies:
@@ -91,84 +109,104 @@ async def calculate_chart(
             "ascendant": {...}  // Common ascendant data from selected methodology
         }
     """
-    try:
-        logger.info(f"Calculating chart for birth date: {request.birth_details.date} (user: {user.email})")
+    if planet_format not in PLANET_FORMATS:
+        raise ValidationError(f"Invalid planet_format '{planet_format}'. Expected one of: {', '.join(PLANET_FORMATS)}")
 
-        # Extract birth details
-        birth_details = request.birth_details
-        preferences = request.preferences or ChartPreferences()
+    etag = chart_etag(request.birth_details, request.preferences, "calculate", include, exclude, planet_format)
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
 
-        # Get the methodology from the registry
-        from app.core.base_methodology import MethodologyRegistry, BirthData, CalculationPreferences
+    started = time.perf_counter()
+    response_data = await build_chart_response(request, user, db, include, exclude, allow_degraded=True)
+    get_degraded_mode().record_latency(time.perf_counter() - started)
+    if planet_format == "table":
+        response_data["data"] = compact_chart_payload(response_data["data"])
+        response_data["planet_format"] = "table"
 
-        selected_methodology = preferences.methodology
-        logger.info(f"Selected methodology: {selected_methodology} (will calculate all methodologies)")
-
-        # Create datetime object from birth details
-        if birth_details.time_unknown:
-            # Default to 12:00 PM if time is unknown
-            birth_datetime = datetime.combine(
-                birth_details.date,
-                datetime.min.time().replace(hour=12)
-            )
-        else:
-            birth_datetime = datetime.combine(birth_details.date, birth_details.time)
-
-        # Prepare birth data for all methodologies
-        birth_data_obj = BirthData(
-            date=birth_datetime,
-            latitude=birth_details.latitude,
-            longitude=birth_details.longitude,
-            timezone=birth_details.timezone,
-            location_name=birth_details.location_name,
-            name=birth_details.name
-        )
+    # A degraded response doesn't match the ETag's full chart
+    headers = {"Cache-Control": "no-store"} if response_data.get("degraded") else cache_headers(etag)
+    # Returning the response directly skips jsonable_encoder over the payload
+    return FastJSONResponse(response_data, headers=headers)
 
-        # Prepare calculation preferences
-        calc_preferences = CalculationPreferences(
-            methodology=preferences.methodology,
-            ayanamsha=preferences.ayanamsha,
-            house_system=preferences.house_system,
-            chart_style=preferences.chart_style
-        )
 
-        # Get all available methodologies
-        all_methodologies = MethodologyRegistry.get_all()
-        logger.info(f"Calculating chart using {len(all_methodologies)} methodologies: {list(all_methodologies.keys())}")
+async def build_chart_response(
+    request: ChartRequest,
+    user: Optional[Any] = None,
+    db: Optional[AsyncSession] = None,
+    include: Optional[str] = None,
+    exclude: Optional[str] = None,
+    allow_degraded: bool = False,
+) -> Dict[str, Any]:
+    """
+    Build the /chart/calculate response dict.
 
-        # Calculate chart for ALL methodologies
-        methodology_results = {}
-        calculation_errors = {}
+    Values may still be datetime objects; render with ``FastJSONResponse`` or
+    convert with ``to_jsonable``. Charts are saved only when an authenticated
+    user and a database session are given.
 
-        for method_name, methodology in all_methodologies.items():
-            try:
-                logger.info(f"Calculating {method_name} methodology...")
+    Args:
+        request: Chart calculation request with birth details and preferences
+        user: Current user (None or guest: not saved)
+        db: Database session
+        include: Sections to calculate (default: all)
+        exclude: Sections to skip
+        allow_degraded: Defer optional sections when under load (only
+            when ``include`` is not given)
 
-                # Update preferences for this methodology
-                method_preferences = CalculationPreferences(
-                    methodology=method_name,
-                    ayanamsha=preferences.ayanamsha,
-                    house_system=preferences.house_system,
-                    chart_style=preferences.chart_style
-                )
+    Returns:
+        Response dict with ``success``, ``data`` and ``sections`` (plus
+        ``deferred_sections`` and ``degraded`` when sections were deferred)
+    """
+    try:
+        logger.info(f"Calculating chart for birth date: {request.birth_details.date} (user: {getattr(user, 'email', 'guest')})")
 
-                # Calculate chart
-                chart_result = methodology.calculate_chart(birth_data_obj, method_preferences)
-                methodology_results[method_name] = chart_result
-                logger.info(f"✓ {method_name} calculation completed successfully")
+        # Extract birth details
+        birth_details = request.birth_details
+        preferences = request.preferences or ChartPreferences()
 
-            except Exception as e:
-                logger.error(f"✗ Error calculating {method_name} methodology: {e}")
-                calculation_errors[method_name] = {
-                    "error": str(e),
-                    "message": f"Failed to calculate {method_name} methodology"
-                }
-                # Store error in results so frontend can display it
-                methodology_results[method_name] = {
-                    "error": True,
-                    "error_message": str(e),
-                    "methodology": method_name
-                }
+        # Get the methodology from the registry
+        from app.core.base_methodology import MethodologyRegistry
+
+        selected_methodology = preferences.methodology
+
+        # Resolve requested sections; by default every section is calculated
+        methodology_names = list(MethodologyRegistry.get_all().keys())
+        sections = resolve_sections(include, exclude, methodology_names, selected_methodology)
+
+        # Sections are evaluated lazily and cached per chart input, so follow-up
+        # requests for more sections reuse everything already calculated
+        chart_state = get_chart_state(birth_details, preferences)
+
+        # Under load, shed optional sections not cached yet; an explicit
+        # include is honored since it is how clients fetch deferred sections
+        deferred_sections, degraded_reasons = [], []
+        if allow_degraded and not include:
+            degraded_mode = get_degraded_mode()
+            degraded_reasons = degraded_mode.check()
+            if degraded_reasons:
+                deferred_sections = degraded_mode.deferrable(sections, selected_methodology, chart_state)
+            if deferred_sections:
+                degraded_mode.record(deferred_sections)
+                sections = [s for s in sections if s not in deferred_sections]
+                logger.info(f"Degraded mode ({', '.join(degraded_reasons)}): deferring {', '.join(deferred_sections)}")
+
+        full_response = len(sections) == len(available_sections(methodology_names))
+        logger.info(f"Selected methodology: {selected_methodology} (sections: {'all' if full_response else ', '.join(sections)})")
+
+        async def calculate() -> Dict[str, Any]:
+            # CPU-bound: run on the heavy-work pool so the event loop stays free
+            return await run_heavy(chart_state.methodology_results, sections, methodology_names)
+
+        if chart_state.needs_compute(sections, methodology_names):
+            # Identical calculations in flight (in other workers too, with
+            # SINGLE_FLIGHT_SHARED) share one result; copied because the
+            # entries are replaced by their normalized form below
+            methodology_results = dict(await get_single_flight("chart", shared=True).do(
+                flight_key(chart_input_hash(birth_details, preferences), sections), calculate
+            ))
+        else:
+            # Everything requested is cached: assembling it is cheaper than a thread hop
+            methodology_results = chart_state.methodology_results(sections, methodology_names)
 
         # Get the selected methodology result
         if selected_methodology not in methodology_results:
@@ -176,195 +214,13 @@ async def calculate_chart(
                 f"Selected methodology '{selected_methodology}' is not available or failed to calculate"
             )
 
-        chart_result = methodology_results[selected_methodology]
-
-        # Process each methodology's results to add additional features
-        # For Parashara, add comprehensive Vedic features
-        if "parashara" in methodology_results and not methodology_results["parashara"].get("error"):
-            # Initialize calculators for Parashara-specific features
-            ephemeris = EphemerisCalculator(ayanamsha=preferences.ayanamsha)
-            house_calc = HouseSystemCalculator(house_system=preferences.house_system)
-            dasha_calc = VimshottariDasha()
-            divisional_calc = DivisionalChartCalculator()
-            yoga_detector = YogaDetector()
-            aspect_calc = VedicAspectCalculator()
-            shadbala_calc = ShadbalaCalculator()
-            relationship_analyzer = PlanetaryRelationshipAnalyzer()
-            ashtakavarga_calc = AshtakavargaCalculator()
-
-        # For Parashara methodology, calculate additional comprehensive features
         if "parashara" in methodology_results and not methodology_results["parashara"].get("error"):
-            # Calculate planetary positions
-            planet_positions = ephemeris.calculate_all_planets(birth_datetime)
-
-            # Calculate ascendant and houses using the selected house system
-            ascendant_data = ephemeris.calculate_ascendant(
-                birth_datetime,
-                birth_details.latitude,
-                birth_details.longitude,
-                house_system=preferences.house_system
-            )
-
-            house_data = house_calc.calculate_houses(
-                birth_datetime,
-                birth_details.latitude,
-                birth_details.longitude,
-                ascendant_data.get('ayanamsha_value', 0.0)
-            )
-
-            # Calculate Dasha periods
-            moon_position = planet_positions.get('Moon', {})
-            moon_longitude = moon_position.get('sidereal_longitude', 0.0)
-
-            current_dasha = dasha_calc.get_current_dasha(
-                birth_datetime,
-                moon_longitude
-            )
-
-            dasha_timeline = dasha_calc.get_dasha_timeline(
-                birth_datetime,
-                moon_longitude,
-                years_ahead=12  # Calculate 12 years from birth date for performance
-            )
-
-            # Calculate comprehensive dasha navigator data
-            dasha_navigator = dasha_calc.get_comprehensive_dasha_navigator(
-                birth_datetime,
-                moon_longitude,
-                years_ahead=120  # Full 120-year cycle
-            )
-
-            # Calculate divisional charts including defaults and user selections
-            all_divisional_charts = preferences.get_all_divisional_charts()
-            divisional_charts = divisional_calc.calculate_all_divisional_charts(
-                planet_positions,
-                chart_types=all_divisional_charts
-            )
-
-            # Convert to response format
-            planets = []
-            for planet_name, pos_data in planet_positions.items():
-                planet = PlanetPosition(
-                    name=planet_name,
-                    tropical_longitude=pos_data['tropical_longitude'],
-                    sidereal_longitude=pos_data['sidereal_longitude'],
-                    sign=get_sign_name(pos_data['sign_number']),
-                    degree_in_sign=pos_data['degree_in_sign'],
-                    nakshatra=get_nakshatra_name(pos_data['nakshatra_number']),
-                    pada=pos_data['pada'],
-                    house=((pos_data['sign_number'] - ascendant_data['sign_number']) % 12) + 1,
-                    retrograde=pos_data['retrograde'],
-                    speed=pos_data['speed']
-                )
-                planets.append(planet)
-
-            # Convert house data
-            houses = []
-            if 'house_cusps_sidereal' in house_data:
-                for i, house_cusp in enumerate(house_data['house_cusps_sidereal']):
-                    house = HousePosition(
-                        number=i + 1,
-                        cusp_longitude=house_cusp,
-                        sign=get_sign_name(int(house_cusp / 30)),
-                        degree_in_sign=house_cusp % 30
-                    )
-                    houses.append(house)
-
-            # Create chart data
-            chart_data = ChartData(
-                birth_info=birth_details,
-                preferences=preferences,
-                ascendant=house_data.get('ascendant_sidereal', 0.0),
-                ascendant_sign=get_sign_name(int(house_data.get('ascendant_sidereal', 0.0) / 30)),
-                planets=planets,
-                houses=houses,
-                ayanamsha_value=ascendant_data.get('ayanamsha_value', 0.0)
-            )
-
-            # Detect yogas
-            yogas = yoga_detector.detect_all_yogas(
-                [planet.dict() for planet in planets],
-                [house.dict() for house in houses],
-                chart_data.ascendant_sign
-            )
-
-            # Convert yogas to dict format
-            yogas_data = []
-            for yoga in yogas:
-                yogas_data.append({
-                    "name": yoga.name,
-                    "type": yoga.type,
-                    "strength": yoga.strength,
-                    "description": yoga.description,
-                    "planets_involved": yoga.planets_involved,
-                    "houses_involved": yoga.houses_involved,
-                    "conditions_met": yoga.conditions_met,
-                    "effects": yoga.effects
-                })
-
-            # Calculate aspects
-            aspects = aspect_calc.calculate_all_aspects(
-                [planet.dict() for planet in planets],
-                [house.dict() for house in houses]
-            )
-
-            # Convert aspects to dict format
-            aspects_data = []
-            for aspect in aspects:
-                aspects_data.append({
-                    "aspecting_planet": aspect.aspecting_planet,
-                    "aspected_planet": aspect.aspected_planet,
-                    "aspected_house": aspect.aspected_house,
-                    "aspect_type": aspect.aspect_type,
-                    "aspect_strength": aspect.aspect_strength,
-                    "orb": aspect.orb,
-                    "description": aspect.description,
-                    "benefic": aspect.benefic
-                })
-
-            # Get aspect summary
-            aspect_summary = aspect_calc.get_aspect_summary(aspects)
-
-            # Calculate Shadbala (planetary strengths)
-            shadbala_results = shadbala_calc.calculate_shadbala(
-                birth_datetime, birth_details.latitude, birth_details.longitude,
-                [planet.dict() for planet in planets],
-                [house.dict() for house in houses]
-            )
-
-            # Calculate planetary relationships
-            relationship_results = relationship_analyzer.analyze_relationships(
-                [planet.dict() for planet in planets]
-            )
-
-            # Calculate Ashtakavarga
-            ashtakavarga_results = ashtakavarga_calc.calculate_ashtakavarga(
-                [planet.dict() for planet in planets],
-                [house.dict() for house in houses]
+            parashara_data = methodology_results["parashara"]
+            logger.info(
+                f"Chart calculation completed successfully with {len(parashara_data.get('yogas', []))} yogas, "
+                f"{len(parashara_data.get('aspects', []))} aspects"
             )
 
-            logger.info(f"Chart calculation completed successfully with {len(yogas)} yogas, {len(aspects)} aspects, and Shadbala analysis")
-
-            # Prepare Parashara-specific data with comprehensive features
-            chart_data_dict = chart_data.dict()
-
-            parashara_data = {
-                **chart_data_dict,
-                "current_dasha": current_dasha,
-                "dasha_timeline": dasha_timeline,
-                "dasha_navigator": dasha_navigator,
-                "divisional_charts": divisional_charts,
-                "yogas": yogas_data,
-                "aspects": aspects_data,
-                "aspect_summary": aspect_summary,
-                "shadbala": shadbala_results,
-                "planetary_relationships": relationship_results,
-                "ashtakavarga": ashtakavarga_results
-            }
-
-            # Update Parashara results with comprehensive data
-            methodology_results["parashara"] = parashara_data
-
         # Normalize all methodology results for frontend compatibility
         def normalize_methodology_data(method_name: str, method_data: Dict[str, Any]) -> Dict[str, Any]:
             """Normalize methodology data to ensure consistent structure."""
@@ -380,11 +236,10 @@ async def calculate_chart(
                 normalized['ascendant_sign'] = get_sign_name(ascendant_obj.get('sign_number', 0))
                 normalized['ayanamsha_value'] = ascendant_obj.get('ayanamsha_value', 0.0)
 
-                # Store full ascendant object in methodology-specific data
+                # Store full ascendant object in methodology-specific data; copied
+                # because the nested dict belongs to the cached (shared) result
                 method_data_key = f"{method_name}_data"
-                if method_data_key not in normalized:
-                    normalized[method_data_key] = {}
-                normalized[method_data_key]['ascendant_details'] = ascendant_obj
+                normalized[method_data_key] = {**normalized.get(method_data_key, {}), 'ascendant_details': ascendant_obj}
 
             # Convert planets dictionary to array format for frontend
             if isinstance(normalized.get('planets'), dict):
@@ -475,16 +330,10 @@ async def calculate_chart(
             parashara_data = methodology_results["parashara"]
             if not parashara_data.get("error"):
                 complete_chart_data.update({
-                    "current_dasha": parashara_data.get("current_dasha"),
-                    "dasha_timeline": parashara_data.get("dasha_timeline"),
-                    "dasha_navigator": parashara_data.get("dasha_navigator"),
-                    "divisional_charts": parashara_data.get("divisional_charts"),
-                    "yogas": parashara_data.get("yogas"),
-                    "aspects": parashara_data.get("aspects"),
-                    "aspect_summary": parashara_data.get("aspect_summary"),
-                    "shadbala": parashara_data.get("shadbala"),
-                    "planetary_relationships": parashara_data.get("planetary_relationships"),
-                    "ashtakavarga": parashara_data.get("ashtakavarga")
+                    key: parashara_data.get(key)
+                    for section, keys in PARASHARA_SECTIONS.items()
+                    if section in sections and section not in ("planets", "houses")
+                    for key in keys
                 })
         elif selected_methodology == "kp" and "kp" in methodology_results:
             kp_data = methodology_results["kp"]
@@ -499,12 +348,10 @@ async def calculate_chart(
             if not western_data.get("error"):
                 complete_chart_data["western_data"] = western_data.get("western_data", {})
 
-        # Recursively convert all datetime objects to ISO format strings
-        complete_chart_data = convert_datetime_objects(complete_chart_data)
-
-        # Save chart to database if user is authenticated (not guest)
+        # Save chart to database if user is authenticated (not guest); partial
+        # responses are not stored so saved charts always hold every section
         chart_id = None
-        if user.id != "guest-demo-user":
+        if user is not None and db is not None and user.id != "guest-demo-user" and full_response:
             try:
                 birth_chart = BirthChart(
                     user_id=user.id,
@@ -519,7 +366,7 @@ async def calculate_chart(
                     ayanamsha=preferences.ayanamsha,
                     house_system=preferences.house_system,
                     chart_style=preferences.chart_style,
-                    chart_data=complete_chart_data,
+                    chart_data=to_jsonable(complete_chart_data),
                     is_public="N",
                 )
                 db.add(birth_chart)
@@ -535,8 +382,15 @@ async def calculate_chart(
         response_data = {
             "success": True,
             "data": complete_chart_data,
-            "message": f"Chart calculated successfully for all {len(methodology_results)} methodologies"
+            "message": f"Chart calculated successfully for all {len(methodology_results)} methodologies",
+            "sections": sections,
         }
+        if deferred_sections:
+            response_data["deferred_sections"] = deferred_sections
+            response_data["degraded"] = {
+                "reasons": degraded_reasons,
+                "retry_after_seconds": get_degraded_mode().hold_seconds,
+            }
 
         # Include chart ID if saved
         if chart_id:
@@ -588,11 +442,61 @@ async def calculate_chart(
         )
 
 
+@router.post("/dasha", response_model=Dict[str, Any])
+async def get_dasha_periods(
+    request: ChartRequest,
+    user = Depends(get_current_user_or_guest),
+    level: str = Query("maha", description="Dasha level: maha, antar or pratyantar"),
+    from_date: Optional[str] = Query(None, alias="from", description="Window start (YYYY-MM-DD or ISO 8601)"),
+    to_date: Optional[str] = Query(None, alias="to", description="Window end (YYYY-MM-DD or ISO 8601)"),
+    path: Optional[str] = Query(None, description="Tree path above the level, e.g. Saturn or Saturn/Mercury"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum periods per page"),
+):
+    """
+    Get one page of Vimshottari Dasha periods for a date window or tree path.
+
+    Periods are served from per-chart boundary arrays that are built once and
+    cached, so the navigator UI can fetch just what it displays instead of the
+    full 120-year ``dasha_navigator`` tree. Pair with
+    ``/calculate?exclude=dasha.navigator,dasha.timeline`` for a light chart payload.
+
+    Args:
+        request: Chart calculation request with birth details and preferences
+        user: Current user (authenticated or guest)
+        level: Dasha level to list
+        from_date: Only periods ending after this date
+        to_date: Only periods starting before this date
+        path: Only descendants of this Mahadasha/Antardasha path
+        cursor: Pagination cursor
+        limit: Page size
+
+    Returns:
+        Page with ``periods``, ``total`` and ``next_cursor``
+    """
+    try:
+        preferences = request.preferences or ChartPreferences()
+        chart_state = get_chart_state(request.birth_details, preferences)
+        boundaries = await run_heavy(chart_state.get, "dasha.boundaries")
+        return boundaries.page(
+            level=level,
+            start=parse_dasha_date(from_date),
+            end=parse_dasha_date(to_date),
+            path=path,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+
+
 @router.get("/sample")
-async def get_sample_chart():
+async def get_sample_chart(http_request: Request):
     """
     Get a sample chart for testing and demonstration purposes.
 
+    Publicly cacheable (``Cache-Control: public``) so nginx can serve it.
+
     Returns:
         Sample chart data with mock birth details
     """
@@ -615,8 +519,15 @@ async def get_sample_chart():
             preferences=ChartPreferences()
         )
 
+        etag = chart_etag(sample_birth, sample_request.preferences, "sample")
+        if etag_matches(http_request, etag):
+            return not_modified(etag, SAMPLE_CACHE_CONTROL)
+
         # Calculate the sample chart
-        return await calculate_chart(sample_request)
+        return FastJSONResponse(
+            await build_chart_response(sample_request),
+            headers=cache_headers(etag, SAMPLE_CACHE_CONTROL),
+        )
 
     except Exception as e:
         logger.error(f"Error generating sample chart: {e}")
@@ -627,7 +538,7 @@ async def get_sample_chart():
 
 
 @router.post("/export/pdf")
-async def export_chart_pdf(request: ChartRequest):
+async def export_chart_pdf(request: ChartRequest, http_request: Request):
     """
     Export Vedic horoscope chart as PDF report.
 
@@ -637,11 +548,15 @@ async def export_chart_pdf(request: ChartRequest):
     Returns:
         PDF file as binary response
     """
+    etag = chart_etag(request.birth_details, request.preferences, "export", "pdf")
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+
     try:
         logger.info("Generating PDF export for chart")
 
         # First calculate the chart (reuse the calculation logic)
-        chart_response = await calculate_chart(request)
+        chart_response = to_jsonable(await build_chart_response(request))
 
         if not chart_response.get("success"):
             raise HTTPException(
@@ -651,9 +566,10 @@ async def export_chart_pdf(request: ChartRequest):
 
         chart_data = chart_response["data"]
 
-        # Generate PDF
+        # Generate PDF (reportlab is imported on first export, not at startup)
+        from app.services.pdf_generator import PDFReportGenerator
         pdf_generator = PDFReportGenerator()
-        pdf_bytes = pdf_generator.generate_chart_report(chart_data)
+        pdf_bytes = await run_heavy(pdf_generator.generate_chart_report, chart_data)
 
         if pdf_bytes is None:
             raise HTTPException(
@@ -676,7 +592,8 @@ async def export_chart_pdf(request: ChartRequest):
             content=pdf_bytes,
             media_type="application/pdf",
             headers={
-                "Content-Disposition": f"attachment; filename={filename}"
+                "Content-Disposition": f"attachment; filename={filename}",
+                **cache_headers(etag),
             }
         )
 
@@ -691,7 +608,7 @@ async def export_chart_pdf(request: ChartRequest):
 
 
 @router.post("/export/svg")
-async def export_chart_svg(request: ChartRequest):
+async def export_chart_svg(request: ChartRequest, http_request: Request):
     """
     Export chart as SVG image.
 
@@ -701,28 +618,36 @@ async def export_chart_svg(request: ChartRequest):
     Returns:
         SVG image response
     """
+    etag = chart_etag(request.birth_details, request.preferences, "export", "svg")
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+    svg_headers = {
+        "Content-Disposition": "attachment; filename=vedic_chart.svg",
+        **cache_headers(etag),
+    }
+
+    artifact = get_artifact_store().get(etag)
+    if artifact is not None:
+        return artifact_response(http_request, artifact, svg_headers)
+
     try:
         logger.info("Generating SVG export")
 
         # Calculate chart data (reuse existing logic)
-        chart_response = await calculate_chart(request)
+        chart_response = to_jsonable(await build_chart_response(request))
         chart_data = chart_response["data"]
 
-        # Initialize image generator
+        # Initialize image generator (PIL is imported on first export)
+        from app.services.image_generator import ImageGenerator
         image_gen = ImageGenerator()
 
         # Generate SVG
-        svg_content = image_gen.generate_chart_svg(chart_data, chart_style="north")
+        svg_content = await run_heavy(image_gen.generate_chart_svg, chart_data, chart_style="north")
 
         logger.info("SVG export completed successfully")
 
-        return Response(
-            content=svg_content,
-            media_type="image/svg+xml",
-            headers={
-                "Content-Disposition": "attachment; filename=vedic_chart.svg"
-            }
-        )
+        artifact = await run_in_threadpool(get_artifact_store().put, etag, svg_content, "image/svg+xml")
+        return artifact_response(http_request, artifact, svg_headers)
 
     except Exception as e:
         logger.error(f"Error generating SVG: {e}")
@@ -730,7 +655,7 @@ async def export_chart_svg(request: ChartRequest):
 
 
 @router.post("/export/png")
-async def export_chart_png(request: ChartRequest):
+async def export_chart_png(request: ChartRequest, http_request: Request):
     """
     Export chart as PNG image.
 
@@ -740,18 +665,23 @@ async def export_chart_png(request: ChartRequest):
     Returns:
         PNG image response
     """
+    etag = chart_etag(request.birth_details, request.preferences, "export", "png")
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+
     try:
         logger.info("Generating PNG export")
 
         # Calculate chart data (reuse existing logic)
-        chart_response = await calculate_chart(request)
+        chart_response = to_jsonable(await build_chart_response(request))
         chart_data = chart_response["data"]
 
-        # Initialize image generator
+        # Initialize image generator (PIL is imported on first export)
+        from app.services.image_generator import ImageGenerator
         image_gen = ImageGenerator()
 
         # Generate PNG
-        png_bytes = image_gen.generate_chart_png(chart_data, chart_style="north", size=800)
+        png_bytes = await run_heavy(image_gen.generate_chart_png, chart_data, chart_style="north", size=800)
 
         logger.info("PNG export completed successfully")
 
@@ -759,7 +689,8 @@ async def export_chart_png(request: ChartRequest):
             content=png_bytes,
             media_type="image/png",
             headers={
-                "Content-Disposition": "attachment; filename=vedic_chart.png"
+                "Content-Disposition": "attachment; filename=vedic_chart.png",
+                **cache_headers(etag),
             }
         )
 
@@ -769,7 +700,7 @@ async def export_chart_png(request: ChartRequest):
 
 
 @router.post("/export/json")
-async def export_chart_json(request: ChartRequest):
+async def export_chart_json(request: ChartRequest, http_request: Request):
     """
     Export complete chart data as JSON.
 
@@ -779,11 +710,15 @@ async def export_chart_json(request: ChartRequest):
     Returns:
         JSON response with complete chart data
     """
+    etag = chart_etag(request.birth_details, request.preferences, "export", "json")
+    if etag_matches(http_request, etag):
+        return not_modified(etag)
+
     try:
         logger.info("Generating JSON export")
 
         # Calculate chart data (reuse existing logic)
-        chart_response = await calculate_chart(request)
+        chart_response = to_jsonable(await build_chart_response(request))
 
         if not chart_response.get("success"):
             raise HTTPException(
@@ -826,7 +761,8 @@ async def export_chart_json(request: ChartRequest):
             content=json.dumps(json_export, indent=2, default=str),
             media_type="application/json",
             headers={
-                "Content-Disposition": "attachment; filename=vedic_chart.json"
+                "Content-Disposition": "attachment; filename=vedic_chart.json",
+                **cache_headers(etag),
             }
         )
 
@@ -856,7 +792,7 @@ async def calculate_intensity_analysis(
         logger.info("Starting Dasha-Bhukti intensity analysis")
 
         # First calculate the chart (reuse the calculation logic)
-        chart_response = await calculate_chart(request, user_or_guest, db)
+        chart_response = to_jsonable(await build_chart_response(request, user_or_guest, db))
 
         if not chart_response.get("success"):
             raise HTTPException(
@@ -1,16 +1,22 @@
 """Chart management API endpoints with caching and methodology support."""
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import date, time, datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
-from app.core.rbac import get_current_user
-from app.core.rate_limit import check_rate_limit, RATE_LIMITS
-from app.models import User, BirthChart, StrengthProfile
-from app.services.chart_service import ChartService
+from app.core.principal import Principal
+from app.core.rbac import get_current_principal
+from app.core.rate_limit import rate_limit
+from app.models import BirthChart, StrengthProfile
+from app.models.chart import BirthDetails, ChartPreferences
+from app.core.dasha import get_dasha_boundaries, parse_dasha_date
+from app.core.admission import run_heavy
+from app.core.chart_sections import get_chart_state
+from app.core.http_cache import CALCULATION_VERSION, cache_headers, etag_matches, make_etag, not_modified
+from app.services.chart_service import CHART_SUMMARY_OPTIONS, ChartService, natal_planet_list
 import logging
 
 logger = logging.getLogger(__name__)
@@ -64,15 +70,21 @@ class BirthChartResponse(BaseModel):
     notes: Optional[str]
     created_at: datetime
     updated_at: datetime
+    # Requested parts of chart_data (GET /charts/{chart_id}?sections=...)
+    sections: Optional[Dict[str, Any]] = None
     
     class Config:
         from_attributes = True
 
 
-@router.post("/charts", response_model=BirthChartResponse)
+@router.post(
+    "/charts",
+    response_model=BirthChartResponse,
+    dependencies=[Depends(rate_limit("chart_calculation", "chart", get_current_principal, "Chart calculation limit exceeded"))],
+)
 async def create_chart(
     request: BirthChartCreate,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -92,18 +104,6 @@ async def create_chart(
     Returns:
         Created chart with calculated data
     """
-    # Check rate limit
-    is_allowed, rate_limit_info = check_rate_limit(
-        f"chart:{user.id}",
-        **RATE_LIMITS["chart_calculation"]
-    )
-    if not is_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Chart calculation limit exceeded",
-            headers={"Retry-After": str(rate_limit_info["reset"])},
-        )
-
     try:
         # Use new ChartService with caching and methodology support
         chart_service = ChartService(db)
@@ -143,29 +143,45 @@ async def create_chart(
 
 @router.get("/charts", response_model=List[BirthChartResponse])
 async def list_charts(
-    user: User = Depends(get_current_user),
+    response: Response,
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
     limit: int = Query(10, ge=1, le=100),
+    skip: Optional[int] = Query(None, include_in_schema=False),
 ):
     """
-    List user's birth charts.
+    List user's birth charts, newest first.
+
+    Only summary columns are loaded (not the chart_data document). Pages
+    use keyset pagination: when more charts follow, the ``X-Next-Cursor``
+    response header holds the ``cursor`` for the next page.
     
     Args:
+        response: Response (for the next-page cursor header)
         user: Current user
         db: Database session
-        skip: Number of records to skip
+        cursor: Pagination cursor
         limit: Maximum records to return
+        skip: No longer supported (rejected with 400 instead of being ignored)
         
     Returns:
         List of charts
     """
-    stmt = select(BirthChart).where(
-        BirthChart.user_id == user.id
-    ).offset(skip).limit(limit)
-    
-    result = await db.execute(stmt)
-    charts = result.scalars().all()
+    if skip is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Offset pagination is not supported; pass the X-Next-Cursor header value as cursor",
+        )
+    try:
+        charts, next_cursor = await ChartService(db).list_user_charts(user.id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return charts
 
@@ -173,41 +189,150 @@ async def list_charts(
 @router.get("/charts/{chart_id}", response_model=BirthChartResponse)
 async def get_chart(
     chart_id: str,
-    user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    sections: Optional[str] = Query(
+        None, description="Comma-separated chart_data sections to return, e.g. planets,houses,methodologies.kp"
+    ),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get specific chart details.
+
+    The chart_data document is not loaded; ``sections`` returns selected
+    parts of it under ``sections``, extracted in the database without
+    reading the whole document.
+
+    Carries an ETag that changes whenever the chart row is updated; a
+    matching ``If-None-Match`` returns 304.
     
     Args:
         chart_id: Chart ID
+        request: Raw request (for If-None-Match)
+        response: Response (for cache headers)
+        sections: chart_data sections to include
         user: Current user
         db: Database session
         
     Returns:
         Chart details
     """
-    stmt = select(BirthChart).where(
-        (BirthChart.id == chart_id) & (BirthChart.user_id == user.id)
-    )
-    
-    result = await db.execute(stmt)
-    chart = result.scalars().first()
+    section_names = [s.strip() for s in (sections or "").split(",") if s.strip()]
+    if section_names:
+        try:
+            found = await ChartService(db).get_chart_sections(chart_id, user.id, section_names)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e),
+            )
+        chart, chart_sections = found if found else (None, None)
+    else:
+        stmt = select(BirthChart).options(*CHART_SUMMARY_OPTIONS).where(
+            (BirthChart.id == chart_id) & (BirthChart.user_id == user.id) & (BirthChart.is_active == True)
+        )
+        result = await db.execute(stmt)
+        chart, chart_sections = result.scalars().first(), None
     
     if not chart:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Chart not found",
         )
-    
+
+    etag = make_etag(
+        CALCULATION_VERSION, chart.id, chart.updated_at.isoformat() if chart.updated_at else "", *section_names
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(cache_headers(etag))
+
+    if chart_sections is not None:
+        return BirthChartResponse.model_validate(chart).model_copy(update={"sections": chart_sections})
     return chart
 
 
+@router.get("/charts/{chart_id}/dasha")
+async def get_chart_dasha(
+    chart_id: str,
+    level: str = Query("maha", description="Dasha level: maha, antar or pratyantar"),
+    from_date: Optional[str] = Query(None, alias="from", description="Window start (YYYY-MM-DD or ISO 8601)"),
+    to_date: Optional[str] = Query(None, alias="to", description="Window end (YYYY-MM-DD or ISO 8601)"),
+    path: Optional[str] = Query(None, description="Tree path above the level, e.g. Saturn or Saturn/Mercury"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum periods per page"),
+    user: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get one page of a saved chart's Dasha periods for a date window or tree path.
+
+    Args:
+        chart_id: Chart ID
+        level: Dasha level to list (maha, antar, pratyantar)
+        from_date: Only periods ending after this date
+        to_date: Only periods starting before this date
+        path: Only descendants of this Mahadasha/Antardasha path
+        cursor: Pagination cursor
+        limit: Page size
+        user: Current user
+        db: Database session
+
+    Returns:
+        Page with ``periods``, ``total`` and ``next_cursor``
+    """
+    # Only the planets section is read, not the chart_data document
+    found = await ChartService(db).get_chart_sections(chart_id, user.id, ["planets"])
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Chart not found",
+        )
+    chart, chart_sections = found
+
+    try:
+        # Reuse the stored natal Moon when the chart has been calculated
+        moon = next((p for p in natal_planet_list(chart_sections["planets"]) if p.get("name") == "Moon"), None)
+        if moon is not None and moon.get("sidereal_longitude") is not None:
+            birth_datetime = datetime.combine(chart.birth_date, chart.birth_time or time(12, 0))
+            boundaries = await run_heavy(get_dasha_boundaries, birth_datetime, moon["sidereal_longitude"])
+        else:
+            birth_details = BirthDetails(
+                name=chart.name,
+                date=chart.birth_date,
+                time=chart.birth_time,
+                time_unknown=chart.birth_time is None,
+                latitude=chart.birth_latitude,
+                longitude=chart.birth_longitude,
+                timezone=chart.birth_timezone,
+                location_name=chart.birth_location,
+            )
+            preferences = ChartPreferences(ayanamsha=chart.ayanamsha, house_system=chart.house_system)
+            # Needs the ephemeris: run it on the heavy-work pool, off the event loop
+            chart_state = get_chart_state(birth_details, preferences)
+            boundaries = await run_heavy(chart_state.get, "dasha.boundaries")
+
+        return boundaries.page(
+            level=level,
+            start=parse_dasha_date(from_date),
+            end=parse_dasha_date(to_date),
+            path=path,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
 @router.put("/charts/{chart_id}", response_model=BirthChartResponse)
 async def update_chart(
     chart_id: str,
     request: BirthChartUpdate,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -259,7 +384,7 @@ async def update_chart(
 @router.delete("/charts/{chart_id}")
 async def delete_chart(
     chart_id: str,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
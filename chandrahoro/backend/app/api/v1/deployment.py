@@ -2,8 +2,9 @@
 
 from typing import Dict, List, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
-from app.core.rbac import get_current_user
+from app.core.rbac import get_current_user, require_admin
 from app.models import User
 from datetime import datetime
 import logging
@@ -43,30 +44,30 @@ async def get_deployment_status(
 
 @router.get("/deployment/monitoring")
 async def get_monitoring_info(
-    user: User = Depends(get_current_user),
+    user: User = Depends(require_admin),
 ) -> Dict[str, Any]:
     """
     Get monitoring information.
-    
+
     Args:
-        user: Current user
-        
+        user: Current admin user
+
     Returns:
-        Monitoring info
+        Where metrics are exposed and a digest of the current ones (request
+        latency per route, DB, LLM and chart stage timings, cache hit rates)
     """
+    from app.core.metrics import METRICS_ENABLED, METRICS_MULTIPROC_DIR, summarize
+
     return {
         "monitoring_tools": [
-            "Prometheus for metrics",
+            "Prometheus for metrics (scrape /metrics)",
             "Grafana for dashboards",
             "ELK Stack for logging",
             "Sentry for error tracking",
         ],
-        "metrics": [
-            "CPU usage: 25%",
-            "Memory usage: 45%",
-            "Disk usage: 60%",
-            "Network I/O: 100 Mbps",
-        ],
+        "metrics_enabled": METRICS_ENABLED,
+        "multiprocess": bool(METRICS_MULTIPROC_DIR),
+        "metrics": summarize(),
         "alerts": [
             "High CPU usage (> 80%)",
             "High memory usage (> 90%)",
@@ -76,6 +77,178 @@ async def get_monitoring_info(
     }
 
 
+@router.get("/deployment/cache-warmer")
+async def get_cache_warmer_status(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Get cache warmer job metrics.
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Scheduler state, per-job run metrics and transit snapshot stats
+    """
+    from app.services.cache_warmer import get_cache_warmer
+    from app.services.transit_snapshot_service import get_transit_snapshot_service
+
+    return {
+        "cache_warmer": get_cache_warmer().get_stats(),
+        "transit_snapshots": get_transit_snapshot_service().get_stats(),
+    }
+
+
+@router.get("/deployment/compression")
+async def get_compression_status(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Get response compression metrics.
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Bytes in/out/saved per encoding, skip reasons and artifact store stats
+    """
+    from app.core.compression import get_artifact_store, get_compression_stats
+
+    return {
+        "compression": get_compression_stats().get_stats(),
+        "artifacts": get_artifact_store().get_stats(),
+    }
+
+
+@router.get("/deployment/principal-cache")
+async def get_principal_cache_status(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Get authenticated-principal cache metrics.
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Hit/miss counts, hit rate and size of the principal cache
+    """
+    from app.core.principal import get_principal_cache
+
+    return get_principal_cache().get_stats()
+
+
+@router.get("/deployment/admission")
+async def get_admission_status(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Get admission control metrics for CPU-heavy endpoints.
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Per-class running/queued/admitted/rejected counts, service-time
+        estimates and latency budgets, plus the chart degraded-mode state
+    """
+    from app.core.admission import get_admission_controller
+    from app.core.degraded_mode import get_degraded_mode
+
+    return {**get_admission_controller().get_stats(), "degraded_mode": get_degraded_mode().get_stats()}
+
+
+@router.get("/deployment/single-flight")
+async def get_single_flight_status(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Get single-flight coalescing metrics.
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Per-group leader/coalesced/remote counts and computation time saved
+    """
+    from app.core.single_flight import get_single_flight_stats
+
+    return get_single_flight_stats()
+
+
+@router.get("/deployment/routers")
+async def get_router_status(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Lazy router mounting status: which routers are mounted, still pending or
+    mounted eagerly, and how long each took to import and mount.
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Router mounter statistics
+    """
+    from app.core.lazy_routes import get_router_mounter
+
+    mounter = get_router_mounter()
+    return mounter.get_stats() if mounter is not None else {"enabled": False}
+
+
+@router.get("/deployment/profiles")
+async def list_request_profiles(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    List captured request profiles (most recent first).
+
+    Args:
+        user: Current admin user
+
+    Returns:
+        Profiler settings and a summary of each buffered profile
+    """
+    from app.core.profiling import get_profile_store
+
+    store = get_profile_store()
+    return {"profiler": store.get_stats(), "profiles": store.list()}
+
+
+@router.get("/deployment/profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    format: str = Query("json", description="json (summary and spans), collapsed or speedscope"),
+    user: User = Depends(require_admin),
+):
+    """
+    Export a captured request profile.
+
+    Args:
+        profile_id: Profile ID (the ``X-Profile-Id`` response header)
+        format: ``json``, ``collapsed`` (flamegraph.pl input) or ``speedscope``
+        user: Current admin user
+
+    Returns:
+        The profile in the requested format
+    """
+    from app.core.profiling import get_profile_store
+
+    profile = get_profile_store().get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    if format == "speedscope":
+        return JSONResponse(
+            profile.speedscope(),
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.speedscope.json"'},
+        )
+    if format != "json":
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown format: {format}")
+    return profile.to_dict()
+
+
 @router.get("/deployment/logging")
 async def get_logging_info(
     user: User = Depends(get_current_user),
@@ -7,9 +7,10 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, or_, desc
 from app.core.database import get_db
-from app.core.rbac import get_current_user
+from app.core.principal import Principal
+from app.core.rbac import get_current_principal
 from app.core.rate_limit import check_rate_limit, RATE_LIMITS
-from app.models import User, BirthChart, JournalEntry
+from app.models import BirthChart, JournalEntry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -65,7 +66,7 @@ class JournalListResponse(BaseModel):
 async def create_journal_entry(
     chart_id: str,
     request: JournalEntryRequest,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -157,7 +158,7 @@ async def list_journal_entries(
     search: Optional[str] = Query(None, description="Search in title and content"),
     skip: int = Query(0, ge=0, description="Skip entries"),
     limit: int = Query(20, ge=1, le=100, description="Limit entries"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -263,7 +264,7 @@ async def list_journal_entries(
 async def get_journal_entry(
     chart_id: str,
     entry_id: str,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -329,7 +330,7 @@ async def update_journal_entry(
     chart_id: str,
     entry_id: str,
     request: JournalEntryRequest,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -415,7 +416,7 @@ async def update_journal_entry(
 async def delete_journal_entry(
     chart_id: str,
     entry_id: str,
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, str]:
     """
@@ -4,10 +4,13 @@ from typing import List, Dict, Any
 import logging
 import os
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query
 
 from app.services.location_service import get_location_service, LocationResult
+from app.services.gazetteer import get_gazetteer
 from app.core.exceptions import ValidationError, ExternalAPIError
+from app.core.rbac import require_admin
+from app.models import User
 
 logger = logging.getLogger(__name__)
 
@@ -92,16 +95,32 @@ async def reverse_geocode(
     try:
         logger.info(f"Reverse geocoding coordinates: {lat}, {lon}")
 
-        # For now, return a simple timezone estimation
-        # In production, this would use a proper reverse geocoding service
-        timezone = _estimate_timezone_from_coords(lat, lon)
-
+        gazetteer = get_gazetteer()
+        if gazetteer is None:
+            # No offline index configured; fall back to a coarse estimate
+            return {
+                "success": True,
+                "latitude": lat,
+                "longitude": lon,
+                "timezone": _estimate_timezone_from_coords(lat, lon),
+                "message": "Reverse geocoding completed (basic implementation)"
+            }
+
+        nearest = gazetteer.reverse(lat, lon)
         return {
             "success": True,
             "latitude": lat,
             "longitude": lon,
-            "timezone": timezone,
-            "message": "Reverse geocoding completed (basic implementation)"
+            "timezone": gazetteer.timezone_at(lat, lon),
+            "nearest_place": {
+                "name": nearest.display_name,
+                "latitude": nearest.latitude,
+                "longitude": nearest.longitude,
+                "country": nearest.country,
+                "admin1": nearest.admin1,
+                "population": nearest.population,
+            } if nearest else None,
+            "message": "Reverse geocoding completed (offline gazetteer)"
         }
 
     except Exception as e:
@@ -132,6 +151,23 @@ def _estimate_timezone_from_coords(lat: float, lon: float) -> str:
         return "UTC"
 
 
+@router.get("/stats")
+async def location_service_stats(
+    user: User = Depends(require_admin),
+) -> Dict[str, Any]:
+    """
+    Location cache hit/miss, request coalescing and provider statistics.
+
+    Args:
+        user: Current admin user
+    """
+    location_service = get_location_service(os.getenv("GEONAMES_USERNAME"))
+    return {
+        "success": True,
+        "stats": location_service.get_stats()
+    }
+
+
 @router.get("/test")
 async def test_locations_api():
     """Test endpoint to verify locations API is working."""
@@ -141,9 +177,11 @@ async def test_locations_api():
         "status": "healthy",
         "message": "Enhanced Locations API is operational",
         "geonames_configured": bool(geonames_username and geonames_username != "your_geonames_username"),
+        "gazetteer_loaded": get_gazetteer() is not None,
         "endpoints": [
             "GET /api/v1/locations/search?q={query}&limit={limit} - Search for locations",
             "GET /api/v1/locations/reverse?lat={lat}&lon={lon} - Reverse geocode coordinates",
+            "GET /api/v1/locations/stats - Cache and provider statistics (admin)",
             "GET /api/v1/locations/test - This test endpoint"
         ]
     }
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Relocation and astrocartography API endpoints."""
+
+from datetime import datetime
+from typing import Optional, List
+import logging
+
+from fastapi import APIRouter, Depends, Query
+
+from app.models.chart import ChartRequest, ChartPreferences
+from app.core.admission import run_heavy
+from app.core.relocation import RelocationEngine, DEFAULT_MAX_LATITUDE
+from app.core.rbac import get_current_user_or_guest
+from app.core.exceptions import ValidationError, DatabaseError
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+def _birth_datetime(request: ChartRequest) -> datetime:
+    """Build the birth datetime the same way /chart/calculate does."""
+    birth_details = request.birth_details
+    if birth_details.time_unknown:
+        return datetime.combine(birth_details.date, datetime.min.time().replace(hour=12))
+    return datetime.combine(birth_details.date, birth_details.time)
+
+
+def _engine(request: ChartRequest) -> RelocationEngine:
+    preferences = request.preferences or ChartPreferences()
+    return RelocationEngine(ayanamsha=preferences.ayanamsha, house_system=preferences.house_system)
+
+
+@router.post("/relocation/grid")
+async def get_relocation_grid(
+    request: ChartRequest,
+    resolution: float = Query(2.0, ge=0.5, le=10.0, description="Grid spacing in degrees"),
+    lat_min: float = Query(-90.0, ge=-90, le=90, description="Viewport south edge"),
+    lat_max: float = Query(90.0, ge=-90, le=90, description="Viewport north edge"),
+    lon_min: float = Query(-180.0, ge=-180, le=180, description="Viewport west edge"),
+    lon_max: float = Query(180.0, ge=-180, le=180, description="Viewport east edge"),
+    angularity_orb: float = Query(5.0, ge=0.5, le=15.0, description="Orb for angular planets"),
+    user = Depends(get_current_user_or_guest),
+):
+    """
+    Get relocated ascendant/MC and angular planets for a map viewport.
+
+    The full grid is computed once per natal chart and cached; viewport
+    parameters only select the visible cells.
+
+    Args:
+        request: Birth details and preferences
+        resolution: Grid spacing in degrees
+        lat_min, lat_max, lon_min, lon_max: Viewport bounds
+        angularity_orb: Orb for a planet to count as angular
+
+    Returns:
+        Grid cells inside the viewport
+    """
+    try:
+        if lat_min > lat_max:
+            raise ValidationError("lat_min must not be greater than lat_max")
+
+        engine = _engine(request)
+        grid = await run_heavy(
+            engine.build_grid,
+            _birth_datetime(request),
+            resolution=resolution,
+            max_latitude=DEFAULT_MAX_LATITUDE,
+            angularity_orb=angularity_orb,
+        )
+        cells = grid.window(lat_min, lat_max, lon_min, lon_max)
+
+        return {
+            "success": True,
+            "data": {
+                "resolution": grid.resolution,
+                "max_latitude": DEFAULT_MAX_LATITUDE,
+                "angularity_orb": grid.angularity_orb,
+                "cells": cells,
+                "count": len(cells),
+            }
+        }
+
+    except ValidationError:
+        raise
+    except Exception as e:
+        logger.error(f"Error calculating relocation grid: {e}", exc_info=True)
+        raise DatabaseError(
+            "Failed to calculate relocation grid. Please try again.",
+            details={"error": str(e)}
+        )
+
+
+@router.post("/relocation/astrocartography")
+async def get_astrocartography_lines(
+    request: ChartRequest,
+    latitude_step: float = Query(1.0, ge=0.25, le=5.0, description="Polyline vertex spacing"),
+    planets: Optional[List[str]] = Query(None, description="Planets to include"),
+    user = Depends(get_current_user_or_guest),
+):
+    """
+    Get astrocartography (ASC/DSC/MC/IC) lines for each planet as polylines.
+
+    Args:
+        request: Birth details and preferences
+        latitude_step: Spacing of polyline vertices in degrees of latitude
+        planets: Optional subset of planets
+
+    Returns:
+        Lines keyed by planet and angle; each line is a list of [lat, lon] polylines
+    """
+    try:
+        engine = _engine(request)
+        lines = await run_heavy(
+            engine.calculate_astrocartography_lines,
+            _birth_datetime(request),
+            latitude_step=latitude_step,
+            planets=planets,
+        )
+
+        return {
+            "success": True,
+            "data": {
+                "lines": lines,
+                "max_latitude": DEFAULT_MAX_LATITUDE,
+            }
+        }
+
+    except Exception as e:
+        logger.error(f"Error calculating astrocartography lines: {e}", exc_info=True)
+        raise DatabaseError(
+            "Failed to calculate astrocartography lines. Please try again.",
+            details={"error": str(e)}
+        )
+
+
+@router.post("/relocation/chart")
+async def get_relocated_chart(
+    request: ChartRequest,
+    lat: float = Query(..., ge=-90, le=90, description="Relocation latitude"),
+    lon: float = Query(..., ge=-180, le=180, description="Relocation longitude"),
+    user = Depends(get_current_user_or_guest),
+):
+    """
+    Get the relocated chart (angles, house cusps, planet houses) for a location.
+
+    Args:
+        request: Birth details and preferences
+        lat: Relocation latitude
+        lon: Relocation longitude
+
+    Returns:
+        Relocated chart data
+    """
+    try:
+        engine = _engine(request)
+        chart = await run_heavy(engine.calculate_relocated_chart, _birth_datetime(request), lat, lon)
+
+        return {
+            "success": True,
+            "data": chart
+        }
+
+    except Exception as e:
+        logger.error(f"Error calculating relocated chart: {e}", exc_info=True)
+        raise DatabaseError(
+            "Failed to calculate relocated chart. Please try again.",
+            details={"error": str(e)}
+        )
@@ -7,9 +7,10 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.core.database import get_db
-from app.core.rbac import get_current_user
-from app.core.rate_limit import check_rate_limit, RATE_LIMITS
-from app.models import User, BirthChart, AspectTimeline, StrengthProfile
+from app.core.principal import Principal
+from app.core.rbac import get_current_principal
+from app.core.rate_limit import rate_limit
+from app.models import BirthChart, AspectTimeline, StrengthProfile
 from app.services.aspect_intensity_service import AspectIntensityCalculator
 import logging
 
@@ -61,7 +62,11 @@ class IntegratedPredictionResponse(BaseModel):
     strength_attributes_used: Optional[Dict[str, float]]
 
 
-@router.get("/charts/{chart_id}/timeline", response_model=AspectTimelineResponse)
+@router.get(
+    "/charts/{chart_id}/timeline",
+    response_model=AspectTimelineResponse,
+    dependencies=[Depends(rate_limit("chart_calculation", "timeline", get_current_principal, "Timeline calculation limit exceeded"))],
+)
 async def get_chart_timeline(
     chart_id: str,
     start_date: date = Query(..., description="Timeline start date"),
@@ -71,7 +76,7 @@ async def get_chart_timeline(
         description="Comma-separated aspect names (Wealth,Health,Business,Spouse,Kids,Career)"
     ),
     interval_days: int = Query(7, ge=1, le=30, description="Days between data points"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -89,18 +94,6 @@ async def get_chart_timeline(
     Returns:
         Timeline data with aspect intensities
     """
-    # Check rate limit
-    is_allowed, rate_limit_info = check_rate_limit(
-        f"timeline:{user.id}",
-        **RATE_LIMITS["chart_calculation"]
-    )
-    if not is_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Timeline calculation limit exceeded",
-            headers={"Retry-After": str(rate_limit_info["reset"])},
-        )
-    
     # Verify chart ownership
     stmt = select(BirthChart).where(
         (BirthChart.id == chart_id) & (BirthChart.user_id == user.id)
@@ -183,7 +176,7 @@ async def get_chart_timeline(
 async def save_timeline(
     chart_id: str,
     aspect_name: str = Query(...),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -235,14 +228,18 @@ async def save_timeline(
     return {"message": "Timeline saved successfully"}
 
 
-@router.get("/charts/{chart_id}/predictions/integrated", response_model=IntegratedPredictionResponse)
+@router.get(
+    "/charts/{chart_id}/predictions/integrated",
+    response_model=IntegratedPredictionResponse,
+    dependencies=[Depends(rate_limit("chart_calculation", "prediction", get_current_principal, "Prediction calculation limit exceeded"))],
+)
 async def get_integrated_predictions(
     chart_id: str,
     aspect_name: str = Query(..., description="Life aspect name"),
     start_date: date = Query(..., description="Timeline start date"),
     end_date: date = Query(..., description="Timeline end date"),
     interval_days: int = Query(7, ge=1, le=30, description="Days between data points"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -263,18 +260,6 @@ async def get_integrated_predictions(
     Returns:
         Integrated prediction timeline with strength attribute adjustments
     """
-    # Check rate limit
-    is_allowed, rate_limit_info = check_rate_limit(
-        f"prediction:{user.id}",
-        **RATE_LIMITS["chart_calculation"]
-    )
-    if not is_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Prediction calculation limit exceeded",
-            headers={"Retry-After": str(rate_limit_info["reset"])},
-        )
-
     # Verify chart ownership
     stmt = select(BirthChart).where(
         (BirthChart.id == chart_id) & (BirthChart.user_id == user.id)
@@ -401,7 +386,11 @@ class EnhancedTimelineResponse(BaseModel):
     zoom_level: int  # 1-7 (day, week, month, quarter, year, 2-year, 5-year)
 
 
-@router.get("/charts/{chart_id}/timeline/enhanced", response_model=EnhancedTimelineResponse)
+@router.get(
+    "/charts/{chart_id}/timeline/enhanced",
+    response_model=EnhancedTimelineResponse,
+    dependencies=[Depends(rate_limit("chart_calculation", "timeline_enhanced", get_current_principal, "Timeline calculation limit exceeded"))],
+)
 async def get_enhanced_timeline(
     chart_id: str,
     start_date: date = Query(..., description="Timeline start date"),
@@ -413,7 +402,7 @@ async def get_enhanced_timeline(
     include_dasha_markers: bool = Query(True, description="Include dasha period markers"),
     include_event_markers: bool = Query(True, description="Include event markers"),
     zoom_level: int = Query(2, ge=1, le=7, description="Zoom level (1=day, 2=week, 3=month, 4=quarter, 5=year, 6=2-year, 7=5-year)"),
-    user: User = Depends(get_current_user),
+    user: Principal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
@@ -439,18 +428,6 @@ async def get_enhanced_timeline(
     Returns:
         Enhanced timeline data
     """
-    # Check rate limit
-    is_allowed, rate_limit_info = check_rate_limit(
-        f"timeline_enhanced:{user.id}",
-        **RATE_LIMITS["chart_calculation"]
-    )
-    if not is_allowed:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Timeline calculation limit exceeded",
-            headers={"Retry-After": str(rate_limit_info["reset"])},
-        )
-
     # Verify chart ownership
     stmt = select(BirthChart).where(
         (BirthChart.id == chart_id) & (BirthChart.user_id == user.id)
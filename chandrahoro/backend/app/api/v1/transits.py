@@ -1,19 +1,32 @@
 """Transit API endpoints."""
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Request, Response
 from typing import Optional
 from datetime import datetime
 import logging
 
 from app.core.transits import TransitCalculator
+from app.core.ephemeris import get_sign_name, get_nakshatra_name
+from app.services.transit_snapshot_service import get_transit_snapshot_service
 from app.models.chart import ChartData
 from app.core.exceptions import ValidationError, NotFoundError, DatabaseError
+from app.core.http_cache import CALCULATION_VERSION, cache_headers, etag_matches, make_etag, not_modified, public_cache_control
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+async def _overlay_snapshot(natal_chart_data: dict, calculation_date: Optional[datetime] = None) -> dict:
+    """Overlay the shared transit snapshot for ``calculation_date`` on a natal chart."""
+    snapshot = await get_transit_snapshot_service().get_snapshot_async(calculation_date)
+    return TransitCalculator().overlay_natal_chart(
+        natal_chart_data,
+        snapshot["positions"],
+        datetime.fromisoformat(snapshot["calculation_date"]),
+    )
+
+
 @router.get("/transits/current")
 async def get_current_transits(
     natal_chart_id: Optional[str] = Query(None, description="Natal chart ID for comparison"),
@@ -38,20 +51,14 @@ async def get_current_transits(
             except ValueError:
                 raise ValidationError("Invalid date format. Please use YYYY-MM-DD format.")
 
-        # Initialize transit calculator
-        transit_calc = TransitCalculator()
-
         # If no natal chart provided, just return current positions
         if not natal_chart_id:
-            # Create a basic chart data structure for current positions
-            current_positions = transit_calc._calculate_current_positions(
-                calculation_date or datetime.now()
-            )
+            # Sky positions are shared by all users for the current tick
+            snapshot = await get_transit_snapshot_service().get_snapshot_async(calculation_date)
 
             # Convert to simple format
             positions = []
-            for planet, pos_data in current_positions.items():
-                from app.core.ephemeris import get_sign_name, get_nakshatra_name
+            for planet, pos_data in snapshot["positions"].items():
                 positions.append({
                     "planet": planet,
                     "longitude": pos_data['sidereal_longitude'],
@@ -66,7 +73,7 @@ async def get_current_transits(
             return {
                 "success": True,
                 "data": {
-                    "calculation_date": (calculation_date or datetime.now()).isoformat(),
+                    "calculation_date": snapshot["calculation_date"],
                     "current_positions": positions,
                     "message": "Current planetary positions calculated"
                 }
@@ -112,14 +119,8 @@ async def compare_transits_to_natal(
             except ValueError:
                 raise ValidationError("Invalid date format. Please use YYYY-MM-DD format.")
 
-        # Initialize transit calculator
-        transit_calc = TransitCalculator()
-
-        # Calculate transits relative to natal chart
-        transit_data = transit_calc.get_current_transits(
-            natal_chart_data,
-            calculation_date
-        )
+        # Overlay the shared sky snapshot on the natal chart
+        transit_data = await _overlay_snapshot(natal_chart_data, calculation_date)
 
         logger.info(f"Transit comparison completed for date: {calculation_date or 'current'}")
 
@@ -140,13 +141,26 @@ async def compare_transits_to_natal(
 
 
 @router.get("/transits/sample")
-async def get_sample_transits():
+async def get_sample_transits(request: Request, response: Response):
     """
     Get sample transit data for testing.
 
+    The result only changes once per snapshot tick, so it carries an ETag for
+    the tick and a public Cache-Control lasting until the tick ends.
+
     Returns:
         Sample transit analysis
     """
+    service = get_transit_snapshot_service()
+    now = datetime.utcnow()
+    bucket = service.bucket_for(now)
+    remaining = int((service.bucket_start(bucket + 1) - now).total_seconds()) + 1
+    etag = make_etag(CALCULATION_VERSION, "transits-sample", service.tick_seconds, bucket)
+    cache_control = public_cache_control(remaining, remaining)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers.update(cache_headers(etag, cache_control))
+
     try:
         # Create sample natal chart data
         sample_natal_chart = {
@@ -218,11 +232,8 @@ async def get_sample_transits():
             ]
         }
 
-        # Initialize transit calculator
-        transit_calc = TransitCalculator()
-
         # Calculate transits for sample chart
-        transit_data = transit_calc.get_current_transits(sample_natal_chart)
+        transit_data = await _overlay_snapshot(sample_natal_chart)
 
         logger.info("Sample transit data generated successfully")
 
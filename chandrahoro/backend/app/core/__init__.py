@@ -1,15 +1,28 @@
 """Core calculation modules for ChandraHoro.
 
 This package contains all astrology calculation engines and methodologies.
+The methodology classes are imported on first access (they pull in the
+ephemeris and every calculator); ``MethodologyRegistry`` loads the built-in
+methodologies itself when first queried.
 """
 
-# Import methodologies to ensure they are registered
-from app.core.parashara_methodology import ParasharaMethodology
-from app.core.kp_methodology import KPMethodology
-from app.core.jaimini_methodology import JaiminiMethodology
+import importlib
+
+_LAZY_EXPORTS = {
+    'ParasharaMethodology': 'app.core.parashara_methodology',
+    'KPMethodology': 'app.core.kp_methodology',
+    'JaiminiMethodology': 'app.core.jaimini_methodology',
+}
 
 __all__ = [
     'ParasharaMethodology',
     'KPMethodology',
     'JaiminiMethodology',
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
@@ -0,0 +1,317 @@
+"""Admission control for CPU-heavy endpoints.
+
+Heavy endpoints are classified by cost (``ROUTE_CLASSES``):
+
+- ``interactive``: chart calculation, dasha/timeline views, relocation,
+  single assessments
+- ``export``: PDF/PNG/SVG rendering and research exports
+- ``batch``: batch assessments and generation
+
+At most ``ADMISSION_CONCURRENCY`` of them run at once. The rest wait in
+per-class queues, served strictly by priority (interactive, then export,
+then batch) and round-robin across callers within a class, so one client
+firing a burst does not starve the others. A request is rejected up front
+with 503 and ``Retry-After`` when its expected queueing delay (from the work
+ahead of it and each class's moving-average service time) exceeds the
+class's latency budget; waiting longer would only end in a client timeout.
+Unclassified requests (``/health``, reads, auth...) are never queued.
+
+CPU-bound parts of the heavy handlers run on a bounded thread pool of the
+same size through ``run_heavy()``, which keeps the event loop free to serve
+everything else.
+
+Environment:
+    ADMISSION_ENABLED: Set to false to disable queueing (default true)
+    ADMISSION_CONCURRENCY: Heavy requests (and pool threads) at once (default: min(4, CPUs))
+    ADMISSION_MAX_QUEUE: Queued requests per class before rejecting (default 200)
+    ADMISSION_BUDGET_<CLASS>_MS: Latency budget per class
+        (defaults: interactive 3000, export 10000, batch 30000)
+"""
+
+import asyncio
+import contextvars
+import functools
+import hashlib
+import logging
+import math
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Pattern, Tuple, TypeVar
+
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.exceptions import ServiceUnavailableError
+from app.core.rate_limit import client_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cost classes in priority order
+COST_CLASSES = ("interactive", "export", "batch")
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+ADMISSION_CONCURRENCY = int(os.getenv("ADMISSION_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "200"))
+LATENCY_BUDGETS = {
+    name: float(os.getenv(f"ADMISSION_BUDGET_{name.upper()}_MS", str(default))) / 1000
+    for name, default in (("interactive", 3000), ("export", 10000), ("batch", 30000))
+}
+
+# Starting service-time estimates (seconds) until real ones are measured
+_INITIAL_SERVICE_SECONDS = {"interactive": 0.25, "export": 1.0, "batch": 5.0}
+_EWMA_ALPHA = 0.2
+
+# (method, path regex, cost class); first match wins
+ROUTE_CLASSES: List[Tuple[str, str, str]] = [
+    ("POST", r"/api/v1/chart/(calculate|dasha|intensity-analysis)", "interactive"),
+    ("GET", r"/api/v1/chart/sample", "interactive"),
+    ("POST", r"/api/v1/chart/export/(pdf|png|svg)", "export"),
+    ("GET", r"/api/v1/charts/[^/]+/(dasha|timeline|timeline/enhanced|predictions/integrated)", "interactive"),
+    ("POST", r"/api/v1/relocation/(grid|astrocartography|chart)", "interactive"),
+    ("POST", r"/api/v1/(synergy/analyze|teams/analyze-synergy|candidates/assess|horoscopes/generate|features/extract)",
+     "interactive"),
+    ("POST", r"/api/v1/organizations/[^/]+/candidates/[^/]+/assess", "interactive"),
+    ("POST", r"/api/v1/research-export/batch", "batch"),
+    ("POST", r"/api/v1/(synergy/export|research-export/[^/]+)", "export"),
+    ("POST", r"/api/v1/(candidates/(batch-assess|top-candidates)|horoscopes/generate-batch|features/extract-batch)",
+     "batch"),
+]
+
+_COMPILED_ROUTES: List[Tuple[str, Pattern[str], str]] = [
+    (method, re.compile(pattern), cost_class) for method, pattern, cost_class in ROUTE_CLASSES
+]
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Cost class of a request, or None if it isn't admission-controlled."""
+    for route_method, pattern, cost_class in _COMPILED_ROUTES:
+        if method == route_method and pattern.fullmatch(path):
+            return cost_class
+    return None
+
+
+def caller_key(request: Request) -> str:
+    """Fairness key: the bearer token (hashed) when present, else the client address."""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return "token:" + hashlib.sha256(authorization[7:].encode("utf-8")).hexdigest()[:16]
+    return "client:" + client_key(request)
+
+
+class AdmissionController:
+    """Bounded priority scheduler for heavy requests."""
+
+    def __init__(self, concurrency: int = ADMISSION_CONCURRENCY,
+                 budgets: Optional[Dict[str, float]] = None,
+                 max_queue: int = ADMISSION_MAX_QUEUE):
+        self.concurrency = max(1, concurrency)
+        self.budgets = dict(LATENCY_BUDGETS, **(budgets or {}))
+        self.max_queue = max_queue
+        # Per class: caller key -> waiting futures, rotated for round-robin
+        self._queues: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            name: OrderedDict() for name in COST_CLASSES
+        }
+        self._queued = {name: 0 for name in COST_CLASSES}
+        self._running = {name: 0 for name in COST_CLASSES}
+        self._service_seconds = dict(_INITIAL_SERVICE_SECONDS)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.admitted = {name: 0 for name in COST_CLASSES}
+        self.rejected = {name: 0 for name in COST_CLASSES}
+        self.wait_seconds = {name: 0.0 for name in COST_CLASSES}
+
+    @property
+    def running(self) -> int:
+        return sum(self._running.values())
+
+    def estimate_wait(self, cost_class: str) -> float:
+        """Expected queueing delay for a new request of ``cost_class``."""
+        if self.running < self.concurrency and not any(self._queued.values()):
+            return 0.0
+        rank = COST_CLASSES.index(cost_class)
+        # Queued work served before it, plus (on average) half of what is running
+        ahead = sum(self._queued[name] * self._service_seconds[name] for name in COST_CLASSES[:rank + 1])
+        in_service = sum(self._running[name] * self._service_seconds[name] for name in COST_CLASSES)
+        return (ahead + in_service / 2) / self.concurrency
+
+    async def acquire(self, cost_class: str, key: str) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            cost_class: One of ``COST_CLASSES``
+            key: Caller key for round-robin fairness
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            ServiceUnavailableError: Expected wait exceeds the class budget (503)
+        """
+        if self.running < self.concurrency and not any(self._queued.values()):
+            self._start(cost_class)
+            return 0.0
+
+        wait = self.estimate_wait(cost_class)
+        if wait > self.budgets[cost_class] or self._queued[cost_class] >= self.max_queue:
+            self.rejected[cost_class] += 1
+            retry_after = max(1, math.ceil(wait))
+            raise ServiceUnavailableError(
+                "Server busy, retry later",
+                details={"cost_class": cost_class, "estimated_wait": round(wait, 3), "retry_after": retry_after},
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues[cost_class].setdefault(key, deque()).append(future)
+        self._queued[cost_class] += 1
+        started = time.perf_counter()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller went away: hand the slot on
+                self.release(cost_class)
+            else:
+                self._discard(cost_class, key, future)
+            raise
+        waited = time.perf_counter() - started
+        self.wait_seconds[cost_class] += waited
+        return waited
+
+    def release(self, cost_class: str, service_seconds: Optional[float] = None) -> None:
+        """Free a slot, updating the class's service-time estimate."""
+        self._running[cost_class] -= 1
+        if service_seconds is not None:
+            previous = self._service_seconds[cost_class]
+            self._service_seconds[cost_class] = previous + _EWMA_ALPHA * (service_seconds - previous)
+        self._dispatch()
+
+    def queued(self) -> int:
+        """Requests waiting for a slot, all classes."""
+        return sum(self._queued.values())
+
+    def _start(self, cost_class: str) -> None:
+        self._running[cost_class] += 1
+        self.admitted[cost_class] += 1
+
+    def _discard(self, cost_class: str, key: str, future: asyncio.Future) -> None:
+        queue = self._queues[cost_class].get(key)
+        if queue is not None and future in queue:
+            queue.remove(future)
+            self._queued[cost_class] -= 1
+            if not queue:
+                del self._queues[cost_class][key]
+
+    def _dispatch(self) -> None:
+        """Grant free slots: highest class first, round-robin across callers."""
+        for cost_class in COST_CLASSES:
+            queues = self._queues[cost_class]
+            while queues and self.running < self.concurrency:
+                key, queue = next(iter(queues.items()))
+                future = queue.popleft()
+                self._queued[cost_class] -= 1
+                if queue:
+                    queues.move_to_end(key)
+                else:
+                    del queues[key]
+                if future.done():
+                    continue
+                self._start(cost_class)
+                future.set_result(None)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run CPU-bound ``fn`` on the bounded heavy-work pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="heavy")
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, fn, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": ADMISSION_ENABLED,
+            "concurrency": self.concurrency,
+            "running": dict(self._running),
+            "queued": dict(self._queued),
+            "admitted": dict(self.admitted),
+            "rejected": dict(self.rejected),
+            "wait_seconds": {name: round(value, 3) for name, value in self.wait_seconds.items()},
+            "service_seconds": {name: round(value, 3) for name, value in self._service_seconds.items()},
+            "budgets_seconds": dict(self.budgets),
+        }
+
+
+_controller = AdmissionController()
+
+
+def get_admission_controller() -> AdmissionController:
+    return _controller
+
+
+async def run_heavy(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work off the event loop on the bounded heavy-work pool."""
+    return await _controller.run_sync(fn, *args, **kwargs)
+
+
+class AdmissionMiddleware:
+    """Queue classified heavy requests through the admission controller."""
+
+    def __init__(self, app: ASGIApp, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or _controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        cost_class = classify(scope.get("method", ""), scope["path"]) if scope["type"] == "http" else None
+        if cost_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        try:
+            await self.controller.acquire(cost_class, caller_key(request))
+        except ServiceUnavailableError as exc:
+            logger.warning(f"Admission rejected {scope['method']} {scope['path']} ({cost_class}): {exc.details}")
+            response = JSONResponse(
+                status_code=exc.status_code,
+                content={
+                    "detail": exc.message,
+                    "type": ServiceUnavailableError.__name__,
+                    "path": str(request.url),
+                    **exc.details,
+                },
+                headers=exc.headers,
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.controller.release(cost_class, time.perf_counter() - started)
+
+        async def send_releasing(message: Message) -> None:
+            # The work is done once the last body chunk is produced; don't
+            # hold the slot while a slow client drains the response
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_releasing)
+        finally:
+            release()
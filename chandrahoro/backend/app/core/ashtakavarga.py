@@ -6,9 +6,12 @@ through eight contributing factors for each planet and house.
 Each planet contributes points to specific houses based on its position.
 """
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime
 
+from .natal_state import PlanetInput, ensure_natal_state
+from .profiling import profile_span
+
 
 class AshtakavargaCalculator:
     """Calculate Ashtakavarga (eight-fold division) for planets"""
@@ -89,23 +92,27 @@ class AshtakavargaCalculator:
             }
         }
 
-    def calculate_ashtakavarga(self, planets: List[Dict[str, Any]], 
-                              houses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @profile_span("ashtakavarga")
+    def calculate_ashtakavarga(self, planets: PlanetInput, 
+                              houses: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Calculate complete Ashtakavarga for all planets
         
         Args:
-            planets: List of planet data with positions
-            houses: List of house data
+            planets: NatalState, or list of planet dicts with positions
+            houses: List of house data (only with planet dicts)
             
         Returns:
             Dictionary with Ashtakavarga calculations
         """
+        natal = ensure_natal_state(planets, houses)
+
         # Create planet position mapping (house numbers)
-        planet_houses = {}
-        for planet in planets:
-            if planet['name'] not in ['Rahu', 'Ketu']:  # Skip shadow planets
-                planet_houses[planet['name'].lower()] = planet['house']
+        planet_houses = {
+            name.lower(): house
+            for name, house in zip(natal.names, natal.houses)
+            if name not in ['Rahu', 'Ketu']  # Skip shadow planets
+        }
         
         # Add ascendant as house 1
         planet_houses['ascendant'] = 1
@@ -4,6 +4,9 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import logging
 
+from app.core.natal_state import NatalState, PlanetInput, SIGN_NAMES, ensure_natal_state
+from app.core.profiling import profile_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,13 +54,14 @@ class VedicAspectCalculator:
         """Initialize aspect calculator."""
         pass
     
-    def calculate_all_aspects(self, planets: List[Dict], houses: List[Dict]) -> List[AspectResult]:
+    @profile_span("aspects")
+    def calculate_all_aspects(self, planets: PlanetInput, houses: Optional[List[Dict]] = None) -> List[AspectResult]:
         """
         Calculate all planetary aspects in the chart.
         
         Args:
-            planets: List of planet positions
-            houses: List of house positions
+            planets: NatalState, or list of planet position dicts
+            houses: List of house positions (only with planet dicts)
             
         Returns:
             List of aspect results
@@ -65,8 +69,9 @@ class VedicAspectCalculator:
         aspects = []
         
         # Convert data to internal format
-        planet_data = self._convert_planet_data(planets)
-        house_data = self._convert_house_data(houses)
+        natal = ensure_natal_state(planets, houses)
+        planet_data = self._convert_planet_data(natal)
+        house_data = self._convert_house_data(natal)
         
         # Calculate aspects for each planet
         for planet_name, planet_info in planet_data.items():
@@ -78,28 +83,28 @@ class VedicAspectCalculator:
         
         return aspects
     
-    def _convert_planet_data(self, planets: List[Dict]) -> Dict[str, Dict]:
-        """Convert planet list to dictionary format."""
-        planet_dict = {}
-        for planet in planets:
-            planet_dict[planet['name']] = {
-                'house': planet['house'],
-                'sign': planet['sign'],
-                'degree': planet['degree_in_sign'],
-                'longitude': planet.get('sidereal_longitude', 0),
-                'retrograde': planet.get('retrograde', False)
+    def _convert_planet_data(self, natal: NatalState) -> Dict[str, Dict]:
+        """Per-planet view used by the aspect rules."""
+        return {
+            name: {
+                'house': natal.houses[i],
+                'sign': SIGN_NAMES[natal.signs[i]],
+                'degree': natal.degrees[i],
+                'longitude': natal.sidereal_longitudes[i],
+                'retrograde': natal.retrograde[i]
             }
-        return planet_dict
+            for i, name in enumerate(natal.names)
+        }
     
-    def _convert_house_data(self, houses: List[Dict]) -> Dict[int, Dict]:
-        """Convert house list to dictionary format."""
-        house_dict = {}
-        for house in houses:
-            house_dict[house['number']] = {
-                'sign': house['sign'],
-                'cusp': house.get('cusp_longitude', 0)
+    def _convert_house_data(self, natal: NatalState) -> Dict[int, Dict]:
+        """Per-house view used by the aspect rules."""
+        return {
+            i + 1: {
+                'sign': SIGN_NAMES[sign],
+                'cusp': cusp
             }
-        return house_dict
+            for i, (sign, cusp) in enumerate(zip(natal.house_signs, natal.house_cusps))
+        }
     
     def _calculate_planet_aspects(self, planet_name: str, planet_info: Dict,
                                  all_planets: Dict[str, Dict], 
@@ -7,8 +7,12 @@ This module provides abstract base classes for implementing different astrology
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import importlib
+import logging
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
 
 class BirthData(BaseModel):
     """Standardized birth data structure for all methodologies."""
@@ -134,9 +138,31 @@ class MethodologyRegistry:
     Registry for all available astrology methodologies.
     
     This allows dynamic registration and retrieval of methodology calculators.
+    The built-in methodologies register themselves when their modules are
+    imported; lookups import them on first use, so importing the registry
+    doesn't load the ephemeris and every calculator.
     """
     
     _methodologies: Dict[str, AstrologyMethodology] = {}
+    _builtins_loaded = False
+
+    # Modules that register a methodology on import
+    BUILTIN_MODULES = (
+        "app.core.parashara_methodology",
+        "app.core.kp_methodology",
+        "app.core.jaimini_methodology",
+        "app.core.western_methodology",
+    )
+
+    @classmethod
+    def _load_builtins(cls) -> None:
+        if cls._builtins_loaded:
+            return
+        # Set first: the modules call register() while importing
+        cls._builtins_loaded = True
+        for module_name in cls.BUILTIN_MODULES:
+            importlib.import_module(module_name)
+        logger.info(f"Registered methodologies: {list(cls._methodologies)}")
     
     @classmethod
     def register(cls, methodology: AstrologyMethodology):
@@ -159,6 +185,7 @@ class MethodologyRegistry:
         Returns:
             Optional[AstrologyMethodology]: Methodology instance or None
         """
+        cls._load_builtins()
         return cls._methodologies.get(methodology_name)
     
     @classmethod
@@ -169,6 +196,7 @@ class MethodologyRegistry:
         Returns:
             Dict[str, AstrologyMethodology]: All registered methodologies
         """
+        cls._load_builtins()
         return cls._methodologies.copy()
     
     @classmethod
@@ -179,5 +207,6 @@ class MethodologyRegistry:
         Returns:
             List[str]: List of methodology names
         """
+        cls._load_builtins()
         return list(cls._methodologies.keys())
 
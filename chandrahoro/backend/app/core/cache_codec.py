@@ -0,0 +1,136 @@
+"""Compact binary encoding for stored cache payloads.
+
+``ChartCache`` rows hold natal and time-based results that are written once
+and read many times. Payloads are serialized with msgpack (or orjson/stdlib
+JSON when msgpack isn't installed) and compressed with zstd (or zlib), and
+the row records the format so any worker can decode it. Datetimes and other
+non-JSON values are stored as they would be in a JSON column (ISO strings).
+
+Environment:
+    CHART_CACHE_ZSTD_LEVEL: zstd level for cache payloads (default 9)
+    CHART_CACHE_ZLIB_LEVEL: zlib level when zstandard is unavailable (default 6)
+"""
+
+import logging
+import os
+import threading
+import zlib
+from typing import Any, Dict, Tuple
+
+from app.core.serialization import dumps, loads, to_jsonable
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+CHART_CACHE_ZSTD_LEVEL = int(os.getenv("CHART_CACHE_ZSTD_LEVEL", "9"))
+CHART_CACHE_ZLIB_LEVEL = int(os.getenv("CHART_CACHE_ZLIB_LEVEL", "6"))
+
+_SERIALIZERS: Dict[str, Tuple[Any, Any]] = {"json": (dumps, loads)}
+if MSGPACK_AVAILABLE:
+    _SERIALIZERS["msgpack"] = (
+        lambda obj: msgpack.packb(obj, default=to_jsonable, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+    )
+
+_COMPRESSORS: Dict[str, Tuple[Any, Any]] = {
+    "zlib": (lambda data: zlib.compress(data, CHART_CACHE_ZLIB_LEVEL), zlib.decompress),
+}
+if ZSTD_AVAILABLE:
+    # Compressor objects aren't thread-safe; keep a pair per thread
+    _zstd_local = threading.local()
+
+    def _zstd() -> threading.local:
+        if not hasattr(_zstd_local, "compressor"):
+            _zstd_local.compressor = zstandard.ZstdCompressor(level=CHART_CACHE_ZSTD_LEVEL)
+            _zstd_local.decompressor = zstandard.ZstdDecompressor()
+        return _zstd_local
+
+    _COMPRESSORS["zstd"] = (
+        lambda data: _zstd().compressor.compress(data),
+        lambda data: _zstd().decompressor.decompress(data),
+    )
+
+# Format written by this worker, e.g. "msgpack+zstd" (stored per row)
+PAYLOAD_FORMAT = f"{'msgpack' if MSGPACK_AVAILABLE else 'json'}+{'zstd' if ZSTD_AVAILABLE else 'zlib'}"
+
+
+class _CodecStats:
+    """Payload sizes before and after encoding."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.encoded = 0
+        self.decoded = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+    def record(self, raw_bytes: int, stored_bytes: int) -> None:
+        with self._lock:
+            self.encoded += 1
+            self.raw_bytes += raw_bytes
+            self.stored_bytes += stored_bytes
+
+    def record_decode(self) -> None:
+        with self._lock:
+            self.decoded += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "format": PAYLOAD_FORMAT,
+            "encoded": self.encoded,
+            "decoded": self.decoded,
+            "raw_bytes": self.raw_bytes,
+            "stored_bytes": self.stored_bytes,
+            "ratio": round(self.stored_bytes / self.raw_bytes, 3) if self.raw_bytes else None,
+        }
+
+
+_stats = _CodecStats()
+
+
+def encode_payload(data: Any) -> Tuple[bytes, str]:
+    """
+    Serialize and compress a payload.
+
+    Returns:
+        (payload bytes, format string to store alongside them)
+    """
+    serializer, compressor = PAYLOAD_FORMAT.split("+")
+    raw = _SERIALIZERS[serializer][0](data)
+    payload = _COMPRESSORS[compressor][0](raw)
+    _stats.record(len(raw), len(payload))
+    return payload, PAYLOAD_FORMAT
+
+
+def decode_payload(payload: bytes, payload_format: str) -> Any:
+    """
+    Decompress and deserialize a payload written by ``encode_payload``.
+
+    Raises:
+        ValueError: If the format's codecs aren't available in this worker
+            or the payload is corrupt
+    """
+    serializer, _, compressor = (payload_format or "").partition("+")
+    if serializer not in _SERIALIZERS or compressor not in _COMPRESSORS:
+        raise ValueError(f"Unsupported cache payload format '{payload_format}'")
+    try:
+        data = _SERIALIZERS[serializer][1](_COMPRESSORS[compressor][1](payload))
+    except Exception as e:
+        raise ValueError(f"Corrupt {payload_format} cache payload: {e}") from e
+    _stats.record_decode()
+    return data
+
+
+def get_codec_stats() -> Dict[str, Any]:
+    return _stats.get_stats()
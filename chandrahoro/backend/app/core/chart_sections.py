@@ -0,0 +1,493 @@
+"""Section-dependency graph for lazily computed chart responses.
+
+Every part of a /chart/calculate response is a node in a small dependency
+graph (planets, houses, dasha.current, dasha.navigator, vargas, yogas,
+shadbala, ...). A ``ChartComputation`` evaluates nodes on demand and keeps
+the results, so a request only pays for the sections it asks for plus their
+dependencies. Computations are cached per chart input, so follow-up requests
+for more sections reuse everything already calculated.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models.chart import BirthDetails, ChartPreferences
+from app.core.ephemeris import EphemerisCalculator, get_sign_name
+from app.core.natal_state import NatalState
+from app.core.houses import HouseSystemCalculator
+from app.core.dasha import VimshottariDasha, get_dasha_boundaries
+from app.core.divisional_charts import DivisionalChartCalculator
+from app.core.yogas import YogaDetector
+from app.core.aspects import VedicAspectCalculator
+from app.core.shadbala import ShadbalaCalculator
+from app.core.planetary_relationships import PlanetaryRelationshipAnalyzer
+from app.core.ashtakavarga import AshtakavargaCalculator
+from app.core.metrics import observe_chart_stage
+
+logger = logging.getLogger(__name__)
+
+PARASHARA = "parashara"
+
+# Public Parashara sections and the response keys they populate
+PARASHARA_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    "planets": ("planets",),
+    "houses": ("houses",),
+    "dasha.current": ("current_dasha",),
+    "dasha.timeline": ("dasha_timeline",),
+    "dasha.navigator": ("dasha_navigator",),
+    "vargas": ("divisional_charts",),
+    "yogas": ("yogas",),
+    "aspects": ("aspects", "aspect_summary"),
+    "shadbala": ("shadbala",),
+    "relationships": ("planetary_relationships",),
+    "ashtakavarga": ("ashtakavarga",),
+}
+
+METHODOLOGY_SECTION_PREFIX = "methodologies."
+
+
+@dataclass
+class SectionNode:
+    """A lazily evaluated chart section with its dependencies."""
+    name: str
+    deps: Tuple[str, ...]
+    compute: Callable[["ChartComputation"], Any]
+
+
+_NODES: Dict[str, SectionNode] = {}
+
+
+def _node(name: str, *deps: str):
+    """Register a node computation."""
+    def register(func: Callable[["ChartComputation"], Any]):
+        _NODES[name] = SectionNode(name, deps, func)
+        return func
+    return register
+
+
+class ChartComputation:
+    """Per-chart evaluation state: computed node values keyed by node name."""
+
+    def __init__(self, birth_details: BirthDetails, preferences: ChartPreferences):
+        self.birth_details = birth_details
+        self.preferences = preferences
+        if birth_details.time_unknown:
+            # Default to 12:00 PM if time is unknown
+            self.birth_datetime = datetime.combine(
+                birth_details.date, datetime.min.time().replace(hour=12)
+            )
+        else:
+            self.birth_datetime = datetime.combine(birth_details.date, birth_details.time)
+
+        self.created_at = time.monotonic()
+        self.timings_ms: Dict[str, float] = {}
+        self._values: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str) -> Any:
+        """Evaluate a node (and its dependencies) once and return its value."""
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+
+            if name.startswith("methodology:"):
+                deps: Tuple[str, ...] = ()
+                compute = lambda state: _compute_methodology(state, name.split(":", 1)[1])
+            else:
+                node = _NODES[name]
+                deps, compute = node.deps, node.compute
+
+            for dep in deps:
+                self.get(dep)
+
+            started = time.perf_counter()
+            value = compute(self)
+            elapsed = time.perf_counter() - started
+            self.timings_ms[name] = round(elapsed * 1000, 3)
+            observe_chart_stage(name, elapsed)
+            self._values[name] = value
+            return value
+
+    def is_computed(self, name: str) -> bool:
+        return name in self._values
+
+    def needs_compute(self, sections: List[str], methodology_names: List[str]) -> bool:
+        """Whether ``methodology_results`` would calculate anything not cached yet."""
+        nodes = [f"methodology:{PARASHARA}", "chart_core"]
+        nodes += [section for section in PARASHARA_SECTIONS if section in sections]
+        nodes += [
+            f"methodology:{name}" for name in methodology_names
+            if name != PARASHARA and f"{METHODOLOGY_SECTION_PREFIX}{name}" in sections
+        ]
+        return not all(self.is_computed(node) for node in nodes)
+
+    def computed_nodes(self) -> List[str]:
+        with self._lock:
+            return list(self._values)
+
+    def parashara_data(self, sections: List[str]) -> Dict[str, Any]:
+        """Build the Parashara result with only the requested sections."""
+        gate = self.get(f"methodology:{PARASHARA}")
+        if gate.get("error"):
+            return gate
+
+        data = dict(self.get("chart_core"))
+        for section, keys in PARASHARA_SECTIONS.items():
+            if section in sections:
+                value = self.get(section)
+                if len(keys) == 1:
+                    data[keys[0]] = value
+                else:
+                    data.update(value)
+            elif section in ("planets", "houses"):
+                # Always computed for the core; omitted unless requested
+                data.pop(section, None)
+        return data
+
+    def methodology_results(self, sections: List[str], methodology_names: List[str]) -> Dict[str, Any]:
+        """
+        Results keyed by methodology, in registry order.
+
+        Parashara is always present (its core is cheap and other fields are
+        derived from it); other methodologies only when requested.
+        """
+        results = {}
+        for name in methodology_names:
+            if name == PARASHARA:
+                results[name] = self.parashara_data(sections)
+            elif f"{METHODOLOGY_SECTION_PREFIX}{name}" in sections:
+                results[name] = self.get(f"methodology:{name}")
+        return results
+
+
+# Node computations
+
+
+def _compute_methodology(state: ChartComputation, method_name: str) -> Dict[str, Any]:
+    from app.core.base_methodology import MethodologyRegistry, BirthData, CalculationPreferences
+
+    birth_details = state.birth_details
+    preferences = state.preferences
+    try:
+        logger.info(f"Calculating {method_name} methodology...")
+        methodology = MethodologyRegistry.get(method_name)
+        birth_data = BirthData(
+            date=state.birth_datetime,
+            latitude=birth_details.latitude,
+            longitude=birth_details.longitude,
+            timezone=birth_details.timezone,
+            location_name=birth_details.location_name,
+            name=birth_details.name
+        )
+        method_preferences = CalculationPreferences(
+            methodology=method_name,
+            ayanamsha=preferences.ayanamsha,
+            house_system=preferences.house_system,
+            chart_style=preferences.chart_style
+        )
+        result = methodology.calculate_chart(birth_data, method_preferences)
+        logger.info(f"✓ {method_name} calculation completed successfully")
+        return result
+    except Exception as e:
+        logger.error(f"✗ Error calculating {method_name} methodology: {e}")
+        # Store error in results so frontend can display it
+        return {
+            "error": True,
+            "error_message": str(e),
+            "methodology": method_name
+        }
+
+
+@_node("planet_positions")
+def _planet_positions(state: ChartComputation):
+    ephemeris = EphemerisCalculator(ayanamsha=state.preferences.ayanamsha)
+    return ephemeris.calculate_all_planets(state.birth_datetime)
+
+
+@_node("ascendant_data")
+def _ascendant_data(state: ChartComputation):
+    ephemeris = EphemerisCalculator(ayanamsha=state.preferences.ayanamsha)
+    return ephemeris.calculate_ascendant(
+        state.birth_datetime,
+        state.birth_details.latitude,
+        state.birth_details.longitude,
+        house_system=state.preferences.house_system
+    )
+
+
+@_node("house_data", "ascendant_data")
+def _house_data(state: ChartComputation):
+    house_calc = HouseSystemCalculator(house_system=state.preferences.house_system)
+    return house_calc.calculate_houses(
+        state.birth_datetime,
+        state.birth_details.latitude,
+        state.birth_details.longitude,
+        state.get("ascendant_data").get('ayanamsha_value', 0.0)
+    )
+
+
+@_node("natal_state", "planet_positions", "ascendant_data", "house_data")
+def _natal_state(state: ChartComputation):
+    # Typed arrays shared by every calculator; dicts are built only for output
+    return NatalState.from_positions(
+        state.get("planet_positions"), state.get("ascendant_data"), state.get("house_data")
+    )
+
+
+@_node("planets", "natal_state")
+def _planets(state: ChartComputation):
+    return state.get("natal_state").planet_dicts()
+
+
+@_node("houses", "natal_state")
+def _houses(state: ChartComputation):
+    return state.get("natal_state").house_dicts()
+
+
+@_node("chart_core", "planets", "houses", "house_data", "ascendant_data")
+def _chart_core(state: ChartComputation):
+    # Same shape as ChartData.dict(), reusing the already dumped planet and
+    # house lists instead of validating and dumping them a second time
+    house_data = state.get("house_data")
+    ascendant = house_data.get('ascendant_sidereal', 0.0)
+    return {
+        "birth_info": state.birth_details.model_dump(),
+        "preferences": state.preferences.model_dump(),
+        "ascendant": ascendant,
+        "ascendant_sign": get_sign_name(int(ascendant / 30)),
+        "planets": state.get("planets"),
+        "houses": state.get("houses"),
+        "calculation_timestamp": datetime.utcnow(),
+        "ayanamsha_value": state.get("ascendant_data").get('ayanamsha_value', 0.0),
+    }
+
+
+@_node("moon_longitude", "planet_positions")
+def _moon_longitude(state: ChartComputation):
+    return state.get("planet_positions").get('Moon', {}).get('sidereal_longitude', 0.0)
+
+
+@_node("dasha.current", "moon_longitude")
+def _dasha_current(state: ChartComputation):
+    return VimshottariDasha().get_current_dasha(state.birth_datetime, state.get("moon_longitude"))
+
+
+@_node("dasha.timeline", "moon_longitude")
+def _dasha_timeline(state: ChartComputation):
+    return VimshottariDasha().get_dasha_timeline(
+        state.birth_datetime,
+        state.get("moon_longitude"),
+        years_ahead=12  # Calculate 12 years from birth date for performance
+    )
+
+
+@_node("dasha.navigator", "moon_longitude")
+def _dasha_navigator(state: ChartComputation):
+    return VimshottariDasha().get_comprehensive_dasha_navigator(
+        state.birth_datetime,
+        state.get("moon_longitude"),
+        years_ahead=120  # Full 120-year cycle
+    )
+
+
+@_node("dasha.boundaries", "moon_longitude")
+def _dasha_boundaries(state: ChartComputation):
+    # Internal node backing the paginated /chart/dasha endpoint
+    return get_dasha_boundaries(state.birth_datetime, state.get("moon_longitude"))
+
+
+@_node("vargas", "planet_positions")
+def _vargas(state: ChartComputation):
+    return DivisionalChartCalculator().calculate_all_divisional_charts(
+        state.get("planet_positions"),
+        chart_types=state.preferences.get_all_divisional_charts()
+    )
+
+
+@_node("yogas", "natal_state")
+def _yogas(state: ChartComputation):
+    yogas = YogaDetector().detect_all_yogas(state.get("natal_state"))
+    return [
+        {
+            "name": yoga.name,
+            "type": yoga.type,
+            "strength": yoga.strength,
+            "description": yoga.description,
+            "planets_involved": yoga.planets_involved,
+            "houses_involved": yoga.houses_involved,
+            "conditions_met": yoga.conditions_met,
+            "effects": yoga.effects
+        }
+        for yoga in yogas
+    ]
+
+
+@_node("aspects", "natal_state")
+def _aspects(state: ChartComputation):
+    aspect_calc = VedicAspectCalculator()
+    aspects = aspect_calc.calculate_all_aspects(state.get("natal_state"))
+    return {
+        "aspects": [
+            {
+                "aspecting_planet": aspect.aspecting_planet,
+                "aspected_planet": aspect.aspected_planet,
+                "aspected_house": aspect.aspected_house,
+                "aspect_type": aspect.aspect_type,
+                "aspect_strength": aspect.aspect_strength,
+                "orb": aspect.orb,
+                "description": aspect.description,
+                "benefic": aspect.benefic
+            }
+            for aspect in aspects
+        ],
+        "aspect_summary": aspect_calc.get_aspect_summary(aspects),
+    }
+
+
+@_node("shadbala", "natal_state")
+def _shadbala(state: ChartComputation):
+    return ShadbalaCalculator().calculate_shadbala(
+        state.birth_datetime, state.birth_details.latitude, state.birth_details.longitude,
+        state.get("natal_state")
+    )
+
+
+@_node("relationships", "natal_state")
+def _relationships(state: ChartComputation):
+    return PlanetaryRelationshipAnalyzer().analyze_relationships(state.get("natal_state"))
+
+
+@_node("ashtakavarga", "natal_state")
+def _ashtakavarga(state: ChartComputation):
+    return AshtakavargaCalculator().calculate_ashtakavarga(state.get("natal_state"))
+
+
+# Section selection
+
+
+def available_sections(methodology_names: List[str]) -> List[str]:
+    """All public section names for the registered methodologies."""
+    return list(PARASHARA_SECTIONS) + [
+        f"{METHODOLOGY_SECTION_PREFIX}{name}" for name in methodology_names if name != PARASHARA
+    ]
+
+
+def resolve_sections(include: Optional[str], exclude: Optional[str],
+                     methodology_names: List[str], selected_methodology: str) -> List[str]:
+    """
+    Resolve ``include=``/``exclude=`` query values to a list of sections.
+
+    Values are comma-separated; a group name such as ``dasha`` or
+    ``methodologies`` selects every section under it. The selected
+    methodology is always included.
+
+    Raises:
+        ValueError: If an unknown section is named
+    """
+    available = available_sections(methodology_names)
+
+    def expand(value: Optional[str]) -> List[str]:
+        selected = []
+        for token in (value or "").split(","):
+            token = token.strip()
+            if not token:
+                continue
+            matches = [s for s in available if s == token or s.startswith(token + ".")]
+            if not matches:
+                raise ValueError(
+                    f"Unknown chart section '{token}'. Available sections: {', '.join(available)}"
+                )
+            selected.extend(m for m in matches if m not in selected)
+        return selected
+
+    sections = expand(include) if include else list(available)
+    excluded = set(expand(exclude))
+    sections = [s for s in sections if s not in excluded]
+
+    selected_section = f"{METHODOLOGY_SECTION_PREFIX}{selected_methodology}"
+    if selected_methodology != PARASHARA and selected_section in available and selected_section not in sections:
+        sections.append(selected_section)
+    return sections
+
+
+# Per-chart state cache
+
+
+def chart_input_hash(birth_details: BirthDetails, preferences: ChartPreferences) -> str:
+    """Stable hash of everything that affects a chart calculation."""
+    payload = {
+        "birth_details": birth_details.model_dump(mode="json"),
+        "preferences": preferences.model_dump(mode="json"),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class _ChartStateCache:
+    """Thread-safe TTL LRU of ChartComputation objects keyed by input hash."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, ChartComputation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, birth_details: BirthDetails, preferences: ChartPreferences) -> ChartComputation:
+        key = chart_input_hash(birth_details, preferences)
+        with self._lock:
+            state = self._entries.get(key)
+            if state is not None and time.monotonic() - state.created_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return state
+
+            self.misses += 1
+            state = ChartComputation(birth_details, preferences)
+            self._entries[key] = state
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return state
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_state_cache = _ChartStateCache(
+    max_entries=int(os.getenv("CHART_STATE_CACHE_SIZE", "128")),
+    # Bounded so time-dependent sections (current dasha) don't go stale
+    ttl_seconds=float(os.getenv("CHART_STATE_TTL_SECONDS", "3600")),
+)
+
+
+def get_chart_state(birth_details: BirthDetails, preferences: ChartPreferences) -> ChartComputation:
+    """Get the cached computation state for a chart, creating it if needed."""
+    return _state_cache.get_or_create(birth_details, preferences)
+
+
+def clear_chart_state_cache() -> None:
+    """Drop all cached chart computation state."""
+    _state_cache.clear()
+
+
+def get_chart_state_stats() -> Dict[str, Any]:
+    return _state_cache.get_stats()
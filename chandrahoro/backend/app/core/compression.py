@@ -0,0 +1,386 @@
+"""Response compression and precompressed artifacts.
+
+``CompressionMiddleware`` compresses buffered responses whose content type is
+in ``COMPRESSIBLE_TYPES`` and whose body is at least ``COMPRESSION_MIN_SIZE``
+bytes, using the best encoding the client accepts: zstd and brotli when their
+packages are installed, gzip always. Streaming responses and responses that
+already carry a Content-Encoding pass through untouched.
+
+Artifacts that are served repeatedly (AI report HTML, SVG exports) are kept
+in ``ArtifactStore`` already compressed with every available codec at high
+levels, and ``artifact_response`` serves the right variant without
+recompressing per request.
+"""
+
+import gzip
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+COMPRESSIBLE_TYPES = frozenset({
+    "application/json",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+    "text/xml",
+})
+
+# Per-request levels favour speed; artifacts are compressed once, so use the max
+_DYNAMIC_LEVELS = {
+    "gzip": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    "br": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    "zstd": int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+}
+_ARTIFACT_LEVELS = {"gzip": 9, "br": 11, "zstd": 19}
+
+
+def _gzip(data: bytes, level: int) -> bytes:
+    # mtime=0 keeps output deterministic for identical input
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+_CODECS: Dict[str, Callable[[bytes, int], bytes]] = {"gzip": _gzip}
+if BROTLI_AVAILABLE:
+    _CODECS["br"] = lambda data, level: brotli.compress(data, quality=level)
+if ZSTD_AVAILABLE:
+    _CODECS["zstd"] = lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+
+# Server preference when the client weights encodings equally
+ENCODING_PREFERENCE: Tuple[str, ...] = tuple(e for e in ("zstd", "br", "gzip") if e in _CODECS)
+
+
+def available_encodings() -> Tuple[str, ...]:
+    return ENCODING_PREFERENCE
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress ``data`` with ``encoding`` at the dynamic (per-request) level by default."""
+    return _CODECS[encoding](data, _DYNAMIC_LEVELS[encoding] if level is None else level)
+
+
+def negotiate_encoding(accept_encoding: str, offered: Iterable[str] = ENCODING_PREFERENCE) -> Optional[str]:
+    """
+    Pick the content coding to use for an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+        offered: Encodings available, in server preference order
+
+    Returns:
+        The encoding with the highest q-value (server preference breaks
+        ties), or None for identity
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for encoding in offered:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";", 1)[0].strip().lower() in COMPRESSIBLE_TYPES
+
+
+def _weak_etag(etag: str) -> str:
+    # The compressed body is a different representation of the same resource
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class CompressionStats:
+    """Byte and response counters for dynamic and precompressed compression."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.by_encoding: Dict[str, Dict[str, int]] = {}
+        self.skipped: Dict[str, int] = {}
+        self.artifact_hits = 0
+        self.artifact_misses = 0
+
+    def record(self, encoding: str, bytes_in: int, bytes_out: int, precompressed: bool = False) -> None:
+        with self._lock:
+            entry = self.by_encoding.setdefault(encoding, {
+                "responses": 0, "precompressed": 0, "bytes_in": 0, "bytes_out": 0,
+            })
+            entry["responses"] += 1
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            if precompressed:
+                entry["precompressed"] += 1
+
+    def skip(self, reason: str) -> None:
+        with self._lock:
+            self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            bytes_in = sum(e["bytes_in"] for e in self.by_encoding.values())
+            bytes_out = sum(e["bytes_out"] for e in self.by_encoding.values())
+            return {
+                "enabled": COMPRESSION_ENABLED,
+                "encodings": list(ENCODING_PREFERENCE),
+                "min_size": COMPRESSION_MIN_SIZE,
+                "responses_compressed": sum(e["responses"] for e in self.by_encoding.values()),
+                "bytes_in": bytes_in,
+                "bytes_out": bytes_out,
+                "bytes_saved": bytes_in - bytes_out,
+                "ratio": round(bytes_in / bytes_out, 2) if bytes_out else None,
+                "by_encoding": {name: dict(entry) for name, entry in self.by_encoding.items()},
+                "skipped": dict(self.skipped),
+                "artifact_hits": self.artifact_hits,
+                "artifact_misses": self.artifact_misses,
+            }
+
+
+_stats = CompressionStats()
+
+
+def get_compression_stats() -> CompressionStats:
+    return _stats
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible buffered responses."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message: Optional[Message] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _skip_reason(self, message: Message, body: bytes) -> Optional[str]:
+        headers = Headers(raw=self.start_message["headers"])
+        if "content-encoding" in headers:
+            return "already_encoded"
+        if self.start_message["status"] < 200 or self.start_message["status"] in (204, 304):
+            return "no_body"
+        if not is_compressible(headers.get("content-type")):
+            return "content_type"
+        if message.get("more_body", False):
+            return "streaming"
+        if len(body) < self.minimum_size:
+            return "below_min_size"
+        return None
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the start message until the first body chunk decides the encoding
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        if self.start_message is None:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        reason = self._skip_reason(message, body)
+        start, self.start_message = self.start_message, None
+        if reason is not None:
+            _stats.skip(reason)
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        compressed = compress(body, self.encoding)
+        _stats.record(self.encoding, len(body), len(compressed))
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers["Content-Length"] = str(len(compressed))
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = _weak_etag(headers["etag"])
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": compressed})
+
+
+class PrecompressedArtifact:
+    """A response body kept in identity form plus every available encoding."""
+
+    __slots__ = ("media_type", "identity", "encoded")
+
+    def __init__(self, content: bytes, media_type: str):
+        self.media_type = media_type
+        self.identity = content
+        self.encoded: Dict[str, bytes] = {}
+        if is_compressible(media_type) and len(content) >= COMPRESSION_MIN_SIZE:
+            for encoding in ENCODING_PREFERENCE:
+                self.encoded[encoding] = compress(content, encoding, _ARTIFACT_LEVELS[encoding])
+
+    @property
+    def size(self) -> int:
+        return len(self.identity) + sum(len(body) for body in self.encoded.values())
+
+    def select(self, accept_encoding: str) -> Tuple[Optional[str], bytes]:
+        """Return (encoding or None, body) for an Accept-Encoding header."""
+        encoding = negotiate_encoding(accept_encoding, tuple(self.encoded))
+        if encoding is None:
+            return None, self.identity
+        return encoding, self.encoded[encoding]
+
+
+class ArtifactStore:
+    """Byte-bounded LRU of precompressed artifacts, keyed by ETag."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("COMPRESSION_ARTIFACT_CACHE_MB", "64")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._artifacts: "OrderedDict[str, PrecompressedArtifact]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[PrecompressedArtifact]:
+        with self._lock:
+            artifact = self._artifacts.get(key)
+            if artifact is None:
+                _stats.artifact_misses += 1
+                return None
+            self._artifacts.move_to_end(key)
+            _stats.artifact_hits += 1
+            return artifact
+
+    def put(self, key: str, content: Any, media_type: str) -> PrecompressedArtifact:
+        """
+        Compress and store an artifact (CPU-bound: call via run_in_threadpool).
+
+        Args:
+            key: Cache key, normally the representation's ETag
+            content: Body as bytes or str
+            media_type: Response media type
+
+        Returns:
+            The stored artifact
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        artifact = PrecompressedArtifact(content, media_type)
+        if artifact.size > self.max_bytes:
+            return artifact
+        with self._lock:
+            previous = self._artifacts.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.size
+            self._artifacts[key] = artifact
+            self.current_bytes += artifact.size
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._artifacts.popitem(last=False)
+                self.current_bytes -= evicted.size
+        return artifact
+
+    def clear(self) -> None:
+        with self._lock:
+            self._artifacts.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "artifacts": len(self._artifacts),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
+
+
+def artifact_response(request: Request, artifact: PrecompressedArtifact,
+                      headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serve an artifact in the best encoding the client accepts.
+
+    The response carries Content-Encoding, so ``CompressionMiddleware``
+    passes it through unchanged.
+    """
+    encoding, body = artifact.select(request.headers.get("accept-encoding", ""))
+    response = Response(content=body, media_type=artifact.media_type, headers=headers)
+    if artifact.encoded:
+        response.headers.add_vary_header("Accept-Encoding")
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+        if "etag" in response.headers:
+            response.headers["ETag"] = _weak_etag(response.headers["etag"])
+        _stats.record(encoding, len(artifact.identity), len(body), precompressed=True)
+    return response
@@ -3,9 +3,15 @@ Vimshottari Dasha calculation module for Vedic astrology.
 Implements the 120-year planetary period system.
 """
 
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 import logging
+import os
+import threading
+from app.core.profiling import profile_span
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,9 @@ class VimshottariDasha:
         'Mercury': 17
     }
 
+    # Length of the full Vimshottari cycle
+    TOTAL_YEARS = 120
+
     # Dasha sequence (starting from Ketu)
     DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
 
@@ -231,17 +240,14 @@ class VimshottariDasha:
         antardashas = []
         current_date = mahadasha_start
 
-        # Calculate total proportional units for this Mahadasha
-        mahadasha_period = self.DASHA_PERIODS[mahadasha_planet]
-
         for i in range(9):
             # Get the Antardasha planet (starting from Mahadasha planet)
             antardasha_index = (start_index + i) % 9
             antardasha_planet = self.DASHA_SEQUENCE[antardasha_index]
             antardasha_period = self.DASHA_PERIODS[antardasha_planet]
 
-            # Calculate proportional duration
-            proportional_duration = (antardasha_period / mahadasha_period) * mahadasha_duration
+            # Sub-periods divide the parent in proportion to the 120-year cycle
+            proportional_duration = (antardasha_period / self.TOTAL_YEARS) * mahadasha_duration
 
             end_date = current_date + timedelta(days=proportional_duration * 365.25)
 
@@ -277,17 +283,14 @@ class VimshottariDasha:
         pratyantardashas = []
         current_date = antardasha_start
 
-        # Calculate total proportional units for this Antardasha
-        antardasha_period = self.DASHA_PERIODS[antardasha_planet]
-
         for i in range(9):
             # Get the Pratyantardasha planet (starting from Antardasha planet)
             pratyantardasha_index = (start_index + i) % 9
             pratyantardasha_planet = self.DASHA_SEQUENCE[pratyantardasha_index]
             pratyantardasha_period = self.DASHA_PERIODS[pratyantardasha_planet]
 
-            # Calculate proportional duration
-            proportional_duration = (pratyantardasha_period / antardasha_period) * antardasha_duration
+            # Sub-periods divide the parent in proportion to the 120-year cycle
+            proportional_duration = (pratyantardasha_period / self.TOTAL_YEARS) * antardasha_duration
 
             end_date = current_date + timedelta(days=proportional_duration * 365.25)
 
@@ -304,6 +307,7 @@ class VimshottariDasha:
 
         return pratyantardashas
 
+    @profile_span("dasha.current")
     def get_current_dasha(self, birth_date: datetime, moon_longitude: float,
                          current_date: Optional[datetime] = None) -> Dict:
         """
@@ -375,6 +379,7 @@ class VimshottariDasha:
             'calculation_date': current_date
         }
 
+    @profile_span("dasha.timeline")
     def get_dasha_timeline(self, birth_date: datetime, moon_longitude: float,
                           years_ahead: int = 20) -> Dict:
         """
@@ -425,6 +430,7 @@ class VimshottariDasha:
 
         return timeline
 
+    @profile_span("dasha.navigator")
     def get_comprehensive_dasha_navigator(self, birth_date: datetime, moon_longitude: float,
                                         years_ahead: int = 120) -> Dict:
         """
@@ -498,6 +504,278 @@ class VimshottariDasha:
         }
 
 
+DASHA_LEVELS = ('maha', 'antar', 'pratyantar')
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_seconds(value: datetime) -> float:
+    return (value - _EPOCH).total_seconds()
+
+
+class DashaBoundaries:
+    """
+    Flat boundary arrays for the maha/antar/pratyantar Dasha hierarchy.
+
+    Each level is stored as parallel arrays (start/end seconds, duration,
+    planet index) in chronological order. Every period has exactly nine
+    children, so the descendants of period ``i`` at ``k`` levels down are
+    the contiguous range ``[i * 9**k, (i + 1) * 9**k)``. Windows are found
+    with ``bisect`` and pages are addressed by index, which makes the index
+    usable as a stable pagination cursor.
+    """
+
+    __slots__ = ('birth_date', 'moon_longitude', 'birth_dasha_index', '_starts', '_ends',
+                 '_durations', '_planets')
+
+    def __init__(self, birth_date: datetime, moon_longitude: float, years_ahead: int = 120):
+        calculator = VimshottariDasha()
+        self.birth_date = birth_date
+        self.moon_longitude = moon_longitude
+        self.birth_dasha_index: Optional[int] = None
+        self._starts = {level: array('d') for level in DASHA_LEVELS}
+        self._ends = {level: array('d') for level in DASHA_LEVELS}
+        self._durations = {level: array('d') for level in DASHA_LEVELS}
+        self._planets = {level: array('b') for level in DASHA_LEVELS}
+
+        for maha_index, maha in enumerate(
+                calculator.calculate_mahadasha_sequence(birth_date, moon_longitude, years_ahead)):
+            if maha.get('is_birth_dasha'):
+                self.birth_dasha_index = maha_index
+            self._append('maha', maha)
+            for antar in calculator.calculate_antardashas(
+                    maha['planet'], maha['start_date'], maha['duration_years']):
+                self._append('antar', antar)
+                for pratyantar in calculator.calculate_pratyantardashas(
+                        antar['planet'], antar['start_date'], antar['duration_years'], maha['planet']):
+                    self._append('pratyantar', pratyantar)
+
+    def _append(self, level: str, period: Dict) -> None:
+        self._starts[level].append(_to_seconds(period['start_date']))
+        self._ends[level].append(_to_seconds(period['end_date']))
+        self._durations[level].append(period['duration_years'])
+        self._planets[level].append(VimshottariDasha.DASHA_SEQUENCE.index(period['planet']))
+
+    def count(self, level: str) -> int:
+        return len(self._starts[level])
+
+    def planet(self, level: str, index: int) -> str:
+        return VimshottariDasha.DASHA_SEQUENCE[self._planets[level][index]]
+
+    def resolve_path(self, path: str) -> Tuple[int, int]:
+        """
+        Resolve a tree path such as ``Saturn/Mercury`` or ``3/5``.
+
+        Top-level segments index into the Mahadasha sequence; deeper segments
+        index into the parent's nine children. A planet name selects the first
+        matching period at that position.
+
+        Returns:
+            (depth, index): depth 0 is maha; index is absolute within that level
+
+        Raises:
+            ValueError: If a segment doesn't match any period
+        """
+        segments = [segment.strip() for segment in path.strip('/').split('/') if segment.strip()]
+        if not segments:
+            raise ValueError("Empty dasha path")
+        if len(segments) > len(DASHA_LEVELS):
+            raise ValueError(f"Dasha path has more than {len(DASHA_LEVELS)} levels")
+
+        lo, hi = 0, self.count('maha')
+        index = -1
+        for depth, segment in enumerate(segments):
+            level = DASHA_LEVELS[depth]
+            if segment.isdigit():
+                index = lo + int(segment)
+                if index >= hi:
+                    raise ValueError(f"Dasha path segment out of range: {segment}")
+            else:
+                planet = segment.capitalize()
+                index = next((i for i in range(lo, hi) if self.planet(level, i) == planet), -1)
+                if index < 0:
+                    raise ValueError(f"No {level}dasha of {segment} at this path")
+            lo, hi = index * 9, (index + 1) * 9
+        return len(segments) - 1, index
+
+    def path_of(self, level: str, index: int) -> str:
+        """Planet path (``Maha/Antar/...``) of a period."""
+        depth = DASHA_LEVELS.index(level)
+        names = []
+        for d in range(depth, -1, -1):
+            names.append(self.planet(DASHA_LEVELS[d], index))
+            index //= 9
+        return '/'.join(reversed(names))
+
+    def period(self, level: str, index: int, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Materialize one period as a response dict."""
+        now_seconds = _to_seconds(now or datetime.now())
+        start, end = self._starts[level][index], self._ends[level][index]
+        if now_seconds < start:
+            status = 'future'
+        elif now_seconds > end:
+            status = 'past'
+        else:
+            status = 'current'
+        period = {
+            'level': level,
+            'index': index,
+            'planet': self.planet(level, index),
+            'path': self.path_of(level, index),
+            'start_date': (_EPOCH + timedelta(seconds=start)).isoformat(),
+            'end_date': (_EPOCH + timedelta(seconds=end)).isoformat(),
+            'duration_years': self._durations[level][index],
+            'status': status,
+        }
+        if level == 'maha':
+            period['is_birth_dasha'] = index == self.birth_dasha_index
+        else:
+            period['parent_index'] = index // 9
+        if level != DASHA_LEVELS[-1]:
+            period['children'] = 9
+        return period
+
+    def window(self, level: str, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, path: Optional[str] = None) -> Tuple[int, int]:
+        """
+        Index range ``[lo, hi)`` of periods at ``level`` overlapping a window.
+
+        Args:
+            level: 'maha', 'antar' or 'pratyantar'
+            start: Only periods ending after this instant
+            end: Only periods starting before this instant
+            path: Only descendants of this tree path
+
+        Raises:
+            ValueError: For an unknown level or a path at or below ``level``
+        """
+        if level not in DASHA_LEVELS:
+            raise ValueError(f"Unknown dasha level '{level}'. Expected one of: {', '.join(DASHA_LEVELS)}")
+        depth = DASHA_LEVELS.index(level)
+        lo, hi = 0, self.count(level)
+
+        if path:
+            path_depth, path_index = self.resolve_path(path)
+            if path_depth >= depth:
+                raise ValueError(f"Path '{path}' must point above the {level} level")
+            span = 9 ** (depth - path_depth)
+            lo, hi = path_index * span, (path_index + 1) * span
+
+        if start is not None:
+            lo = max(lo, bisect_right(self._ends[level], _to_seconds(start), lo, hi))
+        if end is not None:
+            hi = min(hi, bisect_left(self._starts[level], _to_seconds(end), lo, hi))
+        return lo, max(lo, hi)
+
+    def page(self, level: str = 'maha', start: Optional[datetime] = None,
+             end: Optional[datetime] = None, path: Optional[str] = None,
+             cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """
+        One cursor-paginated page of periods.
+
+        Args:
+            level: 'maha', 'antar' or 'pratyantar'
+            start: Window start (inclusive)
+            end: Window end (exclusive)
+            path: Restrict to descendants of a tree path
+            cursor: Opaque cursor from a previous page's ``next_cursor``
+            limit: Maximum periods per page
+
+        Returns:
+            Dictionary with ``periods``, ``total`` and ``next_cursor``
+
+        Raises:
+            ValueError: For invalid level, path or cursor
+        """
+        lo, hi = self.window(level, start, end, path)
+        position = lo
+        if cursor:
+            try:
+                position = int(cursor)
+            except ValueError:
+                raise ValueError(f"Invalid cursor '{cursor}'")
+            if not lo <= position <= hi:
+                raise ValueError(f"Cursor '{cursor}' is outside the requested window")
+
+        now = datetime.now()
+        stop = min(hi, position + max(1, limit))
+        return {
+            'level': level,
+            'path': path,
+            'from': start.isoformat() if start else None,
+            'to': end.isoformat() if end else None,
+            'total': hi - lo,
+            'periods': [self.period(level, i, now) for i in range(position, stop)],
+            'next_cursor': str(stop) if stop < hi else None,
+        }
+
+
+class _DashaBoundaryCache:
+    """Thread-safe LRU of DashaBoundaries keyed by birth instant and Moon longitude."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[datetime, float], DashaBoundaries]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, birth_date: datetime, moon_longitude: float) -> DashaBoundaries:
+        key = (birth_date, round(moon_longitude, 9))
+        with self._lock:
+            boundaries = self._entries.get(key)
+            if boundaries is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return boundaries
+        # Build outside the lock; a racing duplicate build is harmless
+        boundaries = DashaBoundaries(birth_date, moon_longitude)
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = boundaries
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return boundaries
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_boundary_cache = _DashaBoundaryCache(int(os.getenv("DASHA_BOUNDARY_CACHE_SIZE", "512")))
+
+
+def get_dasha_boundaries(birth_date: datetime, moon_longitude: float) -> DashaBoundaries:
+    """Get the cached 120-year Dasha boundary arrays for a chart."""
+    return _boundary_cache.get(birth_date, moon_longitude)
+
+
+def get_dasha_boundary_stats() -> Dict[str, Any]:
+    return _boundary_cache.get_stats()
+
+
+def parse_dasha_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a window bound given as ``YYYY-MM-DD`` or an ISO datetime.
+
+    Raises:
+        ValueError: If the value isn't a valid date
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'. Use YYYY-MM-DD or ISO 8601")
+    # Dasha boundaries are naive, like the birth datetime they derive from
+    return parsed.replace(tzinfo=None)
+
+
 def get_nakshatra_name(nakshatra_number: int) -> str:
     """Get the name of a nakshatra by number."""
     nakshatra_names = {
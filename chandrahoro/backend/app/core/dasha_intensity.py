@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime, timedelta
 import logging
 
+from app.core.natal_state import NatalState, SIGN_NAMES, ensure_natal_state
+
 logger = logging.getLogger(__name__)
 
 
@@ -128,8 +130,9 @@ class DashaIntensityCalculator:
                 return self._get_empty_result()
 
             # Convert to internal format
-            planet_data = self._convert_planet_data(planets)
-            house_data = self._convert_house_data(houses)
+            natal = ensure_natal_state(planets, houses)
+            planet_data = self._convert_planet_data(natal)
+            house_data = self._convert_house_data(natal)
 
             # Calculate intensities for each period
             intensity_results = []
@@ -459,28 +462,28 @@ class DashaIntensityCalculator:
 
         return reasoning
 
-    def _convert_planet_data(self, planets: List[Dict]) -> Dict[str, Dict]:
-        """Convert planet list to dictionary format."""
-        planet_dict = {}
-        for planet in planets:
-            planet_dict[planet['name']] = {
-                'house': planet.get('house', 1),
-                'sign': planet.get('sign', 'Aries'),
-                'sign_number': planet.get('sign_number', 0),
-                'longitude': planet.get('sidereal_longitude', 0.0),
-                'degree_in_sign': planet.get('degree_in_sign', 0.0)
+    def _convert_planet_data(self, natal: NatalState) -> Dict[str, Dict]:
+        """Per-planet view used by the intensity rules (sign numbers 0-11)."""
+        return {
+            name: {
+                'house': natal.houses[i],
+                'sign': SIGN_NAMES[natal.signs[i]],
+                'sign_number': natal.signs[i],
+                'longitude': natal.sidereal_longitudes[i],
+                'degree_in_sign': natal.degrees[i]
             }
-        return planet_dict
-
-    def _convert_house_data(self, houses: List[Dict]) -> Dict[int, Dict]:
-        """Convert house list to dictionary format."""
-        house_dict = {}
-        for house in houses:
-            house_dict[house['number']] = {
-                'cusp_longitude': house.get('cusp_longitude', 0.0),
-                'sign': house.get('sign', 'Aries')
+            for i, name in enumerate(natal.names)
+        }
+
+    def _convert_house_data(self, natal: NatalState) -> Dict[int, Dict]:
+        """Per-house view used by the intensity rules."""
+        return {
+            i + 1: {
+                'cusp_longitude': cusp,
+                'sign': SIGN_NAMES[sign]
             }
-        return house_dict
+            for i, (sign, cusp) in enumerate(zip(natal.house_signs, natal.house_cusps))
+        }
 
     def _generate_summary(self, intensity_results: List[Dict]) -> Dict[str, Any]:
         """Generate summary statistics."""
@@ -0,0 +1,225 @@
+"""Load-shedding degraded mode for chart calculation.
+
+When the server is saturated, a fast partial chart beats a timeout. While
+any pressure signal is over its threshold, ``/chart/calculate`` requests
+for the full chart skip the optional sections in
+``DEGRADED_DEFER_SECTIONS`` (by default the 120-year dasha navigator, the
+non-selected methodologies, Shadbala, Ashtakavarga and the vargas) unless
+they are already cached for that chart. The response lists them under
+``deferred_sections``; once load drops the client fetches them with
+``include=<sections>``, reusing the per-chart state cache. Requests with an
+explicit ``include`` are never degraded.
+
+Pressure signals (a threshold of 0 disables the signal):
+
+- queue depth: heavy requests waiting for an admission slot
+- p95 latency: ``/chart/calculate`` response times over the last
+  ``DEGRADED_P95_WINDOW_SECONDS``
+- CPU: this worker's CPU use over the last second
+
+Degraded mode is held for ``DEGRADED_HOLD_SECONDS`` after the last signal
+so responses don't flap between full and partial.
+
+Environment:
+    DEGRADED_MODE_ENABLED: Set to false to always calculate everything (default true)
+    DEGRADED_QUEUE_DEPTH: Queued heavy requests (default 8)
+    DEGRADED_P95_MS: p95 of chart calculation latency (default 2000)
+    DEGRADED_P95_WINDOW_SECONDS: Age of the latency samples in the p95 (default 60)
+    DEGRADED_CPU_PERCENT: Worker CPU use, 100 = one core busy (default 90)
+    DEGRADED_HOLD_SECONDS: Minimum time in degraded mode (default 10)
+    DEGRADED_DEFER_SECTIONS: Sections (or groups) to defer
+        (default dasha.navigator,methodologies,shadbala,ashtakavarga,vargas)
+"""
+
+import logging
+import os
+import threading
+import math
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+from app.core.admission import get_admission_controller
+from app.core.chart_sections import METHODOLOGY_SECTION_PREFIX, ChartComputation
+
+logger = logging.getLogger(__name__)
+
+DEGRADED_MODE_ENABLED = os.getenv("DEGRADED_MODE_ENABLED", "true").lower() == "true"
+DEGRADED_QUEUE_DEPTH = int(os.getenv("DEGRADED_QUEUE_DEPTH", "8"))
+DEGRADED_P95_MS = float(os.getenv("DEGRADED_P95_MS", "2000"))
+DEGRADED_P95_WINDOW_SECONDS = float(os.getenv("DEGRADED_P95_WINDOW_SECONDS", "60"))
+DEGRADED_CPU_PERCENT = float(os.getenv("DEGRADED_CPU_PERCENT", "90"))
+DEGRADED_HOLD_SECONDS = float(os.getenv("DEGRADED_HOLD_SECONDS", "10"))
+DEGRADED_DEFER_SECTIONS = [
+    token.strip() for token in os.getenv(
+        "DEGRADED_DEFER_SECTIONS", "dasha.navigator,methodologies,shadbala,ashtakavarga,vargas"
+    ).split(",") if token.strip()
+]
+
+# Shortest window for the CPU reading
+_CPU_WINDOW_SECONDS = 1.0
+
+
+class _CpuSampler:
+    """This process's CPU use between readings at least a window apart."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wall = time.monotonic()
+        self._cpu = time.process_time()
+        self.percent = 0.0
+
+    def read(self) -> float:
+        with self._lock:
+            wall, cpu = time.monotonic(), time.process_time()
+            if wall - self._wall >= _CPU_WINDOW_SECONDS:
+                self.percent = 100 * (cpu - self._cpu) / (wall - self._wall)
+                self._wall, self._cpu = wall, cpu
+            return self.percent
+
+
+class _LatencyWindow:
+    """Latency samples from the last ``window_seconds``."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._samples = deque()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+
+    def add(self, seconds: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._samples.append((now, seconds))
+            self._prune(now)
+
+    def percentile(self, percentile: float = 0.95) -> Optional[float]:
+        """Nearest-rank percentile, or None without samples in the window."""
+        with self._lock:
+            self._prune(time.monotonic())
+            if not self._samples:
+                return None
+            ordered = sorted(seconds for _, seconds in self._samples)
+        return ordered[max(0, math.ceil(percentile * len(ordered)) - 1)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._prune(time.monotonic())
+            return len(self._samples)
+
+
+class DegradedModePolicy:
+    """Decides when chart calculation sheds optional sections, and which."""
+
+    def __init__(self, enabled: bool = DEGRADED_MODE_ENABLED,
+                 queue_depth: int = DEGRADED_QUEUE_DEPTH,
+                 p95_ms: float = DEGRADED_P95_MS,
+                 cpu_percent: float = DEGRADED_CPU_PERCENT,
+                 hold_seconds: float = DEGRADED_HOLD_SECONDS,
+                 p95_window_seconds: float = DEGRADED_P95_WINDOW_SECONDS,
+                 defer_sections: Optional[List[str]] = None):
+        self.enabled = enabled
+        self.queue_depth = queue_depth
+        self.p95_ms = p95_ms
+        self.cpu_percent = cpu_percent
+        self.hold_seconds = hold_seconds
+        self.defer_sections = DEGRADED_DEFER_SECTIONS if defer_sections is None else defer_sections
+        self._cpu = _CpuSampler()
+        self._latency = _LatencyWindow(p95_window_seconds)
+        self._degraded_until = 0.0
+        self._reasons: List[str] = []
+        self.degraded_responses = 0
+        self.deferred = Counter()
+
+    def signals(self) -> List[str]:
+        """Pressure signals currently over their thresholds."""
+        controller = get_admission_controller()
+        reasons = []
+        if self.queue_depth > 0:
+            queued = controller.queued()
+            if queued >= self.queue_depth:
+                reasons.append(f"queue_depth={queued}")
+        if self.p95_ms > 0:
+            p95 = self._latency.percentile()
+            if p95 is not None and p95 * 1000 >= self.p95_ms:
+                reasons.append(f"p95_ms={p95 * 1000:.0f}")
+        if self.cpu_percent > 0:
+            cpu = self._cpu.read()
+            if cpu >= self.cpu_percent:
+                reasons.append(f"cpu_percent={cpu:.0f}")
+        return reasons
+
+    def record_latency(self, seconds: float) -> None:
+        """Add a ``/chart/calculate`` response time to the p95 window."""
+        self._latency.add(seconds)
+
+    def check(self) -> List[str]:
+        """
+        Reasons to degrade now (empty when not degraded).
+
+        Returns the last triggering signals while the hold period lasts.
+        """
+        if not self.enabled:
+            return []
+        reasons = self.signals()
+        now = time.monotonic()
+        if reasons:
+            if now >= self._degraded_until:
+                logger.warning(f"Chart calculation entering degraded mode: {', '.join(reasons)}")
+            self._reasons = reasons
+            self._degraded_until = now + self.hold_seconds
+        elif now >= self._degraded_until:
+            return []
+        return self._reasons
+
+    def deferrable(self, sections: List[str], selected_methodology: str,
+                   chart_state: ChartComputation) -> List[str]:
+        """Requested sections to defer: configured ones not cached yet, never the selected methodology."""
+        selected_section = f"{METHODOLOGY_SECTION_PREFIX}{selected_methodology}"
+        deferred = []
+        for section in sections:
+            if section == selected_section:
+                continue
+            if not any(section == token or section.startswith(token + ".") for token in self.defer_sections):
+                continue
+            node = (f"methodology:{section[len(METHODOLOGY_SECTION_PREFIX):]}"
+                    if section.startswith(METHODOLOGY_SECTION_PREFIX) else section)
+            if not chart_state.is_computed(node):
+                deferred.append(section)
+        return deferred
+
+    def record(self, deferred: List[str]) -> None:
+        self.degraded_responses += 1
+        self.deferred.update(deferred)
+
+    def get_stats(self) -> Dict[str, Any]:
+        remaining = self._degraded_until - time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "degraded": remaining > 0,
+            "degraded_for_seconds": round(max(0.0, remaining), 3),
+            "reasons": self._reasons if remaining > 0 else [],
+            "thresholds": {
+                "queue_depth": self.queue_depth,
+                "p95_ms": self.p95_ms,
+                "cpu_percent": self.cpu_percent,
+            },
+            "cpu_percent": round(self._cpu.percent, 1),
+            "p95_ms": None if (p95 := self._latency.percentile()) is None else round(p95 * 1000, 1),
+            "p95_window_seconds": self._latency.window_seconds,
+            "p95_samples": len(self._latency),
+            "defer_sections": self.defer_sections,
+            "degraded_responses": self.degraded_responses,
+            "deferred_sections": dict(self.deferred),
+        }
+
+
+_policy = DegradedModePolicy()
+
+
+def get_degraded_mode() -> DegradedModePolicy:
+    return _policy
@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Any
 import logging
+from app.core.profiling import profile_span
 
 logger = logging.getLogger(__name__)
 
@@ -163,6 +164,7 @@ class DivisionalChartCalculator:
             'pada': pada
         }
     
+    @profile_span("vargas")
     def calculate_all_divisional_charts(self, planet_positions: Dict[str, Dict], 
                                      chart_types: List[str] = None) -> Dict[str, Dict]:
         """
@@ -3,6 +3,8 @@
 from datetime import datetime, timezone
 from typing import Dict, List, Tuple
 import logging
+import threading
+from app.core.profiling import profile_span
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,10 @@ except ImportError:
     SWISSEPH_AVAILABLE = False
     logger.warning("Swiss Ephemeris not available, using mock calculations")
 
+# The sidereal mode is global Swiss Ephemeris state; calculators for different
+# ayanamshas may run on different threads, so set and read it together
+_sid_mode_lock = threading.Lock()
+
 
 class EphemerisCalculator:
     """Calculate planetary positions using Swiss Ephemeris."""
@@ -64,11 +70,18 @@ class EphemerisCalculator:
         """
         self.ayanamsha = ayanamsha
         self.tropical = tropical
+        self.ayanamsha_id = self.AYANAMSHA_SYSTEMS.get(ayanamsha, 1)
 
         if SWISSEPH_AVAILABLE and not tropical:
             # Set ayanamsha system only for sidereal
-            ayanamsha_id = self.AYANAMSHA_SYSTEMS.get(ayanamsha, 1)
-            swe.set_sid_mode(ayanamsha_id)
+            with _sid_mode_lock:
+                swe.set_sid_mode(self.ayanamsha_id)
+
+    def get_ayanamsha_value(self, jd: float) -> float:
+        """Ayanamsha of this calculator's system at the given Julian Day."""
+        with _sid_mode_lock:
+            swe.set_sid_mode(self.ayanamsha_id)
+            return swe.get_ayanamsa_ut(jd)
     
     def calculate_julian_day(self, dt: datetime) -> float:
         """Convert datetime to Julian Day."""
@@ -113,7 +126,7 @@ class EphemerisCalculator:
             ayanamsha_value = 0.0
         else:
             # For sidereal, subtract ayanamsha
-            ayanamsha_value = swe.get_ayanamsa_ut(jd)
+            ayanamsha_value = self.get_ayanamsha_value(jd)
             longitude = (tropical_long - ayanamsha_value) % 360
 
         # Determine sign and degree within sign
@@ -184,6 +197,7 @@ class EphemerisCalculator:
             'ayanamsha_value': 24.0,
         }
     
+    @profile_span("ephemeris.planets")
     def calculate_all_planets(self, dt: datetime) -> Dict[str, Dict]:
         """Calculate positions for all planets."""
         jd = self.calculate_julian_day(dt)
@@ -199,6 +213,7 @@ class EphemerisCalculator:
         
         return positions
     
+    @profile_span("ephemeris.ascendant")
     def calculate_ascendant(self, dt: datetime, latitude: float, longitude: float, house_system: str = 'Placidus') -> Dict:
         """Calculate ascendant (Lagna)."""
         jd = self.calculate_julian_day(dt)
@@ -218,7 +233,7 @@ class EphemerisCalculator:
             ascendant_tropical = houses[0][0]  # First house cusp is ascendant
 
             # Get ayanamsha
-            ayanamsha_value = swe.get_ayanamsa_ut(jd)
+            ayanamsha_value = self.get_ayanamsha_value(jd)
             ascendant_sidereal = (ascendant_tropical - ayanamsha_value) % 360
         else:
             # Mock ascendant calculation
@@ -283,7 +298,7 @@ class EphemerisCalculator:
                     longitude = tropical_long
                     ayanamsha_value = 0.0
                 else:
-                    ayanamsha_value = swe.get_ayanamsa_ut(jd)
+                    ayanamsha_value = self.get_ayanamsha_value(jd)
                     longitude = (tropical_long - ayanamsha_value) % 360
 
                 sign_num = int(longitude / 30)
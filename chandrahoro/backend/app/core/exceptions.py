@@ -10,11 +10,13 @@ class AppException(Exception):
         self,
         message: str,
         status_code: int = 500,
-        details: Optional[Dict[str, Any]] = None
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.message = message
         self.status_code = status_code
         self.details = details or {}
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -75,8 +77,25 @@ class ExternalAPIError(AppException):
 class RateLimitError(AppException):
     """Raised when rate limit is exceeded."""
 
-    def __init__(self, message: str = "Rate limit exceeded", details: Optional[Dict[str, Any]] = None):
-        super().__init__(message, status_code=429, details=details)
+    def __init__(
+        self,
+        message: str = "Rate limit exceeded",
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        super().__init__(message, status_code=429, details=details, headers=headers)
+
+
+class ServiceUnavailableError(AppException):
+    """Raised when the server is too busy to take the request (503)."""
+
+    def __init__(
+        self,
+        message: str = "Server busy, retry later",
+        details: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        super().__init__(message, status_code=503, details=details, headers=headers)
 
 
 class ConfigurationError(AppException):
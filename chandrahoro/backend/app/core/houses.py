@@ -3,6 +3,7 @@
 from datetime import datetime
 from typing import Dict, List, Tuple
 import logging
+from app.core.profiling import profile_span
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ class HouseSystemCalculator:
             time_fraction = (dt.hour + dt.minute / 60.0 + dt.second / 3600.0) / 24.0
             return jdn + time_fraction - 0.5
     
+    @profile_span("houses")
     def calculate_houses(self, dt: datetime, latitude: float, longitude: float,
                         ayanamsha_value: float = 0.0) -> Dict:
         """
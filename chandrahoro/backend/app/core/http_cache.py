@@ -0,0 +1,82 @@
+"""HTTP conditional-request helpers (ETag / If-None-Match / Cache-Control).
+
+Chart output is deterministic for given birth data and preferences, so its
+ETag is derived from the canonical input hash plus ``CALCULATION_VERSION``
+and can be checked before any computation. Responses also carry
+time-relative fields (current dasha, past/current/future period status),
+so chart ETags include the UTC date and roll over daily.
+"""
+
+import hashlib
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+from app.models.chart import BirthDetails, ChartPreferences
+
+# Bump whenever calculation code changes chart, export or report output
+CALCULATION_VERSION = "2026.10.2"
+
+# Clients may keep a copy but must revalidate with If-None-Match
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def public_cache_control(max_age: int, shared_max_age: Optional[int] = None) -> str:
+    """Cache-Control for public responses that shared caches (nginx) may store."""
+    value = f"public, max-age={max_age}"
+    if shared_max_age is not None:
+        value += f", s-maxage={shared_max_age}"
+    return value
+
+
+SAMPLE_CACHE_CONTROL = public_cache_control(
+    int(os.getenv("HTTP_SAMPLE_MAX_AGE", "300")),
+    int(os.getenv("HTTP_SAMPLE_SHARED_MAX_AGE", "3600")),
+)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given parts."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def chart_etag(birth_details: BirthDetails, preferences: Optional[ChartPreferences], *variant: Any) -> str:
+    """
+    ETag for a chart-derived representation.
+
+    Args:
+        birth_details: Birth details
+        preferences: Chart preferences (None for defaults)
+        variant: Anything else that changes the representation (format, sections)
+
+    Returns:
+        Strong ETag header value
+    """
+    # Imported here: chart_sections pulls in every calculator
+    from app.core.chart_sections import chart_input_hash
+
+    input_hash = chart_input_hash(birth_details, preferences or ChartPreferences())
+    return make_etag(CALCULATION_VERSION, input_hash, datetime.utcnow().date().isoformat(), *variant)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match matches ``etag`` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def cache_headers(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": cache_control}
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    """Empty 304 response carrying the validators."""
+    return Response(status_code=304, headers=cache_headers(etag, cache_control))
@@ -0,0 +1,346 @@
+"""Lazy mounting of API routers.
+
+Importing every router module at startup pulls in swisseph, reportlab, PIL,
+the LLM SDKs, cryptography and every calculator before the first request
+can be served. With lazy mounting each router is registered as a single
+placeholder route built from a manifest of its paths and methods
+(``app/api/v1/routes_manifest.json``). The first request matching a
+placeholder imports the module (off the event loop), splices its real routes
+into the placeholder's position, so route precedence is the same as with
+eager ``include_router`` calls, and is then dispatched again.
+
+/docs and /openapi.json mount every router first, so the schema is complete.
+
+Each router's entry carries a hash of its source file; a router whose source
+changed since the manifest was written is mounted eagerly with a warning, so
+a stale manifest costs startup time but never routes. Regenerate with::
+
+    python -m app.core.lazy_routes --write
+
+Warm-up: ``ROUTER_PRELOAD`` lists router names (``chart,charts``) or dotted
+module names (``app.core.parashara_methodology``), or ``all``; they are
+imported on a background thread after startup so the first real request
+doesn't pay for them.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Pattern, Sequence, Set, Tuple
+
+import anyio
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound, compile_path
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+LAZY_ROUTERS_ENABLED = os.getenv("LAZY_ROUTERS", "true").lower() == "true"
+
+# Router names and/or dotted module names to import after startup, or "all"
+ROUTER_PRELOAD = os.getenv("ROUTER_PRELOAD", "")
+
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "api", "v1", "routes_manifest.json")
+MANIFEST_VERSION = 1
+
+
+class RouterSpec(NamedTuple):
+    """A router module and how it is included in the app."""
+    name: str
+    prefix: str
+    tags: List[str]
+
+
+def _module_name(package: str, spec: RouterSpec) -> str:
+    return f"{package}.{spec.name}"
+
+
+def source_hash(module_name: str) -> Optional[str]:
+    """SHA-256 of a module's source file, without importing it."""
+    found = importlib.util.find_spec(module_name)
+    if found is None or not found.origin or not os.path.exists(found.origin):
+        return None
+    with open(found.origin, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_manifest(package: str, specs: Sequence[RouterSpec]) -> Dict[str, Any]:
+    """
+    Import every router and record its routes.
+
+    Args:
+        package: Package holding the router modules
+        specs: Routers in inclusion order
+
+    Returns:
+        Manifest dict (``{"version", "routers": {name: {"prefix", "source_hash", "routes"}}}``)
+    """
+    routers = {}
+    for spec in specs:
+        module_name = _module_name(package, spec)
+        module = importlib.import_module(module_name)
+        scratch = APIRouter()
+        scratch.include_router(module.router, prefix=spec.prefix)
+        routers[spec.name] = {
+            "prefix": spec.prefix,
+            "source_hash": source_hash(module_name),
+            "routes": [
+                {
+                    "path": route.path,
+                    "methods": sorted(route.methods) if getattr(route, "methods", None) else None,
+                    "name": getattr(route, "name", None),
+                }
+                for route in scratch.routes
+            ],
+        }
+    return {"version": MANIFEST_VERSION, "routers": routers}
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable router manifest {path}: {e}")
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        logger.warning(f"Ignoring router manifest {path} with version {manifest.get('version')}")
+        return None
+    return manifest
+
+
+def write_manifest(manifest: Dict[str, Any], path: str = MANIFEST_PATH) -> None:
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+        f.write("\n")
+
+
+class LazyRouter(BaseRoute):
+    """Placeholder for a router module that hasn't been imported yet."""
+
+    def __init__(self, mounter: "LazyRouterMounter", spec: RouterSpec, routes: List[Dict[str, Any]]):
+        self.mounter = mounter
+        self.spec = spec
+        self.patterns: List[Tuple[Pattern, Optional[Set[str]]]] = [
+            (compile_path(route["path"])[0], set(route["methods"]) if route["methods"] else None)
+            for route in routes
+        ]
+        self.names = {route["name"] for route in routes if route.get("name")}
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] != "http":
+            return Match.NONE, {}
+        path = scope["path"]
+        partial = False
+        for regex, methods in self.patterns:
+            if regex.match(path):
+                if methods is None or scope["method"] in methods:
+                    return Match.FULL, {}
+                partial = True
+        return (Match.PARTIAL if partial else Match.NONE), {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.mounter.mount_async(self.spec.name)
+        # The placeholder is gone; route again to the real endpoint (or the
+        # real 405 for a partial match)
+        await self.mounter.app.router(scope, receive, send)
+
+    def url_path_for(self, name: str, **path_params: Any):
+        if name not in self.names:
+            raise NoMatchFound(name, path_params)
+        self.mounter.mount(self.spec.name)
+        return self.mounter.app.router.url_path_for(name, **path_params)
+
+    def __repr__(self) -> str:
+        return f"LazyRouter(name={self.spec.name!r}, prefix={self.spec.prefix!r})"
+
+
+class LazyRouterMounter:
+    """Registers routers lazily and mounts them on first use."""
+
+    def __init__(self, app: FastAPI, package: str, manifest: Optional[Dict[str, Any]] = None,
+                 enabled: bool = LAZY_ROUTERS_ENABLED):
+        self.app = app
+        self.package = package
+        self.enabled = enabled
+        self.manifest = (manifest if manifest is not None else load_manifest()) if enabled else None
+        self._specs: Dict[str, RouterSpec] = {}
+        self._pending: Dict[str, LazyRouter] = {}
+        self._eager: List[str] = []
+        self._mount_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+        if enabled and self.manifest is None:
+            logger.warning(f"No router manifest at {MANIFEST_PATH}; mounting all routers eagerly")
+
+    def include(self, spec: RouterSpec) -> None:
+        """Register a router: as a placeholder if the manifest is current for it, else eagerly."""
+        self._specs[spec.name] = spec
+        entry = (self.manifest or {}).get("routers", {}).get(spec.name)
+        if entry is not None and (entry["prefix"] != spec.prefix
+                                  or entry["source_hash"] != source_hash(_module_name(self.package, spec))):
+            logger.warning(f"Router manifest is stale for {spec.name}; mounting it eagerly "
+                           f"(regenerate with: python -m app.core.lazy_routes --write)")
+            entry = None
+        if entry is None:
+            self._include_now(spec)
+            self._eager.append(spec.name)
+            return
+        placeholder = LazyRouter(self, spec, entry["routes"])
+        self._pending[spec.name] = placeholder
+        self.app.router.routes.append(placeholder)
+
+    def include_all(self, specs: Sequence[RouterSpec]) -> None:
+        for spec in specs:
+            self.include(spec)
+
+    def _include_now(self, spec: RouterSpec) -> None:
+        started = time.perf_counter()
+        module = importlib.import_module(_module_name(self.package, spec))
+        self.app.include_router(module.router, prefix=spec.prefix, tags=spec.tags)
+        self._mount_seconds[spec.name] = time.perf_counter() - started
+
+    def mount(self, name: str) -> None:
+        """Import a pending router and splice its routes in place of its placeholder."""
+        with self._lock:
+            placeholder = self._pending.get(name)
+            if placeholder is None:
+                return
+            started = time.perf_counter()
+            module = importlib.import_module(_module_name(self.package, placeholder.spec))
+            routes = self.app.router.routes
+            before = len(routes)
+            self.app.include_router(module.router, prefix=placeholder.spec.prefix, tags=placeholder.spec.tags)
+            added = routes[before:]
+            del routes[before:]
+            index = next(i for i, route in enumerate(routes) if route is placeholder)
+            routes[index:index + 1] = added
+            del self._pending[name]
+            self._mount_seconds[name] = time.perf_counter() - started
+        logger.info(f"Mounted router {name} ({len(added)} routes) in {self._mount_seconds[name] * 1000:.0f}ms")
+
+    async def mount_async(self, name: str) -> None:
+        """``mount`` with the (slow) module import done on a worker thread."""
+        if name not in self._pending:
+            return
+        await anyio.to_thread.run_sync(importlib.import_module, _module_name(self.package, self._specs[name]))
+        self.mount(name)
+
+    def mount_all(self) -> None:
+        for name in list(self._pending):
+            self.mount(name)
+
+    def install_openapi(self) -> None:
+        """Make the OpenAPI schema (and so /docs) mount every router first."""
+        build_openapi = self.app.openapi
+
+        def openapi() -> Dict[str, Any]:
+            if self._pending:
+                self.mount_all()
+                self.app.openapi_schema = None
+            return build_openapi()
+
+        self.app.openapi = openapi
+
+    def start_warmup(self, preload: str = ROUTER_PRELOAD) -> None:
+        """
+        Import the ``preload`` routers/modules on a background thread.
+
+        Routers are mounted back on the event loop once imported; dotted
+        module names are only imported. Call from a startup hook.
+        """
+        if not preload.strip():
+            return
+        if preload.strip() == "all":
+            targets = list(self._specs)
+        else:
+            targets = [target.strip() for target in preload.split(",") if target.strip()]
+        loop = asyncio.get_running_loop()
+
+        def warm() -> None:
+            started = time.perf_counter()
+            for target in targets:
+                try:
+                    if target in self._specs:
+                        importlib.import_module(_module_name(self.package, self._specs[target]))
+                        loop.call_soon_threadsafe(self.mount, target)
+                    else:
+                        importlib.import_module(target)
+                except Exception as e:
+                    logger.warning(f"Warm-up import of {target} failed: {e}")
+            logger.info(f"Warm-up imported {len(targets)} routers/modules in {time.perf_counter() - started:.2f}s")
+
+        self._warmup_thread = threading.Thread(target=warm, name="router-warmup", daemon=True)
+        self._warmup_thread.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "manifest": self.manifest is not None,
+            "pending": sorted(self._pending),
+            "mounted": sorted(name for name in self._specs if name not in self._pending),
+            "eager": list(self._eager),
+            "mount_ms": {name: round(seconds * 1000, 1) for name, seconds in self._mount_seconds.items()},
+        }
+
+
+_mounter: Optional[LazyRouterMounter] = None
+
+
+def mount_routers(app: FastAPI, package: str, specs: Sequence[RouterSpec]) -> LazyRouterMounter:
+    """
+    Register ``specs`` on ``app`` (lazily when enabled) and hook up /docs.
+
+    Args:
+        app: The FastAPI app
+        package: Package holding the router modules (each exposes ``router``)
+        specs: Routers in inclusion order
+
+    Returns:
+        The mounter, also available from ``get_router_mounter()``
+    """
+    global _mounter
+    mounter = LazyRouterMounter(app, package)
+    mounter.include_all(specs)
+    if mounter.enabled:
+        mounter.install_openapi()
+    _mounter = mounter
+    return mounter
+
+
+def get_router_mounter() -> Optional[LazyRouterMounter]:
+    return _mounter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write or check the lazy router manifest")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--write", action="store_true", help="Regenerate the manifest")
+    group.add_argument("--check", action="store_true", help="Exit 1 if the manifest is missing or stale")
+    args = parser.parse_args()
+
+    from app.api.v1 import ROUTERS
+
+    manifest = build_manifest("app.api.v1", ROUTERS)
+    if args.write:
+        write_manifest(manifest)
+        print(f"wrote {MANIFEST_PATH} ({len(manifest['routers'])} routers)")
+        return
+    if load_manifest() != manifest:
+        print(f"{MANIFEST_PATH} is stale; run python -m app.core.lazy_routes --write", file=sys.stderr)
+        sys.exit(1)
+    print("router manifest is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,328 @@
-"""Logging configuration."""
+"""Logging configuration.
 
-import logging
+Records from the ``chandrahoro`` (request log) and ``app`` loggers go
+through a queue-based pipeline: the emitting thread (usually the event loop)
+only renders the message and enqueues the record without blocking; a
+background writer thread formats records as JSON and writes them to stdout
+in batches. When the queue is full records are dropped (and counted) rather
+than ever blocking a request.
+
+Chatty loggers can be sampled: ``LOG_SAMPLING=app.core.chart_sections=0.05``
+keeps 5% of that logger's (and its children's) records at INFO and below;
+warnings and errors are always kept.
+
+Environment:
+    LOG_LEVEL: Level of the ``chandrahoro`` request log (default INFO)
+    LOG_APP_LEVEL: Level of the ``app.*`` module loggers (default WARNING)
+    LOG_FORMAT: ``json`` (default) or ``text``
+    LOG_SAMPLING: Comma-separated ``logger=rate`` pairs
+    LOG_QUEUE_SIZE: Records buffered before dropping (default 10000)
+    LOG_BATCH_SIZE: Records written per batch (default 256)
+    LOG_FLUSH_INTERVAL_MS: Longest the writer waits to fill a batch (default 50)
+"""
+
+import atexit
+import copy
 import json
-from datetime import datetime
-from typing import Callable
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+import logging
+import os
+import queue
+import random
+import sys
+import threading
 import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, TextIO
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_APP_LEVEL = os.getenv("LOG_APP_LEVEL", "WARNING").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL_MS", "50")) / 1000
+
+# LogRecord attributes; anything else on a record came from ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def _json_default(value: Any) -> str:
+    return str(value)
+
 
 # Configure structured logging
 class JSONFormatter(logging.Formatter):
-    """JSON formatter for structured logging."""
-    
+    """JSON formatter for structured logging (fields passed as ``extra`` included)."""
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data = {
-            "timestamp": datetime.utcnow().isoformat(),
+            # Creation time, not format time: records are formatted later on the writer thread
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).replace(tzinfo=None).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        
-        if record.exc_info:
-            log_data["exception"] = self.formatException(record.exc_info)
-        
-        return json.dumps(log_data)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                log_data[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_data["exception"] = record.exc_text
+        if record.stack_info:
+            log_data["stack"] = record.stack_info
+
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(log_data, default=_json_default).decode()
+        return json.dumps(log_data, default=_json_default)
+
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """Parse ``logger=rate,...`` into {logger: rate}, ignoring malformed entries."""
+    rates = {}
+    for entry in value.split(","):
+        name, _, rate = entry.strip().partition("=")
+        try:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of INFO-and-below records from selected loggers (and their children)."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._resolved: Dict[str, Optional[float]] = {}
+        self.sampled_out = 0
+
+    def _rate(self, name: str) -> Optional[float]:
+        rate = self._resolved.get(name, -1.0)
+        if rate == -1.0:
+            rate = None
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class QueueingHandler(logging.Handler):
+    """
+    Handler that only enqueues.
+
+    The message is rendered (and any traceback formatted) in the emitting
+    thread, since arguments and frames may change or go away before the
+    writer gets to them; JSON encoding and I/O happen on the writer thread.
+    """
+
+    def __init__(self, pipeline: "LogPipeline"):
+        super().__init__()
+        self.pipeline = pipeline
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self.pipeline.enqueue(record)
+        except Exception:
+            self.handleError(record)
+
+
+_STOP = object()
+
+
+class LogPipeline:
+    """Bounded queue plus a writer thread that formats and writes in batches."""
+
+    def __init__(self, formatter: logging.Formatter, stream: Optional[TextIO] = None,
+                 queue_size: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL):
+        self.formatter = formatter
+        self.stream = stream
+        self.queue_size = queue_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self._reported_drops = 0
+
+    def _stream(self) -> TextIO:
+        # Resolved per batch so stdout redirection (tests, capture) is honoured
+        return self.stream if self.stream is not None else sys.stdout
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self._queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Linger briefly so bursts go out in one write
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not _STOP:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            self._write([record for record in batch if record is not _STOP])
+            if stop:
+                return
+
+    def _format(self, record: logging.LogRecord) -> Optional[str]:
+        try:
+            return self.formatter.format(record)
+        except Exception:
+            self.errors += 1
+            return None
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        lines = [line for line in map(self._format, records) if line is not None]
+        if self.dropped > self._reported_drops:
+            lines.append(self.formatter.format(logging.LogRecord(
+                "app.core.logging_config", logging.WARNING, __file__, 0,
+                "Log queue full: dropped %d records", (self.dropped - self._reported_drops,), None,
+            )))
+            self._reported_drops = self.dropped
+        if not lines:
+            return
+        try:
+            stream = self._stream()
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+            self.written += len(lines)
+            self.batches += 1
+        except Exception:
+            self.errors += len(lines)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush everything queued and stop the writer."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+    def _after_fork(self) -> None:
+        # The writer thread doesn't survive fork (e.g. a preloading process
+        # manager); give the child its own queue and writer
+        self._queue = queue.Queue(maxsize=self.queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.start()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self.queue_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "batches": self.batches,
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+_sampling: Optional[SamplingFilter] = None
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    return _pipeline
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """Pipeline counters plus records dropped by sampling."""
+    if _pipeline is None:
+        return {}
+    return {**_pipeline.get_stats(), "sampled_out": _sampling.sampled_out if _sampling else 0}
+
+
+def shutdown_logging() -> None:
+    """Flush queued records (also registered with ``atexit``)."""
+    if _pipeline is not None:
+        _pipeline.stop()
 
 
 def setup_logging():
     """Set up structured logging."""
-    # Create logger
+    global _pipeline, _sampling
+
+    if LOG_FORMAT == "text":
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    else:
+        formatter = JSONFormatter()
+
+    _pipeline = LogPipeline(formatter)
+    _pipeline.start()
+    atexit.register(shutdown_logging)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_pipeline._after_fork)
+
+    handler = QueueingHandler(_pipeline)
+    _sampling = SamplingFilter(parse_sampling(LOG_SAMPLING))
+    handler.addFilter(_sampling)
+
+    # Request log
     logger = logging.getLogger("chandrahoro")
-    logger.setLevel(logging.INFO)
-    
-    # Create console handler
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    
-    # Create formatter
-    formatter = JSONFormatter()
-    handler.setFormatter(formatter)
-    
-    # Add handler
+    logger.setLevel(LOG_LEVEL)
     logger.addHandler(handler)
-    
+    logger.propagate = False
+
+    # Module loggers (logging.getLogger(__name__) under app.*)
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(LOG_APP_LEVEL)
+    app_logger.addHandler(handler)
+    app_logger.propagate = False
+
     return logger
 
 
@@ -51,20 +330,36 @@ def setup_logging():
 logger = setup_logging()
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for request/response logging."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Log request and response."""
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware for request/response logging.
+
+    Adds ``X-Request-ID`` and ``X-Process-Time`` response headers. Logging
+    only enqueues, so it never waits on stdout.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Request info
-        request_id = request.headers.get("X-Request-ID", "unknown")
-        method = request.method
-        path = request.url.path
-        client_ip = request.client.host if request.client else "unknown"
-        
+        request_id = "unknown"
+        for name, value in scope.get("headers", ()):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+
         # Start time
-        start_time = time.time()
-        
+        start_time = time.perf_counter()
+
         # Log request
         logger.info(
             f"Request: {method} {path}",
@@ -75,36 +370,36 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 "client_ip": client_ip,
             }
         )
-        
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start_time
+
+                # Log response
+                logger.info(
+                    f"Response: {method} {path} - {message['status']}",
+                    extra={
+                        "request_id": request_id,
+                        "method": method,
+                        "path": path,
+                        "status_code": message["status"],
+                        "duration_ms": duration * 1000,
+                    }
+                )
+
+                # Add headers
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                headers.append((b"x-process-time", str(duration).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
         try:
-            # Call next middleware
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = time.time() - start_time
-            
-            # Log response
-            logger.info(
-                f"Response: {method} {path} - {response.status_code}",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "path": path,
-                    "status_code": response.status_code,
-                    "duration_ms": duration * 1000,
-                }
-            )
-            
-            # Add headers
-            response.headers["X-Request-ID"] = request_id
-            response.headers["X-Process-Time"] = str(duration)
-            
-            return response
-        
+            await self.app(scope, receive, send_with_headers)
         except Exception as e:
             # Calculate duration
-            duration = time.time() - start_time
-            
+            duration = time.perf_counter() - start_time
+
             # Log error
             logger.error(
                 f"Error: {method} {path} - {str(e)}",
@@ -117,6 +412,5 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 },
                 exc_info=True,
             )
-            
-            raise
 
+            raise
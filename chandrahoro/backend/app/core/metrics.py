@@ -0,0 +1,763 @@
+"""Prometheus-style application metrics.
+
+A small, dependency-free metrics registry (counters, gauges and histograms
+with fixed buckets) exposed in the Prometheus text format at ``/metrics``.
+It records:
+
+- ``http_requests_total`` / ``http_request_duration_seconds`` per method and
+  route template, and ``http_requests_in_flight``
+- ``db_queries_total`` / ``db_query_duration_seconds`` per statement type,
+  from SQLAlchemy cursor events
+- ``llm_requests_total`` / ``llm_request_duration_seconds`` /
+  ``llm_tokens_total`` per provider
+- ``chart_stage_duration_seconds`` per chart section node (planet positions,
+  dasha, yogas, shadbala, ...)
+- ``cache_hits_total`` / ``cache_misses_total`` per cache, read from the
+  caches' own ``get_stats()`` at collection time. Hit ratio:
+  ``rate(cache_hits_total[5m]) / (rate(cache_hits_total[5m]) + rate(cache_misses_total[5m]))``
+
+Recording is a dict lookup plus a locked add, so it stays on in production.
+With several workers, set ``METRICS_MULTIPROC_DIR`` to a directory shared by
+the workers of one host: each worker writes its samples there every
+``METRICS_FLUSH_SECONDS`` and ``/metrics`` merges them (counters and
+histograms are summed; gauges only count live workers).
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# Files of exited workers are deleted once this old
+METRICS_STALE_SECONDS = float(os.getenv("METRICS_STALE_SECONDS", "3600"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+LLM_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """Base class: a named metric family with fixed label names."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labelvalues: Tuple[Any, ...]) -> LabelValues:
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+        return tuple(str(value) for value in labelvalues)
+
+    def samples(self) -> List[Tuple[LabelValues, Any]]:
+        raise NotImplementedError
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": [[list(labels), value] for labels, value in self.samples()],
+        }
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: Any, amount: float = 1.0) -> None:
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (e.g. requests in flight)."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: Any, amount: float = 1.0) -> None:
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labelvalues: Any, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def set(self, value: float, *labelvalues: Any) -> None:
+        key = self._key(labelvalues)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def samples(self) -> List[Tuple[LabelValues, float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class Histogram(_Metric):
+    """
+    Fixed-bucket histogram.
+
+    Each label set keeps per-bucket counts (the last one is ``+Inf``), the
+    sum and the count; buckets are made cumulative only on exposition.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *labelvalues: Any) -> None:
+        key = self._key(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self) -> List[Tuple[LabelValues, List[Any]]]:
+        with self._lock:
+            return [(labels, [list(counts), total, count]) for labels, (counts, total, count) in self._values.items()]
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+
+# A collector returns snapshot-format families computed at collection time
+Collector = Callable[[], Dict[str, Dict[str, Any]]]
+
+
+class MetricsRegistry:
+    """Named metrics plus collectors that read other components' stats."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """This process's samples, by metric name."""
+        families = {name: metric.snapshot() for name, metric in list(self._metrics.items())}
+        for collector in self._collectors:
+            try:
+                families.update(collector())
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+        return families
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    return _registry
+
+
+HTTP_REQUESTS = _registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status"))
+HTTP_DURATION = _registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route"))
+HTTP_IN_FLIGHT = _registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+
+DB_QUERIES = _registry.counter("db_queries_total", "Database statements executed by type.", ("operation",))
+DB_DURATION = _registry.histogram(
+    "db_query_duration_seconds", "Database statement latency by type.", ("operation",), DB_BUCKETS)
+DB_ERRORS = _registry.counter("db_query_errors_total", "Database statements that raised, by type.", ("operation",))
+
+LLM_REQUESTS = _registry.counter(
+    "llm_requests_total", "LLM generation calls by provider and outcome.", ("provider", "status"))
+LLM_DURATION = _registry.histogram(
+    "llm_request_duration_seconds", "LLM generation latency by provider.", ("provider",), LLM_BUCKETS)
+LLM_TOKENS = _registry.counter("llm_tokens_total", "Tokens used by LLM generations.", ("provider", "model"))
+
+CHART_STAGE_DURATION = _registry.histogram(
+    "chart_stage_duration_seconds", "Chart calculation time per section node.", ("stage",), STAGE_BUCKETS)
+
+
+def observe_chart_stage(stage: str, seconds: float) -> None:
+    """Record one chart section node evaluation."""
+    CHART_STAGE_DURATION.observe(seconds, stage)
+
+
+def observe_llm_request(provider: str, model: str, seconds: float, success: bool, tokens: int = 0) -> None:
+    """Record one LLM generation call."""
+    LLM_REQUESTS.inc(provider, "success" if success else "error")
+    LLM_DURATION.observe(seconds, provider)
+    if tokens:
+        LLM_TOKENS.inc(provider, model or "unknown", amount=tokens)
+
+
+def _collect_caches() -> Dict[str, Dict[str, Any]]:
+    """
+    Hit/miss counters of the in-process caches.
+
+    Only modules that are already imported are read, so collecting never
+    pulls in (or creates) a cache that isn't in use.
+    """
+    counts: List[Tuple[str, int, int]] = []
+
+    chart_sections = sys.modules.get("app.core.chart_sections")
+    if chart_sections is not None:
+        stats = chart_sections.get_chart_state_stats()
+        counts.append(("chart_state", stats["hits"], stats["misses"]))
+
+    dasha = sys.modules.get("app.core.dasha")
+    if dasha is not None:
+        stats = dasha.get_dasha_boundary_stats()
+        counts.append(("dasha_boundaries", stats["hits"], stats["misses"]))
+
+    principal = sys.modules.get("app.core.principal")
+    if principal is not None and principal._principal_cache is not None:
+        stats = principal._principal_cache.get_stats()
+        counts.append(("principal", stats["hits"] + stats["redis_hits"], stats["misses"]))
+
+    transits = sys.modules.get("app.services.transit_snapshot_service")
+    if transits is not None and transits._snapshot_service is not None:
+        stats = transits._snapshot_service.get_stats()
+        counts.append(("transit_snapshot", stats["local_hits"] + stats["redis_hits"], stats["computed"]))
+
+    locations = sys.modules.get("app.services.location_service")
+    if locations is not None and locations._location_service is not None:
+        stats = locations._location_service.cache.get_stats()
+        counts.append(("location", stats["hits"], stats["misses"]))
+
+    families = {}
+    for name, index, documentation in (
+        ("cache_hits_total", 1, "Cache hits by cache."),
+        ("cache_misses_total", 2, "Cache misses by cache."),
+    ):
+        families[name] = {
+            "type": "counter",
+            "help": documentation,
+            "labelnames": ["cache"],
+            "samples": [[[entry[0]], float(entry[index])] for entry in counts],
+        }
+
+    rate_limit = sys.modules.get("app.core.rate_limit")
+    if rate_limit is not None:
+        stats = rate_limit.get_rate_limiter().get_stats()
+        families["rate_limit_decisions_total"] = {
+            "type": "counter",
+            "help": "Rate limit checks by decision.",
+            "labelnames": ["decision"],
+            "samples": [[["allowed"], float(stats["allowed"])], [["rejected"], float(stats["rejected"])]],
+        }
+
+    admission = sys.modules.get("app.core.admission")
+    if admission is not None:
+        stats = admission.get_admission_controller().get_stats()
+        families["admission_requests_total"] = {
+            "type": "counter",
+            "help": "Heavy requests by cost class and admission outcome.",
+            "labelnames": ["cost_class", "outcome"],
+            "samples": [
+                [[cost_class, outcome], float(stats[outcome][cost_class])]
+                for cost_class in admission.COST_CLASSES
+                for outcome in ("admitted", "rejected")
+            ],
+        }
+        families["admission_wait_seconds_total"] = {
+            "type": "counter",
+            "help": "Time admitted heavy requests spent queued, by cost class.",
+            "labelnames": ["cost_class"],
+            "samples": [[[name], float(value)] for name, value in stats["wait_seconds"].items()],
+        }
+        families["admission_queue_depth"] = {
+            "type": "gauge",
+            "help": "Heavy requests waiting for a slot, by cost class.",
+            "labelnames": ["cost_class"],
+            "samples": [[[name], float(value)] for name, value in stats["queued"].items()],
+        }
+
+    cache_codec = sys.modules.get("app.core.cache_codec")
+    if cache_codec is not None:
+        stats = cache_codec.get_codec_stats()
+        families["chart_cache_payload_bytes_total"] = {
+            "type": "counter",
+            "help": "Chart cache payload bytes encoded, before (raw) and after (stored) compression.",
+            "labelnames": ["kind"],
+            "samples": [[["raw"], float(stats["raw_bytes"])], [["stored"], float(stats["stored_bytes"])]],
+        }
+
+    degraded_mode = sys.modules.get("app.core.degraded_mode")
+    if degraded_mode is not None:
+        stats = degraded_mode.get_degraded_mode().get_stats()
+        families["chart_degraded_responses_total"] = {
+            "type": "counter",
+            "help": "Chart calculations answered without some optional sections under load.",
+            "labelnames": [],
+            "samples": [[[], float(stats["degraded_responses"])]],
+        }
+        families["chart_deferred_sections_total"] = {
+            "type": "counter",
+            "help": "Optional chart sections deferred under load, by section.",
+            "labelnames": ["section"],
+            "samples": [[[name], float(value)] for name, value in stats["deferred_sections"].items()],
+        }
+
+    single_flight = sys.modules.get("app.core.single_flight")
+    if single_flight is not None:
+        groups = single_flight.get_single_flight_stats()
+        families["single_flight_calls_total"] = {
+            "type": "counter",
+            "help": "Coalesced-call outcomes: leader (computed here), coalesced (waited on a local leader), remote (result from another worker).",
+            "labelnames": ["group", "outcome"],
+            "samples": [
+                [[name, outcome], float(stats[field])]
+                for name, stats in groups.items()
+                for outcome, field in (("leader", "leaders"), ("coalesced", "coalesced"), ("remote", "remote_hits"))
+            ],
+        }
+        families["single_flight_saved_seconds_total"] = {
+            "type": "counter",
+            "help": "Computation time saved by coalescing (leader duration times waiters).",
+            "labelnames": ["group"],
+            "samples": [[[name], float(stats["saved_seconds"])] for name, stats in groups.items()],
+        }
+
+    logging_config = sys.modules.get("app.core.logging_config")
+    if logging_config is not None:
+        stats = logging_config.get_logging_stats()
+        if stats:
+            families["log_records_total"] = {
+                "type": "counter",
+                "help": "Log records by outcome (written, dropped when the queue was full, sampled out).",
+                "labelnames": ["outcome"],
+                "samples": [
+                    [[outcome], float(stats[outcome])] for outcome in ("written", "dropped", "sampled_out", "errors")
+                ],
+            }
+            families["log_queue_depth"] = {
+                "type": "gauge",
+                "help": "Log records waiting for the background writer.",
+                "labelnames": [],
+                "samples": [[[], float(stats["queue_depth"])]],
+            }
+    return families
+
+
+_registry.add_collector(_collect_caches)
+
+
+# Exposition
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: List[str], values: List[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render(families: Dict[str, Dict[str, Any]]) -> str:
+    """Render snapshot-format families in the Prometheus text format (0.0.4)."""
+    lines: List[str] = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family["labelnames"]
+        for labels, value in sorted(family["samples"], key=lambda sample: sample[0]):
+            if family["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            counts, total, count = value
+            cumulative = 0
+            for bound, bucket_count in zip(list(family["buckets"]) + [float("inf")], counts):
+                cumulative += bucket_count
+                le = ("le", _format_value(bound))
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+# Multi-worker aggregation
+
+def _snapshot_path(directory: str, pid: int) -> str:
+    return os.path.join(directory, f"metrics-{pid}.json")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_snapshot(directory: str = "") -> None:
+    """Write this worker's samples to the multi-process directory."""
+    directory = directory or METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    path = _snapshot_path(directory, os.getpid())
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "written_at": time.time(), "metrics": _registry.snapshot()}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write metrics snapshot {path}: {e}")
+
+
+def merge_snapshots(snapshots: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Merge worker snapshots: counters and histograms are summed, gauges are
+    summed over live workers only.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        alive = snapshot.get("alive", True)
+        for name, family in snapshot["metrics"].items():
+            if family["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            samples = target["samples"]
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                if family["type"] != "histogram":
+                    samples[key] = samples.get(key, 0.0) + value
+                elif key not in samples:
+                    samples[key] = [list(value[0]), value[1], value[2]]
+                else:
+                    current = samples[key]
+                    current[0] = [a + b for a, b in zip(current[0], value[0])]
+                    current[1] += value[1]
+                    current[2] += value[2]
+    for family in merged.values():
+        family["samples"] = [[list(labels), value] for labels, value in family["samples"].items()]
+    return merged
+
+
+def collect_all() -> Dict[str, Dict[str, Any]]:
+    """Samples of this worker, or of every worker when multi-process is on."""
+    if not METRICS_MULTIPROC_DIR:
+        return _registry.snapshot()
+
+    own_pid = os.getpid()
+    snapshots = [{"pid": own_pid, "metrics": _registry.snapshot()}]
+    now = time.time()
+    try:
+        names = os.listdir(METRICS_MULTIPROC_DIR)
+    except FileNotFoundError:
+        names = []
+    for filename in names:
+        if not (filename.startswith("metrics-") and filename.endswith(".json")):
+            continue
+        path = os.path.join(METRICS_MULTIPROC_DIR, filename)
+        try:
+            pid = int(filename[len("metrics-"):-len(".json")])
+        except ValueError:
+            continue
+        if pid == own_pid:
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        alive = _pid_alive(pid)
+        if not alive and now - snapshot.get("written_at", 0) > METRICS_STALE_SECONDS:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        snapshot["alive"] = alive
+        snapshots.append(snapshot)
+    return merge_snapshots(snapshots)
+
+
+class _SnapshotFlusher:
+    """Background thread writing this worker's snapshot periodically."""
+
+    def __init__(self):
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if not METRICS_MULTIPROC_DIR or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+        self._thread.start()
+        logger.info(f"Writing metrics snapshots to {METRICS_MULTIPROC_DIR} every {METRICS_FLUSH_SECONDS}s")
+
+    def _run(self) -> None:
+        while not self._stop.wait(METRICS_FLUSH_SECONDS):
+            write_snapshot()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        # Final write so this worker's counters survive it
+        write_snapshot()
+
+
+_flusher = _SnapshotFlusher()
+
+
+def start_metrics_flusher() -> None:
+    _flusher.start()
+
+
+def stop_metrics_flusher() -> None:
+    _flusher.stop()
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """``GET /metrics``: Prometheus text exposition."""
+    if METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {METRICS_TOKEN}":
+        return Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+    return Response(render(collect_all()), media_type=CONTENT_TYPE)
+
+
+# HTTP instrumentation
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request counts, latency and in-flight
+    requests. Requests are labelled by route template (``/api/v1/charts/{chart_id}``),
+    resolved from the endpoint the router matched, so label cardinality stays
+    bounded by the number of routes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[Any, str] = {}
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            # Routes can be added after startup; rebuild the map on a miss
+            app = scope.get("app")
+            for route in getattr(app, "routes", ()):
+                route_endpoint = getattr(route, "endpoint", None)
+                if route_endpoint is not None:
+                    self._route_paths.setdefault(route_endpoint, route.path)
+            path = self._route_paths.setdefault(endpoint, "unknown")
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = self._route_label(scope)
+            method = scope["method"]
+            HTTP_DURATION.observe(time.perf_counter() - started, method, route)
+            HTTP_REQUESTS.inc(method, route, status)
+
+
+# Database instrumentation
+
+_DB_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE"}
+
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip()[:6].upper()
+    return head if head in _DB_OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    operation = _operation(statement)
+    DB_DURATION.observe(time.perf_counter() - starts.pop(), operation)
+    DB_QUERIES.inc(operation)
+
+
+def _handle_error(context):
+    if context.connection is not None:
+        starts = context.connection.info.get("metrics_query_start")
+        if starts:
+            starts.pop()
+    DB_ERRORS.inc(_operation(context.statement or ""))
+
+
+def instrument_engine(engine) -> None:
+    """Record statement counts and latency from an (async) engine's cursor events."""
+    from sqlalchemy import event
+
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# Summary for the admin monitoring endpoint
+
+def _histogram_quantile(quantile: float, buckets: List[float], counts: List[int]) -> Optional[float]:
+    total = sum(counts)
+    if not total:
+        return None
+    rank = quantile * total
+    cumulative = 0
+    lower = 0.0
+    for bound, count in zip(buckets + [float("inf")], counts):
+        if cumulative + count >= rank:
+            if bound == float("inf"):
+                return lower
+            # Linear interpolation within the bucket, as histogram_quantile() does
+            return lower + (bound - lower) * ((rank - cumulative) / count if count else 0)
+        cumulative += count
+        lower = bound
+    return lower
+
+
+def summarize(families: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Human-readable digest of the current metrics (all workers)."""
+    families = families if families is not None else collect_all()
+
+    def histogram_rows(name: str) -> List[Dict[str, Any]]:
+        family = families.get(name)
+        if not family:
+            return []
+        rows = []
+        for labels, (counts, total, count) in family["samples"]:
+            rows.append({
+                **dict(zip(family["labelnames"], labels)),
+                "count": count,
+                "mean_ms": round(total / count * 1000, 3) if count else None,
+                "p95_ms": _round_ms(_histogram_quantile(0.95, family["buckets"], counts)),
+            })
+        return sorted(rows, key=lambda row: row["count"], reverse=True)
+
+    def counter_values(name: str) -> List[Tuple[Dict[str, str], float]]:
+        family = families.get(name)
+        if not family:
+            return []
+        return [(dict(zip(family["labelnames"], labels)), value) for labels, value in family["samples"]]
+
+    errors = sum(value for labels, value in counter_values("http_requests_total") if labels["status"].startswith("5"))
+    requests = sum(value for _, value in counter_values("http_requests_total"))
+    hits = {labels["cache"]: value for labels, value in counter_values("cache_hits_total")}
+    misses = {labels["cache"]: value for labels, value in counter_values("cache_misses_total")}
+    return {
+        "http": {
+            "requests": int(requests),
+            "server_errors": int(errors),
+            "in_flight": int(sum(value for _, value in counter_values("http_requests_in_flight"))),
+            "routes": histogram_rows("http_request_duration_seconds")[:20],
+        },
+        "db": histogram_rows("db_query_duration_seconds"),
+        "llm": histogram_rows("llm_request_duration_seconds"),
+        "chart_stages": histogram_rows("chart_stage_duration_seconds"),
+        "caches": {
+            cache: {
+                "hits": int(hits.get(cache, 0)),
+                "misses": int(misses.get(cache, 0)),
+                "hit_rate": round(hits.get(cache, 0) / (hits.get(cache, 0) + misses.get(cache, 0)), 3)
+                if hits.get(cache, 0) + misses.get(cache, 0) else None,
+            }
+            for cache in sorted(set(hits) | set(misses))
+        },
+    }
+
+
+def _round_ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 3) if seconds is not None else None
@@ -0,0 +1,214 @@
+"""
+Compact, immutable natal chart state shared by the chart calculators.
+
+``NatalState`` holds planet and house data as parallel arrays indexed by
+planet position (see ``names``), so yogas, aspects, Shadbala, relationships,
+Ashtakavarga and intensity analysis all read the same typed values instead
+of each rebuilding their own dicts from ``planet.dict()`` output. JSON
+dicts are produced once, at the edge, by ``planet_dicts()``/``house_dicts()``.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+SIGN_NAMES = (
+    'Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
+    'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces'
+)
+
+NAKSHATRA_NAMES = (
+    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra',
+    'Punarvasu', 'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni',
+    'Hasta', 'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha',
+    'Mula', 'Purva Ashadha', 'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha',
+    'Purva Bhadrapada', 'Uttara Bhadrapada', 'Revati'
+)
+
+# Lord of each sign (0 = Aries)
+SIGN_LORDS = (
+    'Mars', 'Venus', 'Mercury', 'Moon', 'Sun', 'Mercury',
+    'Venus', 'Mars', 'Jupiter', 'Saturn', 'Saturn', 'Jupiter'
+)
+
+NAKSHATRA_SPAN = 360.0 / 27
+
+_SIGN_INDEX = {name: i for i, name in enumerate(SIGN_NAMES)}
+_NAKSHATRA_INDEX = {name: i + 1 for i, name in enumerate(NAKSHATRA_NAMES)}
+
+
+def _sign_number(value: Any, longitude: float) -> int:
+    if isinstance(value, str) and value in _SIGN_INDEX:
+        return _SIGN_INDEX[value]
+    return int(longitude // 30) % 12
+
+
+class NatalState:
+    """
+    Immutable, array-backed planet and house positions for one chart.
+
+    Planet arrays are indexed like ``names``; signs are 0-11, houses 1-12
+    and nakshatras 1-27. House arrays are indexed by house number - 1.
+    """
+
+    __slots__ = (
+        'names', '_index', 'sidereal_longitudes', 'tropical_longitudes', 'degrees',
+        'speeds', 'signs', 'houses', 'nakshatras', 'padas', 'retrograde',
+        'house_cusps', 'house_signs', 'ascendant', 'ascendant_sign', 'house_lords',
+    )
+
+    def __init__(self, names: Iterable[str], sidereal_longitudes: Iterable[float],
+                 tropical_longitudes: Iterable[float], degrees: Iterable[float],
+                 speeds: Iterable[float], signs: Iterable[int], houses: Iterable[int],
+                 nakshatras: Iterable[int], padas: Iterable[int], retrograde: Iterable[bool],
+                 house_cusps: Iterable[float] = (), ascendant: Optional[float] = None):
+        names = tuple(names)
+        house_cusps = array('d', house_cusps)
+        if ascendant is None:
+            ascendant = house_cusps[0] if house_cusps else 0.0
+        ascendant_sign = int(ascendant / 30) % 12
+        house_signs = array('b', (int(cusp / 30) % 12 for cusp in house_cusps))
+        # Whole-sign lords from the ascendant when no cusps are available
+        lord_signs = house_signs if house_signs else ((ascendant_sign + i) % 12 for i in range(12))
+
+        set_ = object.__setattr__
+        set_(self, 'names', names)
+        set_(self, '_index', {name: i for i, name in enumerate(names)})
+        set_(self, 'sidereal_longitudes', array('d', sidereal_longitudes))
+        set_(self, 'tropical_longitudes', array('d', tropical_longitudes))
+        set_(self, 'degrees', array('d', degrees))
+        set_(self, 'speeds', array('d', speeds))
+        set_(self, 'signs', array('b', signs))
+        set_(self, 'houses', array('b', houses))
+        set_(self, 'nakshatras', array('b', nakshatras))
+        set_(self, 'padas', array('b', padas))
+        set_(self, 'retrograde', tuple(bool(r) for r in retrograde))
+        set_(self, 'house_cusps', house_cusps)
+        set_(self, 'house_signs', house_signs)
+        set_(self, 'ascendant', ascendant)
+        set_(self, 'ascendant_sign', ascendant_sign)
+        set_(self, 'house_lords', tuple(SIGN_LORDS[sign] for sign in lord_signs))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("NatalState is immutable")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
+
+    def index(self, name: str) -> int:
+        """Array index of a planet (raises KeyError if absent)."""
+        return self._index[name]
+
+    def longitude(self, name: str) -> float:
+        return self.sidereal_longitudes[self._index[name]]
+
+    def sign(self, name: str) -> int:
+        return self.signs[self._index[name]]
+
+    def house(self, name: str) -> int:
+        return self.houses[self._index[name]]
+
+    def planets_in_house(self, house: int) -> List[str]:
+        return [name for name, h in zip(self.names, self.houses) if h == house]
+
+    def lordships(self, name: str) -> Tuple[int, ...]:
+        """House numbers ruled by a planet."""
+        return tuple(i + 1 for i, lord in enumerate(self.house_lords) if lord == name)
+
+    # Construction
+
+    @classmethod
+    def from_positions(cls, planet_positions: Dict[str, Dict[str, Any]],
+                       ascendant_data: Dict[str, Any], house_data: Dict[str, Any]) -> "NatalState":
+        """
+        Build from ephemeris output (``calculate_all_planets``/``calculate_ascendant``
+        and ``HouseSystemCalculator.calculate_houses``).
+        """
+        positions = list(planet_positions.values())
+        ascendant_sign = ascendant_data['sign_number']
+        return cls(
+            names=planet_positions.keys(),
+            sidereal_longitudes=(p['sidereal_longitude'] for p in positions),
+            tropical_longitudes=(p['tropical_longitude'] for p in positions),
+            degrees=(p['degree_in_sign'] for p in positions),
+            speeds=(p['speed'] for p in positions),
+            signs=(p['sign_number'] % 12 for p in positions),
+            houses=((p['sign_number'] - ascendant_sign) % 12 + 1 for p in positions),
+            nakshatras=(p['nakshatra_number'] for p in positions),
+            padas=(p['pada'] for p in positions),
+            retrograde=(p['retrograde'] for p in positions),
+            house_cusps=house_data.get('house_cusps_sidereal', []),
+            ascendant=house_data.get('ascendant_sidereal', 0.0),
+        )
+
+    @classmethod
+    def from_dicts(cls, planets: List[Dict[str, Any]],
+                   houses: Optional[List[Dict[str, Any]]] = None) -> "NatalState":
+        """Build from planet/house dicts as found in chart JSON."""
+        longitudes = [p.get('sidereal_longitude', p.get('longitude', 0)) or 0.0 for p in planets]
+        cusps = [h.get('cusp_longitude', 0.0) for h in sorted(houses or [], key=lambda h: h['number'])]
+        nakshatras = []
+        for planet, longitude in zip(planets, longitudes):
+            number = planet.get('nakshatra_number') or _NAKSHATRA_INDEX.get(planet.get('nakshatra'))
+            nakshatras.append(number or int(longitude / NAKSHATRA_SPAN) % 27 + 1)
+        return cls(
+            names=(p['name'] for p in planets),
+            sidereal_longitudes=longitudes,
+            tropical_longitudes=(p.get('tropical_longitude', 0.0) for p in planets),
+            degrees=(p.get('degree_in_sign', lon % 30) for p, lon in zip(planets, longitudes)),
+            speeds=(p.get('speed', 0) or 0.0 for p in planets),
+            signs=(_sign_number(p.get('sign'), lon) for p, lon in zip(planets, longitudes)),
+            houses=(p.get('house', 1) for p in planets),
+            nakshatras=nakshatras,
+            padas=(p.get('pada', 1) for p in planets),
+            retrograde=(p.get('retrograde', False) for p in planets),
+            house_cusps=cusps,
+        )
+
+    # JSON edge
+
+    def planet_dicts(self) -> List[Dict[str, Any]]:
+        """Planet dicts in the ``PlanetPosition`` response shape."""
+        return [
+            {
+                'name': name,
+                'tropical_longitude': self.tropical_longitudes[i],
+                'sidereal_longitude': self.sidereal_longitudes[i],
+                'sign': SIGN_NAMES[self.signs[i]],
+                'degree_in_sign': self.degrees[i],
+                'nakshatra': NAKSHATRA_NAMES[self.nakshatras[i] - 1],
+                'pada': self.padas[i],
+                'house': self.houses[i],
+                'retrograde': self.retrograde[i],
+                'speed': self.speeds[i],
+            }
+            for i, name in enumerate(self.names)
+        ]
+
+    def house_dicts(self) -> List[Dict[str, Any]]:
+        """House dicts in the ``HousePosition`` response shape."""
+        return [
+            {
+                'number': i + 1,
+                'cusp_longitude': cusp,
+                'sign': SIGN_NAMES[self.house_signs[i]],
+                'degree_in_sign': cusp % 30,
+            }
+            for i, cusp in enumerate(self.house_cusps)
+        ]
+
+
+PlanetInput = Union[NatalState, List[Dict[str, Any]]]
+
+
+def ensure_natal_state(planets: PlanetInput,
+                       houses: Optional[List[Dict[str, Any]]] = None) -> NatalState:
+    """Return ``planets`` if it is already a NatalState, else convert dicts once."""
+    if isinstance(planets, NatalState):
+        return planets
+    return NatalState.from_dicts(planets, houses)
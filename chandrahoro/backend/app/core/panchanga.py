@@ -0,0 +1,87 @@
+"""Panchanga (tithi, vara, nakshatra, yoga, karana) from Sun/Moon longitudes."""
+
+from datetime import datetime
+from typing import Dict, Any
+
+from app.core.ephemeris import get_nakshatra_name
+
+NAKSHATRA_SPAN = 360.0 / 27
+
+TITHI_NAMES = [
+    'Pratipada', 'Dwitiya', 'Tritiya', 'Chaturthi', 'Panchami', 'Shashthi',
+    'Saptami', 'Ashtami', 'Navami', 'Dashami', 'Ekadashi', 'Dwadashi',
+    'Trayodashi', 'Chaturdashi',
+]
+
+YOGA_NAMES = [
+    'Vishkambha', 'Priti', 'Ayushman', 'Saubhagya', 'Shobhana', 'Atiganda',
+    'Sukarma', 'Dhriti', 'Shula', 'Ganda', 'Vriddhi', 'Dhruva', 'Vyaghata',
+    'Harshana', 'Vajra', 'Siddhi', 'Vyatipata', 'Variyana', 'Parigha', 'Shiva',
+    'Siddha', 'Sadhya', 'Shubha', 'Shukla', 'Brahma', 'Indra', 'Vaidhriti',
+]
+
+MOVABLE_KARANAS = ['Bava', 'Balava', 'Kaulava', 'Taitila', 'Gara', 'Vanija', 'Vishti']
+
+VARA_NAMES = ['Somavara', 'Mangalavara', 'Budhavara', 'Guruvara', 'Shukravara', 'Shanivara', 'Ravivara']
+
+
+def _tithi_name(tithi: int) -> str:
+    if tithi == 15:
+        return 'Purnima'
+    if tithi == 30:
+        return 'Amavasya'
+    return TITHI_NAMES[(tithi - 1) % 15]
+
+
+def _karana_name(karana: int) -> str:
+    """Karana name for half-tithi number 1-60."""
+    if karana == 1:
+        return 'Kimstughna'
+    if karana >= 58:
+        return ['Shakuni', 'Chatushpada', 'Naga'][karana - 58]
+    return MOVABLE_KARANAS[(karana - 2) % 7]
+
+
+def calculate_panchanga(sun_longitude: float, moon_longitude: float, dt: datetime) -> Dict[str, Any]:
+    """
+    Calculate the five limbs of the panchanga at an instant.
+
+    The vara is the weekday of ``dt`` itself; sunrise-based day boundaries
+    need the observer's location and are left to location-aware callers.
+
+    Args:
+        sun_longitude: Sun's sidereal longitude in degrees
+        moon_longitude: Moon's sidereal longitude in degrees
+        dt: Instant the longitudes were calculated for
+
+    Returns:
+        Dictionary with tithi, paksha, vara, nakshatra, yoga and karana
+    """
+    elongation = (moon_longitude - sun_longitude) % 360
+    tithi = int(elongation / 12) + 1
+    karana = int(elongation / 6) + 1
+    nakshatra = int(moon_longitude / NAKSHATRA_SPAN) + 1
+    yoga = int(((sun_longitude + moon_longitude) % 360) / NAKSHATRA_SPAN) + 1
+
+    return {
+        'tithi': {
+            'number': tithi,
+            'name': _tithi_name(tithi),
+            'percent_elapsed': round((elongation % 12) / 12 * 100, 2),
+        },
+        'paksha': 'Shukla' if tithi <= 15 else 'Krishna',
+        'vara': VARA_NAMES[dt.weekday()],
+        'nakshatra': {
+            'number': nakshatra,
+            'name': get_nakshatra_name(nakshatra),
+            'pada': int((moon_longitude % NAKSHATRA_SPAN) / (NAKSHATRA_SPAN / 4)) + 1,
+        },
+        'yoga': {
+            'number': yoga,
+            'name': YOGA_NAMES[yoga - 1],
+        },
+        'karana': {
+            'number': karana,
+            'name': _karana_name(karana),
+        },
+    }
@@ -10,6 +10,9 @@ Implements three types of planetary relationships in Vedic astrology:
 from typing import Dict, List, Any, Tuple
 from enum import Enum
 
+from .natal_state import PlanetInput, ensure_natal_state
+from .profiling import profile_span
+
 
 class RelationshipType(Enum):
     GREAT_FRIEND = "Great Friend"
@@ -78,23 +81,26 @@ class PlanetaryRelationshipAnalyzer:
             12: 'Jupiter'   # Pisces
         }
 
-    def analyze_relationships(self, planets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @profile_span("relationships")
+    def analyze_relationships(self, planets: PlanetInput) -> Dict[str, Any]:
         """
         Analyze all planetary relationships in the chart
         
         Args:
-            planets: List of planet data with positions
+            planets: NatalState, or list of planet dicts with positions
             
         Returns:
             Dictionary with relationship analysis
         """
+        natal = ensure_natal_state(planets)
         results = {}
         
         # Create planet position mapping
-        planet_positions = {}
-        for planet in planets:
-            if planet['name'] not in ['Rahu', 'Ketu']:  # Skip shadow planets
-                planet_positions[planet['name']] = planet.get('sidereal_longitude', planet.get('longitude', 0))
+        planet_positions = {
+            name: longitude
+            for name, longitude in zip(natal.names, natal.sidereal_longitudes)
+            if name not in ['Rahu', 'Ketu']  # Skip shadow planets
+        }
         
         # Analyze relationships for each planet
         for planet1 in planet_positions:
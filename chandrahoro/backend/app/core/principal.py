@@ -0,0 +1,325 @@
+"""Authenticated principal cache.
+
+Access tokens carry the user's ``token_version`` ("tv" claim). Resolving a
+token to a ``Principal`` (id, email, username, role, active flag) is cached
+per (user id, token version), in-process with a short TTL and optionally in
+Redis, so most authenticated requests skip the users-table round-trip.
+
+Bumping ``User.token_version`` revokes every token issued before it. That
+happens automatically when a user's role, active flag or password changes
+(and explicitly on logout), and the user's cached principals are dropped
+once the change is committed. Other workers' in-process entries live at
+most ``PRINCIPAL_CACHE_TTL_SECONDS``.
+
+Invalidation also records the lowest still-valid token version per user
+(in-process and in Redis). A principal read from the database before the
+revoking commit is never cached under a revoked version afterwards: puts
+below the marker are skipped, and Redis entries are checked against it
+when read.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from app.core.redis_client import get_redis, mark_redis_failed
+from app.models import RoleEnum, User
+
+logger = logging.getLogger(__name__)
+
+# Changing any of these revokes the user's tokens
+REVOKING_ATTRIBUTES = ("role", "is_active", "password_hash")
+
+_REVOKED_KEY = "revoked_principals"
+
+
+class Principal:
+    """The authenticated user's identity and role, without an ORM ``User``."""
+
+    __slots__ = ("id", "email", "username", "role", "is_active", "token_version")
+
+    def __init__(self, id: str, email: str, username: str, role: RoleEnum,
+                 is_active: bool, token_version: int):
+        self.id = id
+        self.email = email
+        self.username = username
+        self.role = role
+        self.is_active = is_active
+        self.token_version = token_version
+
+    @classmethod
+    def from_row(cls, row: Any) -> "Principal":
+        return cls(row.id, row.email, row.username, RoleEnum(row.role), bool(row.is_active), row.token_version or 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "email": self.email,
+            "username": self.username,
+            "role": self.role.value,
+            "is_active": self.is_active,
+            "token_version": self.token_version,
+        }
+
+    def __repr__(self):
+        return f"<Principal(id={self.id}, role={self.role.value})>"
+
+
+# Columns needed to build a Principal (no full User load)
+PRINCIPAL_COLUMNS = (User.id, User.email, User.username, User.role, User.is_active, User.token_version)
+
+
+class PrincipalCache:
+    """Per-process TTL/LRU cache of principals, backed by Redis when available."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_size: Optional[int] = None,
+                 redis_ttl_seconds: Optional[int] = None):
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "15"))
+        if max_size is None:
+            max_size = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+        if redis_ttl_seconds is None:
+            redis_ttl_seconds = int(os.getenv("PRINCIPAL_CACHE_REDIS_TTL_SECONDS", "300"))
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max(1, max_size)
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Principal]]" = OrderedDict()
+        # user id -> lowest token version not revoked
+        self._valid_from: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _redis_key(user_id: str) -> str:
+        return f"principal:{user_id}"
+
+    @staticmethod
+    def _redis_marker_key(user_id: str) -> str:
+        return f"principal_valid_from:{user_id}"
+
+    def _revoked_local(self, user_id: str, token_version: int) -> bool:
+        with self._lock:
+            return token_version < self._valid_from.get(user_id, 0)
+
+    def _mark_local(self, user_id: str, valid_from: int) -> None:
+        with self._lock:
+            self._valid_from[user_id] = max(valid_from, self._valid_from.get(user_id, 0))
+            self._valid_from.move_to_end(user_id)
+            while len(self._valid_from) > self.max_size:
+                self._valid_from.popitem(last=False)
+
+    def _get_local(self, key: Tuple[str, int]) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def _put_local(self, principal: Principal) -> None:
+        with self._lock:
+            if principal.token_version < self._valid_from.get(principal.id, 0):
+                return
+            self._entries[(principal.id, principal.token_version)] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end((principal.id, principal.token_version))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(self, user_id: str, token_version: int) -> Optional[Principal]:
+        """Cached principal for (user id, token version), or None."""
+        principal = self._get_local((user_id, token_version))
+        if principal is not None:
+            self.hits += 1
+            return principal
+
+        client = get_redis()
+        if client is not None:
+            try:
+                data = await client.get(self._redis_key(user_id))
+            except Exception as e:
+                mark_redis_failed(e)
+                data = None
+            if data:
+                cached = json.loads(data)
+                current = cached["token_version"] == token_version
+                if current and not await self._revoked_remote(client, user_id, token_version):
+                    principal = Principal(
+                        cached["id"], cached["email"], cached["username"], RoleEnum(cached["role"]),
+                        cached["is_active"], cached["token_version"],
+                    )
+                    self._put_local(principal)
+                    self.redis_hits += 1
+                    return principal
+
+        self.misses += 1
+        return None
+
+    async def _revoked_remote(self, client: Any, user_id: str, token_version: int) -> bool:
+        """Whether Redis marks the version revoked (remembered locally if so)."""
+        try:
+            marker = await client.get(self._redis_marker_key(user_id))
+        except Exception as e:
+            mark_redis_failed(e)
+            return True
+        if marker is not None and token_version < int(marker):
+            self._mark_local(user_id, int(marker))
+            return True
+        return False
+
+    async def put(self, principal: Principal) -> None:
+        """Cache a principal read from the database, unless its version was revoked since."""
+        if self._revoked_local(principal.id, principal.token_version):
+            return
+        self._put_local(principal)
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.set(self._redis_key(principal.id), json.dumps(principal.to_dict()),
+                                 ex=self.redis_ttl_seconds)
+            except Exception as e:
+                mark_redis_failed(e)
+
+    def invalidate_local(self, user_id: str, valid_from: int) -> None:
+        self._mark_local(user_id, valid_from)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+        self.invalidations += 1
+
+    async def invalidate(self, user_id: str, valid_from: int) -> None:
+        """
+        Drop every cached principal of a user (here and in Redis).
+
+        Args:
+            user_id: User whose tokens were revoked
+            valid_from: Lowest token version still valid; lower versions
+                are never cached again
+        """
+        self.invalidate_local(user_id, valid_from)
+        await self.invalidate_remote(user_id, valid_from)
+
+    async def invalidate_remote(self, user_id: str, valid_from: int) -> None:
+        client = get_redis()
+        if client is not None:
+            try:
+                # Outlives any entry put from a read that raced the revocation
+                await client.set(self._redis_marker_key(user_id), valid_from, ex=2 * self.redis_ttl_seconds)
+                await client.delete(self._redis_key(user_id))
+            except Exception as e:
+                mark_redis_failed(e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._valid_from.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 3) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
+
+
+async def load_principal(db: AsyncSession, user_id: str, token_version: int) -> Optional[Principal]:
+    """
+    Resolve a token's (user id, token version) to an active principal.
+
+    Args:
+        db: Database session (only used on a cache miss)
+        user_id: Token subject
+        token_version: Token "tv" claim
+
+    Returns:
+        The principal, or None if the user is missing, inactive or the
+        token has been revoked
+    """
+    cache = get_principal_cache()
+    principal = await cache.get(user_id, token_version)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(*PRINCIPAL_COLUMNS).where(User.id == user_id))
+    row = result.first()
+    if row is None:
+        return None
+    principal = Principal.from_row(row)
+    if not principal.is_active or principal.token_version != token_version:
+        return None
+    await cache.put(principal)
+    return principal
+
+
+def _mark_revoked(target: User, valid_from: int) -> None:
+    session = object_session(target)
+    if session is not None:
+        revoked = session.info.setdefault(_REVOKED_KEY, {})
+        revoked[target.id] = max(valid_from, revoked.get(target.id, 0))
+
+
+@event.listens_for(User, "before_update")
+def _revoke_on_change(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in REVOKING_ATTRIBUTES + ("token_version",)):
+        return
+    if not state.attrs.token_version.history.has_changes():
+        target.token_version = (target.token_version or 0) + 1
+    _mark_revoked(target, target.token_version)
+
+
+@event.listens_for(User, "after_delete")
+def _revoke_on_delete(mapper, connection, target: User) -> None:
+    _mark_revoked(target, (target.token_version or 0) + 1)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_revoked(session: Session) -> None:
+    revoked = session.info.pop(_REVOKED_KEY, None)
+    if not revoked:
+        return
+    cache = get_principal_cache()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for user_id, valid_from in revoked.items():
+        cache.invalidate_local(user_id, valid_from)
+        if loop is not None:
+            loop.create_task(cache.invalidate_remote(user_id, valid_from))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_revoked(session: Session) -> None:
+    session.info.pop(_REVOKED_KEY, None)
@@ -0,0 +1,486 @@
+"""Opt-in sampling profiler for individual requests.
+
+A request is profiled when an admin sends ``X-Profile: 1`` or, for paths
+listed in ``PROFILER_PATHS``, with probability ``PROFILER_SAMPLE_RATE``.
+While it runs, a background thread samples the stacks of the threads doing
+its work (the event loop thread plus any worker thread inside a
+``profile_span``) every ``PROFILER_INTERVAL_MS``. Finished profiles are kept
+in a ring buffer of the last ``PROFILER_BUFFER_SIZE`` and exported as
+collapsed stacks (flamegraph.pl / speedscope input) or speedscope JSON from
+the admin endpoints under ``/api/v1/deployment/profiles``; the profiled
+response carries ``X-Profile-Id``.
+
+The event loop thread is shared, so its samples can include other requests
+that ran concurrently. Samples from worker threads only cover spans.
+
+``profile_span`` marks named hot-path spans in the calculators: span timings
+are recorded on the active profile and sampled stacks show the span name in
+place of the wrapper frame. Without an active profile it costs one
+context-variable lookup.
+"""
+
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import random
+import sys
+import sysconfig
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "true").lower() == "true"
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "0"))
+PROFILER_PATHS = tuple(
+    path.strip() for path in os.getenv(
+        "PROFILER_PATHS", "/api/v1/chart/calculate,/api/v1/ai/generate-html-report"
+    ).split(",") if path.strip()
+)
+PROFILER_INTERVAL_MS = float(os.getenv("PROFILER_INTERVAL_MS", "5"))
+PROFILER_BUFFER_SIZE = int(os.getenv("PROFILER_BUFFER_SIZE", "20"))
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", "30"))
+PROFILER_MAX_DEPTH = 128
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) + os.sep
+_STDLIB_ROOT = sysconfig.get_paths()["stdlib"] + os.sep
+
+_active_profile: contextvars.ContextVar[Optional["Profile"]] = contextvars.ContextVar("active_profile", default=None)
+
+
+class Profile:
+    """Stack samples and span timings captured for one request."""
+
+    def __init__(self, method: str, path: str, trigger: str, interval_ms: float = PROFILER_INTERVAL_MS):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.interval_ms = interval_ms
+        self.started_at = time.time()
+        self.status: Optional[int] = None
+        self.duration_ms: Optional[float] = None
+        self.truncated = False
+        self.samples: Dict[Tuple[str, ...], int] = {}
+        self.spans: List[Dict[str, Any]] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        # Thread id -> number of registrations (event loop + active spans)
+        self._threads: Dict[int, int] = {}
+        # Thread id -> names of the decorated span frames on its stack, outermost first
+        self._frame_spans: Dict[int, List[str]] = {}
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def register_thread(self, thread_id: int) -> None:
+        with self._lock:
+            self._threads[thread_id] = self._threads.get(thread_id, 0) + 1
+
+    def unregister_thread(self, thread_id: int) -> None:
+        with self._lock:
+            remaining = self._threads.get(thread_id, 0) - 1
+            if remaining > 0:
+                self._threads[thread_id] = remaining
+            else:
+                self._threads.pop(thread_id, None)
+
+    def threads(self) -> List[Tuple[int, List[str]]]:
+        with self._lock:
+            return [(thread_id, list(self._frame_spans.get(thread_id, ()))) for thread_id in self._threads]
+
+    def add_sample(self, stack: Tuple[str, ...]) -> None:
+        with self._lock:
+            self.samples[stack] = self.samples.get(stack, 0) + 1
+
+    def add_span(self, name: str, started: float, duration: float, thread_id: int) -> None:
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "start_ms": round((started - self._start) * 1000, 3),
+                "duration_ms": round(duration * 1000, 3),
+                "thread": thread_id,
+            })
+
+    def finish(self, status: Optional[int]) -> None:
+        self.status = status
+        self.duration_ms = round(self.elapsed() * 1000, 3)
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "status": self.status,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "interval_ms": self.interval_ms,
+            "samples": self.sample_count,
+            "truncated": self.truncated,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.summary(), "spans": list(self.spans)}
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text: one ``frame;frame;frame count`` line per stack."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(self.samples.items()))
+
+    def speedscope(self) -> Dict[str, Any]:
+        """Speedscope file-format JSON with one sampled profile (weights in ms)."""
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[str, int] = {}
+        samples: List[List[int]] = []
+        weights: List[float] = []
+        for stack, count in self.samples.items():
+            indexes = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append(_speedscope_frame(label))
+                indexes.append(frame_index[label])
+            samples.append(indexes)
+            weights.append(count * self.interval_ms)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.method} {self.path} ({self.id})",
+            "exporter": "chandrahoro-profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": f"{self.method} {self.path}",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+def _speedscope_frame(label: str) -> Dict[str, Any]:
+    name, _, location = label.partition(" (")
+    if not location:
+        return {"name": name}
+    file, _, line = location.rstrip(")").rpartition(":")
+    return {"name": name, "file": file, "line": int(line) if line.isdigit() else None}
+
+
+# Stack sampling
+
+_code_labels: Dict[Any, str] = {}
+
+
+def _short_path(filename: str) -> str:
+    if filename.startswith(_BACKEND_ROOT):
+        return filename[len(_BACKEND_ROOT):]
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    if filename.startswith(_STDLIB_ROOT):
+        return filename[len(_STDLIB_ROOT):]
+    return filename
+
+
+def _frame_label(code) -> str:
+    label = _code_labels.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name).replace(";", ":")
+        label = _code_labels[code] = f"{name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def _sample_stack(frame, frame_spans: List[str]) -> Tuple[str, ...]:
+    codes = []
+    while frame is not None and len(codes) < PROFILER_MAX_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    stack = []
+    span_index = 0
+    for code in codes:
+        if code in _SPAN_DECORATOR_CODES:
+            continue
+        if code is _SPAN_WRAPPER_CODE:
+            # The n-th span wrapper frame (root first) is the n-th open span
+            if span_index < len(frame_spans):
+                stack.append(f"[span] {frame_spans[span_index]}")
+            span_index += 1
+            continue
+        stack.append(_frame_label(code))
+    return tuple(stack)
+
+
+class _Sampler:
+    """Single background thread sampling every active profile."""
+
+    def __init__(self):
+        self._profiles: Dict[str, Profile] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self.ticks = 0
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def remove(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.pop(profile.id, None)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                while not self._profiles:
+                    # Exit when idle for a while; add() restarts the thread
+                    if not self._wakeup.wait(timeout=60) and not self._profiles:
+                        self._thread = None
+                        return
+                profiles = list(self._profiles.values())
+                interval = min(profile.interval_ms for profile in profiles) / 1000
+
+            frames = sys._current_frames()
+            for profile in profiles:
+                if profile.elapsed() > PROFILER_MAX_SECONDS:
+                    profile.truncated = True
+                    self.remove(profile)
+                    continue
+                for thread_id, frame_spans in profile.threads():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own_id:
+                        profile.add_sample(_sample_stack(frame, frame_spans))
+            del frames
+            self.ticks += 1
+            time.sleep(interval)
+
+
+class ProfileStore:
+    """Ring buffer of the most recent finished profiles."""
+
+    def __init__(self, max_profiles: int = PROFILER_BUFFER_SIZE):
+        self._profiles: Deque[Profile] = deque(maxlen=max(1, max_profiles))
+        self._lock = threading.Lock()
+        self.captured = 0
+
+    def add(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+            self.captured += 1
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile.id == profile_id:
+                    return profile
+        return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [profile.summary() for profile in reversed(self._profiles)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": PROFILER_ENABLED,
+            "sample_rate": PROFILER_SAMPLE_RATE,
+            "paths": list(PROFILER_PATHS),
+            "interval_ms": PROFILER_INTERVAL_MS,
+            "buffered": len(self._profiles),
+            "max_profiles": self._profiles.maxlen,
+            "captured": self.captured,
+            "sampler_ticks": _sampler.ticks,
+        }
+
+
+_sampler = _Sampler()
+_profile_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    global _profile_store
+    if _profile_store is None:
+        _profile_store = ProfileStore()
+    return _profile_store
+
+
+def get_active_profile() -> Optional[Profile]:
+    return _active_profile.get()
+
+
+def start_profile(method: str, path: str, trigger: str) -> Tuple[Profile, contextvars.Token]:
+    """Start profiling the current task (and the threads it runs spans on)."""
+    profile = Profile(method, path, trigger)
+    token = _active_profile.set(profile)
+    profile.register_thread(threading.get_ident())
+    _sampler.add(profile)
+    return profile, token
+
+
+def stop_profile(profile: Profile, token: contextvars.Token, status: Optional[int] = None) -> None:
+    """Stop sampling, store the profile and deactivate it."""
+    _sampler.remove(profile)
+    profile.unregister_thread(threading.get_ident())
+    profile.finish(status)
+    get_profile_store().add(profile)
+    _active_profile.reset(token)
+
+
+# Spans
+
+# Code of the decorator's own wrapper, left out of sampled stacks
+_SPAN_DECORATOR_CODES: set = set()
+
+
+def profile_span(name: str) -> Callable:
+    """
+    Mark a function as a named hot-path span.
+
+    Args:
+        name: Span name shown in span timings and sampled stacks
+
+    Returns:
+        Decorator for sync or async functions
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profile = _active_profile.get()
+                if profile is None:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    profile.add_span(name, started, time.perf_counter() - started, threading.get_ident())
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _active_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            return _run_span(profile, name, func, args, kwargs)
+        _SPAN_DECORATOR_CODES.add(wrapper.__code__)
+        return wrapper
+    return decorator
+
+
+def _run_span(profile: Profile, name: str, func: Callable, args, kwargs):
+    thread_id = threading.get_ident()
+    frame_spans = profile._frame_spans.setdefault(thread_id, [])
+    frame_spans.append(name)
+    profile.register_thread(thread_id)
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profile.add_span(name, started, time.perf_counter() - started, thread_id)
+        profile.unregister_thread(thread_id)
+        frame_spans.pop()
+
+
+# Frames of _run_span stand for the span in sampled stacks
+_SPAN_WRAPPER_CODE = _run_span.__code__
+
+
+# Request hook
+
+async def _is_admin_request(scope) -> bool:
+    """Whether the request carries a valid admin access token."""
+    from app.core.database import AsyncSessionLocal
+    from app.core.principal import load_principal
+    from app.models import RoleEnum
+    from app.services.auth_service import AuthService
+
+    authorization = ""
+    for key, value in scope.get("headers", ()):
+        if key == b"authorization":
+            authorization = value.decode("latin-1")
+            break
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    decoded = AuthService.decode_access_token(token)
+    if decoded is None:
+        return False
+    try:
+        async with AsyncSessionLocal() as db:
+            principal = await load_principal(db, decoded[0], decoded[1])
+    except Exception as e:
+        logger.warning(f"Profiler admin check failed: {e}")
+        return False
+    return principal is not None and principal.role == RoleEnum.ADMIN
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware starting a profile for selected requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _trigger(self, scope) -> Optional[str]:
+        for key, value in scope.get("headers", ()):
+            if key == PROFILE_HEADER:
+                if value.lower() in (b"1", b"true") and await _is_admin_request(scope):
+                    return "header"
+                break
+        if PROFILER_SAMPLE_RATE > 0 and scope["path"].startswith(PROFILER_PATHS) \
+                and random.random() < PROFILER_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = await self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile, token = start_profile(scope["method"], scope["path"], trigger)
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (PROFILE_ID_HEADER.lower().encode(), profile.id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_profile(profile, token, status)
+            logger.info(
+                f"Profiled {scope['method']} {scope['path']}: {profile.sample_count} samples",
+                extra={"profile_id": profile.id, "duration_ms": profile.duration_ms},
+            )
@@ -1,94 +1,410 @@
-"""Rate limiting utilities."""
+"""Rate limiting utilities.
+
+Limits use a sliding-window counter: each key keeps only the request counts
+of the current and previous fixed windows, and the previous count is
+weighted by how much of it still overlaps the sliding window. That is O(1)
+memory and time per key, instead of a list of timestamps per key.
+
+Counters live in Redis when it is configured, updated by one atomic Lua
+script per check, so a limit holds across all worker processes. Without
+Redis (or after a Redis error) an in-process backend is used.
+
+Limits are applied with the ``rate_limit()`` dependency, the optional
+``RateLimitMiddleware`` for all API traffic, or ``check_rate_limit()``
+directly. Responses carry ``RateLimit-Limit``/``-Remaining``/``-Reset``
+and ``RateLimit-Policy`` headers, plus ``Retry-After`` when rejected.
+"""
 
-import time
-from typing import Dict, Tuple
-from collections import defaultdict
 import logging
+import math
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Depends, Request, Response
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.exceptions import RateLimitError
+from app.core.redis_client import get_redis, mark_redis_failed
 
 logger = logging.getLogger(__name__)
 
+try:
+    from redis.exceptions import NoScriptError
+except ImportError:
+    class NoScriptError(Exception):
+        """Placeholder when redis isn't installed (the Redis backend is then unused)."""
+
+
+def _limit_from_env(name: str, max_requests: int, window_seconds: int) -> Dict[str, int]:
+    """Limit config, overridable as ``RATE_LIMIT_<NAME>=<max_requests>/<window_seconds>``."""
+    value = os.getenv(f"RATE_LIMIT_{name.upper()}")
+    if value:
+        try:
+            count, _, window = value.partition("/")
+            return {"max_requests": int(count), "window_seconds": int(window or window_seconds)}
+        except ValueError:
+            logger.warning(f"Ignoring invalid RATE_LIMIT_{name.upper()}={value!r}")
+    return {"max_requests": max_requests, "window_seconds": window_seconds}
+
+
+# Common rate limit configurations
+RATE_LIMITS = {
+    "chart_calculation": _limit_from_env("chart_calculation", 10, 3600),  # 10 per hour
+    "ai_interpretation": _limit_from_env("ai_interpretation", 5, 3600),   # 5 per hour
+    "api_general": _limit_from_env("api_general", 100, 3600),             # 100 per hour
+    "auth": _limit_from_env("auth", 5, 300),                              # 5 per 5 minutes
+}
+
+
+class RateLimitResult:
+    """Outcome of one rate limit check."""
+
+    __slots__ = ("allowed", "limit", "remaining", "window_seconds", "reset_after", "retry_after")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, window_seconds: int,
+                 reset_after: float, retry_after: float = 0.0):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.window_seconds = window_seconds
+        self.reset_after = reset_after
+        self.retry_after = retry_after
+
+    def headers(self) -> Dict[str, str]:
+        """``RateLimit-*`` response headers (plus ``Retry-After`` when rejected)."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+            "RateLimit-Policy": f"{self.limit};w={self.window_seconds}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset": math.ceil(self.reset_after),
+            "retry_after": math.ceil(self.retry_after),
+        }
+
+
+def _evaluate(allowed: bool, current: int, previous: int, elapsed: float,
+              limit: int, window: int, cost: int) -> RateLimitResult:
+    """
+    Build a result from the window counts after a check.
+
+    Args:
+        allowed: Whether the request was admitted
+        current: Current-window count (including this request if admitted)
+        previous: Previous-window count
+        elapsed: Seconds since the current window started
+        limit: Maximum requests per window
+        window: Window length in seconds
+        cost: Units this request consumes
+    """
+    weight = (window - elapsed) / window
+    estimated = previous * weight + current
+    remaining = max(0, int(limit - estimated))
+    reset_after = window - elapsed
+
+    retry_after = 0.0
+    if not allowed:
+        budget = limit - cost - current
+        if budget >= 0 and previous > 0:
+            # The previous window's weight decays enough within this window
+            retry_after = window * (1 - budget / previous) - elapsed
+        else:
+            # Wait for the window to roll over and the current count to decay
+            retry_after = reset_after
+            if current > limit - cost and current > 0:
+                retry_after += window * (1 - max(0, limit - cost) / current)
+        retry_after = max(retry_after, 0.0)
+    return RateLimitResult(allowed, limit, remaining, window, reset_after, retry_after)
+
+
+class MemoryRateLimitBackend:
+    """Per-process sliding-window counters with expiry of idle keys."""
+
+    def __init__(self, sweep_seconds: Optional[float] = None):
+        if sweep_seconds is None:
+            sweep_seconds = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", "60"))
+        self.sweep_seconds = sweep_seconds
+        # (key, window) -> [window_index, current, previous, expires_at]
+        self._counters: Dict[Tuple[str, int], List[Any]] = {}
+        self._next_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def _sweep(self, now: float) -> None:
+        expired = [key for key, entry in self._counters.items() if entry[3] <= now]
+        for key in expired:
+            del self._counters[key]
+        self._next_sweep = now + self.sweep_seconds
+
+    def hit(self, key: str, limit: int, window_seconds: int, cost: int = 1,
+            now: Optional[float] = None) -> RateLimitResult:
+        """Count a request against ``key`` if it fits within the limit."""
+        if now is None:
+            now = time.time()
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+        index = int(now // window_seconds)
+        entry = self._counters.get((key, window_seconds))
+        if entry is None:
+            entry = [index, 0, 0, 0.0]
+            self._counters[(key, window_seconds)] = entry
+        elif entry[0] != index:
+            # Roll forward: the current window becomes the previous one
+            entry[2] = entry[1] if entry[0] == index - 1 else 0
+            entry[1] = 0
+            entry[0] = index
+
+        elapsed = now - index * window_seconds
+        current, previous = entry[1], entry[2]
+        allowed = previous * (window_seconds - elapsed) / window_seconds + current + cost <= limit
+        if allowed:
+            current += cost
+            entry[1] = current
+        # Both windows have slid out of range two windows after this one starts
+        entry[3] = (index + 2) * window_seconds
+        return _evaluate(allowed, current, previous, elapsed, limit, window_seconds, cost)
+
+    def clear(self) -> None:
+        self._counters.clear()
+
+
+# KEYS: current window counter, previous window counter
+# ARGV: limit, weight of the previous window, cost, ttl seconds
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+if previous * weight + current + cost > limit then
+  return {0, current, previous}
+end
+current = redis.call('INCRBY', KEYS[1], cost)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return {1, current, previous}
+"""
+
+
+class RedisRateLimitBackend:
+    """Sliding-window counters in Redis, checked and updated atomically by Lua."""
+
+    def __init__(self, prefix: str = "ratelimit"):
+        self.prefix = prefix
+        self._sha: Optional[str] = None
+
+    async def _eval(self, client, keys: List[str], args: List[Any]) -> List[int]:
+        if self._sha is not None:
+            try:
+                return await client.evalsha(self._sha, len(keys), *keys, *args)
+            except NoScriptError:
+                # Server restarted or failed over: reload the script
+                pass
+        self._sha = await client.script_load(SLIDING_WINDOW_SCRIPT)
+        return await client.evalsha(self._sha, len(keys), *keys, *args)
+
+    async def hit(self, client, key: str, limit: int, window_seconds: int, cost: int = 1,
+                  now: Optional[float] = None) -> RateLimitResult:
+        """Count a request against ``key`` in Redis if it fits within the limit."""
+        if now is None:
+            now = time.time()
+        index = int(now // window_seconds)
+        elapsed = now - index * window_seconds
+        weight = (window_seconds - elapsed) / window_seconds
+        base = f"{self.prefix}:{key}:{window_seconds}"
+        allowed, current, previous = await self._eval(
+            client,
+            [f"{base}:{index}", f"{base}:{index - 1}"],
+            [limit, f"{weight:.6f}", cost, window_seconds * 2],
+        )
+        return _evaluate(bool(allowed), int(current), int(previous), elapsed, limit, window_seconds, cost)
+
 
 class RateLimiter:
-    """Simple in-memory rate limiter."""
-    
-    def __init__(self):
-        """Initialize rate limiter."""
-        self.requests: Dict[str, list] = defaultdict(list)
-    
-    def is_allowed(
-        self,
-        key: str,
-        max_requests: int,
-        window_seconds: int,
-    ) -> Tuple[bool, Dict[str, int]]:
+    """Rate limiter using Redis when available and in-process counters otherwise."""
+
+    def __init__(self, use_redis: Optional[bool] = None):
+        if use_redis is None:
+            use_redis = os.getenv("RATE_LIMIT_BACKEND", "auto").lower() != "memory"
+        self.use_redis = use_redis
+        self.memory = MemoryRateLimitBackend()
+        self.redis = RedisRateLimitBackend()
+        self.allowed = 0
+        self.rejected = 0
+        self.redis_checks = 0
+        self.redis_errors = 0
+
+    async def hit(self, key: str, max_requests: int, window_seconds: int, cost: int = 1) -> RateLimitResult:
         """
-        Check if request is allowed.
-        
+        Check and count a request.
+
         Args:
-            key: Rate limit key (e.g., IP address, user ID)
-            max_requests: Maximum requests allowed
-            window_seconds: Time window in seconds
-            
+            key: Rate limit key (e.g., "chart:<user id>")
+            max_requests: Maximum requests allowed per window
+            window_seconds: Window length in seconds
+            cost: Units this request consumes
+
         Returns:
-            Tuple of (is_allowed, rate_limit_info)
+            RateLimitResult
         """
-        now = time.time()
-        window_start = now - window_seconds
-        
-        # Clean old requests
-        self.requests[key] = [
-            req_time for req_time in self.requests[key]
-            if req_time > window_start
-        ]
-        
-        # Check if allowed
-        current_count = len(self.requests[key])
-        is_allowed = current_count < max_requests
-        
-        if is_allowed:
-            self.requests[key].append(now)
-        
-        # Calculate rate limit info
-        remaining = max(0, max_requests - current_count - (1 if is_allowed else 0))
-        reset_time = int(self.requests[key][0] + window_seconds) if self.requests[key] else int(now + window_seconds)
-        
-        rate_limit_info = {
-            "limit": max_requests,
-            "remaining": remaining,
-            "reset": reset_time,
+        result = None
+        client = get_redis() if self.use_redis else None
+        if client is not None:
+            try:
+                result = await self.redis.hit(client, key, max_requests, window_seconds, cost)
+                self.redis_checks += 1
+            except Exception as e:
+                self.redis_errors += 1
+                mark_redis_failed(e)
+        if result is None:
+            result = self.memory.hit(key, max_requests, window_seconds, cost)
+
+        if result.allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "redis_checks": self.redis_checks,
+            "redis_errors": self.redis_errors,
+            "memory_keys": len(self.memory),
         }
-        
-        return is_allowed, rate_limit_info
 
 
 # Global rate limiter instance
 _rate_limiter = RateLimiter()
 
 
-def check_rate_limit(
+def get_rate_limiter() -> RateLimiter:
+    return _rate_limiter
+
+
+async def check_rate_limit(
     key: str,
     max_requests: int = 10,
     window_seconds: int = 3600,
-) -> Tuple[bool, Dict[str, int]]:
+    cost: int = 1,
+) -> RateLimitResult:
     """
     Check if request is allowed.
-    
+
     Args:
         key: Rate limit key
         max_requests: Maximum requests allowed
         window_seconds: Time window in seconds
-        
+        cost: Units this request consumes
+
     Returns:
-        Tuple of (is_allowed, rate_limit_info)
+        RateLimitResult
     """
-    return _rate_limiter.is_allowed(key, max_requests, window_seconds)
+    return await _rate_limiter.hit(key, max_requests, window_seconds, cost)
 
 
-# Common rate limit configurations
-RATE_LIMITS = {
-    "chart_calculation": {"max_requests": 10, "window_seconds": 3600},  # 10 per hour
-    "ai_interpretation": {"max_requests": 5, "window_seconds": 3600},   # 5 per hour
-    "api_general": {"max_requests": 100, "window_seconds": 3600},       # 100 per hour
-    "auth": {"max_requests": 5, "window_seconds": 300},                 # 5 per 5 minutes
-}
+def client_key(request: Request) -> str:
+    """Rate limit key for the calling client (its address)."""
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(
+    name: str,
+    scope: Optional[str] = None,
+    user_dependency: Optional[Callable] = None,
+    message: str = "Rate limit exceeded",
+) -> Callable:
+    """
+    Build a dependency enforcing ``RATE_LIMITS[name]``.
+
+    Args:
+        name: Key of ``RATE_LIMITS``
+        scope: Key prefix (defaults to ``name``)
+        user_dependency: Limit per user (``user.id``) resolved by this
+            dependency instead of per client address. Pass the same
+            dependency the endpoint uses so it is only resolved once.
+        message: Error message when the limit is exceeded
+
+    Returns:
+        A dependency that sets ``RateLimit-*`` headers, or raises
+        RateLimitError (429 with ``Retry-After``) when over the limit
+    """
+    config = RATE_LIMITS[name]
+    scope = scope or name
+
+    async def enforce(key: str, response: Response) -> RateLimitResult:
+        result = await _rate_limiter.hit(f"{scope}:{key}", config["max_requests"], config["window_seconds"])
+        if not result.allowed:
+            raise RateLimitError(message, details=result.to_dict(), headers=result.headers())
+        response.headers.update(result.headers())
+        return result
+
+    if user_dependency is not None:
+        async def per_user(response: Response, user=Depends(user_dependency)) -> RateLimitResult:
+            return await enforce(str(user.id), response)
+        return per_user
+
+    async def per_client(request: Request, response: Response) -> RateLimitResult:
+        return await enforce(client_key(request), response)
+    return per_client
+
+
+class RateLimitMiddleware:
+    """
+    Apply ``RATE_LIMITS["api_general"]`` per client to all ``/api/`` requests.
+
+    Enabled with ``RATE_LIMIT_API_ENABLED=true``.
+    """
+
+    def __init__(self, app: ASGIApp, name: str = "api_general", path_prefix: str = "/api/"):
+        self.app = app
+        self.name = name
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        config = RATE_LIMITS[self.name]
+        request = Request(scope)
+        result = await _rate_limiter.hit(
+            f"{self.name}:{client_key(request)}", config["max_requests"], config["window_seconds"]
+        )
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "detail": "Rate limit exceeded",
+                    "type": RateLimitError.__name__,
+                    "path": str(request.url),
+                    **result.to_dict(),
+                },
+                headers=result.headers(),
+            )
+            await response(scope, receive, send)
+            return
+
+        headers = result.headers()
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in headers.items()
+                ]
+            await send(message)
 
+        await self.app(scope, receive, send_with_headers)
@@ -8,6 +8,7 @@ from starlette.authentication import AuthCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import User, RoleEnum
 from app.core.database import get_db
+from app.core.principal import Principal, get_principal_cache, load_principal
 from app.services.auth_service import AuthService
 import logging
 
@@ -18,6 +19,69 @@ security = HTTPBearer(auto_error=False)
 # Authentication configuration
 
 
+async def _load_active_user(db: AsyncSession, user_id: str, token_version: int) -> Optional[User]:
+    """Load the token's user if it is active and the token hasn't been revoked."""
+    user = await AuthService.get_user_by_id(db, user_id)
+    if not user or not user.is_active or (user.token_version or 0) != token_version:
+        return None
+    await get_principal_cache().put(Principal.from_row(user))
+    return user
+
+
+async def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> Principal:
+    """
+    Get the current authenticated principal (id, email, role) without
+    loading the ORM ``User``.
+
+    Use this for routes that only need the caller's id or role; principals
+    are cached per (user id, token version), so most requests skip the
+    database entirely.
+
+    Args:
+        credentials: HTTP bearer credentials
+        db: Database session (used on cache misses)
+
+    Returns:
+        Current principal
+
+    Raises:
+        HTTPException: If token is invalid, revoked, or user not found
+    """
+    if not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    claims = AuthService.decode_access_token(credentials.credentials)
+    if not claims:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        principal = await load_principal(db, *claims)
+    except Exception as e:
+        logger.error(f"Database error fetching user {claims[0]}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Database error: {str(e)}",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
+
+
 async def get_current_user(
     credentials = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -44,9 +108,9 @@ async def get_current_user(
         )
     token = credentials.credentials
     logger.debug(f"Token received, length: {len(token) if token else 0}")
-    user_id = AuthService.validate_access_token(token)
+    claims = AuthService.decode_access_token(token)
 
-    if not user_id:
+    if not claims:
         logger.warning("Token validation failed - invalid or expired")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,9 +118,10 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    user_id, token_version = claims
     logger.debug(f"Token valid, user_id: {user_id}")
     try:
-        user = await AuthService.get_user_by_id(db, user_id)
+        user = await _load_active_user(db, user_id, token_version)
     except Exception as e:
         logger.error(f"Database error fetching user {user_id}: {e}")
         raise HTTPException(
@@ -64,7 +129,7 @@ async def get_current_user(
             detail=f"Database error: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    if not user or not user.is_active:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
@@ -145,17 +210,11 @@ async def get_current_user_optional(
     if not credentials:
         return None
 
-    token = credentials.credentials
-    user_id = AuthService.validate_access_token(token)
-
-    if not user_id:
-        return None
-
-    user = await AuthService.get_user_by_id(db, user_id)
-    if not user or not user.is_active:
+    claims = AuthService.decode_access_token(credentials.credentials)
+    if not claims:
         return None
 
-    return user
+    return await _load_active_user(db, *claims)
 
 
 async def get_current_user_or_guest(
@@ -183,12 +242,11 @@ async def get_current_user_or_guest(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    token = credentials.credentials
-    user_id = AuthService.validate_access_token(token)
+    claims = AuthService.decode_access_token(credentials.credentials)
 
-    if user_id:
-        user = await AuthService.get_user_by_id(db, user_id)
-        if user and user.is_active:
+    if claims:
+        user = await _load_active_user(db, *claims)
+        if user:
             return user
 
     # No valid authentication
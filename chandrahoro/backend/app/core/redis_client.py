@@ -0,0 +1,87 @@
+"""Optional shared Redis client.
+
+Redis is used to share computed state (transit snapshots, locks, counters)
+across worker processes. Everything that uses it must keep working without
+it, so ``get_redis()`` returns None when Redis is not configured or has
+recently failed.
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# After a connection error, skip Redis for this many seconds
+REDIS_RETRY_SECONDS = float(os.getenv("REDIS_RETRY_SECONDS", "30"))
+
+_client = None
+_disabled_until = 0.0
+
+
+def _redis_url() -> Optional[str]:
+    url = os.getenv("REDIS_URL")
+    if url:
+        return url
+    host = os.getenv("REDIS_HOST")
+    if not host:
+        return None
+    port = os.getenv("REDIS_PORT", "6379")
+    db = os.getenv("REDIS_DB", "0")
+    password = os.getenv("REDIS_PASSWORD")
+    auth = f":{password}@" if password else ""
+    return f"redis://{auth}{host}:{port}/{db}"
+
+
+def get_redis():
+    """
+    Get the shared async Redis client.
+
+    Returns:
+        A ``redis.asyncio.Redis`` client, or None if Redis is unavailable
+    """
+    global _client
+    if not REDIS_AVAILABLE or time.monotonic() < _disabled_until:
+        return None
+    if _client is None:
+        url = _redis_url()
+        if not url:
+            return None
+        _client = aioredis.from_url(
+            url,
+            socket_connect_timeout=float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.5")),
+            socket_timeout=float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5")),
+        )
+    return _client
+
+
+def mark_redis_failed(error: Exception) -> None:
+    """Back off from Redis after an error so requests don't keep paying timeouts."""
+    global _disabled_until
+    _disabled_until = time.monotonic() + REDIS_RETRY_SECONDS
+    logger.warning(f"Redis unavailable, retrying in {REDIS_RETRY_SECONDS:.0f}s: {error}")
+
+
+def set_redis_client(client) -> None:
+    """Install a specific client (used by tests and load-test harnesses)."""
+    global _client, _disabled_until
+    _client = client
+    _disabled_until = 0.0
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client."""
+    global _client
+    if _client is not None:
+        try:
+            await _client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Redis client: {e}")
+        _client = None
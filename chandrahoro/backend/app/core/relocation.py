@@ -0,0 +1,485 @@
+"""Relocation and astrocartography calculations.
+
+Evaluates the chart angles (ASC/DSC/MC/IC) over a latitude/longitude grid for a
+single birth moment. Sidereal time, obliquity, ayanamsha and planetary equatorial
+coordinates are computed once per chart; every grid cell then only needs the
+per-column ARMC trigonometry and the per-row latitude tangent, so a full world
+grid costs a handful of float operations per cell instead of one ``swe.houses``
+call per location. Full house cusps are only computed (via ``swe.houses_armc``)
+for an individual relocated chart.
+"""
+
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+import math
+import os
+import threading
+import logging
+
+from app.core.ephemeris import EphemerisCalculator, get_sign_name
+from app.core.houses import HouseSystemCalculator
+
+logger = logging.getLogger(__name__)
+
+# Try to import Swiss Ephemeris
+try:
+    import swisseph as swe
+    SWISSEPH_AVAILABLE = True
+except ImportError:
+    SWISSEPH_AVAILABLE = False
+    logger.warning("Swiss Ephemeris not available for relocation calculations")
+
+
+ANGLES = ('ASC', 'DSC', 'MC', 'IC')
+
+# Planets drawn on astrocartography maps
+RELOCATION_PLANETS = [
+    'Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu',
+]
+
+# Beyond this latitude most quadrant house systems are undefined
+DEFAULT_MAX_LATITUDE = 66.0
+
+
+def _normalize_longitude(lon: float) -> float:
+    """Normalize a geographic longitude into [-180, 180)."""
+    return ((lon + 180.0) % 360.0) - 180.0
+
+
+def _angular_distance(a: float, b: float) -> float:
+    """Smallest distance between two ecliptic longitudes in degrees."""
+    diff = abs(a - b) % 360.0
+    return 360.0 - diff if diff > 180.0 else diff
+
+
+@dataclass
+class NatalSky:
+    """Location-independent data for one birth moment."""
+    julian_day: float
+    sidereal_time: float  # Greenwich sidereal time in degrees
+    obliquity: float
+    ayanamsha_value: float
+    planets: Dict[str, Dict[str, float]]  # tropical longitude, RA and declination
+
+
+@dataclass
+class RelocationGrid:
+    """Angles and planetary angularity evaluated over a lat/lon grid."""
+    resolution: float
+    latitudes: List[float]
+    longitudes: List[float]
+    mc: array  # One value per longitude column (tropical)
+    ascendant: array  # Row-major, one value per cell (tropical)
+    ayanamsha_value: float
+    angularity_orb: float
+    # (row, col) -> {planet: (angle, orb)} for planets within the orb of an angle
+    angular_planets: Dict[Tuple[int, int], Dict[str, Tuple[str, float]]] = field(default_factory=dict)
+
+    def cell_index(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Return the (row, col) of the grid cell closest to a location."""
+        row = round((latitude - self.latitudes[0]) / self.resolution)
+        col = round((_normalize_longitude(longitude) - self.longitudes[0]) / self.resolution)
+        row = max(0, min(len(self.latitudes) - 1, row))
+        col = max(0, min(len(self.longitudes) - 1, col))
+        return row, col
+
+    def cell(self, row: int, col: int) -> Dict[str, Any]:
+        """Return the angles of a single grid cell."""
+        asc_tropical = self.ascendant[row * len(self.longitudes) + col]
+        mc_tropical = self.mc[col]
+        asc_sidereal = (asc_tropical - self.ayanamsha_value) % 360
+        mc_sidereal = (mc_tropical - self.ayanamsha_value) % 360
+
+        return {
+            'latitude': self.latitudes[row],
+            'longitude': self.longitudes[col],
+            'ascendant_sidereal': asc_sidereal,
+            'ascendant_sign': get_sign_name(int(asc_sidereal / 30)),
+            'mc_sidereal': mc_sidereal,
+            'mc_sign': get_sign_name(int(mc_sidereal / 30)),
+            'angular_planets': {
+                planet: {'angle': angle, 'orb': orb}
+                for planet, (angle, orb) in self.angular_planets.get((row, col), {}).items()
+            },
+        }
+
+    def window(self, lat_min: float, lat_max: float,
+               lon_min: float, lon_max: float) -> List[Dict[str, Any]]:
+        """
+        Return the cells inside a map viewport.
+
+        Panning a map only slices the cached grid; nothing is recomputed.
+        Viewports crossing the antimeridian (lon_min > lon_max) are supported.
+        """
+        full_width = lon_max - lon_min >= 360.0
+        lon_min = _normalize_longitude(lon_min)
+        # 180 is the same meridian as -180, but as an upper bound it is the east edge
+        lon_max = 180.0 if lon_max == 180.0 else _normalize_longitude(lon_max)
+        wraps = lon_min > lon_max
+
+        cells = []
+        for row, lat in enumerate(self.latitudes):
+            if not lat_min <= lat <= lat_max:
+                continue
+            for col, lon in enumerate(self.longitudes):
+                if full_width:
+                    inside = True
+                else:
+                    inside = (lon >= lon_min or lon <= lon_max) if wraps else lon_min <= lon <= lon_max
+                if inside:
+                    cells.append(self.cell(row, col))
+        return cells
+
+
+class _GridCache:
+    """Small thread-safe LRU cache for per-chart relocation data."""
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Tuple, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_grid_cache = _GridCache(int(os.getenv("RELOCATION_GRID_CACHE_SIZE", "64")))
+
+
+class RelocationEngine:
+    """Calculate relocated angles, astrocartography lines and relocated charts."""
+
+    def __init__(self, ayanamsha: str = 'Lahiri', house_system: str = 'Whole Sign'):
+        """
+        Initialize relocation engine.
+
+        Args:
+            ayanamsha: Ayanamsha system for sidereal output
+            house_system: House system used for relocated charts
+        """
+        self.ayanamsha = ayanamsha
+        self.house_system = house_system
+        self.ephemeris = EphemerisCalculator(ayanamsha=ayanamsha)
+        self.house_calc = HouseSystemCalculator(house_system=house_system)
+
+    def get_natal_sky(self, dt: datetime) -> NatalSky:
+        """Calculate (or fetch from cache) the location-independent sky for a birth moment."""
+        jd = self.ephemeris.calculate_julian_day(dt)
+        key = ('sky', round(jd, 8), self.ayanamsha)
+        cached = _grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if SWISSEPH_AVAILABLE:
+            sidereal_time = swe.sidtime(jd) * 15.0
+            obliquity = swe.calc_ut(jd, swe.ECL_NUT)[0][0]
+        else:
+            t = (jd - 2451545.0) / 36525.0
+            sidereal_time = (280.46061837 + 360.98564736629 * (jd - 2451545.0)) % 360
+            obliquity = 23.4392911 - 0.0130042 * t
+
+        planets = {}
+        ayanamsha_value = 0.0
+        for planet_name in RELOCATION_PLANETS:
+            position = self.ephemeris.get_planet_position(planet_name, jd)
+            ayanamsha_value = position.get('ayanamsha_value', ayanamsha_value)
+            ra, dec = self._equatorial_coordinates(planet_name, jd, position['tropical_longitude'], obliquity)
+            planets[planet_name] = {
+                'tropical_longitude': position['tropical_longitude'],
+                'right_ascension': ra,
+                'declination': dec,
+            }
+
+        sky = NatalSky(
+            julian_day=jd,
+            sidereal_time=sidereal_time,
+            obliquity=obliquity,
+            ayanamsha_value=ayanamsha_value,
+            planets=planets,
+        )
+        _grid_cache.set(key, sky)
+        return sky
+
+    def _equatorial_coordinates(self, planet_name: str, jd: float,
+                                tropical_longitude: float, obliquity: float) -> Tuple[float, float]:
+        """Return (right ascension, declination) of a planet in degrees."""
+        if SWISSEPH_AVAILABLE:
+            planet_id = EphemerisCalculator.PLANETS['Rahu' if planet_name == 'Ketu' else planet_name]
+            result = swe.calc_ut(jd, planet_id, swe.FLG_EQUATORIAL)[0]
+            ra, dec = result[0], result[1]
+            if planet_name == 'Ketu':
+                ra, dec = (ra + 180.0) % 360, -dec
+            return ra, dec
+
+        # Without Swiss Ephemeris assume zero ecliptic latitude
+        lam = math.radians(tropical_longitude)
+        eps = math.radians(obliquity)
+        ra = math.degrees(math.atan2(math.sin(lam) * math.cos(eps), math.cos(lam))) % 360
+        dec = math.degrees(math.asin(math.sin(eps) * math.sin(lam)))
+        return ra, dec
+
+    def build_grid(self, dt: datetime, resolution: float = 2.0,
+                   max_latitude: float = DEFAULT_MAX_LATITUDE,
+                   angularity_orb: float = 5.0) -> RelocationGrid:
+        """
+        Evaluate ASC/MC and planetary angularity over a world grid.
+
+        The grid is cached per birth moment and parameters, so repeated calls
+        (e.g. while a client pans a map) are served from memory.
+
+        Args:
+            dt: Birth datetime
+            resolution: Grid spacing in degrees
+            max_latitude: Grid covers [-max_latitude, max_latitude]
+            angularity_orb: Orb in degrees for a planet to count as angular
+
+        Returns:
+            RelocationGrid for the chart
+        """
+        sky = self.get_natal_sky(dt)
+        key = ('grid', round(sky.julian_day, 8), self.ayanamsha, resolution, max_latitude, angularity_orb)
+        cached = _grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        steps = int(round(max_latitude / resolution))
+        latitudes = [i * resolution for i in range(-steps, steps + 1)]
+        longitudes = [-180.0 + i * resolution for i in range(int(round(360.0 / resolution)))]
+
+        sin_eps = math.sin(math.radians(sky.obliquity))
+        cos_eps = math.cos(math.radians(sky.obliquity))
+
+        # Per-column terms: ARMC and its trigonometry depend only on longitude
+        col_sin = []
+        col_cos = []
+        mc = array('d')
+        for lon in longitudes:
+            armc = math.radians((sky.sidereal_time + lon) % 360)
+            s, c = math.sin(armc), math.cos(armc)
+            col_sin.append(s * cos_eps)
+            col_cos.append(c)
+            mc.append(math.degrees(math.atan2(s, c * cos_eps)) % 360)
+
+        # Per-row term: only tan(latitude) depends on the row
+        row_terms = [math.tan(math.radians(lat)) * sin_eps for lat in latitudes]
+
+        planet_longitudes = [
+            (name, data['tropical_longitude']) for name, data in sky.planets.items()
+        ]
+
+        ascendant = array('d')
+        angular_planets: Dict[Tuple[int, int], Dict[str, Tuple[str, float]]] = {}
+        for row, row_term in enumerate(row_terms):
+            for col in range(len(longitudes)):
+                asc = math.degrees(math.atan2(col_cos[col], -(col_sin[col] + row_term))) % 360
+                ascendant.append(asc)
+
+                angles = (
+                    ('ASC', asc),
+                    ('DSC', (asc + 180) % 360),
+                    ('MC', mc[col]),
+                    ('IC', (mc[col] + 180) % 360),
+                )
+                cell_planets = {}
+                for planet_name, planet_long in planet_longitudes:
+                    for angle_name, angle_long in angles:
+                        orb = _angular_distance(planet_long, angle_long)
+                        if orb <= angularity_orb:
+                            previous = cell_planets.get(planet_name)
+                            if previous is None or orb < previous[1]:
+                                cell_planets[planet_name] = (angle_name, orb)
+                if cell_planets:
+                    angular_planets[(row, col)] = cell_planets
+
+        grid = RelocationGrid(
+            resolution=resolution,
+            latitudes=latitudes,
+            longitudes=longitudes,
+            mc=mc,
+            ascendant=ascendant,
+            ayanamsha_value=sky.ayanamsha_value,
+            angularity_orb=angularity_orb,
+            angular_planets=angular_planets,
+        )
+        _grid_cache.set(key, grid)
+        logger.info(
+            f"Built relocation grid: {len(latitudes)}x{len(longitudes)} cells at {resolution}° resolution"
+        )
+        return grid
+
+    def calculate_astrocartography_lines(self, dt: datetime, latitude_step: float = 1.0,
+                                         max_latitude: float = DEFAULT_MAX_LATITUDE,
+                                         planets: Optional[List[str]] = None) -> Dict[str, Dict[str, List[List[List[float]]]]]:
+        """
+        Calculate ASC/DSC/MC/IC lines for each planet.
+
+        MC/IC lines are meridians where the planet culminates/anti-culminates.
+        ASC/DSC lines follow the planet's rising/setting hour angle, which
+        varies with latitude. Each line is a list of polylines of [lat, lon]
+        points; lines are split where they cross the antimeridian.
+
+        Args:
+            dt: Birth datetime
+            latitude_step: Spacing of polyline vertices in degrees of latitude
+            max_latitude: Lines are drawn within [-max_latitude, max_latitude]
+            planets: Planets to include (default: all relocation planets)
+
+        Returns:
+            {planet: {'ASC': [...], 'DSC': [...], 'MC': [...], 'IC': [...]}}
+        """
+        sky = self.get_natal_sky(dt)
+        selected = planets or list(sky.planets.keys())
+        key = ('lines', round(sky.julian_day, 8), self.ayanamsha, latitude_step, max_latitude, tuple(selected))
+        cached = _grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        steps = int(round(max_latitude / latitude_step))
+        latitudes = [i * latitude_step for i in range(-steps, steps + 1)]
+        tan_lats = [math.tan(math.radians(lat)) for lat in latitudes]
+
+        lines = {}
+        for planet_name in selected:
+            data = sky.planets.get(planet_name)
+            if data is None:
+                continue
+
+            ra = data['right_ascension']
+            tan_dec = math.tan(math.radians(data['declination']))
+            mc_lon = _normalize_longitude(ra - sky.sidereal_time)
+            ic_lon = _normalize_longitude(mc_lon + 180.0)
+
+            asc_points = []
+            dsc_points = []
+            for lat, tan_lat in zip(latitudes, tan_lats):
+                cos_h = -tan_lat * tan_dec
+                if abs(cos_h) > 1.0:
+                    # Circumpolar or never rises at this latitude
+                    asc_points.append(None)
+                    dsc_points.append(None)
+                    continue
+                hour_angle = math.degrees(math.acos(cos_h))
+                asc_points.append([lat, _normalize_longitude(mc_lon - hour_angle)])
+                dsc_points.append([lat, _normalize_longitude(mc_lon + hour_angle)])
+
+            lines[planet_name] = {
+                'ASC': self._split_polyline(asc_points),
+                'DSC': self._split_polyline(dsc_points),
+                'MC': [[[latitudes[0], mc_lon], [latitudes[-1], mc_lon]]],
+                'IC': [[[latitudes[0], ic_lon], [latitudes[-1], ic_lon]]],
+            }
+
+        _grid_cache.set(key, lines)
+        return lines
+
+    @staticmethod
+    def _split_polyline(points: List[Optional[List[float]]]) -> List[List[List[float]]]:
+        """Split a sequence of points at gaps and antimeridian crossings."""
+        polylines = []
+        current: List[List[float]] = []
+        for point in points:
+            if point is None:
+                if len(current) > 1:
+                    polylines.append(current)
+                current = []
+                continue
+            if current and abs(point[1] - current[-1][1]) > 180.0:
+                if len(current) > 1:
+                    polylines.append(current)
+                current = []
+            current.append(point)
+        if len(current) > 1:
+            polylines.append(current)
+        return polylines
+
+    def calculate_relocated_chart(self, dt: datetime, latitude: float, longitude: float) -> Dict[str, Any]:
+        """
+        Calculate the relocated chart for a single location.
+
+        Planetary longitudes are unchanged by relocation; only the angles and
+        house cusps move. The ARMC is derived from the cached sidereal time so
+        only one ``swe.houses_armc`` call is needed.
+
+        Args:
+            dt: Birth datetime
+            latitude: Relocation latitude
+            longitude: Relocation longitude
+
+        Returns:
+            Dictionary with relocated angles, house cusps and planet houses
+        """
+        sky = self.get_natal_sky(dt)
+        key = ('chart', round(sky.julian_day, 8), self.ayanamsha, self.house_system,
+               round(latitude, 4), round(longitude, 4))
+        cached = _grid_cache.get(key)
+        if cached is not None:
+            return cached
+
+        armc = (sky.sidereal_time + longitude) % 360
+
+        if SWISSEPH_AVAILABLE:
+            cusps, ascmc = swe.houses_armc(armc, latitude, sky.obliquity, self.house_calc.house_code)
+            asc_tropical, mc_tropical = ascmc[0], ascmc[1]
+            cusps_sidereal = [(cusp - sky.ayanamsha_value) % 360 for cusp in cusps]
+        else:
+            houses = self.house_calc.calculate_houses(dt, latitude, longitude, sky.ayanamsha_value)
+            asc_tropical = houses['ascendant_tropical']
+            mc_tropical = houses['mc_tropical']
+            cusps_sidereal = houses['house_cusps_sidereal']
+
+        asc_sidereal = (asc_tropical - sky.ayanamsha_value) % 360
+        mc_sidereal = (mc_tropical - sky.ayanamsha_value) % 360
+        asc_sign_num = int(asc_sidereal / 30)
+
+        planets = []
+        for planet_name, data in sky.planets.items():
+            sidereal_long = (data['tropical_longitude'] - sky.ayanamsha_value) % 360
+            sign_num = int(sidereal_long / 30)
+            if self.house_system == 'Whole Sign':
+                house = ((sign_num - asc_sign_num) % 12) + 1
+            else:
+                house = self.house_calc.get_planet_house(sidereal_long, cusps_sidereal)
+            planets.append({
+                'name': planet_name,
+                'sidereal_longitude': sidereal_long,
+                'sign': get_sign_name(sign_num),
+                'house': house,
+            })
+
+        chart = {
+            'latitude': latitude,
+            'longitude': longitude,
+            'house_system': self.house_system,
+            'ascendant_sidereal': asc_sidereal,
+            'ascendant_sign': get_sign_name(asc_sign_num),
+            'mc_sidereal': mc_sidereal,
+            'mc_sign': get_sign_name(int(mc_sidereal / 30)),
+            'house_cusps_sidereal': cusps_sidereal,
+            'planets': planets,
+            'ayanamsha_value': sky.ayanamsha_value,
+        }
+        _grid_cache.set(key, chart)
+        return chart
+
+
+def clear_relocation_cache() -> None:
+    """Drop all cached relocation grids, lines and charts."""
+    _grid_cache.clear()
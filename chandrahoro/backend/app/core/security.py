@@ -1,16 +1,42 @@
-"""Security utilities for authentication and authorization."""
+"""Security utilities for authentication and authorization.
 
+Argon2 hashing takes tens to hundreds of milliseconds of CPU by design, so
+async code must use the ``*_async`` helpers, which run it on a dedicated
+bounded thread pool (argon2-cffi releases the GIL while hashing) instead of
+blocking the event loop. JWT signing/verification (HS256) takes
+microseconds and stays inline.
+"""
+
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Argon2 cost parameters. Hashes made with other parameters still verify and
+# are transparently rehashed on the next successful login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
+# Maximum concurrent hash/verify operations (threads); further calls queue
+PASSWORD_HASH_CONCURRENCY = int(os.getenv("PASSWORD_HASH_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+
 # Password hashing - use argon2 instead of bcrypt to avoid version compatibility issues
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+_password_executor: Optional[ThreadPoolExecutor] = None
 
 # JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -29,6 +55,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def get_password_executor() -> ThreadPoolExecutor:
+    """Thread pool that runs password hashing off the event loop."""
+    global _password_executor
+    if _password_executor is None:
+        _password_executor = ThreadPoolExecutor(
+            max_workers=max(1, PASSWORD_HASH_CONCURRENCY),
+            thread_name_prefix="password-hash",
+        )
+    return _password_executor
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash on the password thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_password_executor(), pwd_context.verify, plain_password, hashed_password
+    )
+
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str,
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its parameters are outdated.
+
+    Args:
+        plain_password: Password to check
+        hashed_password: Stored hash
+
+    Returns:
+        Tuple of (valid, new_hash); new_hash is None unless the password is
+        valid and the stored hash should be replaced
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_password_executor(), pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False)
+        _password_executor = None
+
+
 def create_access_token(
     data: Dict[str, Any],
     expires_delta: Optional[timedelta] = None
@@ -0,0 +1,143 @@
+"""Fast JSON serialization for large chart payloads.
+
+Chart responses are rendered directly with orjson, which encodes datetime,
+date, time, UUID, Enum, dataclass and NumPy values natively. This replaces
+the recursive ``convert_datetime_objects`` pass plus FastAPI's
+``jsonable_encoder``/``json.dumps`` path. When orjson isn't installed the
+stdlib encoder is used with the same fallback rules, so output is identical
+apart from speed.
+
+Planet tables can optionally be encoded as a compact column/row table
+(``planet_format=table``) with rounded floats.
+"""
+
+import json
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.info("orjson not installed, using stdlib json for chart responses")
+
+PLANET_FORMATS = ("objects", "table")
+
+# Decimal places kept for floats in compact planet tables
+COMPACT_FLOAT_PRECISION = 6
+
+
+def _default(obj: Any) -> Any:
+    """Encode types neither encoder handles natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):  # NumPy values when orjson is unavailable
+        return obj.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def to_jsonable(obj: Any) -> Any:
+    """
+    Convert a payload to plain JSON types (ISO strings for datetimes).
+
+    A single encode/decode round trip in C, used where JSON-safe dicts are
+    needed (database JSON columns, exporters) instead of a recursive walk.
+    """
+    return loads(dumps(obj))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (or stdlib json as a fallback)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def compact_planet_table(planets: List[Dict[str, Any]], precision: int = COMPACT_FLOAT_PRECISION) -> Dict[str, Any]:
+    """
+    Encode a list of planet dicts as a column/row table.
+
+    Args:
+        planets: Planet dicts, as in ``data.planets``
+        precision: Decimal places kept for floats
+
+    Returns:
+        ``{"format": "table", "columns": [...], "rows": [[...], ...]}``
+    """
+    columns: List[str] = []
+    seen = set()
+    for planet in planets:
+        for key in planet:
+            if key not in seen:
+                seen.add(key)
+                columns.append(key)
+
+    rows = [
+        [
+            round(value, precision) if isinstance(value, float) else value
+            for value in (planet.get(column) for column in columns)
+        ]
+        for planet in planets
+    ]
+    return {"format": "table", "columns": columns, "rows": rows}
+
+
+def _is_planet_list(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def compact_chart_payload(data: Dict[str, Any], precision: int = COMPACT_FLOAT_PRECISION) -> Dict[str, Any]:
+    """
+    Replace planet lists in a chart ``data`` dict with compact tables.
+
+    Only the containers on the path to each planet list are copied, so cached
+    calculation results shared with other requests are never mutated.
+
+    Args:
+        data: Chart data (``response["data"]`` of /chart/calculate)
+        precision: Decimal places kept for floats
+
+    Returns:
+        A shallow copy of ``data`` with compact planet tables
+    """
+    compact = dict(data)
+    if _is_planet_list(compact.get("planets")):
+        compact["planets"] = compact_planet_table(compact["planets"], precision)
+
+    methodologies: Optional[Dict[str, Any]] = compact.get("methodologies")
+    if isinstance(methodologies, dict):
+        compact["methodologies"] = {}
+        for name, result in methodologies.items():
+            if isinstance(result, dict) and _is_planet_list(result.get("planets")):
+                result = dict(result)
+                result["planets"] = compact_planet_table(result["planets"], precision)
+            compact["methodologies"][name] = result
+    return compact
@@ -12,9 +12,11 @@ through six different factors:
 """
 
 import math
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime
 from .ephemeris import EphemerisCalculator
+from .natal_state import NatalState, PlanetInput, ensure_natal_state
+from .profiling import profile_span
 
 
 class ShadbalaCalculator:
@@ -56,8 +58,9 @@ class ShadbalaCalculator:
             'Saturn': 7     # 7th house
         }
 
+    @profile_span("shadbala")
     def calculate_shadbala(self, birth_datetime: datetime, latitude: float, longitude: float, 
-                          planets: List[Dict[str, Any]], houses: List[Dict[str, Any]]) -> Dict[str, Any]:
+                          planets: PlanetInput, houses: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Calculate complete Shadbala for all planets
         
@@ -65,29 +68,29 @@ class ShadbalaCalculator:
             birth_datetime: Birth date and time
             latitude: Birth latitude
             longitude: Birth longitude
-            planets: List of planet data with positions
-            houses: List of house data
+            planets: NatalState, or list of planet dicts with positions
+            houses: List of house data (only with planet dicts)
             
         Returns:
             Dictionary with Shadbala calculations for each planet
         """
+        natal = ensure_natal_state(planets, houses)
         results = {}
         
-        for planet_data in planets:
-            planet_name = planet_data['name']
+        for i, planet_name in enumerate(natal.names):
             if planet_name in ['Rahu', 'Ketu']:  # Skip shadow planets for Shadbala
                 continue
                 
-            planet_position = planet_data.get('sidereal_longitude', planet_data.get('longitude', 0))
-            planet_house = planet_data['house']
+            planet_position = natal.sidereal_longitudes[i]
+            planet_house = natal.houses[i]
             
             # Calculate each component of Shadbala
             sthana_bala = self._calculate_sthana_bala(planet_name, planet_position, planet_house)
             dig_bala = self._calculate_dig_bala(planet_name, planet_house)
             kala_bala = self._calculate_kala_bala(planet_name, birth_datetime)
-            chesta_bala = self._calculate_chesta_bala(planet_name, planet_data.get('speed', 0))
+            chesta_bala = self._calculate_chesta_bala(planet_name, natal.speeds[i])
             naisargika_bala = self.naisargika_bala.get(planet_name, 0)
-            drik_bala = self._calculate_drik_bala(planet_name, planets)
+            drik_bala = self._calculate_drik_bala(planet_name, natal)
             
             # Total Shadbala
             total_shadbala = (sthana_bala + dig_bala + kala_bala + 
@@ -188,7 +191,7 @@ class ShadbalaCalculator:
         else:  # Normal motion
             return 30
 
-    def _calculate_drik_bala(self, planet_name: str, planets: List[Dict[str, Any]]) -> float:
+    def _calculate_drik_bala(self, planet_name: str, natal: NatalState) -> float:
         """Calculate Drik Bala (Aspectual Strength)"""
         # Simplified aspectual strength calculation
         # Based on beneficial vs malefic aspects received
@@ -196,30 +199,24 @@ class ShadbalaCalculator:
         benefic_aspects = 0
         malefic_aspects = 0
         
-        planet_position = None
-        for p in planets:
-            if p['name'] == planet_name:
-                planet_position = p.get('sidereal_longitude', p.get('longitude', 0))
-                break
-                
-        if planet_position is None:
+        if planet_name not in natal:
             return 30
+        planet_position = natal.longitude(planet_name)
             
-        for other_planet in planets:
-            if other_planet['name'] == planet_name:
+        for other_name, other_position in zip(natal.names, natal.sidereal_longitudes):
+            if other_name == planet_name:
                 continue
                 
             # Calculate aspect (simplified - using 7th house aspect for all)
-            other_position = other_planet.get('sidereal_longitude', other_planet.get('longitude', 0))
             aspect_distance = abs(planet_position - other_position)
             if aspect_distance > 180:
                 aspect_distance = 360 - aspect_distance
                 
             # Check if within orb of aspect (±10 degrees)
             if 170 <= aspect_distance <= 190:  # 7th house aspect
-                if other_planet['name'] in ['Jupiter', 'Venus', 'Moon']:
+                if other_name in ['Jupiter', 'Venus', 'Moon']:
                     benefic_aspects += 1
-                elif other_planet['name'] in ['Mars', 'Saturn']:
+                elif other_name in ['Mars', 'Saturn']:
                     malefic_aspects += 1
                     
         # Calculate Drik Bala based on net beneficial aspects
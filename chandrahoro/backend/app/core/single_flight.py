@@ -0,0 +1,222 @@
+"""Single-flight coalescing of identical in-flight computations.
+
+When many identical requests arrive together (a shared chart link, the
+sample chart, the same AI report requested twice), only the first one runs
+the expensive computation; the others await its result. Calls are grouped
+per use (``chart``, ``location``, ``transit_snapshot``, ``llm``) and keyed
+by a hash of their canonical inputs (``flight_key``).
+
+The computation runs as its own task, so a leader whose client disconnects
+doesn't cancel the work the other callers are waiting for. Results and
+exceptions are shared as-is: callers must not mutate a shared result.
+
+Groups created with ``shared=True`` also coalesce across worker processes
+when ``SINGLE_FLIGHT_SHARED`` is on and Redis is configured: the leader
+holds a Redis lock while computing and publishes the result (which must be
+JSON-serializable) for a few seconds; other workers poll for it instead of
+recomputing, and compute locally if the lock holder goes away.
+
+Environment:
+    SINGLE_FLIGHT_ENABLED: Set to false to run every call (default true)
+    SINGLE_FLIGHT_SHARED: Coalesce across workers through Redis (default false)
+    SINGLE_FLIGHT_LOCK_TTL_SECONDS: Redis lock lifetime, also the longest a
+        follower waits for another worker (default 120)
+    SINGLE_FLIGHT_RESULT_TTL_SECONDS: How long a published result is kept (default 10)
+    SINGLE_FLIGHT_POLL_MS: First poll interval while waiting on another worker (default 50)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.core.redis_client import get_redis, mark_redis_failed
+from app.core.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+SINGLE_FLIGHT_SHARED = os.getenv("SINGLE_FLIGHT_SHARED", "false").lower() == "true"
+LOCK_TTL_SECONDS = float(os.getenv("SINGLE_FLIGHT_LOCK_TTL_SECONDS", "120"))
+RESULT_TTL_SECONDS = float(os.getenv("SINGLE_FLIGHT_RESULT_TTL_SECONDS", "10"))
+POLL_SECONDS = float(os.getenv("SINGLE_FLIGHT_POLL_MS", "50")) / 1000
+
+# Cap for the backed-off poll interval while waiting on another worker
+_MAX_POLL_SECONDS = 1.0
+
+
+def flight_key(*parts: Any) -> str:
+    """Stable hash of the inputs that determine a computation's result."""
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation."""
+
+    def __init__(self, name: str, shared: bool = False, enabled: Optional[bool] = None):
+        self.name = name
+        self.shared = shared
+        self.enabled = SINGLE_FLIGHT_ENABLED if enabled is None else enabled
+        self._flights: Dict[str, "asyncio.Task[Any]"] = {}
+        self._waiters: Dict[str, int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+        self.remote_hits = 0
+        self.errors = 0
+        self.computed_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether calls also coalesce across workers (needs Redis at call time)."""
+        return self.enabled and self.shared and SINGLE_FLIGHT_SHARED
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn()`` unless an identical call is already in flight, then share its result.
+
+        Args:
+            key: Canonical input hash (see ``flight_key``)
+            fn: Zero-argument coroutine function doing the work
+
+        Returns:
+            The result of the (single) computation for ``key``
+        """
+        if not self.enabled:
+            return await fn()
+
+        task = self._flights.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self._waiters[key] += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(self._run(key, fn))
+            # Retrieve the exception even if every caller was cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._flights[key] = task
+            self._waiters[key] = 0
+        return await asyncio.shield(task)
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        computed = True
+        try:
+            if self.is_shared:
+                result, computed = await self._run_shared(key, fn)
+                return result
+            return await fn()
+        except BaseException:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if computed:
+                self.computed_seconds += elapsed
+                self.saved_seconds += elapsed * self._waiters.pop(key, 0)
+            else:
+                self._waiters.pop(key, None)
+            del self._flights[key]
+
+    async def _run_shared(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Compute under a Redis lock, or wait for the worker that holds it.
+
+        Returns:
+            (result, whether it was computed here)
+        """
+        redis = get_redis()
+        if redis is None:
+            return await fn(), True
+
+        lock_key = f"single_flight:{self.name}:{key}:lock"
+        result_key = f"single_flight:{self.name}:{key}:result"
+        token = uuid.uuid4().hex
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=int(LOCK_TTL_SECONDS * 1000))
+        except Exception as e:
+            mark_redis_failed(e)
+            return await fn(), True
+
+        if acquired:
+            try:
+                result = await fn()
+                try:
+                    await redis.set(result_key, dumps(result), px=int(RESULT_TTL_SECONDS * 1000))
+                except Exception as e:
+                    mark_redis_failed(e)
+                return result, True
+            finally:
+                await self._release(redis, lock_key, token)
+
+        data = await self._wait_for_result(redis, lock_key, result_key)
+        if data is not None:
+            self.remote_hits += 1
+            return loads(data), False
+        return await fn(), True
+
+    async def _wait_for_result(self, redis, lock_key: str, result_key: str) -> Optional[bytes]:
+        """Poll for another worker's result; None if it gave up or timed out."""
+        deadline = time.monotonic() + LOCK_TTL_SECONDS
+        interval = POLL_SECONDS
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(interval)
+                interval = min(interval * 1.5, _MAX_POLL_SECONDS)
+                data = await redis.get(result_key)
+                if data is not None:
+                    return data
+                if await redis.get(lock_key) is None:
+                    # The result is published before the lock is released
+                    return await redis.get(result_key)
+        except Exception as e:
+            mark_redis_failed(e)
+        return None
+
+    @staticmethod
+    async def _release(redis, lock_key: str, token: str) -> None:
+        """Delete the lock if it is still ours (it may have expired and been retaken)."""
+        try:
+            current = await redis.get(lock_key)
+            if current is not None and (current.decode() if isinstance(current, bytes) else current) == token:
+                await redis.delete(lock_key)
+        except Exception as e:
+            mark_redis_failed(e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "shared": self.is_shared,
+            "inflight": len(self._flights),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "remote_hits": self.remote_hits,
+            "errors": self.errors,
+            "coalesced_ratio": round(self.coalesced / calls, 3) if calls else None,
+            "computed_seconds": round(self.computed_seconds, 3),
+            "saved_seconds": round(self.saved_seconds, 3),
+        }
+
+
+# Global groups, one per use
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str, shared: bool = False) -> SingleFlight:
+    """Get or create the named single-flight group."""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name, shared=shared)
+    return group
+
+
+def get_single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: group.get_stats() for name, group in sorted(_groups.items())}
@@ -96,6 +96,24 @@ class TransitCalculator:
         # Calculate current planetary positions
         current_positions = self._calculate_current_positions(current_date)
 
+        return self.overlay_natal_chart(natal_chart_data, current_positions, current_date)
+
+    def overlay_natal_chart(self, natal_chart_data: Dict, current_positions: Dict[str, Dict],
+                            current_date: datetime) -> Dict[str, Any]:
+        """
+        Overlay precomputed sky positions on a natal chart.
+
+        This is the per-chart part of a transit calculation; the positions
+        themselves can come from a shared snapshot.
+
+        Args:
+            natal_chart_data: Natal chart data with planetary positions
+            current_positions: Planet positions keyed by planet name
+            current_date: Instant the positions were calculated for
+
+        Returns:
+            Dictionary with current transit positions and aspects
+        """
         # Get natal planetary positions
         natal_positions = self._extract_natal_positions(natal_chart_data)
 
@@ -120,15 +138,19 @@ class TransitCalculator:
             "summary": self._create_transit_summary(transit_positions, transit_aspects)
         }
 
-    def _calculate_current_positions(self, date: datetime) -> Dict[str, Dict]:
+    def _calculate_current_positions(self, date: datetime,
+                                     planets: Optional[List[str]] = None) -> Dict[str, Dict]:
         """Calculate current planetary positions."""
         positions = {}
 
-        planets = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
+        if planets is None:
+            planets = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
+
+        jd = self.ephemeris.calculate_julian_day(date)
 
         for planet in planets:
             try:
-                pos_data = self.ephemeris.get_planet_position(date, planet)
+                pos_data = self.ephemeris.get_planet_position(planet, jd)
                 positions[planet] = pos_data
             except Exception as e:
                 logger.warning(f"Could not calculate position for {planet}: {e}")
@@ -158,7 +180,7 @@ class TransitCalculator:
             'sidereal_longitude': longitude,
             'sign_number': sign_num,
             'degree_in_sign': degree_in_sign,
-            'nakshatra_number': int(longitude * 27 / 360) % 27,
+            'nakshatra_number': int(longitude * 27 / 360) % 27 + 1,
             'pada': int((longitude * 27 / 360) % 1 * 4) + 1,
             'speed': speed,
             'retrograde': speed < 0
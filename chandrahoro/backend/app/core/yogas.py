@@ -4,6 +4,9 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import logging
 
+from app.core.natal_state import NatalState, PlanetInput, SIGN_NAMES, ensure_natal_state
+from app.core.profiling import profile_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -60,15 +63,16 @@ class YogaDetector:
         """Initialize yoga detector."""
         pass
 
-    def detect_all_yogas(self, planets: List[Dict], houses: List[Dict],
-                        ascendant_sign: str) -> List[YogaResult]:
+    @profile_span("yogas")
+    def detect_all_yogas(self, planets: PlanetInput, houses: Optional[List[Dict]] = None,
+                        ascendant_sign: Optional[str] = None) -> List[YogaResult]:
         """
         Detect all yogas in the chart.
 
         Args:
-            planets: List of planet positions
-            houses: List of house positions
-            ascendant_sign: Ascendant sign name
+            planets: NatalState, or list of planet position dicts
+            houses: List of house positions (only with planet dicts)
+            ascendant_sign: Ascendant sign name (default: from the natal state)
 
         Returns:
             List of detected yogas
@@ -76,9 +80,11 @@ class YogaDetector:
         yogas = []
 
         # Convert data to internal format
-        planet_data = self._convert_planet_data(planets)
-        house_data = self._convert_house_data(houses)
-        ascendant_sign_num = self._get_sign_number(ascendant_sign)
+        natal = ensure_natal_state(planets, houses)
+        planet_data = self._convert_planet_data(natal)
+        ascendant_sign_num = (
+            self._get_sign_number(ascendant_sign) if ascendant_sign else natal.ascendant_sign
+        )
 
         # Detect different types of yogas
         yogas.extend(self._detect_raja_yogas(planet_data, ascendant_sign_num))
@@ -89,35 +95,23 @@ class YogaDetector:
 
         return yogas
 
-    def _convert_planet_data(self, planets: List[Dict]) -> Dict[str, Dict]:
-        """Convert planet list to dictionary format."""
-        planet_dict = {}
-        for planet in planets:
-            planet_dict[planet['name']] = {
-                'house': planet['house'],
-                'sign': self._get_sign_number(planet['sign']),
-                'degree': planet['degree_in_sign'],
-                'retrograde': planet.get('retrograde', False),
-                'longitude': planet.get('sidereal_longitude', 0)
+    def _convert_planet_data(self, natal: NatalState) -> Dict[str, Dict]:
+        """Per-planet view used by the yoga rules (sign numbers 0-11)."""
+        return {
+            name: {
+                'house': natal.houses[i],
+                'sign': natal.signs[i],
+                'degree': natal.degrees[i],
+                'retrograde': natal.retrograde[i],
+                'longitude': natal.sidereal_longitudes[i]
             }
-        return planet_dict
-
-    def _convert_house_data(self, houses: List[Dict]) -> Dict[int, Dict]:
-        """Convert house list to dictionary format."""
-        house_dict = {}
-        for house in houses:
-            house_dict[house['number']] = {
-                'sign': self._get_sign_number(house['sign']),
-                'cusp': house['cusp_longitude']
-            }
-        return house_dict
+            for i, name in enumerate(natal.names)
+        }
 
     def _get_sign_number(self, sign_name: str) -> int:
         """Convert sign name to number (0-11)."""
-        signs = ['Aries', 'Taurus', 'Gemini', 'Cancer', 'Leo', 'Virgo',
-                'Libra', 'Scorpio', 'Sagittarius', 'Capricorn', 'Aquarius', 'Pisces']
         try:
-            return signs.index(sign_name)
+            return SIGN_NAMES.index(sign_name)
         except ValueError:
             return 0
 
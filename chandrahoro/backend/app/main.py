@@ -23,9 +23,37 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Per-request sampling profiler (admin X-Profile header or PROFILER_SAMPLE_RATE).
+# Innermost, so a profile covers routing, dependencies and the endpoint.
+from app.core.profiling import PROFILER_ENABLED, ProfilingMiddleware
+if PROFILER_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Response compression (gzip, plus brotli/zstd when installed), wrapping the
+# app directly so it sees the endpoint's response body as produced.
+from app.core.compression import COMPRESSION_ENABLED, CompressionMiddleware
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Admission control: CPU-heavy endpoints are queued by cost class and
+# priority, and rejected with 503 + Retry-After when over their latency budget
+from app.core.admission import ADMISSION_ENABLED, AdmissionMiddleware
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware)
+
+# Optional per-client limit on all API traffic (shared across workers via Redis)
+if os.getenv("RATE_LIMIT_API_ENABLED", "false").lower() == "true":
+    from app.core.rate_limit import RateLimitMiddleware
+    app.add_middleware(RateLimitMiddleware)
+
 # Add logging middleware
 app.add_middleware(LoggingMiddleware)
 
+# Request count/latency metrics, outermost so they include all middleware
+from app.core.metrics import METRICS_ENABLED, MetricsMiddleware
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # CORS middleware
 import os
 
@@ -57,6 +85,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor of GET /api/v1/charts
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -80,7 +110,8 @@ async def app_exception_handler(request: Request, exc: AppException):
             "type": exc.__class__.__name__,
             "path": str(request.url),
             **exc.details
-        }
+        },
+        headers=exc.headers
     )
 
 
@@ -106,10 +137,6 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 
-# Import methodologies to register them
-from app.core import parashara_methodology, kp_methodology, western_methodology
-
-
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
@@ -120,10 +147,19 @@ async def startup_event():
     except Exception as e:
         logger.warning(f"Database initialization failed: {e}. Running in demo mode.")
 
-    # Log registered methodologies
-    from app.core.base_methodology import MethodologyRegistry
-    registered_methodologies = MethodologyRegistry.list_available()
-    logger.info(f"Registered methodologies: {registered_methodologies}")
+    # Background import of ROUTER_PRELOAD routers/modules (methodologies
+    # register themselves on first use of MethodologyRegistry)
+    router_mounter.start_warmup()
+
+    if os.getenv("CACHE_WARMER_ENABLED", "false").lower() == "true":
+        from app.services.cache_warmer import get_cache_warmer
+        get_cache_warmer().start()
+
+    if METRICS_ENABLED:
+        from app.core.database import engine
+        from app.core.metrics import instrument_engine, start_metrics_flusher
+        instrument_engine(engine)
+        start_metrics_flusher()
 
     logger.info("Application started")
 
@@ -131,7 +167,27 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close database on shutdown."""
+    if os.getenv("CACHE_WARMER_ENABLED", "false").lower() == "true":
+        from app.services.cache_warmer import get_cache_warmer
+        await get_cache_warmer().stop()
+
     await close_db()
+
+    from app.services.location_service import close_location_service
+    await close_location_service()
+
+    from app.core.redis_client import close_redis
+    await close_redis()
+
+    from app.core.security import shutdown_password_executor
+    shutdown_password_executor()
+
+    from app.core.admission import get_admission_controller
+    get_admission_controller().shutdown()
+
+    if METRICS_ENABLED:
+        from app.core.metrics import stop_metrics_flusher
+        stop_metrics_flusher()
     logger.info("Application shutdown")
 
 
@@ -156,6 +212,11 @@ async def health_check():
     }
 
 
+if METRICS_ENABLED:
+    from app.core.metrics import metrics_endpoint
+    app.add_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+
 @app.get("/api/v1/health")
 async def api_health_check():
     """API v1 health check."""
@@ -165,47 +226,12 @@ async def api_health_check():
     }
 
 
-# Include API routers
-from app.api.v1 import chart, locations, transits, ai, auth, charts, profiles, timeline, calibration, journal, comparison, synergy, roles, candidates, teams, pipeline, corporate_dashboard, privacy, stock_universe, research_session, horoscope_generation, feature_extraction, feature_aggregation, price_data, prediction_metrics, research_dashboard, research_export, research_safety, performance_optimization, security_hardening, documentation, testing_qa, deployment, llm, methodologies, ai_prompts, ai_reports
-
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
-app.include_router(chart.router, prefix="/api/v1/chart", tags=["charts"])
-app.include_router(charts.router, prefix="/api/v1", tags=["charts"])
-app.include_router(methodologies.router, prefix="/api/v1/methodologies", tags=["methodologies"])
-app.include_router(profiles.router, prefix="/api/v1", tags=["profiles"])
-app.include_router(timeline.router, prefix="/api/v1", tags=["timeline"])
-app.include_router(calibration.router, prefix="/api/v1", tags=["calibration"])
-app.include_router(journal.router, prefix="/api/v1", tags=["journal"])
-app.include_router(comparison.router, prefix="/api/v1", tags=["comparison"])
-app.include_router(synergy.router, prefix="/api/v1", tags=["synergy"])
-app.include_router(roles.router, prefix="/api/v1", tags=["roles"])
-app.include_router(candidates.router, prefix="/api/v1", tags=["candidates"])
-app.include_router(teams.router, prefix="/api/v1", tags=["teams"])
-app.include_router(pipeline.router, prefix="/api/v1", tags=["pipeline"])
-app.include_router(corporate_dashboard.router, prefix="/api/v1", tags=["dashboard"])
-app.include_router(privacy.router, prefix="/api/v1", tags=["privacy"])
-app.include_router(stock_universe.router, prefix="/api/v1", tags=["stock_universe"])
-app.include_router(research_session.router, prefix="/api/v1", tags=["research_session"])
-app.include_router(horoscope_generation.router, prefix="/api/v1", tags=["horoscope_generation"])
-app.include_router(feature_extraction.router, prefix="/api/v1", tags=["feature_extraction"])
-app.include_router(feature_aggregation.router, prefix="/api/v1", tags=["feature_aggregation"])
-app.include_router(price_data.router, prefix="/api/v1", tags=["price_data"])
-app.include_router(prediction_metrics.router, prefix="/api/v1", tags=["prediction_metrics"])
-app.include_router(research_dashboard.router, prefix="/api/v1", tags=["research_dashboard"])
-app.include_router(research_export.router, prefix="/api/v1", tags=["research_export"])
-app.include_router(research_safety.router, prefix="/api/v1", tags=["research_safety"])
-app.include_router(performance_optimization.router, prefix="/api/v1", tags=["performance_optimization"])
-app.include_router(security_hardening.router, prefix="/api/v1", tags=["security_hardening"])
-app.include_router(documentation.router, prefix="/api/v1", tags=["documentation"])
-app.include_router(testing_qa.router, prefix="/api/v1", tags=["testing_qa"])
-app.include_router(deployment.router, prefix="/api/v1", tags=["deployment"])
-app.include_router(locations.router, prefix="/api/v1/locations", tags=["locations"])
-app.include_router(transits.router, prefix="/api/v1", tags=["transits"])
-app.include_router(ai.router, prefix="/api/v1/ai", tags=["ai"])
-app.include_router(llm.router, prefix="/api/v1/llm", tags=["llm"])
-app.include_router(ai_prompts.router, prefix="/api/v1", tags=["ai-prompts"])
-app.include_router(ai_reports.router, prefix="/api/v1/ai-reports", tags=["ai-reports"])
+# Include API routers. With LAZY_ROUTERS (default) each router module is
+# imported on the first request it serves; see app.core.lazy_routes.
+from app.api.v1 import ROUTERS
+from app.core.lazy_routes import mount_routers
 
+router_mounter = mount_routers(app, "app.api.v1", ROUTERS)
 
 if __name__ == "__main__":
     import uvicorn
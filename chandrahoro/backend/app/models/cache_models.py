@@ -2,8 +2,10 @@
 
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, JSON, Boolean, Enum, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Integer, JSON, Boolean, Enum, Index, LargeBinary
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
 from sqlalchemy.orm import relationship
+from app.core.cache_codec import decode_payload, encode_payload
 from app.models.base import BaseModel
 import enum
 
@@ -39,8 +41,11 @@ class ChartCache(BaseModel):
     cache_type = Column(Enum(CacheType), nullable=False, index=True)
     cache_key = Column(String(255), nullable=False, index=True)  # Unique identifier for this cache entry
     
-    # Cached data
-    cache_data = Column(JSON, nullable=False)  # The actual calculation result
+    # Cached data: compressed binary payload (see app.core.cache_codec); rows
+    # written before payloads existed keep their result in cache_data
+    payload = Column(LargeBinary().with_variant(MEDIUMBLOB(), "mysql"), nullable=True)
+    payload_format = Column(String(20), nullable=True)  # e.g. msgpack+zstd
+    cache_data = Column(JSON(none_as_null=True), nullable=True)  # Legacy uncompressed result
     
     # Expiry management
     expires_at = Column(DateTime, nullable=True, index=True)  # NULL for permanent cache
@@ -50,8 +55,9 @@ class ChartCache(BaseModel):
     calculation_time_ms = Column(Integer, nullable=True)  # How long calculation took
     calculation_params = Column(JSON, nullable=True)  # Parameters used for calculation
     
-    # Version tracking
-    cache_version = Column(String(20), default="1.0", nullable=False)  # For cache invalidation
+    # Version tracking: calculation code version that produced the entry
+    # (CALCULATION_VERSION); entries from other versions are recomputed
+    cache_version = Column(String(20), default="1.0", nullable=False)
     
     # Relationships
     birth_chart = relationship("BirthChart", back_populates="cache_entries")
@@ -72,6 +78,22 @@ class ChartCache(BaseModel):
         if self.expires_at is None:
             return False
         return datetime.utcnow() > self.expires_at
+
+    def get_data(self) -> Any:
+        """
+        The cached result.
+
+        Raises:
+            ValueError: If the payload can't be decoded by this worker
+        """
+        if self.payload is not None:
+            return decode_payload(self.payload, self.payload_format)
+        return self.cache_data
+
+    def set_data(self, data: Any) -> None:
+        """Store a result as a compressed payload."""
+        self.payload, self.payload_format = encode_payload(data)
+        self.cache_data = None
     
     @classmethod
     def get_expiry_duration(cls, cache_type: CacheType) -> Optional[timedelta]:
@@ -96,16 +118,17 @@ class ChartCache(BaseModel):
         return expiry_map.get(cache_type)
     
     @classmethod
-    def create_cache_entry(
+    def entry_values(
         cls,
         birth_chart_id: str,
         cache_type: CacheType,
         cache_key: str,
-        cache_data: Dict[str, Any],
+        cache_data: Any,
+        cache_version: str,
         calculation_time_ms: Optional[int] = None,
         calculation_params: Optional[Dict[str, Any]] = None,
-    ) -> "ChartCache":
-        """Create a new cache entry with appropriate expiry."""
+    ) -> Dict[str, Any]:
+        """Column values for a new cache entry with appropriate expiry (for bulk inserts)."""
         expiry_duration = cls.get_expiry_duration(cache_type)
         
         expires_at = None
@@ -114,17 +137,42 @@ class ChartCache(BaseModel):
         if expiry_duration is not None:
             expires_at = datetime.utcnow() + expiry_duration
             is_permanent = False
-        
-        return cls(
+
+        payload, payload_format = encode_payload(cache_data)
+        return {
+            "birth_chart_id": birth_chart_id,
+            "cache_type": cache_type,
+            "cache_key": cache_key,
+            "payload": payload,
+            "payload_format": payload_format,
+            "expires_at": expires_at,
+            "is_permanent": is_permanent,
+            "calculation_time_ms": calculation_time_ms,
+            "calculation_params": calculation_params,
+            "cache_version": cache_version,
+        }
+
+    @classmethod
+    def create_cache_entry(
+        cls,
+        birth_chart_id: str,
+        cache_type: CacheType,
+        cache_key: str,
+        cache_data: Any,
+        cache_version: str,
+        calculation_time_ms: Optional[int] = None,
+        calculation_params: Optional[Dict[str, Any]] = None,
+    ) -> "ChartCache":
+        """Create a new cache entry with appropriate expiry."""
+        return cls(**cls.entry_values(
             birth_chart_id=birth_chart_id,
             cache_type=cache_type,
             cache_key=cache_key,
             cache_data=cache_data,
-            expires_at=expires_at,
-            is_permanent=is_permanent,
+            cache_version=cache_version,
             calculation_time_ms=calculation_time_ms,
             calculation_params=calculation_params,
-        )
+        ))
 
 
 class UserRequest(BaseModel):
@@ -2,7 +2,7 @@
 
 from datetime import datetime, date
 from typing import Optional
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Integer, JSON, Date, Time
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Text, Integer, JSON, Date, Time, Index
 from sqlalchemy.orm import relationship
 from app.models.base import BaseModel
 
@@ -48,6 +48,11 @@ class BirthChart(BaseModel):
     cache_entries = relationship("ChartCache", back_populates="birth_chart", cascade="all, delete-orphan")
     request_history = relationship("UserRequest", back_populates="birth_chart", cascade="all, delete-orphan")
 
+    # Keyset pagination of a user's charts (newest first)
+    __table_args__ = (
+        Index('idx_birth_charts_user_created', 'user_id', 'created_at', 'id'),
+    )
+
 
 class StrengthProfile(BaseModel):
     """Strength profile model."""
@@ -36,6 +36,8 @@ class User(BaseModel):
     is_verified = Column(Boolean, default=False, nullable=False)
     is_email_verified = Column(Boolean, default=False, nullable=False)
     last_login = Column(DateTime, nullable=True)
+    # Bumped to revoke issued tokens (role/status/password change, logout)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Preferences
     timezone = Column(String(50), default="UTC", nullable=False)
@@ -1,6 +1,6 @@
 """Aspect Intensity Calculation Engine for life aspects."""
 
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 import logging
@@ -124,8 +124,11 @@ class AspectIntensityCalculator:
         if aspect_name not in self.LIFE_ASPECTS:
             raise ValueError(f"Unknown aspect: {aspect_name}")
         
-        # Calculate dasha period
-        dasha_info = self.dasha_calc.get_dasha_at_date(birth_date, target_date)
+        # Calculate dasha period (from the birth instant; noon if the time is unknown)
+        birth_datetime = birth_date if isinstance(birth_date, datetime) else datetime.combine(
+            birth_date, time.fromisoformat(birth_time) if birth_time else time(12, 0)
+        )
+        dasha_info = self.dasha_calc.get_dasha_at_date(birth_datetime, target_date)
         dasha_period = f"{dasha_info['mahadasha']} - {dasha_info['antardasha']}"
         
         # Calculate transit influences
@@ -2,11 +2,11 @@
 
 from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.models import User, RoleEnum
 from app.core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_and_update_password_async,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -64,7 +64,7 @@ class AuthService:
         user = User(
             email=email,
             username=username,
-            password_hash=hash_password(password),
+            password_hash=await hash_password_async(password),
             full_name=full_name,
             role=role,
         )
@@ -74,8 +74,7 @@ class AuthService:
         await db.refresh(user)
         
         # Generate tokens
-        access_token = create_access_token({"sub": user.id, "email": user.email})
-        refresh_token = create_refresh_token({"sub": user.id})
+        access_token, refresh_token = AuthService.issue_tokens(user)
         
         logger.info(f"User registered: {user.email}")
         return user, access_token, refresh_token
@@ -102,21 +101,56 @@ class AuthService:
         result = await db.execute(stmt)
         user = result.scalars().first()
         
-        if not user or not verify_password(password, user.password_hash):
+        if not user:
+            logger.warning(f"Failed login attempt for: {email}")
+            return None, None, None
+
+        valid, new_hash = await verify_and_update_password_async(password, user.password_hash)
+        if not valid:
             logger.warning(f"Failed login attempt for: {email}")
             return None, None, None
         
         if not user.is_active:
             logger.warning(f"Login attempt for inactive user: {email}")
             return None, None, None
+
+        if new_hash:
+            # Argon2 parameters changed: store the upgraded hash. A Core UPDATE
+            # so it doesn't count as a password change (which revokes tokens).
+            await db.execute(update(User).where(User.id == user.id).values(password_hash=new_hash))
+            await db.commit()
+            await db.refresh(user)
+            logger.info(f"Password hash upgraded for: {email}")
         
         # Generate tokens
-        access_token = create_access_token({"sub": user.id, "email": user.email})
-        refresh_token = create_refresh_token({"sub": user.id})
+        access_token, refresh_token = AuthService.issue_tokens(user)
         
         logger.info(f"User authenticated: {user.email}")
         return user, access_token, refresh_token
     
+    @staticmethod
+    def issue_tokens(user: User) -> Tuple[str, str]:
+        """
+        Create an access and refresh token for a user.
+
+        Both carry the user's token version ("tv"), so bumping
+        ``User.token_version`` revokes them.
+
+        Returns:
+            Tuple of (access_token, refresh_token)
+        """
+        token_version = user.token_version or 0
+        access_token = create_access_token({"sub": user.id, "email": user.email, "tv": token_version})
+        refresh_token = create_refresh_token({"sub": user.id, "tv": token_version})
+        return access_token, refresh_token
+
+    @staticmethod
+    async def revoke_tokens(db: AsyncSession, user: User) -> None:
+        """Revoke every token issued to a user (e.g. on logout)."""
+        user.token_version = (user.token_version or 0) + 1
+        db.add(user)
+        await db.commit()
+
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
         """Get user by ID."""
@@ -139,6 +173,23 @@ class AuthService:
         if not token_data or not verify_token_type(token_data, "access"):
             return None
         return token_data.get("sub")
+
+    @staticmethod
+    def decode_access_token(token: str) -> Optional[Tuple[str, int]]:
+        """
+        Validate access token and return its subject and token version.
+
+        Args:
+            token: JWT token
+
+        Returns:
+            Tuple of (user_id, token_version) or None if invalid. Tokens
+            issued before token versions existed count as version 0.
+        """
+        token_data = decode_token(token)
+        if not token_data or not verify_token_type(token_data, "access") or not token_data.get("sub"):
+            return None
+        return token_data["sub"], int(token_data.get("tv", 0))
     
     @staticmethod
     def validate_refresh_token(token: str) -> Optional[str]:
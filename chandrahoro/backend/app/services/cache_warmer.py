@@ -0,0 +1,288 @@
+"""Background cache warmer and scheduled precomputation jobs.
+
+Jobs:
+- ``refresh_time_based``: recompute CURRENT_TRANSITS / CURRENT_DASHA cache
+  entries for recently active charts before they expire
+- ``precompute_snapshots``: compute the next tick's and tomorrow's transit
+  snapshot (which includes the panchanga) ahead of demand
+- ``prune_expired``: delete expired, non-permanent ChartCache rows in batches
+
+The scheduler runs in-process when ``CACHE_WARMER_ENABLED=true`` or as a
+standalone worker::
+
+    python -m app.services.cache_warmer            # run forever
+    python -m app.services.cache_warmer --once     # run every job once
+
+A semaphore bounds how much warm-up work runs at once, and each chart
+refresh yields between items, so warming never starves live traffic.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import select, delete, and_
+
+from app.core.database import AsyncSessionLocal
+from app.models.cache_models import ChartCache, CacheType, UserRequest
+from app.models.chart_models import BirthChart
+from app.services.chart_service import ChartService
+from app.services.transit_snapshot_service import get_transit_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+TIME_BASED_CACHE_TYPES = [CacheType.CURRENT_TRANSITS, CacheType.CURRENT_DASHA]
+
+
+@dataclass
+class JobStats:
+    """Run metrics for one scheduled job."""
+    runs: int = 0
+    failures: int = 0
+    items: int = 0
+    last_run_at: Optional[str] = None
+    last_duration_ms: Optional[int] = None
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.__dict__.copy()
+
+
+@dataclass
+class ScheduledJob:
+    """A coroutine run every ``interval_seconds``."""
+    name: str
+    interval_seconds: float
+    func: Callable[[], Awaitable[int]]
+    next_run: float = 0.0
+    stats: JobStats = field(default_factory=JobStats)
+
+
+class CacheWarmer:
+    """In-process async scheduler for cache warming jobs."""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        activity_window_days: Optional[int] = None,
+        refresh_horizon_hours: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self.concurrency = concurrency or int(os.getenv("CACHE_WARMER_CONCURRENCY", "2"))
+        self.activity_window = timedelta(days=activity_window_days or int(os.getenv("CACHE_WARMER_ACTIVITY_DAYS", "7")))
+        self.refresh_horizon = timedelta(hours=refresh_horizon_hours or float(os.getenv("CACHE_WARMER_HORIZON_HOURS", "2")))
+        self.batch_size = batch_size or int(os.getenv("CACHE_WARMER_BATCH_SIZE", "200"))
+        # Pause between refreshed items so warm-up yields CPU to live requests
+        self.item_delay = float(os.getenv("CACHE_WARMER_ITEM_DELAY", "0.01"))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+        self.jobs: List[ScheduledJob] = [
+            ScheduledJob(
+                "refresh_time_based",
+                float(os.getenv("CACHE_WARMER_REFRESH_INTERVAL", "900")),
+                self.refresh_time_based,
+            ),
+            ScheduledJob(
+                "precompute_snapshots",
+                float(os.getenv("CACHE_WARMER_SNAPSHOT_INTERVAL", os.getenv("TRANSIT_SNAPSHOT_TICK_SECONDS", "60"))),
+                self.precompute_snapshots,
+            ),
+            ScheduledJob(
+                "prune_expired",
+                float(os.getenv("CACHE_WARMER_PRUNE_INTERVAL", "3600")),
+                self.prune_expired,
+            ),
+        ]
+
+    # Jobs
+
+    async def refresh_time_based(self) -> int:
+        """Refresh expiring time-based cache entries for recently active charts."""
+        now = datetime.utcnow()
+        active_since = now - self.activity_window
+        refresh_before = now + self.refresh_horizon
+
+        async with AsyncSessionLocal() as db:
+            active_chart_ids = (
+                select(UserRequest.birth_chart_id)
+                .where(and_(UserRequest.created_at >= active_since, UserRequest.birth_chart_id.isnot(None)))
+                .distinct()
+            )
+            result = await db.execute(
+                select(BirthChart)
+                .where(and_(BirthChart.id.in_(active_chart_ids), BirthChart.is_active == True))
+                .order_by(BirthChart.updated_at.desc())
+                .limit(self.batch_size)
+            )
+            charts = list(result.scalars().all())
+            if not charts:
+                return 0
+
+            # Entries that are still fresh beyond the horizon need no work
+            result = await db.execute(
+                select(ChartCache.birth_chart_id, ChartCache.cache_type).where(
+                    and_(
+                        ChartCache.birth_chart_id.in_([chart.id for chart in charts]),
+                        ChartCache.cache_type.in_(TIME_BASED_CACHE_TYPES),
+                        ChartCache.is_active == True,
+                        ChartCache.expires_at > refresh_before,
+                    )
+                )
+            )
+            fresh = {(chart_id, cache_type) for chart_id, cache_type in result.all()}
+
+            # Charts are fully loaded; each refresh writes through its own session
+            # so up to CACHE_WARMER_CONCURRENCY of them run at once
+            stale = [
+                (chart, cache_type)
+                for chart in charts
+                for cache_type in TIME_BASED_CACHE_TYPES
+                if (chart.id, cache_type) not in fresh
+            ]
+
+        refreshed = await asyncio.gather(*(self._refresh_entry(chart, cache_type, now) for chart, cache_type in stale))
+        return sum(refreshed)
+
+    async def _refresh_entry(self, chart: BirthChart, cache_type: CacheType, now: datetime) -> bool:
+        """Refresh one chart's time-based entry under the concurrency bound."""
+        async with self._semaphore:
+            try:
+                async with AsyncSessionLocal() as db:
+                    entry = await ChartService(db).refresh_time_based_cache(chart, cache_type, now)
+                    await db.commit()
+                    return entry is not None
+            except Exception as e:
+                logger.warning(f"Cache refresh failed for chart {chart.id} ({cache_type.value}): {e}")
+                return False
+            finally:
+                # Let request handlers run between items
+                await asyncio.sleep(self.item_delay)
+
+    async def precompute_snapshots(self) -> int:
+        """Compute the next tick's and tomorrow's transit snapshots ahead of demand."""
+        service = get_transit_snapshot_service()
+        now = datetime.utcnow()
+        next_tick = service.bucket_start(service.bucket_for(now) + 1)
+        tomorrow = datetime.combine((now + timedelta(days=1)).date(), datetime.min.time())
+
+        async with self._semaphore:
+            for at in (next_tick, tomorrow):
+                await service.get_snapshot_async(at)
+        return 2
+
+    async def prune_expired(self) -> int:
+        """Delete expired, non-permanent cache rows in batches (uses idx_cache_expiry)."""
+        now = datetime.utcnow()
+        pruned = 0
+        async with AsyncSessionLocal() as db:
+            while True:
+                result = await db.execute(
+                    select(ChartCache.id)
+                    .where(and_(ChartCache.expires_at < now, ChartCache.is_permanent == False))
+                    .limit(self.batch_size)
+                )
+                ids = [row[0] for row in result.all()]
+                if not ids:
+                    break
+                await db.execute(delete(ChartCache).where(ChartCache.id.in_(ids)))
+                await db.commit()
+                pruned += len(ids)
+                await asyncio.sleep(0)
+        return pruned
+
+    # Scheduling
+
+    async def run_job(self, job: ScheduledJob) -> None:
+        """Run one job and record its metrics."""
+        started = time.perf_counter()
+        job.stats.runs += 1
+        job.stats.last_run_at = datetime.utcnow().isoformat()
+        try:
+            job.stats.items += await job.func()
+            job.stats.last_error = None
+        except Exception as e:
+            job.stats.failures += 1
+            job.stats.last_error = str(e)
+            logger.error(f"Cache warmer job {job.name} failed: {e}", exc_info=True)
+        finally:
+            job.stats.last_duration_ms = int((time.perf_counter() - started) * 1000)
+            job.next_run = time.monotonic() + job.interval_seconds
+
+    async def run_once(self) -> None:
+        """Run every job once, sequentially."""
+        for job in self.jobs:
+            await self.run_job(job)
+
+    async def run_forever(self) -> None:
+        """Run due jobs until ``stop()`` is called."""
+        logger.info(f"Cache warmer started (concurrency={self.concurrency})")
+        while not self._stopping.is_set():
+            for job in self.jobs:
+                if time.monotonic() >= job.next_run and not self._stopping.is_set():
+                    await self.run_job(job)
+            next_due = min(job.next_run for job in self.jobs) - time.monotonic()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=max(1.0, next_due))
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Cache warmer stopped")
+
+    def start(self) -> None:
+        """Start the scheduler as a background task on the running loop."""
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.get_running_loop().create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        """Stop the scheduler and wait for the current job to finish."""
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "concurrency": self.concurrency,
+            "jobs": {
+                job.name: {"interval_seconds": job.interval_seconds, **job.stats.to_dict()}
+                for job in self.jobs
+            },
+        }
+
+
+# Global instance
+_cache_warmer: Optional[CacheWarmer] = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get or create the global cache warmer."""
+    global _cache_warmer
+    if _cache_warmer is None:
+        _cache_warmer = CacheWarmer()
+    return _cache_warmer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chandrahoro cache warmer worker")
+    parser.add_argument("--once", action="store_true", help="Run every job once and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    warmer = get_cache_warmer()
+    if args.once:
+        asyncio.run(warmer.run_once())
+        print(warmer.get_stats())
+    else:
+        asyncio.run(warmer.run_forever())
+
+
+if __name__ == "__main__":
+    main()
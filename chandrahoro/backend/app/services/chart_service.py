@@ -1,9 +1,14 @@
 """Chart calculation and persistence service with caching."""
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, date, time
+import asyncio
+import base64
+import logging
+import re
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, delete, insert
+from sqlalchemy.orm import defer
 import json
 import hashlib
 
@@ -12,6 +17,72 @@ from app.models.cache_models import ChartCache, CacheType, UserRequest
 from app.models.subscription_models import Subscription
 from app.core.base_methodology import MethodologyRegistry, BirthData
 from app.core.parashara_methodology import ParasharaPreferences
+from app.core.dasha import VimshottariDasha
+from app.core.ephemeris import get_sign_name
+from app.core.transits import TransitCalculator
+from app.core.http_cache import CALCULATION_VERSION
+from app.core.serialization import to_jsonable
+from app.services.transit_snapshot_service import get_transit_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+# Summary projection for lists: the chart_data document can be hundreds of KB
+# per row, so it is not loaded (and raises instead of lazy-loading per row)
+CHART_SUMMARY_OPTIONS = (defer(BirthChart.chart_data, raiseload=True),)
+
+# Dotted section paths into chart_data, e.g. planets or methodologies.kp
+_SECTION_PATH = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)*$")
+MAX_CHART_SECTIONS = 20
+
+# chart_data key -> (cache type, cache key) of the natal results cached per chart
+NATAL_CACHE_SECTIONS: Dict[str, Tuple[CacheType, str]] = {
+    "planets": (CacheType.NATAL_POSITIONS, "natal_positions"),
+    "houses": (CacheType.NATAL_HOUSES, "natal_houses"),
+    "divisional_charts": (CacheType.NATAL_DIVISIONAL, "natal_divisional"),
+    "dasha": (CacheType.NATAL_DASHA_BALANCE, "natal_dasha"),
+    "yogas": (CacheType.NATAL_YOGAS, "natal_yogas"),
+    "shadbala": (CacheType.NATAL_SHADBALA, "natal_shadbala"),
+    "ashtakavarga": (CacheType.NATAL_ASHTAKAVARGA, "natal_ashtakavarga"),
+}
+_NATAL_SECTION_BY_TYPE = {cache_type: section for section, (cache_type, _) in NATAL_CACHE_SECTIONS.items()}
+_NATAL_CACHE_KEYS = {cache_type: cache_key for cache_type, cache_key in NATAL_CACHE_SECTIONS.values()}
+TIME_BASED_CACHE_TYPES = (CacheType.CURRENT_TRANSITS, CacheType.CURRENT_DASHA)
+
+
+def natal_planet_list(planets: Any) -> List[Dict[str, Any]]:
+    """
+    Planets as a list of dicts with ``name`` and ``sign``.
+
+    chart_data from ``ChartService`` keeps the methodology's dict keyed by
+    planet name; charts saved from ``/chart/calculate`` hold the list form.
+    """
+    if isinstance(planets, dict):
+        return [
+            {"name": name, "sign": get_sign_name(position.get("sign_number", 0)), **position}
+            for name, position in planets.items()
+        ]
+    return list(planets or [])
+
+
+def encode_chart_cursor(chart: BirthChart) -> str:
+    """Opaque keyset cursor positioned after ``chart`` in newest-first order."""
+    raw = json.dumps([chart.created_at.isoformat(), chart.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_chart_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor from ``encode_chart_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, chart_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(chart_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor '{cursor}'") from e
 
 
 class ChartService:
@@ -130,16 +201,106 @@ class ChartService:
         )
         return result.scalar_one_or_none()
     
-    async def list_user_charts(self, user_id: str, skip: int = 0, limit: int = 100) -> List[BirthChart]:
-        """List all charts for a user."""
+    async def get_chart_sections(
+        self,
+        chart_id: str,
+        user_id: str,
+        sections: List[str],
+    ) -> Optional[Tuple[BirthChart, Dict[str, Any]]]:
+        """
+        Get a chart's summary columns and selected parts of its chart_data.
+
+        Sections are extracted in the database with JSON path expressions, so
+        only the requested parts of the document are transferred and parsed.
+        Top-level natal sections (``planets``, ``houses``, ...) are read from
+        their ChartCache entries when the chart has them, which recalculates
+        entries left by an older calculation version.
+
+        Args:
+            chart_id: Chart ID
+            user_id: Owner's user ID
+            sections: Dotted paths into chart_data (e.g. ``planets``,
+                ``methodologies.kp``); missing ones map to None
+
+        Returns:
+            (chart without chart_data loaded, {section: value}), or None if
+            the chart doesn't exist
+
+        Raises:
+            ValueError: For an invalid section path or too many sections
+        """
+        if len(sections) > MAX_CHART_SECTIONS:
+            raise ValueError(f"At most {MAX_CHART_SECTIONS} sections can be requested at once")
+        for section in sections:
+            if not _SECTION_PATH.match(section):
+                raise ValueError(f"Invalid section '{section}'")
+
+        columns = []
+        for section in sections:
+            parts = section.split(".")
+            columns.append(BirthChart.chart_data[parts[0] if len(parts) == 1 else tuple(parts)])
         result = await self.db.execute(
+            select(BirthChart, *columns)
+            .options(*CHART_SUMMARY_OPTIONS)
+            .where(
+                and_(
+                    BirthChart.id == chart_id,
+                    BirthChart.user_id == user_id,
+                    BirthChart.is_active == True
+                )
+            )
+        )
+        row = result.first()
+        if row is None:
+            return None
+        chart, values = row[0], dict(zip(sections, row[1:]))
+        for section in sections:
+            if section in NATAL_CACHE_SECTIONS:
+                cached = await self.get_cached_calculation(chart.id, NATAL_CACHE_SECTIONS[section][0])
+                if cached is not None:
+                    values[section] = cached
+        return chart, values
+
+    async def list_user_charts(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[BirthChart], Optional[str]]:
+        """
+        List one page of a user's charts, newest first, without chart_data.
+
+        Uses keyset pagination on (created_at, id), so deep pages cost the
+        same as the first one.
+
+        Args:
+            user_id: Owner's user ID
+            cursor: ``next_cursor`` from the previous page
+            limit: Page size
+
+        Returns:
+            (charts, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        stmt = (
             select(BirthChart)
+            .options(*CHART_SUMMARY_OPTIONS)
             .where(and_(BirthChart.user_id == user_id, BirthChart.is_active == True))
-            .order_by(BirthChart.created_at.desc())
-            .offset(skip)
-            .limit(limit)
         )
-        return list(result.scalars().all())
+        if cursor:
+            created_at, chart_id = decode_chart_cursor(cursor)
+            stmt = stmt.where(or_(
+                BirthChart.created_at < created_at,
+                and_(BirthChart.created_at == created_at, BirthChart.id < chart_id),
+            ))
+        result = await self.db.execute(
+            stmt.order_by(BirthChart.created_at.desc(), BirthChart.id.desc()).limit(limit + 1)
+        )
+        charts = list(result.scalars().all())
+        next_cursor = encode_chart_cursor(charts[limit - 1]) if len(charts) > limit else None
+        return charts[:limit], next_cursor
     
     async def delete_chart(self, chart_id: str, user_id: str) -> bool:
         """Soft delete a chart."""
@@ -156,10 +317,16 @@ class ChartService:
         birth_chart_id: str,
         cache_type: CacheType,
         cache_key: Optional[str] = None,
-    ) -> Optional[Dict[str, Any]]:
-        """Get cached calculation if available and not expired."""
+    ) -> Optional[Any]:
+        """
+        Get a cached calculation if available and not expired.
+
+        Entries written by another calculation version (``cache_version``) or
+        that can't be decoded are recomputed now for natal and time-based
+        types, and the session is committed.
+        """
         if cache_key is None:
-            cache_key = cache_type.value
+            cache_key = _NATAL_CACHE_KEYS.get(cache_type, cache_type.value)
         
         result = await self.db.execute(
             select(ChartCache).where(
@@ -173,10 +340,129 @@ class ChartService:
         )
         cache_entry = result.scalar_one_or_none()
         
-        if cache_entry and not cache_entry.is_expired():
-            return cache_entry.cache_data
-        
-        return None
+        if not cache_entry or cache_entry.is_expired():
+            return None
+
+        if cache_entry.cache_version == CALCULATION_VERSION:
+            try:
+                return cache_entry.get_data()
+            except ValueError as e:
+                logger.warning(f"Unreadable {cache_type.value} cache entry for chart {birth_chart_id}: {e}")
+        return await self._recompute_cached(birth_chart_id, cache_type)
+
+    async def _recompute_cached(self, birth_chart_id: str, cache_type: CacheType) -> Optional[Any]:
+        """Recalculate a stale cache entry (all natal entries at once for natal types)."""
+        # Reloaded in full: the session may hold the chart as a summary without chart_data
+        chart = await self.db.get(BirthChart, birth_chart_id, populate_existing=True)
+        if chart is None:
+            return None
+
+        if cache_type in TIME_BASED_CACHE_TYPES:
+            cache_entry = await self.refresh_time_based_cache(chart, cache_type)
+            await self.db.commit()
+            return cache_entry.get_data() if cache_entry else None
+
+        section = _NATAL_SECTION_BY_TYPE.get(cache_type)
+        if section is None:
+            return None
+        logger.info(f"Recalculating natal cache for chart {chart.id} (calculation version {CALCULATION_VERSION})")
+        start_time = datetime.utcnow()
+        chart_data = await self._calculate_chart(
+            birth_datetime=datetime.combine(chart.birth_date, chart.birth_time or time(12, 0)),
+            latitude=chart.birth_latitude,
+            longitude=chart.birth_longitude,
+            timezone=chart.birth_timezone,
+            location_name=chart.birth_location,
+            methodology=chart.methodology,
+            ayanamsha=chart.ayanamsha,
+            house_system=chart.house_system,
+        )
+        await self._cache_natal_calculations(
+            birth_chart_id=chart.id,
+            chart_data=chart_data,
+            calculation_time_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000),
+        )
+        await self.db.commit()
+        return to_jsonable(chart_data[section]) if section in chart_data else None
+
+    async def refresh_time_based_cache(
+        self,
+        chart: BirthChart,
+        cache_type: CacheType,
+        at: Optional[datetime] = None,
+    ) -> Optional[ChartCache]:
+        """
+        Recalculate and store an expiring cache entry (current transits or dasha).
+
+        Args:
+            chart: Birth chart with calculated chart_data
+            cache_type: CacheType.CURRENT_TRANSITS or CacheType.CURRENT_DASHA
+            at: Reference instant in UT (default: now)
+
+        Returns:
+            The updated or created cache entry, or None if the chart has no natal data
+        """
+        chart_data = chart.chart_data or {}
+        if not chart_data.get("planets"):
+            return None
+
+        planets = natal_planet_list(chart_data["planets"])
+        start_time = datetime.utcnow()
+        if cache_type == CacheType.CURRENT_TRANSITS:
+            natal_data = {**chart_data, "planets": planets}
+            ascendant = chart_data.get("ascendant")
+            if "ascendant_sign" not in natal_data and isinstance(ascendant, dict) and "sign_number" in ascendant:
+                natal_data["ascendant_sign"] = get_sign_name(ascendant["sign_number"])
+            snapshot = await get_transit_snapshot_service().get_snapshot_async(at, chart.ayanamsha)
+            data = await asyncio.to_thread(
+                TransitCalculator(ayanamsha=chart.ayanamsha).overlay_natal_chart,
+                natal_data,
+                snapshot["positions"],
+                datetime.fromisoformat(snapshot["calculation_date"]),
+            )
+        elif cache_type == CacheType.CURRENT_DASHA:
+            moon = next((p for p in planets if p.get("name") == "Moon"), None)
+            if moon is None or moon.get("sidereal_longitude") is None:
+                return None
+            birth_datetime = datetime.combine(chart.birth_date, chart.birth_time or time(12, 0))
+            data = await asyncio.to_thread(
+                VimshottariDasha().get_current_dasha,
+                birth_datetime,
+                moon["sidereal_longitude"],
+                at or datetime.utcnow(),
+            )
+        else:
+            raise ValueError(f"Cache type {cache_type.value} is not time-based")
+        calculation_time_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+
+        result = await self.db.execute(
+            select(ChartCache).where(
+                and_(
+                    ChartCache.birth_chart_id == chart.id,
+                    ChartCache.cache_type == cache_type,
+                    ChartCache.cache_key == cache_type.value,
+                )
+            )
+        )
+        cache_entry = result.scalar_one_or_none()
+        if cache_entry is None:
+            cache_entry = ChartCache.create_cache_entry(
+                birth_chart_id=chart.id,
+                cache_type=cache_type,
+                cache_key=cache_type.value,
+                cache_data=data,
+                cache_version=CALCULATION_VERSION,
+                calculation_time_ms=calculation_time_ms,
+            )
+            self.db.add(cache_entry)
+        else:
+            cache_entry.set_data(data)
+            cache_entry.cache_version = CALCULATION_VERSION
+            cache_entry.expires_at = datetime.utcnow() + ChartCache.get_expiry_duration(cache_type)
+            cache_entry.calculation_time_ms = calculation_time_ms
+            cache_entry.is_active = True
+
+        return cache_entry
 
     async def _get_subscription(self, user_id: str) -> Subscription:
         """Get user's subscription."""
@@ -239,83 +525,31 @@ class ChartService:
         chart_data: Dict[str, Any],
         calculation_time_ms: int,
     ):
-        """Cache one-time (natal) calculations."""
-        # Cache planetary positions
-        if "planets" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
+        """Cache one-time (natal) calculations, replacing earlier entries, in one bulk insert."""
+        rows = [
+            ChartCache.entry_values(
                 birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_POSITIONS,
-                cache_key="natal_positions",
-                cache_data=chart_data["planets"],
+                cache_type=cache_type,
+                cache_key=cache_key,
+                cache_data=chart_data[section],
+                cache_version=CALCULATION_VERSION,
                 calculation_time_ms=calculation_time_ms,
             )
-            self.db.add(cache_entry)
+            for section, (cache_type, cache_key) in NATAL_CACHE_SECTIONS.items()
+            if section in chart_data
+        ]
+        if not rows:
+            return
 
-        # Cache houses
-        if "houses" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
-                birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_HOUSES,
-                cache_key="natal_houses",
-                cache_data=chart_data["houses"],
-                calculation_time_ms=calculation_time_ms,
-            )
-            self.db.add(cache_entry)
-
-        # Cache divisional charts
-        if "divisional_charts" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
-                birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_DIVISIONAL,
-                cache_key="natal_divisional",
-                cache_data=chart_data["divisional_charts"],
-                calculation_time_ms=calculation_time_ms,
-            )
-            self.db.add(cache_entry)
-
-        # Cache dasha balance
-        if "dasha" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
-                birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_DASHA_BALANCE,
-                cache_key="natal_dasha",
-                cache_data=chart_data["dasha"],
-                calculation_time_ms=calculation_time_ms,
-            )
-            self.db.add(cache_entry)
-
-        # Cache yogas
-        if "yogas" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
-                birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_YOGAS,
-                cache_key="natal_yogas",
-                cache_data=chart_data["yogas"],
-                calculation_time_ms=calculation_time_ms,
-            )
-            self.db.add(cache_entry)
-
-        # Cache Shadbala
-        if "shadbala" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
-                birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_SHADBALA,
-                cache_key="natal_shadbala",
-                cache_data=chart_data["shadbala"],
-                calculation_time_ms=calculation_time_ms,
-            )
-            self.db.add(cache_entry)
-
-        # Cache Ashtakavarga
-        if "ashtakavarga" in chart_data:
-            cache_entry = ChartCache.create_cache_entry(
-                birth_chart_id=birth_chart_id,
-                cache_type=CacheType.NATAL_ASHTAKAVARGA,
-                cache_key="natal_ashtakavarga",
-                cache_data=chart_data["ashtakavarga"],
-                calculation_time_ms=calculation_time_ms,
+        await self.db.execute(
+            delete(ChartCache).where(
+                and_(
+                    ChartCache.birth_chart_id == birth_chart_id,
+                    ChartCache.cache_type.in_([row["cache_type"] for row in rows]),
+                )
             )
-            self.db.add(cache_entry)
+        )
+        await self.db.execute(insert(ChartCache), rows)
 
     async def _log_request(
         self,
@@ -0,0 +1,614 @@
+"""Offline gazetteer built from GeoNames city dumps.
+
+The index is a directory of compact, read-only files that are memory-mapped at
+runtime, so lookups never hit the network and cost a few binary searches:
+
+- ``records.dat``   one tab-separated record per place (name, admin, tz, ...)
+- ``names.dat``     sorted normalized names -> record ids (exact/prefix search)
+- ``prefixes.dat``  top places by population for short prefixes (2-4 chars)
+- ``trigrams.dat``  trigram posting lists for fuzzy matching
+- ``population.bin`` / ``coords.bin`` / ``tz.bin``  per-record numeric columns
+- ``tzgrid.bin``    precomputed lat/lon grid of time-zone ids
+- ``meta.json``     counts, grid geometry and the time-zone name table
+
+Every ``*.dat`` file has a sibling ``*.dat.idx`` holding the byte offset of each
+line, which is what makes mmap binary search possible.
+
+Build an index from https://download.geonames.org/export/dump/::
+
+    python -m app.services.gazetteer build --cities cities15000.txt \\
+        --admin1 admin1CodesASCII.txt --countries countryInfo.txt \\
+        --out data/gazetteer
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+import unicodedata
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.services.location_service import LocationResult
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+# Prefixes up to this length are answered from precomputed top lists
+PREFIX_TOP_MAX_LEN = 4
+PREFIX_TOP_SIZE = 20
+
+# Posting lists are kept sorted by population and truncated to this length
+TRIGRAM_POSTING_LIMIT = 5000
+
+# Time-zone grid cell flags
+TZ_GRID_NONE = 0x7FFF
+TZ_GRID_MIXED = 0x8000
+
+
+def normalize_name(text: str) -> str:
+    """Lowercase, strip accents and punctuation for index keys."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in stripped.lower())
+    return " ".join(cleaned.split())
+
+
+def trigrams(text: str) -> List[str]:
+    """Return the distinct trigrams of a normalized name."""
+    padded = f" {text} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def _fallback_timezone(longitude: float) -> str:
+    """Nautical time zone for locations with no nearby populated place."""
+    offset = int(round(longitude / 15.0))
+    if offset == 0:
+        return "Etc/GMT"
+    # Etc/GMT zones use inverted POSIX signs
+    return f"Etc/GMT{'-' if offset > 0 else '+'}{abs(offset)}"
+
+
+class SortedKeyFile:
+    """Read-only ``key\\tvalue`` line file searched through mmap."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._idx_file = open(path + ".idx", "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        idx_size = os.fstat(self._idx_file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._idx_mm = mmap.mmap(self._idx_file.fileno(), 0, access=mmap.ACCESS_READ) if idx_size else None
+        self._offsets = memoryview(self._idx_mm).cast("Q") if self._idx_mm else []
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _line(self, i: int) -> bytes:
+        start = self._offsets[i]
+        end = self._mm.find(b"\n", start)
+        return self._mm[start:end if end != -1 else len(self._mm)]
+
+    def _key(self, i: int) -> bytes:
+        start = self._offsets[i]
+        end = self._mm.find(b"\t", start)
+        return self._mm[start:end]
+
+    def item_at(self, i: int) -> Tuple[str, str]:
+        """Return the (key, value) pair on line ``i``."""
+        key, _, value = self._line(i).partition(b"\t")
+        return key.decode("utf-8"), value.decode("utf-8")
+
+    def value_at(self, i: int) -> str:
+        return self.item_at(i)[1]
+
+    def bisect_left(self, key: str) -> int:
+        """Index of the first line whose key is >= ``key``."""
+        target = key.encode("utf-8")
+        lo, hi = 0, len(self._offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the value for an exact key."""
+        i = self.bisect_left(key)
+        if i < len(self._offsets) and self._key(i) == key.encode("utf-8"):
+            return self.value_at(i)
+        return None
+
+    def iter_prefix(self, prefix: str) -> Iterator[Tuple[str, str]]:
+        """Yield (key, value) pairs whose key starts with ``prefix``."""
+        target = prefix.encode("utf-8")
+        i = self.bisect_left(prefix)
+        while i < len(self._offsets) and self._key(i).startswith(target):
+            yield self.item_at(i)
+            i += 1
+
+    def close(self) -> None:
+        self._offsets = []
+        for handle in (self._mm, self._idx_mm, self._file, self._idx_file):
+            if handle is not None:
+                handle.close()
+
+    @staticmethod
+    def write(path: str, items: Iterable[Tuple[str, str]]) -> int:
+        """Write ``(key, value)`` pairs (already sorted by key) and their offsets."""
+        offsets = array("Q")
+        position = 0
+        with open(path, "wb") as out:
+            for key, value in items:
+                line = f"{key}\t{value}\n".encode("utf-8")
+                offsets.append(position)
+                out.write(line)
+                position += len(line)
+        with open(path + ".idx", "wb") as idx:
+            offsets.tofile(idx)
+        return len(offsets)
+
+
+def _load_column(path: str, typecode: str) -> array:
+    column = array(typecode)
+    with open(path, "rb") as handle:
+        column.frombytes(handle.read())
+    return column
+
+
+class Gazetteer:
+    """Offline place search and time-zone lookup over a prebuilt index."""
+
+    def __init__(self, index_dir: str):
+        with open(os.path.join(index_dir, "meta.json")) as handle:
+            self.meta = json.load(handle)
+        if self.meta.get("version") != INDEX_VERSION:
+            raise ValueError(
+                f"Gazetteer index version {self.meta.get('version')} does not match {INDEX_VERSION}"
+            )
+
+        self.index_dir = index_dir
+        self.timezones: List[str] = self.meta["timezones"]
+        self.records = SortedKeyFile(os.path.join(index_dir, "records.dat"))
+        self.names = SortedKeyFile(os.path.join(index_dir, "names.dat"))
+        self.prefixes = SortedKeyFile(os.path.join(index_dir, "prefixes.dat"))
+        self.trigram_index = SortedKeyFile(os.path.join(index_dir, "trigrams.dat"))
+        self.population = _load_column(os.path.join(index_dir, "population.bin"), "I")
+        self.coords = _load_column(os.path.join(index_dir, "coords.bin"), "f")
+        self.record_tz = _load_column(os.path.join(index_dir, "tz.bin"), "H")
+        self.tz_grid = _load_column(os.path.join(index_dir, "tzgrid.bin"), "H")
+
+        grid = self.meta["tz_grid"]
+        self._grid_resolution = grid["resolution"]
+        self._grid_rows = grid["rows"]
+        self._grid_cols = grid["cols"]
+        self._buckets: Optional[Dict[Tuple[int, int], List[int]]] = None
+        self._buckets_lock = threading.Lock()
+
+        logger.info(f"Gazetteer loaded from {index_dir}: {len(self.records)} places")
+
+    # Search
+
+    def search(self, query: str, max_results: int = 10) -> List[LocationResult]:
+        """
+        Autocomplete search: exact, then prefix, then trigram fuzzy matches.
+
+        Args:
+            query: User input
+            max_results: Maximum number of results
+
+        Returns:
+            Matching places ranked by match quality and population
+        """
+        normalized = normalize_name(query)
+        if len(normalized) < 2:
+            return []
+
+        ranked: List[int] = []
+        seen = set()
+
+        def add(ids: Iterable[int]) -> None:
+            for record_id in ids:
+                if record_id not in seen:
+                    seen.add(record_id)
+                    ranked.append(record_id)
+
+        exact = self.names.get(normalized)
+        if exact:
+            add(self._parse_ids(exact))
+
+        if len(ranked) < max_results:
+            add(self._prefix_ids(normalized, max_results))
+
+        if len(ranked) < max_results:
+            add(self._fuzzy_ids(normalized, max_results))
+
+        return [self.record(record_id) for record_id in ranked[:max_results]]
+
+    def _prefix_ids(self, prefix: str, limit: int) -> List[int]:
+        if len(prefix) <= PREFIX_TOP_MAX_LEN:
+            value = self.prefixes.get(prefix)
+            return self._parse_ids(value) if value else []
+
+        # Longer prefixes select a narrow key range; rank it by population
+        candidates = set()
+        for _, value in self.names.iter_prefix(prefix):
+            candidates.update(self._parse_ids(value))
+            if len(candidates) >= TRIGRAM_POSTING_LIMIT:
+                break
+        return heapq.nlargest(limit, candidates, key=self.population.__getitem__)
+
+    def _fuzzy_ids(self, normalized: str, limit: int) -> List[int]:
+        query_grams = trigrams(normalized)
+        overlap: Dict[int, int] = {}
+        for gram in query_grams:
+            value = self.trigram_index.get(gram)
+            if not value:
+                continue
+            for record_id in self._parse_ids(value):
+                overlap[record_id] = overlap.get(record_id, 0) + 1
+
+        if not overlap:
+            return []
+
+        # Re-score the strongest candidates with a proper Jaccard similarity
+        shortlist = heapq.nlargest(
+            limit * 5, overlap.items(),
+            key=lambda item: (item[1], self.population[item[0]]),
+        )
+        scored = []
+        for record_id, shared in shortlist:
+            name_grams = len(trigrams(normalize_name(self._record_fields(record_id)[0])))
+            similarity = shared / (len(query_grams) + name_grams - shared)
+            if similarity >= 0.3:
+                scored.append((similarity, self.population[record_id], record_id))
+        scored.sort(reverse=True)
+        return [record_id for _, _, record_id in scored[:limit]]
+
+    @staticmethod
+    def _parse_ids(value: str) -> List[int]:
+        return [int(part) for part in value.split(",") if part]
+
+    def _record_fields(self, record_id: int) -> List[str]:
+        return self.records.value_at(record_id).split("\t")
+
+    def record(self, record_id: int) -> LocationResult:
+        """Materialize a record as a LocationResult."""
+        name, display_name, country, country_code, admin1, admin2 = self._record_fields(record_id)
+        return LocationResult(
+            name=name,
+            display_name=display_name,
+            # Coordinates are stored as float32; trim the representation noise
+            latitude=round(self.coords[record_id * 2], 4),
+            longitude=round(self.coords[record_id * 2 + 1], 4),
+            country=country,
+            country_code=country_code,
+            admin1=admin1,
+            admin2=admin2,
+            admin3=name,
+            timezone=self.timezones[self.record_tz[record_id]],
+            population=int(self.population[record_id]),
+            importance=1.0,
+            source="gazetteer",
+        )
+
+    # Time zones and reverse lookup
+
+    def timezone_at(self, latitude: float, longitude: float) -> str:
+        """
+        Resolve the IANA time zone for a coordinate.
+
+        Uses the precomputed grid; cells near a time-zone border are refined
+        with a nearest-place search.
+        """
+        row, col = self._grid_cell(latitude, longitude)
+        value = self.tz_grid[row * self._grid_cols + col]
+
+        if value == TZ_GRID_NONE:
+            return _fallback_timezone(longitude)
+        if value & TZ_GRID_MIXED:
+            nearest = self.nearest(latitude, longitude)
+            if nearest is not None:
+                return self.timezones[self.record_tz[nearest]]
+            value &= ~TZ_GRID_MIXED
+        return self.timezones[value]
+
+    def reverse(self, latitude: float, longitude: float) -> Optional[LocationResult]:
+        """Return the nearest populated place to a coordinate."""
+        nearest = self.nearest(latitude, longitude)
+        return self.record(nearest) if nearest is not None else None
+
+    def nearest(self, latitude: float, longitude: float, max_rings: int = 4) -> Optional[int]:
+        """Return the id of the nearest place within ``max_rings`` grid cells."""
+        buckets = self._get_buckets()
+        row, col = self._grid_cell(latitude, longitude)
+        best, best_distance = None, float("inf")
+
+        for ring in range(max_rings + 1):
+            for d_row in range(-ring, ring + 1):
+                for d_col in range(-ring, ring + 1):
+                    if max(abs(d_row), abs(d_col)) != ring:
+                        continue
+                    key = (row + d_row, (col + d_col) % self._grid_cols)
+                    for record_id in buckets.get(key, ()):
+                        distance = _distance_sq(
+                            latitude, longitude,
+                            self.coords[record_id * 2], self.coords[record_id * 2 + 1],
+                        )
+                        if distance < best_distance:
+                            best, best_distance = record_id, distance
+            # Anything found within this ring cannot be beaten by the next one
+            if best is not None and ring > 0:
+                break
+        return best
+
+    def _grid_cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        res = self._grid_resolution
+        row = min(self._grid_rows - 1, max(0, int((latitude + 90.0) / res)))
+        col = int(((longitude + 180.0) % 360.0) / res) % self._grid_cols
+        return row, col
+
+    def _get_buckets(self) -> Dict[Tuple[int, int], List[int]]:
+        if self._buckets is None:
+            with self._buckets_lock:
+                if self._buckets is None:
+                    buckets: Dict[Tuple[int, int], List[int]] = {}
+                    for record_id in range(len(self.population)):
+                        cell = self._grid_cell(self.coords[record_id * 2], self.coords[record_id * 2 + 1])
+                        buckets.setdefault(cell, []).append(record_id)
+                    self._buckets = buckets
+        return self._buckets
+
+    def close(self) -> None:
+        for sorted_file in (self.records, self.names, self.prefixes, self.trigram_index):
+            sorted_file.close()
+
+
+def _distance_sq(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Equirectangular squared distance; good enough for nearest-place ranking."""
+    d_lon = abs(lon1 - lon2)
+    if d_lon > 180.0:
+        d_lon = 360.0 - d_lon
+    d_lon *= math.cos(math.radians((lat1 + lat2) / 2.0))
+    return (lat1 - lat2) ** 2 + d_lon ** 2
+
+
+# Index builder
+
+
+def _read_admin1(path: Optional[str]) -> Dict[str, str]:
+    names = {}
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 2:
+                    names[parts[0]] = parts[1]
+    return names
+
+
+def _read_countries(path: Optional[str]) -> Dict[str, str]:
+    names = {}
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("#"):
+                    continue
+                parts = line.rstrip("\n").split("\t")
+                if len(parts) >= 5:
+                    names[parts[0]] = parts[4]
+    return names
+
+
+def build_index(cities_path: str, out_dir: str, admin1_path: Optional[str] = None,
+                countries_path: Optional[str] = None, grid_resolution: float = 0.5) -> Dict:
+    """
+    Build a gazetteer index from a GeoNames ``citiesNNNN.txt`` dump.
+
+    Args:
+        cities_path: Path to cities1000.txt / cities15000.txt
+        out_dir: Output directory for the index
+        admin1_path: Optional admin1CodesASCII.txt for state names
+        countries_path: Optional countryInfo.txt for country names
+        grid_resolution: Time-zone grid cell size in degrees
+
+    Returns:
+        The written metadata
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    admin1_names = _read_admin1(admin1_path)
+    country_names = _read_countries(countries_path)
+
+    places = []
+    with open(cities_path, encoding="utf-8") as handle:
+        for line in handle:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 18:
+                continue
+            places.append({
+                "name": parts[1],
+                "ascii": parts[2],
+                "alternates": [alt for alt in parts[3].split(",") if alt],
+                "lat": float(parts[4]),
+                "lon": float(parts[5]),
+                "country_code": parts[8],
+                "admin1": admin1_names.get(f"{parts[8]}.{parts[10]}", ""),
+                "population": int(parts[14] or 0),
+                "timezone": parts[17] or _fallback_timezone(float(parts[5])),
+            })
+
+    # Most populous first so record ids double as a population rank
+    places.sort(key=lambda place: -place["population"])
+
+    timezones = sorted({place["timezone"] for place in places})
+    tz_ids = {tz: i for i, tz in enumerate(timezones)}
+
+    population = array("I")
+    coords = array("f")
+    record_tz = array("H")
+    records = []
+    names: Dict[str, List[int]] = {}
+
+    for record_id, place in enumerate(places):
+        country = country_names.get(place["country_code"], place["country_code"])
+        display = ", ".join(part for part in (place["name"], place["admin1"], country) if part)
+        records.append((f"{record_id:08d}", "\t".join([
+            place["name"], display, country, place["country_code"], place["admin1"], "",
+        ])))
+        population.append(min(place["population"], 2 ** 32 - 1))
+        coords.extend((place["lat"], place["lon"]))
+        record_tz.append(tz_ids[place["timezone"]])
+
+        keys = {normalize_name(place["name"]), normalize_name(place["ascii"])}
+        keys.update(normalize_name(alt) for alt in place["alternates"])
+        for key in keys:
+            if len(key) >= 2:
+                names.setdefault(key, []).append(record_id)
+
+    # Ids were appended in population order, so lists are already ranked
+    SortedKeyFile.write(os.path.join(out_dir, "records.dat"), records)
+    SortedKeyFile.write(
+        os.path.join(out_dir, "names.dat"),
+        ((key, ",".join(map(str, ids))) for key, ids in sorted(names.items())),
+    )
+
+    prefix_top: Dict[str, List[int]] = {}
+    for key, ids in names.items():
+        for length in range(2, min(PREFIX_TOP_MAX_LEN, len(key)) + 1):
+            bucket = prefix_top.setdefault(key[:length], [])
+            if len(bucket) < PREFIX_TOP_SIZE or ids[0] < bucket[-1]:
+                bucket.extend(i for i in ids[:PREFIX_TOP_SIZE] if i not in bucket)
+                bucket.sort()
+                del bucket[PREFIX_TOP_SIZE:]
+    SortedKeyFile.write(
+        os.path.join(out_dir, "prefixes.dat"),
+        ((prefix, ",".join(map(str, ids))) for prefix, ids in sorted(prefix_top.items())),
+    )
+
+    postings: Dict[str, List[int]] = {}
+    for record_id, place in enumerate(places):
+        for gram in trigrams(normalize_name(place["name"])):
+            posting = postings.setdefault(gram, [])
+            if len(posting) < TRIGRAM_POSTING_LIMIT:
+                posting.append(record_id)
+    SortedKeyFile.write(
+        os.path.join(out_dir, "trigrams.dat"),
+        ((gram, ",".join(map(str, ids))) for gram, ids in sorted(postings.items())),
+    )
+
+    for filename, column in (("population.bin", population), ("coords.bin", coords), ("tz.bin", record_tz)):
+        with open(os.path.join(out_dir, filename), "wb") as handle:
+            column.tofile(handle)
+
+    grid_meta = _build_tz_grid(places, tz_ids, grid_resolution, os.path.join(out_dir, "tzgrid.bin"))
+
+    meta = {
+        "version": INDEX_VERSION,
+        "source": os.path.basename(cities_path),
+        "places": len(places),
+        "names": len(names),
+        "timezones": timezones,
+        "tz_grid": grid_meta,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w") as handle:
+        json.dump(meta, handle)
+
+    logger.info(f"Gazetteer index built: {len(places)} places, {len(names)} names in {out_dir}")
+    return meta
+
+
+def _build_tz_grid(places: List[Dict], tz_ids: Dict[str, int], resolution: float,
+                   path: str, max_rings: int = 4) -> Dict:
+    """Assign each grid cell the time zone of its nearest populated place."""
+    rows = int(math.ceil(180.0 / resolution))
+    cols = int(math.ceil(360.0 / resolution))
+
+    def cell_of(lat: float, lon: float) -> Tuple[int, int]:
+        return (min(rows - 1, max(0, int((lat + 90.0) / resolution))),
+                int(((lon + 180.0) % 360.0) / resolution) % cols)
+
+    buckets: Dict[Tuple[int, int], List[Dict]] = {}
+    for place in places:
+        buckets.setdefault(cell_of(place["lat"], place["lon"]), []).append(place)
+
+    grid = array("H", [TZ_GRID_NONE]) * (rows * cols)
+    for row in range(rows):
+        center_lat = -90.0 + (row + 0.5) * resolution
+        for col in range(cols):
+            center_lon = -180.0 + (col + 0.5) * resolution
+            best, best_distance = None, float("inf")
+            neighbour_zones = set()
+            for ring in range(max_rings + 1):
+                for d_row in range(-ring, ring + 1):
+                    for d_col in range(-ring, ring + 1):
+                        if max(abs(d_row), abs(d_col)) != ring:
+                            continue
+                        for place in buckets.get((row + d_row, (col + d_col) % cols), ()):
+                            if ring <= 1:
+                                neighbour_zones.add(place["timezone"])
+                            distance = _distance_sq(center_lat, center_lon, place["lat"], place["lon"])
+                            if distance < best_distance:
+                                best, best_distance = place, distance
+                if best is not None and ring > 0:
+                    break
+            if best is None:
+                continue
+            value = tz_ids[best["timezone"]]
+            if len(neighbour_zones) > 1:
+                value |= TZ_GRID_MIXED
+            grid[row * cols + col] = value
+
+    with open(path, "wb") as handle:
+        grid.tofile(handle)
+    return {"resolution": resolution, "rows": rows, "cols": cols}
+
+
+# Global instance
+_gazetteer: Optional[Gazetteer] = None
+_gazetteer_loaded = False
+
+
+def get_gazetteer() -> Optional[Gazetteer]:
+    """Get the global gazetteer, or None if no index is configured."""
+    global _gazetteer, _gazetteer_loaded
+    if not _gazetteer_loaded:
+        _gazetteer_loaded = True
+        index_dir = os.getenv("GAZETTEER_PATH", "")
+        if index_dir and os.path.exists(os.path.join(index_dir, "meta.json")):
+            try:
+                _gazetteer = Gazetteer(index_dir)
+            except Exception as e:
+                logger.error(f"Failed to load gazetteer index from {index_dir}: {e}")
+        else:
+            logger.info("Offline gazetteer not configured (set GAZETTEER_PATH)")
+    return _gazetteer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline gazetteer index tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Build an index from a GeoNames dump")
+    build.add_argument("--cities", required=True, help="cities1000.txt or cities15000.txt")
+    build.add_argument("--admin1", help="admin1CodesASCII.txt")
+    build.add_argument("--countries", help="countryInfo.txt")
+    build.add_argument("--out", required=True, help="Output directory")
+    build.add_argument("--grid-resolution", type=float, default=0.5, help="Time-zone grid cell size")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "build":
+        meta = build_index(args.cities, args.out, args.admin1, args.countries, args.grid_resolution)
+        print(json.dumps({k: v for k, v in meta.items() if k != "timezones"}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
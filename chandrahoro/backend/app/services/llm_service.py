@@ -3,6 +3,7 @@
 import os
 import json
 import time
+import hashlib
 import asyncio
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
@@ -15,6 +16,9 @@ from app.models import (
     LlmProvider, ResponseFormat, AuditAction, AiModuleType
 )
 from app.core.security import hash_password
+from app.core.metrics import observe_llm_request
+from app.core.profiling import profile_span
+from app.core.single_flight import flight_key, get_single_flight
 import logging
 import httpx
 
@@ -1006,7 +1010,6 @@ class LlmService:
                     logger.warning("No HTML tags found in LLM response, using template fallback")
 
                     import os
-                    from datetime import datetime
 
                     template_path = os.path.join(
                         os.path.dirname(os.path.dirname(__file__)),
@@ -1180,6 +1183,7 @@ class LlmService:
                 "error": f"Failed to generate PDF: {str(e)}"
             }
 
+    @profile_span("llm.generate")
     async def _generate_with_provider(
         self,
         provider: LlmProvider,
@@ -1214,15 +1218,37 @@ class LlmService:
         if os.getenv("AI_DEMO_MODE", "false").lower() == "true":
             return await self._generate_demo_response(request_type, data)
 
+        # Identical requests made with the same API key (e.g. a report
+        # requested twice) share one provider call
+        key = flight_key(
+            provider.value, model, hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
+            request_type, custom_prompt, data,
+        )
+        result = await get_single_flight("llm", shared=True).do(
+            key, lambda: self._call_provider(provider, api_key, model, data, request_type, custom_prompt)
+        )
+        return dict(result)
+
+    async def _call_provider(
+        self,
+        provider: LlmProvider,
+        api_key: str,
+        model: str,
+        data: Dict[str, Any],
+        request_type: str,
+        custom_prompt: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Make one provider call and record its metrics."""
+        started = time.perf_counter()
         try:
             if provider == LlmProvider.OPENROUTER:
-                return await self._generate_openrouter(api_key, model, data, request_type, custom_prompt)
+                result = await self._generate_openrouter(api_key, model, data, request_type, custom_prompt)
             elif provider == LlmProvider.OPENAI:
-                return await self._generate_openai(api_key, model, data, request_type, custom_prompt)
+                result = await self._generate_openai(api_key, model, data, request_type, custom_prompt)
             elif provider == LlmProvider.ANTHROPIC:
-                return await self._generate_anthropic(api_key, model, data, request_type, custom_prompt)
+                result = await self._generate_anthropic(api_key, model, data, request_type, custom_prompt)
             elif provider == LlmProvider.PERPLEXITY:
-                return await self._generate_perplexity(api_key, model, data, request_type, custom_prompt)
+                result = await self._generate_perplexity(api_key, model, data, request_type, custom_prompt)
             else:
                 return {
                     "success": False,
@@ -1230,11 +1256,17 @@ class LlmService:
                 }
         except Exception as e:
             logger.error(f"Error in _generate_with_provider: {e}")
-            return {
+            result = {
                 "success": False,
                 "error": f"Provider error: {str(e)}"
             }
 
+        observe_llm_request(
+            provider.value, model, time.perf_counter() - started,
+            bool(result.get("success")), result.get("tokens") or 0,
+        )
+        return result
+
     async def _generate_demo_response(self, request_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate demo/mock responses for testing without real API calls."""
 
@@ -1426,7 +1458,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
         try:
             import openai
 
-            client = openai.OpenAI(
+            client = openai.AsyncOpenAI(
                 api_key=api_key,
                 base_url="https://openrouter.ai/api/v1"
             )
@@ -1446,7 +1478,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
                 else:
                     raise ValueError(f"Unknown request type: {request_type}")
 
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=8000,  # Increased for comprehensive horoscope reports
@@ -1518,7 +1550,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
         try:
             import openai
 
-            client = openai.OpenAI(api_key=api_key)
+            client = openai.AsyncOpenAI(api_key=api_key)
 
             # Use custom prompt if provided, otherwise use default
             if custom_prompt:
@@ -1535,7 +1567,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
                 else:
                     raise ValueError(f"Unknown request type: {request_type}")
 
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=8000,  # Increased for comprehensive horoscope reports
@@ -1567,7 +1599,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
         try:
             import anthropic
 
-            client = anthropic.Anthropic(api_key=api_key)
+            client = anthropic.AsyncAnthropic(api_key=api_key)
 
             # Use custom prompt if provided, otherwise use default
             if custom_prompt:
@@ -1584,7 +1616,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
                 else:
                     raise ValueError(f"Unknown request type: {request_type}")
 
-            response = client.messages.create(
+            response = await client.messages.create(
                 model=model,
                 max_tokens=8000,  # Increased for comprehensive horoscope reports
                 temperature=0.7,
@@ -1616,7 +1648,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
         try:
             import openai
 
-            client = openai.OpenAI(
+            client = openai.AsyncOpenAI(
                 api_key=api_key,
                 base_url="https://api.perplexity.ai"
             )
@@ -1636,7 +1668,7 @@ Your chart shows interesting patterns that suggest this is a good time for intro
                 else:
                     raise ValueError(f"Unknown request type: {request_type}")
 
-            response = client.chat.completions.create(
+            response = await client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=8000,  # Increased for comprehensive horoscope reports
@@ -2,13 +2,15 @@
 
 import asyncio
 import logging
+import os
 import re
 from typing import List, Dict, Any, Optional, Tuple
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 import aiohttp
-import json
-from urllib.parse import quote
+
+from app.core.single_flight import get_single_flight
 
 logger = logging.getLogger(__name__)
 
@@ -31,38 +33,181 @@ class LocationResult:
     source: str  # Which API provided this result
 
 
-class LocationCache:
-    """Simple in-memory cache for location results."""
+def normalize_query(query: str) -> str:
+    """Normalize a search query for cache keys and coalescing."""
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
 
-    def __init__(self, ttl_hours: int = 24):
-        self._cache: Dict[str, Tuple[List[LocationResult], datetime]] = {}
-        self._ttl = timedelta(hours=ttl_hours)
 
-    def get(self, query: str) -> Optional[List[LocationResult]]:
+class LocationCache:
+    """
+    Size-bounded in-memory TTL LRU cache for location results.
+
+    Complete, non-empty answers are kept for ``LOCATION_CACHE_TTL_HOURS``;
+    empty or partial ones (a provider was throttled or failed) only for
+    ``LOCATION_CACHE_NEGATIVE_TTL_SECONDS``.
+    """
+
+    def __init__(self, ttl_hours: Optional[float] = None, max_entries: Optional[int] = None,
+                 negative_ttl_seconds: Optional[float] = None):
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv("LOCATION_CACHE_TTL_HOURS", "24"))
+        if max_entries is None:
+            max_entries = int(os.getenv("LOCATION_CACHE_MAX_ENTRIES", "5000"))
+        if negative_ttl_seconds is None:
+            negative_ttl_seconds = float(os.getenv("LOCATION_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+        # key -> (results, expires_at)
+        self._cache: "OrderedDict[str, Tuple[List[LocationResult], float]]" = OrderedDict()
+        self._ttl = ttl_hours * 3600
+        self.negative_ttl = negative_ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(query: str, max_results: int = 10) -> str:
+        return f"{normalize_query(query)}|{max_results}"
+
+    def get(self, query: str, max_results: int = 10) -> Optional[List[LocationResult]]:
         """Get cached results for a query."""
-        key = query.lower().strip()
-        if key in self._cache:
-            results, timestamp = self._cache[key]
-            if datetime.now() - timestamp < self._ttl:
+        key = self.make_key(query, max_results)
+        entry = self._cache.get(key)
+        if entry is not None:
+            results, expires_at = entry
+            if time.monotonic() < expires_at:
+                self._cache.move_to_end(key)
+                self.hits += 1
                 return results
-            else:
-                del self._cache[key]
+            del self._cache[key]
+            self.expirations += 1
+        self.misses += 1
         return None
 
-    def set(self, query: str, results: List[LocationResult]) -> None:
-        """Cache results for a query."""
-        key = query.lower().strip()
-        self._cache[key] = (results, datetime.now())
+    def set(self, query: str, results: List[LocationResult], max_results: int = 10,
+            ttl_seconds: Optional[float] = None) -> None:
+        """Cache results for a query (default TTL unless given), evicting the least recently used entries."""
+        ttl = self._ttl if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        key = self.make_key(query, max_results)
+        self._cache[key] = (results, time.monotonic() + ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self.evictions += 1
 
     def clear_expired(self) -> None:
         """Remove expired cache entries."""
-        now = datetime.now()
+        now = time.monotonic()
         expired_keys = [
-            key for key, (_, timestamp) in self._cache.items()
-            if now - timestamp >= self._ttl
+            key for key, (_, expires_at) in self._cache.items()
+            if now >= expires_at
         ]
         for key in expired_keys:
             del self._cache[key]
+        self.expirations += len(expired_keys)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self._ttl,
+            "negative_ttl_seconds": self.negative_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class ProviderSession:
+    """
+    Pooled aiohttp session shared by all searches of one provider.
+
+    Requests are spaced at least ``min_interval`` seconds apart to respect the
+    provider's usage policy. Callers that would have to queue for longer than
+    ``max_wait`` are turned away instead, so a burst of keystrokes degrades to
+    cached/offline results rather than piling up behind the rate limit.
+    """
+
+    def __init__(self, name: str, min_interval: float = 0.0, max_wait: float = 2.0,
+                 pool_size: int = 10, headers: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.min_interval = min_interval
+        self.max_wait = max_wait
+        self.pool_size = pool_size
+        self.headers = headers or {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._next_slot = 0.0
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300),
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def _acquire_slot(self) -> bool:
+        """Reserve the next request slot; False if the queue is too long."""
+        if self.min_interval <= 0:
+            return True
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        if slot - now > self.max_wait:
+            self.throttled += 1
+            return False
+        self._next_slot = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return True
+
+    async def get_json(self, url: str, params: Dict[str, Any]) -> Optional[Any]:
+        """GET a JSON document, or None if throttled or the request failed."""
+        if not await self._acquire_slot():
+            logger.info(f"{self.name} rate limit reached, skipping request")
+            return None
+
+        self.requests += 1
+        try:
+            async with self._get_session().get(url, params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                self.errors += 1
+                logger.error(f"{self.name} API error: {response.status}")
+                return None
+        except Exception:
+            self.errors += 1
+            raise
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "min_interval_seconds": self.min_interval,
+        }
 
 
 class GeoNamesProvider:
@@ -71,9 +216,13 @@ class GeoNamesProvider:
     def __init__(self, username: str):
         self.username = username
         self.base_url = "http://api.geonames.org"
+        self.http = ProviderSession(
+            "GeoNames",
+            min_interval=float(os.getenv("GEONAMES_MIN_INTERVAL_SECONDS", "0.0")),
+        )
 
-    async def search(self, query: str, max_results: int = 10) -> List[LocationResult]:
-        """Search locations using GeoNames API."""
+    async def search(self, query: str, max_results: int = 10) -> Optional[List[LocationResult]]:
+        """Search locations using GeoNames API (None if throttled or the request failed)."""
         if not self.username or self.username == "your_geonames_username":
             logger.warning("GeoNames username not configured, skipping GeoNames search")
             return []
@@ -90,18 +239,12 @@ class GeoNamesProvider:
 
             url = f"{self.base_url}/searchJSON"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, timeout=5) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_geonames_response(data)
-                    else:
-                        logger.error(f"GeoNames API error: {response.status}")
-                        return []
+            data = await self.http.get_json(url, params)
+            return self._parse_geonames_response(data) if data is not None else None
 
         except Exception as e:
             logger.error(f"GeoNames search error: {e}")
-            return []
+            return None
 
     def _parse_geonames_response(self, data: Dict[str, Any]) -> List[LocationResult]:
         """Parse GeoNames API response."""
@@ -145,11 +288,18 @@ class GeoNamesProvider:
 class NominatimProvider:
     """OpenStreetMap Nominatim API provider."""
 
-    def __init__(self):
+    def __init__(self, gazetteer=None):
         self.base_url = "https://nominatim.openstreetmap.org"
-
-    async def search(self, query: str, max_results: int = 10) -> List[LocationResult]:
-        """Search locations using Nominatim API."""
+        self.gazetteer = gazetteer
+        # Nominatim's usage policy allows at most one request per second
+        self.http = ProviderSession(
+            "Nominatim",
+            min_interval=float(os.getenv("NOMINATIM_MIN_INTERVAL_SECONDS", "1.0")),
+            headers={'User-Agent': 'Chandrahoro-Astrology-App/1.0 (contact@example.com)'},
+        )
+
+    async def search(self, query: str, max_results: int = 10) -> Optional[List[LocationResult]]:
+        """Search locations using Nominatim API (None if throttled or the request failed)."""
         try:
             params = {
                 'q': query,
@@ -161,27 +311,12 @@ class NominatimProvider:
                 'accept-language': 'en'
             }
 
-            headers = {
-                'User-Agent': 'Chandrahoro-Astrology-App/1.0 (contact@example.com)'
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{self.base_url}/search",
-                    params=params,
-                    headers=headers,
-                    timeout=5
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._parse_nominatim_response(data)
-                    else:
-                        logger.error(f"Nominatim API error: {response.status}")
-                        return []
+            data = await self.http.get_json(f"{self.base_url}/search", params)
+            return self._parse_nominatim_response(data) if data is not None else None
 
         except Exception as e:
             logger.error(f"Nominatim search error: {e}")
-            return []
+            return None
 
     def _parse_nominatim_response(self, data: List[Dict[str, Any]]) -> List[LocationResult]:
         """Parse Nominatim API response."""
@@ -227,8 +362,10 @@ class NominatimProvider:
         return results
 
     def _get_timezone_from_coords(self, lat: float, lon: float) -> str:
-        """Simple timezone estimation based on coordinates."""
-        # This is a simplified approach - in production, use a proper timezone API
+        """Timezone from the offline gazetteer, else a coarse coordinate estimate."""
+        if self.gazetteer is not None:
+            return self.gazetteer.timezone_at(lat, lon)
+
         if 68.7 <= lon <= 97.25 and 8.4 <= lat <= 37.6:  # India
             return "Asia/Kolkata"
         elif -125 <= lon <= -66.9 and 20.7 <= lat <= 71.5:  # USA
@@ -250,9 +387,17 @@ class EnhancedLocationService:
     """Enhanced location search service with multiple providers."""
 
     def __init__(self, geonames_username: Optional[str] = None):
+        # Imported here because the gazetteer builds LocationResult objects
+        from app.services.gazetteer import get_gazetteer
+
         self.cache = LocationCache()
+        self.gazetteer = get_gazetteer()
+        self.offline_only = os.getenv("LOCATION_OFFLINE_ONLY", "false").lower() == "true"
         self.geonames = GeoNamesProvider(geonames_username) if geonames_username else None
-        self.nominatim = NominatimProvider()
+        self.nominatim = NominatimProvider(self.gazetteer)
+
+        # Identical concurrent queries share one upstream search
+        self._flights = get_single_flight("location")
 
         # Indian cities database for better coverage
         self.indian_cities = self._load_indian_cities()
@@ -339,25 +484,48 @@ class EnhancedLocationService:
             return []
 
         # Check cache first
-        cached_results = self.cache.get(query)
-        if cached_results:
-            logger.info(f"Returning cached results for query: {query}")
+        cached_results = self.cache.get(query, max_results)
+        if cached_results is not None:
+            logger.debug(f"Returning cached results for query: {query}")
             return cached_results[:max_results]
 
-        # Clean up expired cache entries periodically
-        self.cache.clear_expired()
+        results = await self._flights.do(
+            self.cache.make_key(query, max_results),
+            lambda: self._search_and_cache(query, max_results),
+        )
+        return results[:max_results]
+
+    async def _search_and_cache(self, query: str, max_results: int) -> List[LocationResult]:
+        results, complete = await self._search_uncached(query, max_results)
+        # Empty or partial answers are retried soon instead of pinned for the full TTL
+        ttl = None if complete and results else self.cache.negative_ttl
+        self.cache.set(query, results, max_results, ttl_seconds=ttl)
+        return results
+
+    async def _search_uncached(self, query: str, max_results: int) -> Tuple[List[LocationResult], bool]:
+        """
+        Run the offline and upstream searches for a cache miss.
 
+        Returns:
+            (results, complete); complete is False when a provider call was
+            throttled or failed
+        """
         # Search in built-in database first (for Indian cities)
         builtin_results = self._search_builtin(query)
 
+        # Offline gazetteer answers most autocomplete queries without the network
+        gazetteer_results = self.gazetteer.search(query, max_results) if self.gazetteer else []
+
         # Search using external APIs
         api_results = []
+        complete = True
 
-        # Try multiple providers concurrently
+        # Only fall back to the network when the offline index is not enough
         tasks = []
-        if self.geonames:
-            tasks.append(self.geonames.search(query, max_results))
-        tasks.append(self.nominatim.search(query, max_results))
+        if not self.offline_only and len(gazetteer_results) < max_results:
+            if self.geonames:
+                tasks.append(self.geonames.search(query, max_results))
+            tasks.append(self.nominatim.search(query, max_results))
 
         if tasks:
             try:
@@ -365,23 +533,42 @@ class EnhancedLocationService:
                 for response in api_responses:
                     if isinstance(response, list):
                         api_results.extend(response)
-                    elif isinstance(response, Exception):
-                        logger.warning(f"API search error: {response}")
+                    else:
+                        complete = False
+                        if isinstance(response, Exception):
+                            logger.warning(f"API search error: {response}")
             except Exception as e:
+                complete = False
                 logger.error(f"Error in concurrent API search: {e}")
 
         # Combine and deduplicate results
-        all_results = builtin_results + api_results
+        all_results = builtin_results + gazetteer_results + api_results
         deduplicated_results = self._deduplicate_results(all_results)
 
         # Sort by relevance and importance
         sorted_results = self._sort_results(deduplicated_results, query)
 
-        # Cache the results
-        self.cache.set(query, sorted_results)
-
         logger.info(f"Found {len(sorted_results)} locations for query: {query}")
-        return sorted_results[:max_results]
+        return sorted_results, complete
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache, coalescing and provider statistics."""
+        providers = {"nominatim": self.nominatim.http.get_stats()}
+        if self.geonames:
+            providers["geonames"] = self.geonames.http.get_stats()
+        return {
+            "cache": self.cache.get_stats(),
+            "coalesced": self._flights.coalesced,
+            "inflight": self._flights.get_stats()["inflight"],
+            "providers": providers,
+            "gazetteer_loaded": self.gazetteer is not None,
+        }
+
+    async def close(self) -> None:
+        """Close pooled provider sessions."""
+        await self.nominatim.http.close()
+        if self.geonames:
+            await self.geonames.http.close()
 
     def _search_builtin(self, query: str) -> List[LocationResult]:
         """Search in built-in Indian cities database."""
@@ -433,6 +620,8 @@ class EnhancedLocationService:
             # Boost built-in results for Indian cities
             if result.source == "builtin":
                 score += 1.0
+            elif result.source == "gazetteer":
+                score += 0.5
 
             return score
 
@@ -448,4 +637,10 @@ def get_location_service(geonames_username: Optional[str] = None) -> EnhancedLoc
     global _location_service
     if _location_service is None:
         _location_service = EnhancedLocationService(geonames_username)
-    return _location_service
\ No newline at end of file
+    return _location_service
+
+
+async def close_location_service() -> None:
+    """Close the global location service's HTTP sessions."""
+    if _location_service is not None:
+        await _location_service.close()
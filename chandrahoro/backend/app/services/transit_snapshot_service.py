@@ -0,0 +1,194 @@
+"""Shared transit snapshot service.
+
+Current planetary positions are the same for every user at a given instant,
+so they are computed once per tick (e.g. each minute) and shared across
+requests through an in-process LRU and, when configured, across workers
+through Redis. Per-chart work is then just the natal overlay in
+``TransitCalculator.overlay_natal_chart``.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.panchanga import calculate_panchanga
+from app.core.redis_client import get_redis, mark_redis_failed
+from app.core.single_flight import flight_key, get_single_flight
+from app.core.transits import TransitCalculator
+
+logger = logging.getLogger(__name__)
+
+TRANSIT_PLANETS = ['Sun', 'Moon', 'Mercury', 'Venus', 'Mars', 'Jupiter', 'Saturn', 'Rahu', 'Ketu']
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class TransitSnapshotService:
+    """Compute planetary positions once per tick and share them."""
+
+    def __init__(self, tick_seconds: Optional[int] = None, cache_size: Optional[int] = None):
+        if tick_seconds is None:
+            tick_seconds = int(os.getenv("TRANSIT_SNAPSHOT_TICK_SECONDS", "60"))
+        if cache_size is None:
+            cache_size = int(os.getenv("TRANSIT_SNAPSHOT_CACHE_SIZE", "256"))
+        self.tick_seconds = max(1, tick_seconds)
+        self.cache_size = max(1, cache_size)
+        self._snapshots: "OrderedDict[Tuple[str, int], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.computed = 0
+
+    def bucket_for(self, at: datetime) -> int:
+        """Tick bucket number containing ``at``."""
+        return int((at - _EPOCH).total_seconds() // self.tick_seconds)
+
+    def bucket_start(self, bucket: int) -> datetime:
+        return _EPOCH + timedelta(seconds=bucket * self.tick_seconds)
+
+    def _redis_key(self, ayanamsha: str, bucket: int) -> str:
+        return f"transit_snapshot:{ayanamsha}:{self.tick_seconds}:{bucket}"
+
+    def _redis_ttl(self) -> int:
+        # Keep at least an hour so date-based lookups are shared too
+        return max(self.tick_seconds * 2, 3600)
+
+    def compute_snapshot(self, at: datetime, ayanamsha: str = "Lahiri") -> Dict[str, Any]:
+        """Compute a snapshot for the start of the tick containing ``at``."""
+        bucket = self.bucket_for(at)
+        instant = self.bucket_start(bucket)
+        # A fresh calculator re-applies the sidereal mode for this ayanamsha
+        calculator = TransitCalculator(ayanamsha=ayanamsha)
+        positions = calculator._calculate_current_positions(instant, TRANSIT_PLANETS)
+        self.computed += 1
+        return {
+            "calculation_date": instant.isoformat(),
+            "ayanamsha": ayanamsha,
+            "bucket": bucket,
+            "tick_seconds": self.tick_seconds,
+            "positions": positions,
+            "panchanga": calculate_panchanga(
+                positions["Sun"]["sidereal_longitude"],
+                positions["Moon"]["sidereal_longitude"],
+                instant,
+            ),
+        }
+
+    def _get_local(self, key: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+                self.local_hits += 1
+            return snapshot
+
+    def _set_local(self, key: Tuple[str, int], snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._snapshots[key] = snapshot
+            self._snapshots.move_to_end(key)
+            while len(self._snapshots) > self.cache_size:
+                self._snapshots.popitem(last=False)
+
+    def get_snapshot(self, at: Optional[datetime] = None, ayanamsha: str = "Lahiri") -> Dict[str, Any]:
+        """
+        Get the snapshot for ``at`` from the local cache, computing it if needed.
+
+        Args:
+            at: Instant in UT (default: now)
+            ayanamsha: Ayanamsha system
+
+        Returns:
+            Snapshot dict with ``positions`` keyed by planet
+        """
+        at = at or datetime.utcnow()
+        key = (ayanamsha, self.bucket_for(at))
+        snapshot = self._get_local(key)
+        if snapshot is None:
+            snapshot = self.compute_snapshot(at, ayanamsha)
+            self._set_local(key, snapshot)
+        return snapshot
+
+    async def get_snapshot_async(self, at: Optional[datetime] = None,
+                                 ayanamsha: str = "Lahiri") -> Dict[str, Any]:
+        """
+        Get the snapshot for ``at``, shared across workers through Redis.
+
+        Args:
+            at: Instant in UT (default: now)
+            ayanamsha: Ayanamsha system
+
+        Returns:
+            Snapshot dict with ``positions`` keyed by planet
+        """
+        at = at or datetime.utcnow()
+        bucket = self.bucket_for(at)
+        key = (ayanamsha, bucket)
+
+        snapshot = self._get_local(key)
+        if snapshot is not None:
+            return snapshot
+
+        # Concurrent misses for the same tick (and, with SINGLE_FLIGHT_SHARED,
+        # other workers' misses) wait for one computation
+        return await get_single_flight("transit_snapshot", shared=True).do(
+            flight_key(ayanamsha, bucket, self.tick_seconds),
+            lambda: self._load_or_compute(at, ayanamsha, bucket),
+        )
+
+    async def _load_or_compute(self, at: datetime, ayanamsha: str, bucket: int) -> Dict[str, Any]:
+        """Read the snapshot from Redis, or compute and publish it."""
+        key = (ayanamsha, bucket)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                cached = await redis.get(self._redis_key(ayanamsha, bucket))
+                if cached:
+                    snapshot = json.loads(cached)
+                    self.redis_hits += 1
+                    self._set_local(key, snapshot)
+                    return snapshot
+            except Exception as e:
+                mark_redis_failed(e)
+                redis = None
+
+        snapshot = self.compute_snapshot(at, ayanamsha)
+        self._set_local(key, snapshot)
+
+        if redis is not None:
+            try:
+                await redis.set(
+                    self._redis_key(ayanamsha, bucket),
+                    json.dumps(snapshot),
+                    ex=self._redis_ttl(),
+                )
+            except Exception as e:
+                mark_redis_failed(e)
+
+        return snapshot
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cached = len(self._snapshots)
+        return {
+            "tick_seconds": self.tick_seconds,
+            "cached_snapshots": cached,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "computed": self.computed,
+        }
+
+
+# Global instance
+_snapshot_service: Optional[TransitSnapshotService] = None
+
+
+def get_transit_snapshot_service() -> TransitSnapshotService:
+    """Get or create the global transit snapshot service."""
+    global _snapshot_service
+    if _snapshot_service is None:
+        _snapshot_service = TransitSnapshotService()
+    return _snapshot_service
@@ -0,0 +1,315 @@
+"""Benchmark suite for the astrology core.
+
+Times each calculator on the fixed birth charts in ``benchmarks.fixtures``
+(inputs such as planet positions are prepared outside the timed region):
+
+- ephemeris.planets: EphemerisCalculator.calculate_all_planets
+- dasha.navigator: VimshottariDasha.get_comprehensive_dasha_navigator (120 years)
+- kp.sub_lords: KP sub-lords of the nine grahas and the ascendant
+- vargas: DivisionalChartCalculator.calculate_all_divisional_charts
+- yogas, shadbala, ashtakavarga
+- methodology.<name>: calculate_chart of every registered methodology
+- api.chart_calculate: POST /api/v1/chart/calculate through the ASGI app
+  (authenticated, SQLite database, chart state cache cleared per call)
+
+Each benchmark is calibrated so one sample takes at least ``--min-time``
+seconds, then ``--samples`` samples are timed with the GC paused. Results
+(per-call seconds: median, min, max, mean, stdev) are written as JSON for
+``benchmarks.compare``.
+
+Usage (from chandrahoro/backend)::
+
+    python -m benchmarks.bench_core [--samples 15] [--min-time 0.05] [--filter dasha]
+        [--output benchmarks/results/core.json]
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# The end-to-end benchmark runs against a throwaway SQLite database
+_DB_DIR = tempfile.mkdtemp(prefix="bench-core-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'bench.db')}")
+
+from app.core import jaimini_methodology, kp_methodology, parashara_methodology, western_methodology  # noqa: F401,E402
+from app.core.ashtakavarga import AshtakavargaCalculator  # noqa: E402
+from app.core.base_methodology import BirthData, CalculationPreferences, MethodologyRegistry  # noqa: E402
+from app.core.chart_sections import ChartComputation, clear_chart_state_cache  # noqa: E402
+from app.core.dasha import VimshottariDasha  # noqa: E402
+from app.core.divisional_charts import DivisionalChartCalculator  # noqa: E402
+from app.core.ephemeris import EphemerisCalculator  # noqa: E402
+from app.core.shadbala import ShadbalaCalculator  # noqa: E402
+from app.core.yogas import YogaDetector  # noqa: E402
+from app.models.chart import ChartPreferences  # noqa: E402
+from benchmarks.fixtures import BIRTH_FIXTURES  # noqa: E402
+
+SUITE = "core"
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+class Case:
+    """One benchmark: ``run(i)`` performs a single call on fixture ``i``."""
+
+    def __init__(self, name: str, run: Callable[[int], Any], teardown: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.run = run
+        self.teardown = teardown
+
+
+def prepare_inputs() -> List[Dict[str, Any]]:
+    """Per-fixture calculator inputs (computed once, outside any timing)."""
+    preferences = ChartPreferences()
+    inputs = []
+    for birth_details in BIRTH_FIXTURES:
+        state = ChartComputation(birth_details, preferences)
+        inputs.append({
+            "birth_details": birth_details,
+            "birth_datetime": state.birth_datetime,
+            "planet_positions": state.get("planet_positions"),
+            "ascendant_data": state.get("ascendant_data"),
+            "natal_state": state.get("natal_state"),
+            "moon_longitude": state.get("moon_longitude"),
+        })
+    return inputs
+
+
+def calculator_cases(inputs: List[Dict[str, Any]]) -> List[Case]:
+    preferences = ChartPreferences()
+    ephemeris = EphemerisCalculator(ayanamsha=preferences.ayanamsha)
+    dasha = VimshottariDasha()
+    kp = MethodologyRegistry.get("kp")
+    vargas = DivisionalChartCalculator()
+    chart_types = preferences.get_all_divisional_charts()
+    yogas = YogaDetector()
+    shadbala = ShadbalaCalculator()
+    ashtakavarga = AshtakavargaCalculator()
+
+    def kp_sub_lords(i: int) -> None:
+        longitudes = [planet["sidereal_longitude"] for planet in inputs[i]["planet_positions"].values()]
+        longitudes.append(inputs[i]["ascendant_data"]["sidereal_longitude"])
+        for longitude in longitudes:
+            kp._calculate_sub_lord(longitude)
+
+    return [
+        Case("ephemeris.planets", lambda i: ephemeris.calculate_all_planets(inputs[i]["birth_datetime"])),
+        Case("dasha.navigator", lambda i: dasha.get_comprehensive_dasha_navigator(
+            inputs[i]["birth_datetime"], inputs[i]["moon_longitude"], years_ahead=120)),
+        Case("kp.sub_lords", kp_sub_lords),
+        Case("vargas", lambda i: vargas.calculate_all_divisional_charts(
+            inputs[i]["planet_positions"], chart_types=chart_types)),
+        Case("yogas", lambda i: yogas.detect_all_yogas(inputs[i]["natal_state"])),
+        Case("shadbala", lambda i: shadbala.calculate_shadbala(
+            inputs[i]["birth_datetime"], inputs[i]["birth_details"].latitude,
+            inputs[i]["birth_details"].longitude, inputs[i]["natal_state"])),
+        Case("ashtakavarga", lambda i: ashtakavarga.calculate_ashtakavarga(inputs[i]["natal_state"])),
+    ]
+
+
+def methodology_cases(inputs: List[Dict[str, Any]]) -> List[Case]:
+    preferences = ChartPreferences()
+    cases = []
+    for name, methodology in MethodologyRegistry.get_all().items():
+        birth_data = [
+            BirthData(
+                date=item["birth_datetime"],
+                latitude=item["birth_details"].latitude,
+                longitude=item["birth_details"].longitude,
+                timezone=item["birth_details"].timezone,
+                location_name=item["birth_details"].location_name,
+                name=item["birth_details"].name,
+            )
+            for item in inputs
+        ]
+        method_preferences = CalculationPreferences(
+            methodology=name,
+            ayanamsha=preferences.ayanamsha,
+            house_system=preferences.house_system,
+            chart_style=preferences.chart_style,
+        )
+        cases.append(Case(
+            f"methodology.{name}",
+            lambda i, m=methodology, b=birth_data, p=method_preferences: m.calculate_chart(b[i], p),
+        ))
+    return cases
+
+
+def api_case() -> Case:
+    """POST /api/v1/chart/calculate end to end, as an authenticated user."""
+    import httpx
+
+    from app.core.database import close_db, init_db
+    from app.main import app
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+    payloads = [
+        {"birth_details": birth_details.model_dump(mode="json"), "preferences": ChartPreferences().model_dump()}
+        for birth_details in BIRTH_FIXTURES
+    ]
+
+    async def setup() -> Dict[str, str]:
+        await init_db()
+        credentials = {"email": "bench@example.com", "username": "bench", "password": "Bench-passw0rd!", "full_name": "Bench"}
+        await client.post("/api/v1/auth/register", json=credentials)
+        response = await client.post("/api/v1/auth/login", json={"email": credentials["email"], "password": credentials["password"]})
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    headers = loop.run_until_complete(setup())
+
+    async def calculate(i: int) -> None:
+        response = await client.post("/api/v1/chart/calculate", json=payloads[i], headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"/chart/calculate returned {response.status_code}: {response.text[:200]}")
+
+    def run(i: int) -> None:
+        # Cold calculation every call, not a cached ChartComputation
+        clear_chart_state_cache()
+        loop.run_until_complete(calculate(i))
+
+    def teardown() -> None:
+        loop.run_until_complete(client.aclose())
+        loop.run_until_complete(close_db())
+        loop.close()
+
+    return Case("api.chart_calculate", run, teardown)
+
+
+def measure(case: Case, fixtures: int, samples: int, min_time: float) -> Dict[str, Any]:
+    """Calibrate calls per sample, then time ``samples`` samples."""
+    for i in range(fixtures):
+        case.run(i)  # warm up
+
+    calls = fixtures
+    while True:
+        started = time.perf_counter()
+        for n in range(calls):
+            case.run(n % fixtures)
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or calls >= 1_000_000:
+            break
+        calls *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    per_call = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(samples):
+            started = time.perf_counter()
+            for n in range(calls):
+                case.run(n % fixtures)
+            per_call.append((time.perf_counter() - started) / calls)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "unit": "seconds",
+        "calls_per_sample": calls,
+        "samples": samples,
+        "median": statistics.median(per_call),
+        "min": min(per_call),
+        "max": max(per_call),
+        "mean": statistics.fmean(per_call),
+        "stdev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    try:
+        import swisseph  # noqa: F401
+        swisseph_available = True
+    except ImportError:
+        swisseph_available = False
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+        "swisseph": swisseph_available,
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=15, help="Timed samples per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per sample")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--skip-api", action="store_true", help="Skip the end-to-end API benchmark")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/core-<timestamp>.json)")
+    args = parser.parse_args()
+
+    # Calculators log at INFO per call
+    logging.disable(logging.INFO)
+
+    inputs = prepare_inputs()
+    cases = calculator_cases(inputs) + methodology_cases(inputs)
+    if not args.skip_api and args.filter in "api.chart_calculate":
+        cases.append(api_case())
+
+    results: Dict[str, Any] = {}
+    for case in cases:
+        if args.filter not in case.name:
+            continue
+        try:
+            results[case.name] = measure(case, len(BIRTH_FIXTURES), args.samples, args.min_time)
+        finally:
+            if case.teardown is not None:
+                case.teardown()
+        result = results[case.name]
+        print(
+            f"{case.name:<24} median {format_seconds(result['median']):>12}  "
+            f"min {format_seconds(result['min']):>12}  stdev {result['stdev'] / result['median']:>6.1%}",
+            flush=True,
+        )
+
+    report = {
+        "suite": SUITE,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": {
+            "samples": args.samples,
+            "min_time": args.min_time,
+            "fixtures": [birth_details.name for birth_details in BIRTH_FIXTURES],
+        },
+        "benchmarks": results,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{SUITE}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
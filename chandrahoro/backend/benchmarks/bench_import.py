@@ -0,0 +1,190 @@
+"""Startup benchmark: import time of ``app.main`` with and without lazy routers.
+
+Each sample is a fresh interpreter (``python -X importtime``) that imports
+``app.main`` and then serves one request (GET /api/v1/chart/sample through
+the ASGI app, so a lazily mounted router pays its import there). Reported
+per mode (``LAZY_ROUTERS=true`` / ``false``):
+
+- import.<mode>: wall time of ``import app.main``
+- first_request.<mode>: the first request after import
+- startup.<mode>: the two together
+
+plus a per-module import report from the last sample: the modules with the
+largest cumulative and self import times, and self time summed by package.
+Results use the ``bench_core`` JSON layout, so ``benchmarks.compare`` works
+on them.
+
+Usage (from chandrahoro/backend)::
+
+    python -m benchmarks.bench_import [--samples 5] [--top 25] [--mode lazy]
+        [--output benchmarks/results/import.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.bench_core import RESULTS_DIR, environment
+
+SUITE = "import"
+MODES = {"lazy": "true", "eager": "false"}
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line of timings
+CHILD = """
+import asyncio, json, logging, time
+logging.disable(logging.WARNING)
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def first_request():
+    import httpx
+    transport = httpx.ASGITransport(app=app.main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get("/api/v1/chart/sample")
+        response.raise_for_status()
+
+asyncio.run(first_request())
+print(json.dumps({"import": imported - started, "first_request": time.perf_counter() - imported}))
+"""
+
+
+def run_child(lazy: str, workdir: str) -> Tuple[Dict[str, float], str]:
+    """One fresh-interpreter sample; returns (timings, -X importtime output)."""
+    env = {
+        **os.environ,
+        "LAZY_ROUTERS": lazy,
+        "ROUTER_PRELOAD": "",
+        "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(workdir, 'bench.db')}",
+        "PYTHONPATH": BACKEND_DIR,
+    }
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import benchmark child failed:\n{completed.stderr[-2000:]}")
+    timings = json.loads(completed.stdout.strip().splitlines()[-1])
+    return timings, completed.stderr
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Parse ``-X importtime`` lines into {module, self_us, cumulative_us, depth}."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|")
+        self_us = head.split(":")[1]
+        stripped = name.lstrip()
+        modules.append({
+            "module": stripped,
+            "self_us": int(self_us.strip()),
+            "cumulative_us": int(cumulative_us.strip()),
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return modules
+
+
+def package_of(module: str) -> str:
+    """Group ``app.*`` by subpackage (app.api, app.core...), everything else by top-level package."""
+    parts = module.split(".")
+    return ".".join(parts[:2]) if parts[0] == "app" and len(parts) > 1 else parts[0]
+
+
+def module_report(modules: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    by_package: Dict[str, int] = defaultdict(int)
+    for module in modules:
+        by_package[package_of(module["module"])] += module["self_us"]
+    return {
+        "total_modules": len(modules),
+        "total_self_ms": round(sum(module["self_us"] for module in modules) / 1000, 2),
+        "top_cumulative": [
+            {"module": m["module"], "cumulative_ms": round(m["cumulative_us"] / 1000, 2)}
+            for m in sorted(modules, key=lambda m: m["cumulative_us"], reverse=True)[:top]
+        ],
+        "top_self": [
+            {"module": m["module"], "self_ms": round(m["self_us"] / 1000, 2)}
+            for m in sorted(modules, key=lambda m: m["self_us"], reverse=True)[:top]
+        ],
+        "by_package_self_ms": {
+            package: round(us / 1000, 2)
+            for package, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+    }
+
+
+def summarize(values: List[float]) -> Dict[str, Any]:
+    return {
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+        "mean": statistics.fmean(values),
+        "stdev": statistics.stdev(values) if len(values) > 1 else 0.0,
+        "samples": len(values),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5, help="Fresh interpreters per mode")
+    parser.add_argument("--top", type=int, default=25, help="Modules/packages listed in the report")
+    parser.add_argument("--mode", choices=sorted(MODES), action="append", help="Mode(s) to run (default: both)")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/import-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {}
+    reports: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="chandrahoro-bench-") as workdir:
+        for mode in args.mode or ["eager", "lazy"]:
+            samples: Dict[str, List[float]] = defaultdict(list)
+            importtime = ""
+            for _ in range(args.samples):
+                timings, importtime = run_child(MODES[mode], workdir)
+                samples["import"].append(timings["import"])
+                samples["first_request"].append(timings["first_request"])
+                samples["startup"].append(timings["import"] + timings["first_request"])
+            for name, values in samples.items():
+                results[f"{name}.{mode}"] = summarize(values)
+            reports[mode] = module_report(parse_importtime(importtime), args.top)
+
+    for mode, report in reports.items():
+        print(f"\n== {mode}: {report['total_modules']} modules imported ==")
+        print("slowest modules (cumulative ms):")
+        for entry in report["top_cumulative"][:15]:
+            print(f"  {entry['cumulative_ms']:>9.1f}  {entry['module']}")
+        print("self time by package (ms):")
+        for package, ms in list(report["by_package_self_ms"].items())[:15]:
+            print(f"  {ms:>9.1f}  {package}")
+
+    print()
+    for name, result in results.items():
+        print(f"{name:<24} median {result['median'] * 1000:>9.1f} ms  min {result['min'] * 1000:>9.1f} ms")
+
+    report = {
+        "suite": SUITE,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "config": {"samples": args.samples},
+        "benchmarks": results,
+        "modules": reports,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{SUITE}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark event-loop latency of unrelated requests during a login storm.
+
+A small ASGI app exposes a login endpoint that verifies an argon2 password
+hash either inline (the previous behaviour) or on the password thread pool,
+plus a trivial ``/ping`` endpoint. While ``--logins`` concurrent clients
+hammer the login endpoint, ``/ping`` is due every 10 ms; its latency
+(measured from when each ping was due) is what every unrelated endpoint
+sees.
+
+Usage (from chandrahoro/backend)::
+
+    python -m benchmarks.bench_password_hashing [--logins 16] [--duration 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.security import (
+    PASSWORD_HASH_CONCURRENCY,
+    hash_password,
+    shutdown_password_executor,
+    verify_password,
+    verify_password_async,
+)
+
+PASSWORD = "correct horse battery staple"
+PING_INTERVAL = 0.01
+
+
+def build_app(password_hash: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login/inline")
+    async def login_inline():
+        return {"ok": verify_password(PASSWORD, password_hash)}
+
+    @app.post("/login/offloaded")
+    async def login_offloaded():
+        return {"ok": await verify_password_async(PASSWORD, password_hash)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def storm(client: httpx.AsyncClient, login_path: str, logins: int, duration: float) -> Dict[str, float]:
+    deadline = time.perf_counter() + duration
+    ping_latencies: List[float] = []
+    completed_logins = 0
+
+    async def login_worker() -> None:
+        nonlocal completed_logins
+        while time.perf_counter() < deadline:
+            response = await client.post(login_path)
+            assert response.json()["ok"]
+            completed_logins += 1
+
+    async def ping_worker() -> None:
+        # Pings are due every PING_INTERVAL; latency counts from when a ping
+        # was due, so time spent waiting for a blocked loop is included
+        due = time.perf_counter()
+        while due < deadline:
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await client.get("/ping")
+            now = time.perf_counter()
+            while due <= now and due < deadline:
+                ping_latencies.append((now - due) * 1000)
+                due += PING_INTERVAL
+
+    await asyncio.gather(ping_worker(), *(login_worker() for _ in range(logins)))
+    return {
+        "logins_per_s": completed_logins / duration,
+        "pings": len(ping_latencies),
+        "ping_p50_ms": statistics.median(ping_latencies),
+        "ping_p99_ms": percentile(ping_latencies, 0.99),
+        "ping_max_ms": max(ping_latencies),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=16, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per scenario")
+    args = parser.parse_args()
+
+    password_hash = hash_password(PASSWORD)
+    app = build_app(password_hash)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle = await storm(client, "/login/offloaded", 0, 1.0)
+        results = {
+            "idle": idle,
+            "inline": await storm(client, "/login/inline", args.logins, args.duration),
+            "offloaded": await storm(client, "/login/offloaded", args.logins, args.duration),
+        }
+    shutdown_password_executor()
+
+    print(f"login clients: {args.logins}, pool size: {PASSWORD_HASH_CONCURRENCY}, duration: {args.duration}s")
+    print(f"{'scenario':<10} {'logins/s':>9} {'pings':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['logins_per_s']:>9.1f} {result['pings']:>7} {result['ping_p50_ms']:>8.2f} "
+            f"{result['ping_p99_ms']:>8.2f} {result['ping_max_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
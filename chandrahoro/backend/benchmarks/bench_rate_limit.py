@@ -0,0 +1,133 @@
+"""Benchmark rate limiter backends under concurrent load.
+
+Runs ``--clients`` concurrent asyncio tasks, each making ``--requests``
+checks against one of ``--keys`` keys with a generous limit, through:
+
+- legacy: the previous list-of-timestamps limiter (O(n) per check and per key)
+- memory: MemoryRateLimitBackend (sliding-window counter, O(1))
+- redis: RedisRateLimitBackend, when REDIS_URL/REDIS_HOST is configured
+
+and reports throughput, per-check latency and memory held by the limiter.
+
+Usage (from chandrahoro/backend)::
+
+    python -m benchmarks.bench_rate_limit [--clients 200] [--requests 50] [--keys 100]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, List
+
+from app.core.rate_limit import MemoryRateLimitBackend, RedisRateLimitBackend
+from app.core.redis_client import close_redis, get_redis
+
+LIMIT = 1_000_000
+WINDOW = 3600
+
+
+class LegacyRateLimiter:
+    """The list-based limiter this module replaced."""
+
+    def __init__(self):
+        self.requests: Dict[str, list] = defaultdict(list)
+
+    def is_allowed(self, key: str, max_requests: int, window_seconds: int) -> bool:
+        now = time.time()
+        window_start = now - window_seconds
+        self.requests[key] = [t for t in self.requests[key] if t > window_start]
+        allowed = len(self.requests[key]) < max_requests
+        if allowed:
+            self.requests[key].append(now)
+        return allowed
+
+
+async def run_load(check: Callable[[str], Awaitable[bool]], clients: int, requests: int,
+                   keys: int) -> Dict[str, float]:
+    latencies: List[float] = []
+
+    async def client(n: int) -> None:
+        key = f"user:{n % keys}"
+        for _ in range(requests):
+            started = time.perf_counter()
+            await check(key)
+            latencies.append((time.perf_counter() - started) * 1e6)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "checks_per_s": len(latencies) / elapsed,
+        "p50_us": statistics.median(latencies),
+        "p99_us": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+async def bench_in_process(make: Callable, clients: int, requests: int, keys: int) -> Dict[str, float]:
+    _, check = make()
+    result = await run_load(check, clients, requests, keys)
+
+    # Repeat with a fresh limiter under tracemalloc (too slow to time with it on)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    limiter, check = make()
+    await run_load(check, clients, requests, keys)
+    result["memory_kb"] = (tracemalloc.get_traced_memory()[0] - baseline) / 1024
+    tracemalloc.stop()
+    del limiter
+    return result
+
+
+def make_legacy():
+    limiter = LegacyRateLimiter()
+
+    async def check(key: str) -> bool:
+        return limiter.is_allowed(key, LIMIT, WINDOW)
+    return limiter, check
+
+
+def make_memory():
+    backend = MemoryRateLimitBackend()
+
+    async def check(key: str) -> bool:
+        return backend.hit(key, LIMIT, WINDOW).allowed
+    return backend, check
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=50, help="Checks per client")
+    parser.add_argument("--keys", type=int, default=100, help="Distinct rate limit keys")
+    args = parser.parse_args()
+
+    results = {
+        "legacy": await bench_in_process(make_legacy, args.clients, args.requests, args.keys),
+        "memory": await bench_in_process(make_memory, args.clients, args.requests, args.keys),
+    }
+
+    client = get_redis()
+    if client is not None:
+        backend = RedisRateLimitBackend(prefix=f"ratelimit-bench:{time.time_ns()}")
+
+        async def check(key: str) -> bool:
+            return (await backend.hit(client, key, LIMIT, WINDOW)).allowed
+        results["redis"] = await run_load(check, args.clients, args.requests, args.keys)
+        await close_redis()
+
+    print(f"clients: {args.clients}, checks/client: {args.requests}, keys: {args.keys}")
+    print(f"{'backend':<8} {'checks/s':>12} {'p50 us':>9} {'p99 us':>9} {'memory KB':>10}")
+    for name, result in results.items():
+        memory = f"{result['memory_kb']:>10.1f}" if "memory_kb" in result else f"{'-':>10}"
+        print(
+            f"{name:<8} {result['checks_per_s']:>12,.0f} {result['p50_us']:>9.1f} "
+            f"{result['p99_us']:>9.1f} {memory}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
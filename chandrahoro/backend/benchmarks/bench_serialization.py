@@ -0,0 +1,119 @@
+"""Benchmark chart response serialization: legacy pipeline vs orjson.
+
+Builds the sample chart once, then times encoding the same response dict
+through:
+
+- legacy: recursive convert_datetime_objects + FastAPI response_model
+  serialization + JSONResponse.render (the pre-orjson /chart/calculate path)
+- fast: FastJSONResponse.render (orjson, native datetimes)
+- fast+table: FastJSONResponse with compact planet tables
+
+Usage (from chandrahoro/backend)::
+
+    python -m benchmarks.bench_serialization [--repeat 50]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import date, datetime, time as time_type
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.v1.chart import build_chart_response
+from app.core.serialization import FastJSONResponse, ORJSON_AVAILABLE, compact_chart_payload
+from app.models.chart import BirthDetails, ChartPreferences, ChartRequest
+
+
+def convert_datetime_objects(obj: Any) -> Any:
+    """The recursive conversion pass the legacy endpoint ran on every response."""
+    if isinstance(obj, (datetime, date, time_type)):
+        return obj.isoformat()
+    elif isinstance(obj, dict):
+        return {k: convert_datetime_objects(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [convert_datetime_objects(item) for item in obj]
+    return obj
+
+
+_RESPONSE_FIELD = create_response_field(name="Response_calculate_chart", type_=Dict[str, Any], mode="serialization")
+
+
+def legacy_encode(response: Dict[str, Any]) -> bytes:
+    response = dict(response, data=convert_datetime_objects(response["data"]))
+    content = asyncio.run(serialize_response(field=_RESPONSE_FIELD, response_content=response))
+    return JSONResponse(content).body
+
+
+def fast_encode(response: Dict[str, Any]) -> bytes:
+    return FastJSONResponse(response).body
+
+
+def fast_table_encode(response: Dict[str, Any]) -> bytes:
+    return FastJSONResponse(dict(response, data=compact_chart_payload(response["data"]))).body
+
+
+def sample_response() -> Dict[str, Any]:
+    request = ChartRequest(
+        birth_details=BirthDetails(
+            name="Sample Person",
+            date=date(1990, 6, 15),
+            time=time_type(14, 30),
+            latitude=28.6139,
+            longitude=77.2090,
+            timezone="Asia/Kolkata",
+            location_name="New Delhi, India",
+        ),
+        preferences=ChartPreferences(),
+    )
+    return asyncio.run(build_chart_response(request))
+
+
+def measure(encode: Callable[[Dict[str, Any]], bytes], response: Dict[str, Any], repeat: int) -> Dict[str, float]:
+    encode(response)  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(response)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "bytes": len(body),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=50, help="Timed iterations per encoder")
+    args = parser.parse_args()
+
+    response = sample_response()
+
+    # Both paths must produce the same document
+    if json.loads(legacy_encode(response)) != json.loads(fast_encode(response)):
+        raise SystemExit("legacy and fast encoders produced different JSON")
+
+    results = {
+        "legacy": measure(legacy_encode, response, args.repeat),
+        "fast": measure(fast_encode, response, args.repeat),
+        "fast+table": measure(fast_table_encode, response, args.repeat),
+    }
+
+    print(f"orjson available: {ORJSON_AVAILABLE}, repeat: {args.repeat}")
+    print(f"{'encoder':<12} {'median ms':>10} {'min ms':>10} {'bytes':>10} {'speedup':>8}")
+    baseline = results["legacy"]["median_ms"]
+    for name, result in results.items():
+        print(
+            f"{name:<12} {result['median_ms']:>10.2f} {result['min_ms']:>10.2f} "
+            f"{result['bytes']:>10} {baseline / result['median_ms']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Compare benchmark results against a stored baseline.
+
+A benchmark regresses when both its median and its minimum per-call time
+are more than ``--threshold`` (a fraction, default 0.10) slower than the
+baseline's, and improves when both are that much faster; requiring both
+keeps one noisy run from failing the comparison. Exits with status 1 if
+anything regressed, so it can gate CI. Benchmarks missing from either file
+are listed but don't fail the comparison.
+
+Baselines are only meaningful on the same machine and fixtures; a warning is
+printed when the recorded environments differ.
+
+Usage (from chandrahoro/backend)::
+
+    python -m benchmarks.bench_core --output /tmp/current.json
+    python -m benchmarks.compare benchmarks/baseline.json /tmp/current.json [--threshold 0.1]
+
+    # Accept the current numbers as the new baseline
+    cp /tmp/current.json benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Environment keys that make timings incomparable when they differ
+ENVIRONMENT_KEYS = ("python", "implementation", "machine", "processor", "cpu_count", "swisseph")
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Tuple[str, str, Any, Any, Any]]:
+    """
+    Compare two result files.
+
+    Args:
+        baseline: Baseline results (``bench_core`` JSON)
+        current: Current results
+        threshold: Allowed relative slowdown of the median and minimum (0.1 = 10%)
+
+    Returns:
+        Rows of (name, status, baseline median, current median, relative
+        change of the median) where status is regression, improvement, ok,
+        new or missing
+    """
+    rows = []
+    base_benchmarks = baseline["benchmarks"]
+    current_benchmarks = current["benchmarks"]
+    for name in sorted(set(base_benchmarks) | set(current_benchmarks)):
+        if name not in current_benchmarks:
+            rows.append((name, "missing", base_benchmarks[name]["median"], None, None))
+            continue
+        if name not in base_benchmarks:
+            rows.append((name, "new", None, current_benchmarks[name]["median"], None))
+            continue
+        before = base_benchmarks[name]["median"]
+        after = current_benchmarks[name]["median"]
+        change = (after - before) / before
+        min_change = (current_benchmarks[name]["min"] - base_benchmarks[name]["min"]) / base_benchmarks[name]["min"]
+        if change > threshold and min_change > threshold:
+            status = "regression"
+        elif change < -threshold and min_change < -threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, status, before, after, change))
+    return rows
+
+
+def environment_differences(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    before = baseline.get("environment", {})
+    after = current.get("environment", {})
+    differences = [
+        f"{key}: {before.get(key)!r} -> {after.get(key)!r}"
+        for key in ENVIRONMENT_KEYS if before.get(key) != after.get(key)
+    ]
+    if baseline.get("config", {}).get("fixtures") != current.get("config", {}).get("fixtures"):
+        differences.append("fixtures differ")
+    return differences
+
+
+def format_ms(seconds: Any) -> str:
+    return f"{seconds * 1000:.4f}" if seconds is not None else "-"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="Baseline results JSON")
+    parser.add_argument("current", help="Current results JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown (default 0.10)")
+    args = parser.parse_args()
+
+    baseline = load(args.baseline)
+    current = load(args.current)
+
+    for difference in environment_differences(baseline, current):
+        print(f"warning: environment differs from baseline ({difference})", file=sys.stderr)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"{'benchmark':<24} {'baseline ms':>12} {'current ms':>12} {'change':>8}  status")
+    for name, status, before, after, change in rows:
+        change_text = f"{change:+.1%}" if change is not None else "-"
+        print(f"{name:<24} {format_ms(before):>12} {format_ms(after):>12} {change_text:>8}  {status}")
+
+    regressions = [row[0] for row in rows if row[1] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\nno regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Fixed birth-data fixtures shared by the benchmarks.
+
+The set spans both hemispheres, a high latitude (kept below the polar
+circle, beyond which Placidus cusps are undefined) and an unknown birth
+time so every calculator path (house cusps, day/night strength, dasha
+balance) is exercised. Keep it stable: results are only comparable against a baseline
+measured on the same fixtures.
+"""
+
+from datetime import date, time
+from typing import List
+
+from app.models.chart import BirthDetails
+
+BIRTH_FIXTURES: List[BirthDetails] = [
+    BirthDetails(
+        name="New Delhi",
+        date=date(1990, 6, 15),
+        time=time(14, 30),
+        latitude=28.6139,
+        longitude=77.2090,
+        timezone="Asia/Kolkata",
+        location_name="New Delhi, India",
+    ),
+    BirthDetails(
+        name="New York",
+        date=date(1975, 11, 3),
+        time=time(4, 12),
+        latitude=40.7128,
+        longitude=-74.0060,
+        timezone="America/New_York",
+        location_name="New York, USA",
+    ),
+    BirthDetails(
+        name="Sydney",
+        date=date(2001, 2, 27),
+        time=time(21, 45),
+        latitude=-33.8688,
+        longitude=151.2093,
+        timezone="Australia/Sydney",
+        location_name="Sydney, Australia",
+    ),
+    BirthDetails(
+        name="Reykjavik",
+        date=date(1962, 12, 21),
+        time=time(9, 0),
+        latitude=64.1466,
+        longitude=-21.9426,
+        timezone="Atlantic/Reykjavik",
+        location_name="Reykjavik, Iceland",
+    ),
+    BirthDetails(
+        name="Chennai (time unknown)",
+        date=date(1948, 8, 9),
+        time_unknown=True,
+        latitude=13.0827,
+        longitude=80.2707,
+        timezone="Asia/Kolkata",
+        location_name="Chennai, India",
+    ),
+]
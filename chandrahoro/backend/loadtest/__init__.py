@@ -0,0 +1,18 @@
+"""Self-contained load-test harness.
+
+Drives the API with scenario-based virtual users against local stand-ins
+for every external dependency:
+
+- MySQL -> SQLite via aiosqlite (a fresh database per run)
+- Redis -> ``FakeRedis`` installed with ``set_redis_client``
+- OpenAI / Anthropic -> a fake compatible HTTP server with configurable
+  latency, token pacing, streaming and error rate (the SDKs are pointed at
+  it through ``OPENAI_BASE_URL`` / ``ANTHROPIC_BASE_URL``)
+
+Run (from chandrahoro/backend)::
+
+    python -m loadtest.runner --mode inprocess --users 10 --duration 30
+    python -m loadtest.runner --mode http --users 10 --duration 30
+
+See ``loadtest.runner`` for all options.
+"""
@@ -0,0 +1,242 @@
+"""Fake OpenAI- and Anthropic-compatible LLM server.
+
+Serves ``POST /v1/chat/completions`` (OpenAI, also OpenRouter/Perplexity
+shaped) and ``POST /v1/messages`` (Anthropic), both with and without
+``stream: true``. Each call waits ``latency_ms`` (time to first token), then
+emits ``tokens`` tokens ``token_interval_ms`` apart; a fraction
+``error_rate`` of calls fail with HTTP 500. Usage figures are reported so
+token accounting works.
+
+Run standalone::
+
+    python -m loadtest.fake_llm --port 8900 --latency-ms 800 --tokens 400
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# Reply body; HTML so the report endpoints get something renderable
+REPLY = (
+    "<!DOCTYPE html><html><head><title>Load test report</title></head><body>"
+    "<h1>Vedic Horoscope</h1><p>This report was produced by the load-test LLM stand-in.</p>"
+    "</body></html>"
+)
+
+
+@dataclass
+class FakeLLMConfig:
+    """Timing and failure behaviour of the fake server."""
+    latency_ms: float = 500.0
+    token_interval_ms: float = 5.0
+    tokens: int = 200
+    error_rate: float = 0.0
+
+
+class FakeLLMStats:
+    def __init__(self):
+        self.requests = 0
+        self.streamed = 0
+        self.errors = 0
+
+    def to_dict(self):
+        return {"requests": self.requests, "streamed": self.streamed, "errors": self.errors}
+
+
+def _tokens(count: int) -> List[str]:
+    """Split the reply into ``count`` chunks (padding with spaces if short)."""
+    count = max(1, count)
+    size = -(-len(REPLY) // count)
+    chunks = [REPLY[i:i + size] for i in range(0, len(REPLY), size)]
+    return chunks + [" "] * (count - len(chunks))
+
+
+def _prompt_tokens(body: dict) -> int:
+    text = "".join(str(message.get("content", "")) for message in body.get("messages", []))
+    return max(1, len(text) // 4)
+
+
+def build_app(config: FakeLLMConfig) -> Starlette:
+    """ASGI app emulating the provider APIs."""
+    stats = FakeLLMStats()
+
+    async def _pace() -> AsyncIterator[str]:
+        await asyncio.sleep(config.latency_ms / 1000)
+        for index, token in enumerate(_tokens(config.tokens)):
+            if index:
+                await asyncio.sleep(config.token_interval_ms / 1000)
+            yield token
+
+    def _should_fail() -> bool:
+        return config.error_rate > 0 and random.random() < config.error_rate
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        stats.requests += 1
+        if _should_fail():
+            stats.errors += 1
+            return JSONResponse({"error": {"message": "fake upstream error", "type": "server_error"}}, status_code=500)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "fake-model")
+        prompt_tokens = _prompt_tokens(body)
+
+        if body.get("stream"):
+            stats.streamed += 1
+
+            async def events():
+                async for token in _pace():
+                    chunk = {
+                        "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                        "model": model, "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                final = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        content = "".join([token async for token in _pace()])
+        return JSONResponse({
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": config.tokens,
+                      "total_tokens": prompt_tokens + config.tokens},
+        })
+
+    async def messages(request: Request):
+        body = await request.json()
+        stats.requests += 1
+        if _should_fail():
+            stats.errors += 1
+            return JSONResponse({"type": "error", "error": {"type": "api_error", "message": "fake upstream error"}},
+                                status_code=500)
+        message_id = f"msg_{uuid.uuid4().hex[:12]}"
+        model = body.get("model", "fake-model")
+        input_tokens = _prompt_tokens(body)
+
+        if body.get("stream"):
+            stats.streamed += 1
+
+            def event(name: str, data: dict) -> str:
+                return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+            async def events():
+                yield event("message_start", {"type": "message_start", "message": {
+                    "id": message_id, "type": "message", "role": "assistant", "model": model, "content": [],
+                    "stop_reason": None, "stop_sequence": None,
+                    "usage": {"input_tokens": input_tokens, "output_tokens": 0}}})
+                yield event("content_block_start", {"type": "content_block_start", "index": 0,
+                                                    "content_block": {"type": "text", "text": ""}})
+                async for token in _pace():
+                    yield event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                        "delta": {"type": "text_delta", "text": token}})
+                yield event("content_block_stop", {"type": "content_block_stop", "index": 0})
+                yield event("message_delta", {"type": "message_delta",
+                                              "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                              "usage": {"output_tokens": config.tokens}})
+                yield event("message_stop", {"type": "message_stop"})
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        content = "".join([token async for token in _pace()])
+        return JSONResponse({
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": config.tokens},
+        })
+
+    async def stats_endpoint(request: Request):
+        return JSONResponse(stats.to_dict())
+
+    routes = [
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/chat/completions", chat_completions, methods=["POST"]),
+        Route("/v1/messages", messages, methods=["POST"]),
+        Route("/stats", stats_endpoint, methods=["GET"]),
+    ]
+    app = Starlette(routes=routes)
+    app.state.stats = stats
+    return app
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class FakeLLMServer:
+    """The fake server running in a background thread (uvicorn)."""
+
+    def __init__(self, config: FakeLLMConfig, host: str = "127.0.0.1", port: int = 0):
+        import uvicorn
+
+        self.config = config
+        self.host = host
+        self.port = port or free_port(host)
+        self.app = build_app(config)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, name="fake-llm", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stats(self) -> FakeLLMStats:
+        return self.app.state.stats
+
+    def start(self, timeout: float = 10.0) -> "FakeLLMServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("fake LLM server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Time to first token")
+    parser.add_argument("--token-interval-ms", type=float, default=5.0, help="Delay between tokens")
+    parser.add_argument("--tokens", type=int, default=200, help="Tokens per reply")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing with 500")
+    args = parser.parse_args()
+
+    config = FakeLLMConfig(args.latency_ms, args.token_interval_ms, args.tokens, args.error_rate)
+    uvicorn.run(build_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
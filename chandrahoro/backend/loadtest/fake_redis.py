@@ -0,0 +1,144 @@
+"""In-memory stand-in for ``redis.asyncio.Redis``.
+
+Implements the commands the app uses (GET, SET with EX/NX, DELETE, INCRBY,
+EXPIRE, TTL, PING, SCRIPT LOAD, EVALSHA). Lua is not interpreted: scripts the
+app loads are matched by SHA1 and run as Python ports, so keys, arguments and
+return values behave like the real server.
+"""
+
+import hashlib
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.rate_limit import SLIDING_WINDOW_SCRIPT, NoScriptError
+
+
+def _sha(script: str) -> str:
+    return hashlib.sha1(script.encode()).hexdigest()
+
+
+class FakeRedis:
+    """Single-process Redis stand-in with key expiry."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._scripts: Dict[str, Callable] = {}
+        self._ports: Dict[str, Callable] = {_sha(SLIDING_WINDOW_SCRIPT): self._sliding_window}
+        self.commands = 0
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= self._clock():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if isinstance(value, bytes):
+            return value
+        return str(value).encode()
+
+    async def ping(self) -> bool:
+        self.commands += 1
+        return True
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.commands += 1
+        return self._data[key] if self._alive(key) else None
+
+    async def set(self, key: str, value: Any, ex: Optional[int] = None, px: Optional[int] = None,
+                  nx: bool = False, xx: bool = False) -> Optional[bool]:
+        self.commands += 1
+        exists = self._alive(key)
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._data[key] = self._encode(value)
+        self._expires.pop(key, None)
+        if ex is not None:
+            self._expires[key] = self._clock() + ex
+        elif px is not None:
+            self._expires[key] = self._clock() + px / 1000
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        self.commands += 1
+        deleted = 0
+        for key in keys:
+            if self._alive(key):
+                deleted += 1
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return deleted
+
+    def _incrby(self, key: str, amount: int) -> int:
+        value = int(self._data[key]) if self._alive(key) else 0
+        value += int(amount)
+        self._data[key] = self._encode(value)
+        return value
+
+    async def incrby(self, key: str, amount: int = 1) -> int:
+        self.commands += 1
+        return self._incrby(key, amount)
+
+    async def incr(self, key: str) -> int:
+        return await self.incrby(key, 1)
+
+    def _expire(self, key: str, seconds: float) -> bool:
+        if not self._alive(key):
+            return False
+        self._expires[key] = self._clock() + float(seconds)
+        return True
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        self.commands += 1
+        return self._expire(key, seconds)
+
+    async def ttl(self, key: str) -> int:
+        self.commands += 1
+        if not self._alive(key):
+            return -2
+        expires_at = self._expires.get(key)
+        return -1 if expires_at is None else max(0, int(expires_at - self._clock()))
+
+    async def script_load(self, script: str) -> str:
+        self.commands += 1
+        sha = _sha(script)
+        if sha not in self._ports:
+            raise NotImplementedError("FakeRedis has no Python port of this script")
+        self._scripts[sha] = self._ports[sha]
+        return sha
+
+    async def evalsha(self, sha: str, numkeys: int, *keys_and_args: Any) -> Any:
+        self.commands += 1
+        script = self._scripts.get(sha)
+        if script is None:
+            raise NoScriptError("NOSCRIPT No matching script. Please use EVAL.")
+        return script(list(keys_and_args[:numkeys]), list(keys_and_args[numkeys:]))
+
+    def _sliding_window(self, keys: List[str], args: List[Any]) -> List[int]:
+        """Python port of ``SLIDING_WINDOW_SCRIPT``."""
+        current = int(self._data[keys[0]]) if self._alive(keys[0]) else 0
+        previous = int(self._data[keys[1]]) if self._alive(keys[1]) else 0
+        limit, weight, cost, ttl = int(args[0]), float(args[1]), int(args[2]), int(args[3])
+        if previous * weight + current + cost > limit:
+            return [0, current, previous]
+        current = self._incrby(keys[0], cost)
+        self._expire(keys[0], ttl)
+        return [1, current, previous]
+
+    async def flushall(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return sum(1 for key in list(self._data) if self._alive(key))
@@ -0,0 +1,246 @@
+"""Run load-test scenarios and report throughput and latency percentiles.
+
+Two modes:
+
+- ``inprocess``: the app runs in this process behind ``httpx.ASGITransport``.
+  No sockets or server overhead, so it isolates application cost; client and
+  app share one event loop, so anything that blocks the loop shows up as
+  latency for every virtual user.
+- ``http``: the app runs in a separate uvicorn process (``loadtest.server``)
+  and is driven over real HTTP, like production with one worker. Pass
+  ``--base-url`` to target an already running server instead.
+
+Both modes use SQLite, ``FakeRedis`` and the fake LLM server started here.
+
+Usage (from chandrahoro/backend)::
+
+    python -m loadtest.runner --mode inprocess --users 10 --duration 30
+    python -m loadtest.runner --mode http --scenario dashboard --scenario ai_report \\
+        --users 20 --duration 60 --llm-latency-ms 1500 --output /tmp/load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from loadtest.fake_llm import FakeLLMConfig, FakeLLMServer, free_port
+from loadtest.scenarios import SCENARIOS, Recorder, RequestFailed, Scenario, Session
+from loadtest.stack import configure_environment
+
+logger = logging.getLogger("loadtest")
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    summary = {
+        "requests": len(ordered),
+        "errors": errors,
+        "rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(ordered, pct) * 1000, 2)
+    summary["max_ms"] = round(ordered[-1] * 1000, 2) if ordered else 0.0
+    return summary
+
+
+def build_report(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    """Per-scenario and per-request-label throughput and latency."""
+    report = {}
+    for scenario, labels in recorder.samples.items():
+        errors = recorder.errors.get(scenario, {})
+        all_samples = [sample for samples in labels.values() for sample in samples]
+        report[scenario] = {
+            **summarize(all_samples, sum(errors.values()), elapsed),
+            "statuses": recorder.statuses.get(scenario, {}),
+            "requests_by_label": {
+                label: summarize(samples, errors.get(label, 0), elapsed)
+                for label, samples in sorted(labels.items())
+            },
+        }
+    return report
+
+
+def print_report(report: Dict[str, Any], elapsed: float) -> None:
+    header = f"{'scenario / request':<34} {'reqs':>7} {'errs':>6} {'req/s':>8} " + \
+        " ".join(f"{f'p{pct} ms':>9}" for pct in PERCENTILES) + f" {'max ms':>9}"
+    print(f"\nmeasured {elapsed:.1f}s")
+    print(header)
+    print("-" * len(header))
+
+    def row(name: str, summary: Dict[str, Any]) -> str:
+        return f"{name:<34} {summary['requests']:>7} {summary['errors']:>6} {summary['rps']:>8.2f} " + \
+            " ".join(f"{summary[f'p{pct}_ms']:>9.1f}" for pct in PERCENTILES) + f" {summary['max_ms']:>9.1f}"
+
+    for scenario, summary in report.items():
+        print(row(scenario, summary))
+        for label, label_summary in summary["requests_by_label"].items():
+            print(row(f"  {label}", label_summary))
+
+
+async def virtual_user(scenario: Scenario, session: Session, deadline: float, think_seconds: float) -> None:
+    """Set up once, then repeat the scenario's step until the deadline."""
+    try:
+        state = await scenario.setup(session)
+    except RequestFailed as e:
+        logger.warning(f"{scenario.name} user {session.user_index} setup failed: {e}")
+        return
+    while time.monotonic() < deadline:
+        try:
+            await scenario.step(session, state)
+        except RequestFailed as e:
+            logger.debug(f"{scenario.name} user {session.user_index}: {e}")
+        session.iteration += 1
+        await asyncio.sleep(think_seconds)
+
+
+async def run_load(client: httpx.AsyncClient, scenarios: List[Scenario], users: int, duration: float,
+                   think_seconds: float, recorder: Recorder) -> float:
+    """Run ``users`` virtual users per scenario for ``duration`` seconds; return elapsed seconds."""
+    started = time.monotonic()
+    deadline = started + duration
+    tasks = [
+        virtual_user(scenario, Session(client, recorder, scenario.name, index), deadline, think_seconds)
+        for scenario in scenarios
+        for index in range(users)
+    ]
+    await asyncio.gather(*tasks)
+    return time.monotonic() - started
+
+
+async def run_inprocess(args, scenarios: List[Scenario], recorder: Recorder) -> float:
+    from app.core.database import close_db
+    from app.main import app
+    from loadtest.stack import prepare_app, quiet_app_logging
+
+    if not args.app_logs:
+        quiet_app_logging()
+    await prepare_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+        elapsed = await run_load(client, scenarios, args.users, args.duration, args.think_ms / 1000, recorder)
+    await close_db()
+    return elapsed
+
+
+def start_server(workdir: str, llm_base_url: str, app_logs: bool) -> Tuple[subprocess.Popen, str]:
+    """Start ``loadtest.server`` in a subprocess and wait for /health."""
+    port = free_port()
+    command = [sys.executable, "-m", "loadtest.server", "--port", str(port), "--workdir", workdir,
+               "--llm-base-url", llm_base_url]
+    if app_logs:
+        command.append("--app-logs")
+    process = subprocess.Popen(
+        command,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"load-test server exited with status {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("load-test server did not become healthy within 60s")
+
+
+async def run_http(base_url: str, args, scenarios: List[Scenario], recorder: Recorder) -> float:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        return await run_load(client, scenarios, args.users, args.duration, args.think_ms / 1000, recorder)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("inprocess", "http"), default="inprocess")
+    parser.add_argument("--base-url", help="http mode: target an already running server instead of starting one")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: all)")
+    parser.add_argument("--users", type=int, default=5, help="Virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Pause between a user's iterations")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--llm-latency-ms", type=float, default=500.0, help="Fake LLM time to first token")
+    parser.add_argument("--llm-token-interval-ms", type=float, default=5.0, help="Fake LLM delay between tokens")
+    parser.add_argument("--llm-tokens", type=int, default=200, help="Fake LLM tokens per reply")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of fake LLM calls failing")
+    parser.add_argument("--app-logs", action="store_true", help="Keep the app's per-request INFO logs")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    llm_config = FakeLLMConfig(args.llm_latency_ms, args.llm_token_interval_ms, args.llm_tokens, args.llm_error_rate)
+    llm_server = FakeLLMServer(llm_config).start()
+    workdir = tempfile.mkdtemp(prefix="chandrahoro-loadtest-")
+    configure_environment(workdir, llm_server.base_url)
+
+    scenarios = [SCENARIOS[name] for name in (args.scenario or sorted(SCENARIOS))]
+    recorder = Recorder()
+    server: Optional[subprocess.Popen] = None
+    try:
+        if args.mode == "inprocess":
+            elapsed = asyncio.run(run_inprocess(args, scenarios, recorder))
+        else:
+            base_url = args.base_url
+            if not base_url:
+                server, base_url = start_server(workdir, llm_server.base_url, args.app_logs)
+            elapsed = asyncio.run(run_http(base_url, args, scenarios, recorder))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+        llm_server.stop()
+
+    report = build_report(recorder, elapsed)
+    print_report(report, elapsed)
+    for label, error in sorted(recorder.first_error.items()):
+        print(f"first error ({label}): {error}")
+    print(f"\nfake LLM: {llm_server.stats.to_dict()}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "config": {
+                    "mode": args.mode,
+                    "scenarios": [scenario.name for scenario in scenarios],
+                    "users": args.users,
+                    "duration": args.duration,
+                    "think_ms": args.think_ms,
+                    "llm": vars(llm_config),
+                },
+                "elapsed": elapsed,
+                "scenarios": report,
+                "first_errors": recorder.first_error,
+                "fake_llm": llm_server.stats.to_dict(),
+            }, f, indent=2)
+        print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
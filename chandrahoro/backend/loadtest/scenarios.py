@@ -0,0 +1,225 @@
+"""Load-test scenarios.
+
+Each virtual user runs one scenario: ``setup`` once (register, log in, create
+a chart...), then ``step`` in a loop until the run ends. Every HTTP call goes
+through ``Session.request`` so it is timed and recorded under a stable label.
+
+Nothing here imports ``app`` at module level: the runner has to configure the
+environment first.
+"""
+
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+class RequestFailed(Exception):
+    """A scenario request returned an unexpected status."""
+
+
+class Recorder:
+    """Collects (latency, ok) samples per scenario and request label."""
+
+    def __init__(self):
+        self.samples: Dict[str, Dict[str, List[float]]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+        # First failure per label, to show why a request kept failing
+        self.first_error: Dict[str, str] = {}
+
+    def record(self, scenario: str, label: str, seconds: float, ok: bool, status: Any, detail: str = "") -> None:
+        self.samples.setdefault(scenario, {}).setdefault(label, []).append(seconds)
+        if not ok:
+            errors = self.errors.setdefault(scenario, {})
+            errors[label] = errors.get(label, 0) + 1
+            self.first_error.setdefault(f"{scenario} {label}", f"{status} {detail}".strip())
+        statuses = self.statuses.setdefault(scenario, {})
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+
+def _birth(index: int):
+    from benchmarks.fixtures import BIRTH_FIXTURES
+
+    return BIRTH_FIXTURES[index % len(BIRTH_FIXTURES)]
+
+
+class Session:
+    """One virtual user's client, auth headers and recorder."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, scenario: str, user_index: int):
+        self.client = client
+        self.recorder = recorder
+        self.scenario = scenario
+        self.user_index = user_index
+        self.headers: Dict[str, str] = {}
+        self.iteration = 0
+
+    async def request(self, label: str, method: str, url: str, expect: int = 200, **kwargs) -> httpx.Response:
+        """Send a request, record its latency and raise if the status is not ``expect``."""
+        headers = {**self.headers, **kwargs.pop("headers", {})}
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.recorder.record(self.scenario, label, time.perf_counter() - started, False, type(e).__name__, str(e))
+            raise RequestFailed(f"{label}: {e}") from e
+        ok = response.status_code == expect
+        self.recorder.record(self.scenario, label, time.perf_counter() - started, ok, response.status_code,
+                             "" if ok else response.text[:200])
+        if not ok:
+            raise RequestFailed(f"{label}: HTTP {response.status_code} {response.text[:200]}")
+        return response
+
+    async def login(self) -> None:
+        """Register a unique user and keep its bearer token."""
+        suffix = uuid.uuid4().hex[:10]
+        credentials = {
+            "email": f"load-{suffix}@example.com",
+            "username": f"load_{suffix}",
+            "password": "Load-test-passw0rd!",
+            "full_name": f"Load User {self.user_index}",
+        }
+        await self.request("auth.register", "POST", "/api/v1/auth/register", json=credentials)
+        response = await self.request(
+            "auth.login", "POST", "/api/v1/auth/login",
+            json={"email": credentials["email"], "password": credentials["password"]},
+        )
+        self.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    async def create_chart(self) -> str:
+        birth = _birth(self.user_index)
+        payload = {
+            "name": birth.name,
+            "birth_date": birth.date.isoformat(),
+            "birth_time": (birth.time.isoformat() if birth.time else None),
+            "birth_latitude": birth.latitude,
+            "birth_longitude": birth.longitude,
+            "birth_timezone": birth.timezone,
+            "birth_location": birth.location_name,
+            "chart_name": f"{birth.name} (load test)",
+        }
+        response = await self.request("charts.create", "POST", "/api/v1/charts", json=payload)
+        return response.json()["id"]
+
+
+def _calculate_payload(index: int) -> Dict[str, Any]:
+    return {"birth_details": _birth(index).model_dump(mode="json"), "preferences": {}}
+
+
+class Scenario:
+    """Base scenario: subclasses set ``name`` and implement ``step``."""
+
+    name = ""
+    description = ""
+
+    async def setup(self, session: Session) -> Dict[str, Any]:
+        return {}
+
+    async def step(self, session: Session, state: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class GuestChartScenario(Scenario):
+    """Anonymous visitor: the public sample chart and transit endpoints."""
+
+    name = "guest_chart"
+    description = "Public sample chart and current transits (no login)"
+
+    async def step(self, session: Session, state: Dict[str, Any]) -> None:
+        await session.request("chart.sample", "GET", "/api/v1/chart/sample")
+        await session.request("transits.sample", "GET", "/api/v1/transits/sample")
+
+
+class DashboardScenario(Scenario):
+    """Logged-in user opening the dashboard and calculating charts."""
+
+    name = "dashboard"
+    description = "Authenticated dashboard reads plus chart calculation"
+
+    async def setup(self, session: Session) -> Dict[str, Any]:
+        await session.login()
+        return {"chart_id": await session.create_chart()}
+
+    async def step(self, session: Session, state: Dict[str, Any]) -> None:
+        chart_id = state["chart_id"]
+        await session.request("auth.me", "GET", "/api/v1/auth/me")
+        await session.request("charts.list", "GET", "/api/v1/charts")
+        await session.request("charts.get", "GET", f"/api/v1/charts/{chart_id}")
+        await session.request("ai_reports.list", "GET", "/api/v1/ai-reports/")
+        await session.request(
+            "chart.calculate", "POST", "/api/v1/chart/calculate",
+            json=_calculate_payload(session.user_index + session.iteration),
+        )
+
+
+class TimelineScenario(Scenario):
+    """Logged-in user browsing a chart's life-aspect timeline."""
+
+    name = "timeline"
+    description = "Dasha periods, aspect timelines and integrated predictions"
+
+    async def setup(self, session: Session) -> Dict[str, Any]:
+        await session.login()
+        return {"chart_id": await session.create_chart()}
+
+    async def step(self, session: Session, state: Dict[str, Any]) -> None:
+        chart_id = state["chart_id"]
+        # Slide the window so successive steps don't all hit the same cached range
+        start = date(2025, 1, 1) + timedelta(days=30 * (session.iteration % 12))
+        window = {"start_date": start.isoformat(), "end_date": (start + timedelta(days=180)).isoformat()}
+        requests = [
+            ("dasha", f"/api/v1/charts/{chart_id}/dasha", {}),
+            ("timeline", f"/api/v1/charts/{chart_id}/timeline", window),
+            ("timeline.enhanced", f"/api/v1/charts/{chart_id}/timeline/enhanced", window),
+            ("predictions.integrated", f"/api/v1/charts/{chart_id}/predictions/integrated",
+             {**window, "aspect_name": "Career"}),
+        ]
+        # The views load independently in the UI, so one failing doesn't skip the rest
+        failures = []
+        for label, url, params in requests:
+            try:
+                await session.request(label, "GET", url, params=params)
+            except RequestFailed as e:
+                failures.append(str(e))
+        if failures:
+            raise RequestFailed("; ".join(failures))
+
+
+class AIReportScenario(Scenario):
+    """Logged-in user generating an HTML report through the (fake) LLM."""
+
+    name = "ai_report"
+    description = "HTML report generation against the fake OpenAI server"
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        self.model = model
+
+    async def setup(self, session: Session) -> Dict[str, Any]:
+        await session.login()
+        await session.request(
+            "llm.save", "POST", "/api/v1/llm/save",
+            json={"provider": "openai", "model": self.model, "api_key": "sk-loadtest", "daily_limit": 10000},
+        )
+        response = await session.request(
+            "chart.calculate", "POST", "/api/v1/chart/calculate", json=_calculate_payload(session.user_index),
+        )
+        return {"chart_data": response.json()}
+
+    async def step(self, session: Session, state: Dict[str, Any]) -> None:
+        await session.request(
+            "ai.generate_html_report", "POST", "/api/v1/ai/generate-html-report",
+            json={"chart_data": state["chart_data"]}, timeout=120,
+        )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (GuestChartScenario(), DashboardScenario(), TimelineScenario(), AIReportScenario())
+}
+
+
+def get_scenario(name: str) -> Optional[Scenario]:
+    return SCENARIOS.get(name)
@@ -0,0 +1,45 @@
+"""Serve the app over HTTP wired to the local stand-ins.
+
+Started by ``loadtest.runner --mode http``; can also be run by hand to point
+an external load generator at it::
+
+    python -m loadtest.server --port 8800 --llm-base-url http://127.0.0.1:8900
+"""
+
+import argparse
+import os
+import tempfile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--workdir", help="Directory for the SQLite database (default: a new temp dir)")
+    parser.add_argument("--llm-base-url", help="Fake LLM server base URL")
+    parser.add_argument("--app-logs", action="store_true", help="Keep the app's per-request INFO logs")
+    args = parser.parse_args()
+
+    from loadtest.stack import configure_environment
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="chandrahoro-loadtest-")
+    os.makedirs(workdir, exist_ok=True)
+    configure_environment(workdir, args.llm_base_url)
+
+    import uvicorn
+
+    from app.core.redis_client import set_redis_client
+    from app.main import app
+    from loadtest.fake_redis import FakeRedis
+    from loadtest.stack import quiet_app_logging
+
+    if not args.app_logs:
+        quiet_app_logging()
+
+    # The startup hook creates the schema; only Redis needs installing here
+    set_redis_client(FakeRedis())
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Wire the app to the local stand-ins.
+
+``configure_environment`` must run before anything imports ``app`` (settings,
+rate limits and the database engine read the environment at import time).
+"""
+
+import os
+from typing import Optional
+
+# Rate limits high enough that the harness measures the app, not the limiter
+UNLIMITED = "1000000000/3600"
+RATE_LIMIT_NAMES = ("CHART_CALCULATION", "AI_INTERPRETATION", "API_GENERAL", "AUTH")
+
+
+def configure_environment(workdir: str, llm_base_url: Optional[str] = None) -> None:
+    """
+    Point the app at SQLite and the fake LLM server.
+
+    Args:
+        workdir: Directory for the SQLite database and the LLM key vault
+        llm_base_url: Base URL of the fake LLM server, if any
+    """
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(workdir, 'loadtest.db')}"
+    os.environ["LLM_VAULT_DIR"] = os.path.join(workdir, "llm_vault")
+    for name in RATE_LIMIT_NAMES:
+        os.environ[f"RATE_LIMIT_{name}"] = UNLIMITED
+    os.environ["CACHE_WARMER_ENABLED"] = "false"
+    # Redis is replaced in-process by ``prepare_app``; never reach a real one
+    for name in ("REDIS_URL", "REDIS_HOST"):
+        os.environ.pop(name, None)
+    if llm_base_url:
+        os.environ["OPENAI_BASE_URL"] = f"{llm_base_url}/v1"
+        os.environ["ANTHROPIC_BASE_URL"] = llm_base_url
+
+
+async def prepare_app():
+    """
+    Create the schema and install ``FakeRedis``.
+
+    Returns:
+        The ``FakeRedis`` instance in use
+    """
+    from app.core.database import init_db
+    from app.core.redis_client import set_redis_client
+    from loadtest.fake_redis import FakeRedis
+
+    redis = FakeRedis()
+    set_redis_client(redis)
+    await init_db()
+    return redis
+
+
+def quiet_app_logging() -> None:
+    """Drop the app's per-request INFO logs, which would flood the report output."""
+    import logging
+
+    logging.getLogger("chandrahoro").setLevel(logging.WARNING)
+    logging.getLogger("app").setLevel(logging.WARNING)
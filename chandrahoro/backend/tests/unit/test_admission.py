@@ -0,0 +1,72 @@
+"""Tests for admission control of heavy endpoints."""
+
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionController, classify
+from app.core.exceptions import ServiceUnavailableError
+
+
+def test_classify_routes():
+    assert classify("POST", "/api/v1/chart/calculate") == "interactive"
+    assert classify("POST", "/api/v1/chart/export/pdf") == "export"
+    assert classify("POST", "/api/v1/research-export/batch") == "batch"
+    assert classify("POST", "/api/v1/research-export/results-csv") == "export"
+    assert classify("GET", "/api/v1/charts/abc/timeline") == "interactive"
+    assert classify("GET", "/api/v1/charts/abc/dasha") == "interactive"
+    assert classify("GET", "/health") is None
+    assert classify("GET", "/api/v1/chart/calculate") is None
+
+
+def test_priority_then_round_robin_across_callers():
+    controller = AdmissionController(concurrency=1, budgets={"interactive": 60, "export": 60, "batch": 60})
+    order = []
+
+    async def request(cost_class, key, label):
+        await controller.acquire(cost_class, key)
+        order.append(label)
+        await asyncio.sleep(0)
+        controller.release(cost_class, 0.01)
+
+    async def run():
+        await controller.acquire("interactive", "holder")
+        tasks = [
+            asyncio.ensure_future(request("batch", "a", "batch-a")),
+            asyncio.ensure_future(request("interactive", "a", "a1")),
+            asyncio.ensure_future(request("interactive", "a", "a2")),
+            asyncio.ensure_future(request("interactive", "a", "a3")),
+            asyncio.ensure_future(request("interactive", "b", "b1")),
+            asyncio.ensure_future(request("export", "b", "export-b")),
+        ]
+        await asyncio.sleep(0)
+        controller.release("interactive", 0.01)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["a1", "b1", "a2", "a3", "export-b", "batch-a"]
+    assert controller.get_stats()["running"] == {"interactive": 0, "export": 0, "batch": 0}
+
+
+def test_rejects_when_over_budget_and_drops_cancelled_waiters():
+    controller = AdmissionController(concurrency=1, budgets={"interactive": 0.3})
+
+    async def run():
+        await controller.acquire("interactive", "holder")
+        # Initial estimate is 0.25s per interactive request
+        waiter = asyncio.ensure_future(controller.acquire("interactive", "a"))
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            await controller.acquire("interactive", "b")
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        controller.release("interactive")
+        return exc_info.value
+
+    error = asyncio.run(run())
+    assert error.status_code == 503
+    assert error.headers["Retry-After"] == "1"
+    stats = controller.get_stats()
+    assert stats["rejected"]["interactive"] == 1
+    assert stats["queued"]["interactive"] == 0
+    assert stats["running"]["interactive"] == 0
@@ -0,0 +1,43 @@
+"""Tests for the cache warmer's time-based refresh."""
+
+import asyncio
+from datetime import date, time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 (registers every table)
+from app.core.database import Base
+from app.models import CacheType, ChartCache
+from app.services import cache_warmer
+from app.services.cache_warmer import CacheWarmer
+from app.services.chart_service import ChartService
+
+
+def test_refresh_time_based_for_service_created_chart(monkeypatch):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(cache_warmer, "AsyncSessionLocal", sessions)
+
+        async with sessions() as db:
+            chart = await ChartService(db).create_chart(
+                user_id="user-1", name="Test", birth_date=date(1990, 1, 1), birth_time=time(6, 30),
+                latitude=28.6, longitude=77.2, timezone="Asia/Kolkata", location_name="Delhi",
+            )
+        refreshed = await CacheWarmer(concurrency=2).refresh_time_based()
+        async with sessions() as db:
+            entries = (await db.execute(
+                select(ChartCache).where(ChartCache.cache_type.in_(cache_warmer.TIME_BASED_CACHE_TYPES))
+            )).scalars().all()
+        await engine.dispose()
+        return chart, refreshed, {entry.cache_type: entry.get_data() for entry in entries}
+
+    chart, refreshed, data = asyncio.run(run())
+    # ChartService keeps planets as a dict keyed by name
+    assert isinstance(chart.chart_data["planets"], dict)
+    assert refreshed == 2
+    assert data[CacheType.CURRENT_DASHA]
+    assert {position["planet"] for position in data[CacheType.CURRENT_TRANSITS]["transit_positions"]} >= {"Sun", "Moon"}
@@ -0,0 +1,159 @@
+"""Tests for chart list projections, pagination, section fetch and the natal cache."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 (registers every table)
+from app.core.cache_codec import decode_payload, encode_payload
+from app.core.database import Base
+from app.core.http_cache import CALCULATION_VERSION
+from app.models import BirthChart, CacheType, ChartCache
+from app.services.chart_service import ChartService
+
+
+async def _session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessions() as db:
+        start = datetime(2026, 1, 1)
+        for i in range(7):
+            db.add(BirthChart(
+                user_id="user-1", name=f"chart-{i}", birth_date=date(1990, 1, 1),
+                birth_latitude=28.6, birth_longitude=77.2, birth_timezone="Asia/Kolkata",
+                birth_location="Delhi", created_at=start + timedelta(minutes=i // 2),
+                chart_data={"planets": [{"name": "Sun"}], "methodologies": {"kp": {"index": i}}},
+            ))
+        await db.commit()
+    return sessions
+
+
+def test_keyset_pages_cover_every_chart_once():
+    async def run():
+        sessions = await _session_factory()
+        async with sessions() as db:
+            service, cursor, pages = ChartService(db), None, []
+            while True:
+                charts, cursor = await service.list_user_charts("user-1", cursor=cursor, limit=3)
+                pages.append([chart.created_at for chart in charts])
+                if cursor is None:
+                    return pages
+
+    pages = asyncio.run(run())
+    assert [len(page) for page in pages] == [3, 3, 1]
+    created = [value for page in pages for value in page]
+    assert created == sorted(created, reverse=True)
+
+
+def test_sections_are_extracted_without_loading_chart_data():
+    async def run():
+        sessions = await _session_factory()
+        async with sessions() as db:
+            service = ChartService(db)
+            charts, _ = await service.list_user_charts("user-1", limit=1)
+            chart, sections = await service.get_chart_sections(
+                charts[0].id, "user-1", ["planets", "methodologies.kp", "missing"]
+            )
+            return chart, sections, await service.get_chart_sections(charts[0].id, "user-2", ["planets"])
+
+    chart, sections, other_user = asyncio.run(run())
+    assert sections == {"planets": [{"name": "Sun"}], "methodologies.kp": {"index": 6}, "missing": None}
+    assert "chart_data" not in chart.__dict__
+    assert other_user is None
+
+
+def test_payload_round_trip_stores_datetimes_as_iso_strings():
+    payload, payload_format = encode_payload({"start": datetime(2026, 1, 1, 12, 30), "values": (1, 2.5)})
+    assert decode_payload(payload, payload_format) == {"start": "2026-01-01T12:30:00", "values": [1, 2.5]}
+
+
+def test_natal_cache_bulk_write_and_stale_version_recompute():
+    async def run():
+        sessions = await _session_factory()
+        async with sessions() as db:
+            service = ChartService(db)
+            charts, _ = await service.list_user_charts("user-1", limit=1)
+            chart_id = charts[0].id
+            await service._cache_natal_calculations(chart_id, {"planets": [{"name": "Sun"}], "yogas": []}, 5)
+            await db.commit()
+            fresh = await service.get_cached_calculation(chart_id, CacheType.NATAL_POSITIONS)
+
+            entries = (await db.execute(select(ChartCache))).scalars().all()
+            for entry in entries:
+                entry.cache_version = "1.0"
+            await db.commit()
+
+            async def recalculate(**kwargs):
+                return {"planets": [{"name": "Moon"}], "yogas": [{"name": "Gaja Kesari"}]}
+
+            service._calculate_chart = recalculate
+            recomputed = await service.get_cached_calculation(chart_id, CacheType.NATAL_POSITIONS)
+            entries = (await db.execute(select(ChartCache).execution_options(populate_existing=True))).scalars().all()
+            return fresh, recomputed, entries
+
+    fresh, recomputed, entries = asyncio.run(run())
+    assert fresh == [{"name": "Sun"}]
+    assert recomputed == [{"name": "Moon"}]
+    assert len(entries) == 2
+    assert all(entry.cache_version == CALCULATION_VERSION and entry.cache_data is None for entry in entries)
+    assert {entry.cache_type: entry.get_data() for entry in entries}[CacheType.NATAL_YOGAS] == [{"name": "Gaja Kesari"}]
+
+
+def test_sections_serve_natal_cache_and_recompute_stale_versions():
+    async def run():
+        sessions = await _session_factory()
+        async with sessions() as db:
+            service = ChartService(db)
+            charts, _ = await service.list_user_charts("user-1", limit=1)
+            chart_id = charts[0].id
+            await service._cache_natal_calculations(chart_id, {"planets": [{"name": "Sun", "cached": True}]}, 5)
+            await db.commit()
+            _, cached = await service.get_chart_sections(chart_id, "user-1", ["planets", "methodologies.kp"])
+
+            for entry in (await db.execute(select(ChartCache))).scalars().all():
+                entry.cache_version = "1.0"
+            await db.commit()
+
+            async def recalculate(**kwargs):
+                return {"planets": {"Moon": {"sidereal_longitude": 99.8}}}
+
+            service._calculate_chart = recalculate
+            _, recomputed = await service.get_chart_sections(chart_id, "user-1", ["planets"])
+            return cached, recomputed
+
+    cached, recomputed = asyncio.run(run())
+    assert cached == {"planets": [{"name": "Sun", "cached": True}], "methodologies.kp": {"index": 6}}
+    assert recomputed == {"planets": {"Moon": {"sidereal_longitude": 99.8}}}
+
+
+def test_stale_time_based_entry_is_recomputed():
+    async def run():
+        sessions = await _session_factory()
+        async with sessions() as db:
+            service = ChartService(db)
+            charts, _ = await service.list_user_charts("user-1", limit=1)
+            chart = await db.get(BirthChart, charts[0].id)
+            chart.chart_data = {"planets": {"Moon": {"sidereal_longitude": 99.8, "sign_number": 3}}}
+            db.add(ChartCache.create_cache_entry(
+                birth_chart_id=chart.id, cache_type=CacheType.CURRENT_DASHA,
+                cache_key=CacheType.CURRENT_DASHA.value, cache_data={"stale": True},
+                cache_version="1.0", calculation_time_ms=1,
+            ))
+            await db.commit()
+
+        async with sessions() as db:
+            service = ChartService(db)
+            # Leaves the chart in the session as a summary without chart_data
+            summary, _ = await service.get_chart_sections(chart.id, "user-1", ["methodologies"])
+            data = await service.get_cached_calculation(summary.id, CacheType.CURRENT_DASHA)
+            entry = (await db.execute(select(ChartCache).execution_options(populate_existing=True))).scalar_one()
+            return data, entry
+
+    data, entry = asyncio.run(run())
+    assert data and "stale" not in data
+    assert entry.cache_version == CALCULATION_VERSION
+    assert entry.get_data() == data
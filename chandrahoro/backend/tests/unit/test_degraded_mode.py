@@ -0,0 +1,64 @@
+"""Tests for load-shedding degraded mode."""
+
+from app.core import degraded_mode as dm
+from app.core.admission import AdmissionController
+from app.core.chart_sections import PARASHARA_SECTIONS, available_sections
+
+
+class _State:
+    def __init__(self, computed):
+        self.computed = computed
+
+    def is_computed(self, name):
+        return name in self.computed
+
+
+def test_deferrable_skips_selected_and_cached_sections():
+    policy = dm.DegradedModePolicy(defer_sections=["dasha.navigator", "methodologies", "shadbala"])
+    sections = available_sections(["parashara", "kp", "jaimini", "western"])
+    deferred = policy.deferrable(sections, "kp", _State({"methodology:western"}))
+    assert deferred == ["dasha.navigator", "shadbala", "methodologies.jaimini"]
+    assert set(PARASHARA_SECTIONS) - {"dasha.navigator", "shadbala"} <= set(sections) - set(deferred)
+
+
+def test_queue_depth_signal_and_hold(monkeypatch):
+    controller = AdmissionController(concurrency=1)
+    monkeypatch.setattr(dm, "get_admission_controller", lambda: controller)
+    policy = dm.DegradedModePolicy(enabled=True, queue_depth=2, p95_ms=0, cpu_percent=0, hold_seconds=60)
+    assert policy.check() == []
+
+    controller._queued["interactive"] = 2
+    assert policy.check() == ["queue_depth=2"]
+
+    # Held after the queue drains
+    controller._queued["interactive"] = 0
+    assert policy.check() == ["queue_depth=2"]
+    assert policy.get_stats()["degraded"] is True
+
+    policy._degraded_until = 0
+    assert policy.check() == []
+
+
+def test_p95_signal_ages_out(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dm.time, "monotonic", lambda: now[0])
+    policy = dm.DegradedModePolicy(enabled=True, queue_depth=0, p95_ms=500, cpu_percent=0,
+                                   hold_seconds=0, p95_window_seconds=30)
+    assert policy.check() == []
+
+    for _ in range(20):
+        policy.record_latency(0.1)
+    policy.record_latency(0.9)
+    assert policy.check() == []
+
+    for _ in range(5):
+        policy.record_latency(0.9)
+    assert policy.check() == ["p95_ms=900"]
+
+    # Slow samples leave the window once load drops
+    now[0] += 31
+    assert policy.check() == []
+    assert policy.get_stats()["p95_ms"] is None
+    policy.record_latency(0.2)
+    assert policy.check() == []
+    assert policy.get_stats()["p95_samples"] == 1
@@ -0,0 +1,107 @@
+"""Tests for the offline gazetteer index."""
+
+import pytest
+
+from app.services.gazetteer import TZ_GRID_MIXED, Gazetteer, SortedKeyFile, build_index, normalize_name
+
+# name, ascii name, alternates, lat, lon, country, admin1 code, population, time zone
+PLACES = [
+    ("Mumbai", "Mumbai", "Bombay", 19.0728, 72.8826, "IN", "16", 12691836, "Asia/Kolkata"),
+    ("Delhi", "Delhi", "Dilli", 28.6519, 77.2315, "IN", "07", 10927986, "Asia/Kolkata"),
+    ("London", "London", "", 51.5085, -0.1257, "GB", "ENG", 8961989, "Europe/London"),
+    ("Paris", "Paris", "", 48.8534, 2.3488, "FR", "11", 2138551, "Europe/Paris"),
+    ("Denver", "Denver", "", 39.7392, -104.9847, "US", "CO", 715522, "America/Denver"),
+    ("Dehradun", "Dehradun", "Dehra Dun", 30.3256, 78.0437, "IN", "39", 578420, "Asia/Kolkata"),
+    ("Zürich", "Zurich", "", 47.3667, 8.55, "CH", "ZH", 341730, "Europe/Zurich"),
+    ("New Delhi", "New Delhi", "", 28.6358, 77.2245, "IN", "07", 317797, "Asia/Kolkata"),
+]
+
+
+@pytest.fixture(scope="module")
+def gazetteer(tmp_path_factory):
+    root = tmp_path_factory.mktemp("gazetteer")
+    cities = root / "cities.txt"
+    with open(cities, "w", encoding="utf-8") as handle:
+        for geoname_id, (name, ascii_name, alternates, lat, lon, cc, admin1, population, tz) in enumerate(PLACES):
+            fields = [str(geoname_id), name, ascii_name, alternates, str(lat), str(lon), "P", "PPL", cc, "",
+                      admin1, "", "", "", str(population), "", "0", tz, "2024-01-01"]
+            handle.write("\t".join(fields) + "\n")
+    admin1 = root / "admin1.txt"
+    admin1.write_text("IN.07\tDelhi\tDelhi\t1\nIN.16\tMaharashtra\tMaharashtra\t2\n", encoding="utf-8")
+    countries = root / "countries.txt"
+    countries.write_text("#ISO\tISO3\tISO-Numeric\tfips\tCountry\nIN\tIND\t356\tIN\tIndia\n", encoding="utf-8")
+
+    build_index(str(cities), str(root / "index"), str(admin1), str(countries), grid_resolution=5.0)
+    index = Gazetteer(str(root / "index"))
+    yield index
+    index.close()
+
+
+def _names(results):
+    return [result.name for result in results]
+
+
+def test_exact_match_on_alternate_and_accent_folded_names(gazetteer):
+    mumbai = gazetteer.search("Bombay")[0]
+    assert mumbai.name == "Mumbai"
+    assert mumbai.display_name == "Mumbai, Maharashtra, India"
+    assert (mumbai.latitude, mumbai.longitude, mumbai.timezone) == (19.0728, 72.8826, "Asia/Kolkata")
+    assert _names(gazetteer.search("ZURICH"))[0] == "Zürich"
+    assert normalize_name("Zürich, CH") == "zurich ch"
+
+
+def test_exact_match_ranks_before_fuzzy_matches(gazetteer):
+    assert _names(gazetteer.search("delhi"))[:2] == ["Delhi", "New Delhi"]
+
+
+def test_short_prefix_is_ranked_by_population(gazetteer):
+    assert _names(gazetteer.search("de")) == ["Delhi", "Denver", "Dehradun"]
+    assert _names(gazetteer.search("de", max_results=2)) == ["Delhi", "Denver"]
+
+
+def test_long_prefix_uses_the_sorted_name_range(gazetteer):
+    assert _names(gazetteer.search("dehra")) == ["Dehradun"]
+
+
+def test_fuzzy_match_tolerates_typos(gazetteer):
+    assert _names(gazetteer.search("mumbaii"))[0] == "Mumbai"
+    assert _names(gazetteer.search("londn"))[0] == "London"
+
+
+def test_empty_short_and_unmatched_queries(gazetteer):
+    assert gazetteer.search("") == []
+    assert gazetteer.search("  a ") == []
+    assert gazetteer.search("xyzzyq") == []
+
+
+def test_timezone_lookup(gazetteer):
+    assert gazetteer.timezone_at(28.6, 77.2) == "Asia/Kolkata"
+    assert gazetteer.timezone_at(39.7, -105.0) == "America/Denver"
+    # Border cell between London, Paris and Zurich: refined by the nearest place
+    row, col = gazetteer._grid_cell(48.9, 2.4)
+    assert gazetteer.tz_grid[row * gazetteer._grid_cols + col] & TZ_GRID_MIXED
+    assert gazetteer.timezone_at(48.9, 2.4) == "Europe/Paris"
+    assert gazetteer.timezone_at(51.5, -0.1) == "Europe/London"
+    # Open ocean falls back to a nautical zone
+    assert gazetteer.timezone_at(-40.0, -140.0) == "Etc/GMT+9"
+    assert gazetteer.reverse(28.64, 77.22).name == "New Delhi"
+
+
+def test_sorted_key_file_empty_prefix_and_missing_keys(tmp_path):
+    path = str(tmp_path / "keys.dat")
+    SortedKeyFile.write(path, [("alpha", "1"), ("beta", "2"), ("betamax", "3")])
+    keys = SortedKeyFile(path)
+    assert [key for key, _ in keys.iter_prefix("")] == ["alpha", "beta", "betamax"]
+    assert list(keys.iter_prefix("beta")) == [("beta", "2"), ("betamax", "3")]
+    assert list(keys.iter_prefix("c")) == []
+    assert keys.get("beta") == "2"
+    assert keys.get("bet") is None and keys.get("zeta") is None
+    keys.close()
+
+    empty_path = str(tmp_path / "empty.dat")
+    SortedKeyFile.write(empty_path, [])
+    empty = SortedKeyFile(empty_path)
+    assert len(empty) == 0
+    assert empty.get("alpha") is None
+    assert list(empty.iter_prefix("")) == []
+    empty.close()
@@ -0,0 +1,66 @@
+"""Tests for lazy router mounting."""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1 import ROUTERS
+from app.core.lazy_routes import LazyRouter, LazyRouterMounter, build_manifest, load_manifest
+
+
+def _route_table(app):
+    return [
+        (route.path, sorted(getattr(route, "methods", None) or []), getattr(route, "name", None))
+        for route in app.router.routes
+    ]
+
+
+def _lazy_app():
+    app = FastAPI()
+    mounter = LazyRouterMounter(app, "app.api.v1", enabled=True)
+    mounter.include_all(ROUTERS)
+    mounter.install_openapi()
+    return app, mounter
+
+
+def test_manifest_is_current():
+    # Regenerate with: python -m app.core.lazy_routes --write
+    assert load_manifest() == build_manifest("app.api.v1", ROUTERS)
+
+
+def test_lazy_mount_reproduces_eager_route_order():
+    eager = FastAPI()
+    LazyRouterMounter(eager, "app.api.v1", enabled=False).include_all(ROUTERS)
+
+    lazy, mounter = _lazy_app()
+    assert sum(isinstance(route, LazyRouter) for route in lazy.router.routes) == len(ROUTERS)
+    mounter.mount_all()
+
+    assert _route_table(lazy) == _route_table(eager)
+    assert mounter.get_stats()["pending"] == []
+
+
+def test_first_request_mounts_only_the_matching_router():
+    app, mounter = _lazy_app()
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            ok = await client.get("/api/v1/methodologies/")
+            not_allowed = await client.delete("/api/v1/methodologies/")
+            return ok, not_allowed
+
+    ok, not_allowed = asyncio.run(run())
+    assert ok.status_code == 200
+    assert not_allowed.status_code == 405
+    stats = mounter.get_stats()
+    assert stats["mounted"] == ["methodologies"]
+    assert "chart" in stats["pending"]
+
+
+def test_openapi_mounts_every_router():
+    app, mounter = _lazy_app()
+    paths = app.openapi()["paths"]
+    assert "/api/v1/chart/calculate" in paths
+    assert "/api/v1/ai-reports/" in paths
+    assert mounter.get_stats()["pending"] == []
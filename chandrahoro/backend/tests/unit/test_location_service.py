@@ -0,0 +1,39 @@
+"""Tests for location search result caching."""
+
+import asyncio
+import time
+
+from app.services.location_service import EnhancedLocationService, LocationCache
+
+
+def _service(nominatim_results):
+    service = EnhancedLocationService()
+    service.cache = LocationCache(ttl_hours=24, negative_ttl_seconds=30)
+    service.offline_only = False
+    service.gazetteer = None
+
+    async def search(query, max_results=10):
+        return nominatim_results
+
+    service.nominatim.search = search
+    return service
+
+
+def _ttl_left(service, query):
+    _, expires_at = service.cache._cache[service.cache.make_key(query)]
+    return expires_at - time.monotonic()
+
+
+def test_partial_results_after_a_failed_provider_are_cached_briefly():
+    service = _service(None)
+    results = asyncio.run(service.search_locations("Mumbai"))
+    assert [r.source for r in results] == ["builtin"]
+    assert _ttl_left(service, "Mumbai") <= 30
+
+
+def test_complete_results_use_the_full_ttl_and_empty_ones_do_not():
+    service = _service([])
+    asyncio.run(service.search_locations("Mumbai"))
+    asyncio.run(service.search_locations("Nowhereville"))
+    assert _ttl_left(service, "Mumbai") > 23 * 3600
+    assert _ttl_left(service, "Nowhereville") <= 30
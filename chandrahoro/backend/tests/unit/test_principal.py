@@ -0,0 +1,59 @@
+"""Tests for the authenticated principal cache."""
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401 (registers every table)
+from app.core import principal as principal_module
+from app.core.database import Base
+from app.core.principal import PrincipalCache, load_principal
+from app.models import User
+from app.services.auth_service import AuthService
+from loadtest.fake_redis import FakeRedis
+
+
+def test_revocation_between_read_and_put_is_not_cached(monkeypatch, tmp_path):
+    redis = FakeRedis()
+    cache = PrincipalCache(ttl_seconds=60, redis_ttl_seconds=300)
+    monkeypatch.setattr(principal_module, "get_redis", lambda: redis)
+    monkeypatch.setattr(principal_module, "_principal_cache", cache)
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'principal.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            user = User(email="a@example.com", username="a", password_hash="x")
+            db.add(user)
+            await db.commit()
+
+        async def logout():
+            async with sessions() as db:
+                await AuthService.revoke_tokens(db, await AuthService.get_user_by_id(db, user.id))
+            # Let the Redis invalidation scheduled by after_commit run
+            await asyncio.sleep(0)
+
+        async with sessions() as db:
+            execute = db.execute
+
+            async def read_then_logout(*args, **kwargs):
+                frozen = (await execute(*args, **kwargs)).freeze()
+                await logout()
+                return frozen()
+
+            db.execute = read_then_logout
+            # The read saw version 0, so this request still passes
+            assert (await load_principal(db, user.id, 0)) is not None
+
+        other_worker = PrincipalCache(ttl_seconds=60, redis_ttl_seconds=300)
+        async with sessions() as db:
+            current = await load_principal(db, user.id, 1)
+        await engine.dispose()
+        return current, await cache.get(user.id, 0), await other_worker.get(user.id, 0)
+
+    current, local, remote = asyncio.run(run())
+    assert local is None and remote is None
+    assert current is not None and current.token_version == 1
+    assert cache.get_stats()["invalidations"] == 1
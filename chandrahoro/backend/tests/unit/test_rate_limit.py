@@ -0,0 +1,222 @@
+"""Tests for the sliding-window rate limiter (memory and Redis backends)."""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from app.core import rate_limit as rl
+from app.core.redis_client import set_redis_client
+from app.core.rate_limit import (
+    SLIDING_WINDOW_SCRIPT,
+    MemoryRateLimitBackend,
+    NoScriptError,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for redis.asyncio.Redis.
+
+    ``evalsha`` runs a Python port of ``SLIDING_WINDOW_SCRIPT`` against the
+    fake's own GET/INCRBY/EXPIRE so the backend's keys, arguments and result
+    handling are exercised. Keys expire against ``clock``.
+    """
+
+    def __init__(self):
+        self.clock = 0.0
+        self.data = {}
+        self.expires = {}
+        self.scripts = {}
+        self.fail = False
+        self.calls = []
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("fake redis down")
+
+    def _purge(self, key):
+        if key in self.expires and self.expires[key] <= self.clock:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+
+    def get(self, key):
+        self._purge(key)
+        return self.data.get(key)
+
+    def incrby(self, key, amount):
+        self._purge(key)
+        self.data[key] = int(self.data.get(key, 0)) + int(amount)
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        self.expires[key] = self.clock + int(seconds)
+
+    async def script_load(self, script):
+        self._check()
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        self.scripts[sha] = script
+        return sha
+
+    async def evalsha(self, sha, numkeys, *keys_and_args):
+        self._check()
+        self.calls.append(sha)
+        if sha not in self.scripts:
+            raise NoScriptError("NOSCRIPT No matching script")
+        assert self.scripts[sha] == SLIDING_WINDOW_SCRIPT
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        current = int(self.get(keys[0]) or 0)
+        previous = int(self.get(keys[1]) or 0)
+        limit, weight, cost, ttl = int(args[0]), float(args[1]), int(args[2]), int(args[3])
+        if previous * weight + current + cost > limit:
+            return [0, current, previous]
+        current = self.incrby(keys[0], cost)
+        self.expire(keys[0], ttl)
+        return [1, current, previous]
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_redis():
+    client = FakeRedis()
+    set_redis_client(client)
+    yield client
+    set_redis_client(None)
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestMemoryBackend:
+
+    def test_allows_up_to_limit_then_rejects(self):
+        backend = MemoryRateLimitBackend()
+        results = [backend.hit("k", 3, 60, now=1000.0) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after > 0
+
+    def test_previous_window_is_weighted(self):
+        backend = MemoryRateLimitBackend()
+        for _ in range(4):
+            assert backend.hit("k", 4, 60, now=0.0).allowed
+        # 15s into the next window, 4 * 0.75 = 3 of the old requests still count
+        assert backend.hit("k", 4, 60, now=75.0).allowed
+        assert not backend.hit("k", 4, 60, now=75.0).allowed
+        # Halfway through, only 2 count
+        assert backend.hit("k", 4, 60, now=90.0).allowed
+
+    def test_retry_after_is_when_a_request_fits_again(self):
+        backend = MemoryRateLimitBackend()
+        for _ in range(2):
+            backend.hit("k", 2, 60, now=0.0)
+        rejected = backend.hit("k", 2, 60, now=10.0)
+        assert not rejected.allowed
+        assert backend.hit("k", 2, 60, now=10.0 + rejected.retry_after + 0.01).allowed
+
+    def test_keys_are_independent(self):
+        backend = MemoryRateLimitBackend()
+        assert backend.hit("a", 1, 60, now=0.0).allowed
+        assert backend.hit("b", 1, 60, now=0.0).allowed
+        assert not backend.hit("a", 1, 60, now=0.0).allowed
+
+    def test_idle_keys_expire(self):
+        backend = MemoryRateLimitBackend(sweep_seconds=0)
+        for i in range(100):
+            backend.hit(f"user:{i}", 5, 60, now=0.0)
+        assert len(backend) == 100
+        backend.hit("other", 5, 60, now=120.0)
+        assert len(backend) == 1
+
+    def test_headers(self):
+        backend = MemoryRateLimitBackend()
+        backend.hit("k", 1, 60, now=30.0)
+        headers = backend.hit("k", 1, 60, now=30.0).headers()
+        assert headers["RateLimit-Limit"] == "1"
+        assert headers["RateLimit-Remaining"] == "0"
+        assert headers["RateLimit-Reset"] == "30"
+        assert headers["RateLimit-Policy"] == "1;w=60"
+        assert int(headers["Retry-After"]) >= 1
+
+
+class TestRedisBackend:
+
+    def test_matches_memory_backend(self):
+        client = FakeRedis()
+        backend = RedisRateLimitBackend()
+        memory = MemoryRateLimitBackend()
+        for now in (0.0, 1.0, 2.0, 59.0, 61.0, 75.0, 90.0, 130.0, 200.0):
+            client.clock = now
+            expected = memory.hit("k", 3, 60, now=now)
+            actual = run(backend.hit(client, "k", 3, 60, now=now))
+            assert (actual.allowed, actual.remaining) == (expected.allowed, expected.remaining)
+
+    def test_keys_expire_after_two_windows(self):
+        client = FakeRedis()
+        backend = RedisRateLimitBackend()
+        run(backend.hit(client, "k", 3, 60, now=10.0))
+        assert client.data
+        client.clock = 120.0
+        assert all(client.get(key) is None for key in list(client.data))
+
+    def test_reloads_script_after_noscript(self):
+        client = FakeRedis()
+        backend = RedisRateLimitBackend()
+        run(backend.hit(client, "k", 3, 60, now=0.0))
+        client.scripts.clear()  # e.g. Redis restarted
+        assert run(backend.hit(client, "k", 3, 60, now=0.0)).allowed
+        assert len(client.scripts) == 1
+
+    def test_limit_is_shared_between_limiters(self, fake_redis):
+        # Two limiters stand in for two worker processes
+        workers = [RateLimiter(use_redis=True), RateLimiter(use_redis=True)]
+
+        async def scenario():
+            return [await workers[i % 2].hit("shared", 4, 60) for i in range(6)]
+
+        results = run(scenario())
+        assert [r.allowed for r in results] == [True] * 4 + [False] * 2
+        assert all(len(worker.memory) == 0 for worker in workers)
+
+    def test_falls_back_to_memory_when_redis_fails(self, fake_redis):
+        fake_redis.fail = True
+        limiter = RateLimiter(use_redis=True)
+        assert run(limiter.hit("k", 1, 60)).allowed
+        assert not run(limiter.hit("k", 1, 60)).allowed
+        assert limiter.redis_errors == 1
+        assert len(limiter.memory) == 1
+
+
+class TestDependency:
+
+    def test_sets_headers_and_rejects_with_429(self, monkeypatch):
+        from fastapi import Depends, FastAPI
+        from fastapi.testclient import TestClient
+
+        from app.main import app_exception_handler
+        from app.core.exceptions import AppException
+
+        monkeypatch.setattr(rl, "_rate_limiter", RateLimiter(use_redis=False))
+        monkeypatch.setitem(rl.RATE_LIMITS, "test", {"max_requests": 2, "window_seconds": 60})
+
+        app = FastAPI()
+        app.add_exception_handler(AppException, app_exception_handler)
+
+        @app.get("/limited", dependencies=[Depends(rl.rate_limit("test"))])
+        async def limited():
+            return {"ok": True}
+
+        client = TestClient(app)
+        first = client.get("/limited")
+        assert first.status_code == 200
+        assert first.headers["RateLimit-Remaining"] == "1"
+        client.get("/limited")
+        rejected = client.get("/limited")
+        assert rejected.status_code == 429
+        assert rejected.headers["RateLimit-Remaining"] == "0"
+        assert "Retry-After" in rejected.headers
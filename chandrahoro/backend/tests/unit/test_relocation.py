@@ -0,0 +1,30 @@
+"""Tests for relocation grid viewports."""
+
+from array import array
+
+from app.core.relocation import RelocationGrid
+
+
+def _grid(resolution: float = 10.0) -> RelocationGrid:
+    latitudes = [-10.0, 0.0, 10.0]
+    longitudes = [-180.0 + i * resolution for i in range(int(360 / resolution))]
+    return RelocationGrid(
+        resolution=resolution,
+        latitudes=latitudes,
+        longitudes=longitudes,
+        mc=array('d', [0.0] * len(longitudes)),
+        ascendant=array('d', [0.0] * (len(latitudes) * len(longitudes))),
+        ayanamsha_value=24.0,
+        angularity_orb=2.0,
+    )
+
+
+def test_default_viewport_returns_the_whole_grid():
+    grid = _grid()
+    assert len(grid.window(-90, 90, -180, 180)) == 3 * 36
+    assert len(grid.window(-90, 90, 0, 180)) == 3 * 18
+
+
+def test_viewport_crossing_the_antimeridian():
+    cells = _grid().window(-5, 5, 170, -170)
+    assert sorted(cell['longitude'] for cell in cells) == [-180.0, -170.0, 170.0]
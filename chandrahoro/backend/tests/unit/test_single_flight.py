@@ -0,0 +1,72 @@
+"""Tests for single-flight coalescing (local and across workers through Redis)."""
+
+import asyncio
+
+from app.core import single_flight as sf
+from app.core.redis_client import set_redis_client
+from app.core.single_flight import SingleFlight, flight_key
+from loadtest.fake_redis import FakeRedis
+
+
+def test_concurrent_calls_share_one_computation():
+    group = SingleFlight("test")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    async def run():
+        key = flight_key("chart", {"b": 1, "a": 2})
+        return await asyncio.gather(*(group.do(key, compute) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert results == [{"value": 42}] * 5
+    assert len(calls) == 1
+    stats = group.get_stats()
+    assert (stats["leaders"], stats["coalesced"], stats["inflight"]) == (1, 4, 0)
+    assert stats["saved_seconds"] > 0
+
+
+def test_exceptions_are_shared_and_not_cached():
+    group = SingleFlight("test")
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        results = await asyncio.gather(*(group.do("k", fail) for _ in range(3)), return_exceptions=True)
+        retry = await asyncio.gather(group.do("k", fail), return_exceptions=True)
+        return results + retry
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 2
+
+
+def test_shared_mode_waits_for_the_lock_holder(monkeypatch):
+    monkeypatch.setattr(sf, "SINGLE_FLIGHT_SHARED", True)
+    monkeypatch.setattr(sf, "POLL_SECONDS", 0.005)
+    set_redis_client(FakeRedis())
+    # Two groups with the same name stand in for two worker processes
+    workers = [SingleFlight("llm", shared=True), SingleFlight("llm", shared=True)]
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"content": "report"}
+
+    async def run():
+        return await asyncio.gather(*(worker.do("same", compute) for worker in workers))
+
+    try:
+        assert asyncio.run(run()) == [{"content": "report"}] * 2
+    finally:
+        set_redis_client(None)
+    assert len(calls) == 1
+    assert sum(worker.remote_hits for worker in workers) == 1
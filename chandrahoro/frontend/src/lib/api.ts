@@ -259,6 +259,11 @@ class ApiClient {
   // ============================================================================
 
   private async request<T>(endpoint: string, options?: RequestInit): Promise<T> {
+    const response = await this.send(endpoint, options);
+    return response.json();
+  }
+
+  private async send(endpoint: string, options?: RequestInit): Promise<Response> {
     // Use Next.js proxy routes for all API calls to avoid CSP violations
     const url = endpoint.startsWith('/api/') ? endpoint : `${this.baseUrl}${endpoint}`;
 
@@ -292,7 +297,7 @@ class ApiClient {
       throw new Error(error.message || error.detail || 'API request failed');
     }
 
-    return response.json();
+    return response;
   }
 
   async calculateChart(request: ChartRequest): Promise<ChartResponse> {
@@ -551,10 +556,20 @@ class ApiClient {
   /**
    * List user's saved charts
    */
-  async listCharts(skip: number = 0, limit: number = 10): Promise<BirthChart[]> {
-    return this.request<BirthChart[]>(
-      `/api/v1/charts?skip=${skip}&limit=${limit}`
-    );
+  async listCharts(limit: number = 10): Promise<BirthChart[]> {
+    // Pages are keyset-paginated: follow X-Next-Cursor until `limit` charts are loaded
+    const charts: BirthChart[] = [];
+    let cursor: string | null = null;
+    do {
+      const params = new URLSearchParams({ limit: String(Math.min(limit - charts.length, 100)) });
+      if (cursor) {
+        params.set('cursor', cursor);
+      }
+      const response = await this.send(`/api/v1/charts?${params}`);
+      charts.push(...(await response.json()));
+      cursor = response.headers.get('X-Next-Cursor');
+    } while (cursor && charts.length < limit);
+    return charts;
   }
 
   /**
@@ -33,7 +33,7 @@ export default function ChartsPage() {
     try {
       setIsLoading(true);
       setError('');
-      const data = await apiClient.listCharts(0, 100);
+      const data = await apiClient.listCharts(100);
       setCharts(data);
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to load charts';